@@ -0,0 +1,42 @@
+"""
+Shared fixtures for the performance benchmarks (pytest-benchmark).
+
+The benchmarks are not part of the unit test run (`testpaths` is `tests`); run them
+with `benchmarks/run_benchmarks.sh`, which keeps a result history and fails on
+regressions, or directly:
+    python -m pytest benchmarks --benchmark-only
+
+Most benchmarks are in-process micro-benchmarks against the stand-in servers
+(inprocess_standin.py); test_bench_synthetic_server.py runs the interactor over HTTP
+against the synthetic PLAXIS server and needs plxscripting.
+"""
+import os
+import sys
+import logging
+
+import pytest
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCHMARKS_DIR, '..', 'src')))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from backend.plaxis_interactor import interactor as interactor_module  # noqa: E402
+from inprocess_standin import new_standin_server  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    """Builders log every command; time our code, not the log handlers."""
+    root = logging.getLogger()
+    saved_level = root.level
+    root.setLevel(logging.WARNING)
+    yield
+    root.setLevel(saved_level)
+
+
+@pytest.fixture
+def standin_plaxis(monkeypatch):
+    """Routes `PlaxisInteractor` connections to in-process stand-in servers (see inprocess_standin.py)."""
+    monkeypatch.setattr(interactor_module, "new_server", new_standin_server)
+    return new_standin_server
+
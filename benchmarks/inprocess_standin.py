@@ -0,0 +1,82 @@
+"""
+In-process stand-in for the PLAXIS Input/Output servers used by the micro-benchmarks.
+
+`StandInObject` accepts any attribute access, call, index or slice and answers
+with another stand-in object, so every builder and parser code path runs without
+PLAXIS or plxscripting. It counts the calls it receives (the would-be HTTP
+requests) and is much cheaper than `unittest.mock.MagicMock`, so the benchmarks
+time our own code rather than the mock.
+
+No HTTP is involved, so these timings exclude serialisation and round trips; the
+end-to-end benchmarks against the synthetic server are in test_bench_synthetic_server.py.
+
+`StandInOutput` additionally serves step results for a spudcan with a configurable
+number of calculation steps, for the result extraction benchmarks.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StandInObject:
+    """Proxy that tolerates any PLAXIS API usage. `calls` is shared by all proxies of one server."""
+
+    def __init__(self, name: str = "g", calls: Optional[List[int]] = None):
+        self._name = name
+        self._calls = calls if calls is not None else [0]
+        self._children: Dict[str, "StandInObject"] = {}
+
+    @property
+    def calls(self) -> int:
+        return self._calls[0]
+
+    def __getattr__(self, name: str) -> "StandInObject":
+        if name.startswith("__"):
+            raise AttributeError(name)
+        child = self._children.get(name)
+        if child is None:
+            child = self._children[name] = StandInObject(f"{self._name}.{name}", self._calls)
+        return child
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "StandInObject":
+        self._calls[0] += 1
+        return StandInObject(f"{self._name}()", self._calls)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            return [StandInObject(f"{self._name}[{i}]", self._calls) for i in range(*key.indices(key.stop or 0))]
+        return StandInObject(f"{self._name}[{key!r}]", self._calls)
+
+    def __contains__(self, item: Any) -> bool:
+        return True
+
+    def __iter__(self):
+        return iter(())
+
+    def __repr__(self) -> str:
+        return f"<StandIn {self._name}>"
+
+
+def new_standin_server(host: str = "localhost", port: int = 10000, password: str = "") -> Tuple[StandInObject, StandInObject]:
+    """Drop-in replacement for `plxscripting.easy.new_server` returning (s_i, g_i) stand-ins."""
+    calls = [0]
+    return StandInObject("s", calls), StandInObject("g", calls)
+
+
+def synthetic_curve(n_steps: int) -> Tuple[List[float], List[float]]:
+    """Monotonic penetration (m) and a load (kN) that rises and softens, as PLAXIS would report per step."""
+    displacements = [-0.001 * i for i in range(n_steps)]
+    loads = [-(5000.0 * (1.0 - 1.0 / (1.0 + 0.01 * i)) + 0.2 * i) for i in range(n_steps)]
+    return displacements, loads
+
+
+class StandInOutput(StandInObject):
+    """Output global (`g_o`) whose `getresults` returns a `n_steps` step curve for any object."""
+
+    def __init__(self, n_steps: int):
+        super().__init__("g_o")
+        self.Phases = [StandInObject("g_o.Phases[0]", self._calls), StandInObject("g_o.Phases[1]", self._calls)]
+        self._displacements, self._loads = synthetic_curve(n_steps)
+
+    def getresults(self, obj: Any, phase: Any, result_type: Any, location: str = "node") -> List[float]:
+        self._calls[0] += 1
+        return self._loads if str(result_type).endswith("Fz>") else self._displacements
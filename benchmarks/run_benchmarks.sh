@@ -0,0 +1,40 @@
+#!/bin/bash
+
+# Runs the performance benchmarks, appends the results to the history and fails
+# (non-zero exit) if a benchmark regressed against the baseline run.
+#
+# Requires pytest-benchmark (see requirements.txt). Extra arguments are passed to pytest,
+# e.g. `benchmarks/run_benchmarks.sh -k extract_results`. The synthetic-server (HTTP)
+# benchmarks also need plxscripting and are skipped without it.
+
+# --- Configuration (override through the environment) ---
+# History directory; pytest-benchmark keeps one subfolder per machine/interpreter.
+BENCHMARK_STORAGE="${BENCHMARK_STORAGE:-benchmarks/.history}"
+# Space-separated regression limits, e.g. "mean:15%" or "mean:10% min:0.002".
+BENCHMARK_FAIL_THRESHOLDS="${BENCHMARK_FAIL_THRESHOLDS:-mean:15%}"
+# Run id (e.g. 0003) to compare against; empty compares against the latest saved run.
+BENCHMARK_BASELINE="${BENCHMARK_BASELINE:-}"
+
+cd "$(dirname "$0")/.." || exit 1
+
+COMPARE_OPTIONS=()
+if compgen -G "${BENCHMARK_STORAGE}/*/*.json" > /dev/null; then
+    if [ -n "$BENCHMARK_BASELINE" ]; then
+        COMPARE_OPTIONS+=("--benchmark-compare=${BENCHMARK_BASELINE}")
+    else
+        COMPARE_OPTIONS+=("--benchmark-compare")
+    fi
+    for threshold in $BENCHMARK_FAIL_THRESHOLDS; do
+        COMPARE_OPTIONS+=("--benchmark-compare-fail=${threshold}")
+    done
+else
+    echo "No benchmark history in '${BENCHMARK_STORAGE}'; this run becomes the baseline."
+fi
+
+python -m pytest benchmarks \
+    --benchmark-only \
+    --benchmark-storage="file://${BENCHMARK_STORAGE}" \
+    --benchmark-autosave \
+    --benchmark-columns=min,mean,median,stddev,rounds \
+    "${COMPARE_OPTIONS[@]}" \
+    "$@"
@@ -0,0 +1,23 @@
+"""
+Benchmarks for generating the model setup and calculation callables.
+"""
+import pytest
+
+from backend.plaxis_interactor import model_setup, calculation_builder
+
+from workloads import LAYER_COUNTS, make_project
+
+
+@pytest.mark.parametrize("n_layers", LAYER_COUNTS)
+def test_generate_model_setup_callables(benchmark, n_layers):
+    project = make_project(n_layers)
+    callables = benchmark(model_setup.generate_model_setup_callables, project)
+    assert callables
+
+
+@pytest.mark.parametrize("n_layers", LAYER_COUNTS)
+def test_generate_analysis_control_callables(benchmark, n_layers):
+    project = make_project(n_layers)
+    callables = benchmark(calculation_builder.generate_analysis_control_callables,
+                          project.analysis_control, project.loading)
+    assert callables
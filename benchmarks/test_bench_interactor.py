@@ -0,0 +1,51 @@
+"""
+In-process micro-benchmarks for the PlaxisInteractor stages against the stand-in
+servers (inprocess_standin.py); no HTTP is involved.
+
+`extra_info["plaxis_calls"]` records the API calls (HTTP requests against a real
+server) of one round, so a change in round trips shows up next to the timings.
+"""
+import pytest
+
+from backend.plaxis_interactor import model_setup, results_parser
+from backend.plaxis_interactor.interactor import PlaxisInteractor
+
+from inprocess_standin import StandInOutput
+from workloads import LAYER_COUNTS, CURVE_STEP_COUNTS, make_project
+
+
+@pytest.mark.parametrize("n_layers", LAYER_COUNTS)
+def test_setup_model_in_plaxis(benchmark, standin_plaxis, n_layers):
+    project = make_project(n_layers)
+    interactor = PlaxisInteractor(project_settings=project)
+    setup_callables = model_setup.generate_model_setup_callables(project)
+    interactor.setup_model_in_plaxis(setup_callables) # Connects; later rounds reuse the connection.
+
+    calls_before = interactor.g_i.calls
+    benchmark.pedantic(interactor.setup_model_in_plaxis, args=(setup_callables,), rounds=20, iterations=1)
+    benchmark.extra_info["plaxis_calls"] = (interactor.g_i.calls - calls_before) // 20
+
+
+def _output_interactor(tmp_path, n_steps):
+    project = make_project(10)
+    project.project_file_path = str(tmp_path / "benchmark.p3dxml")
+    (tmp_path / "benchmark.p3dxml").write_text("", encoding="utf-8")
+    interactor = PlaxisInteractor(project_settings=project)
+    interactor.s_o, interactor.g_o = object(), StandInOutput(n_steps) # Treated as an open Output connection.
+    return project, interactor
+
+
+@pytest.mark.parametrize("n_steps", CURVE_STEP_COUNTS)
+def test_extract_results(benchmark, tmp_path, n_steps):
+    project, interactor = _output_interactor(tmp_path, n_steps)
+    extraction_callables = results_parser.get_standard_results_commands(project)
+    raw_results = benchmark(interactor.extract_results, extraction_callables)
+    assert len(raw_results[0]) == n_steps
+
+
+@pytest.mark.parametrize("n_steps", CURVE_STEP_COUNTS)
+def test_compile_analysis_results(benchmark, tmp_path, n_steps):
+    project, interactor = _output_interactor(tmp_path, n_steps)
+    raw_results = interactor.extract_results(results_parser.get_standard_results_commands(project))
+    compiled = benchmark(results_parser.compile_analysis_results, raw_results, project)
+    assert compiled.peak_vertical_resistance is not None
@@ -0,0 +1,25 @@
+"""
+Benchmarks for saving and loading large project files.
+"""
+import pytest
+
+from backend.project_io import save_project, load_project
+
+from workloads import CURVE_STEP_COUNTS, make_project
+
+LARGE_PROJECT_LAYERS = 100
+
+
+@pytest.mark.parametrize("n_curve_points", CURVE_STEP_COUNTS)
+def test_save_project(benchmark, tmp_path, n_curve_points):
+    project = make_project(LARGE_PROJECT_LAYERS, n_curve_points)
+    path = str(tmp_path / "large_project.json")
+    assert benchmark(save_project, project, path)
+
+
+@pytest.mark.parametrize("n_curve_points", CURVE_STEP_COUNTS)
+def test_load_project(benchmark, tmp_path, n_curve_points):
+    path = str(tmp_path / "large_project.json")
+    assert save_project(make_project(LARGE_PROJECT_LAYERS, n_curve_points), path)
+    loaded = benchmark(load_project, path)
+    assert loaded is not None and len(loaded.soil_stratigraphy) == LARGE_PROJECT_LAYERS
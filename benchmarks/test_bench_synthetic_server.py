@@ -0,0 +1,41 @@
+"""
+End-to-end benchmarks for the PlaxisInteractor against the synthetic PLAXIS server.
+
+Unlike the in-process micro-benchmarks (inprocess_standin.py), these go through
+plxscripting over HTTP, so serialisation and round trips are part of the timings.
+`extra_info["plaxis_requests"]` records the HTTP requests of one round. Skipped when
+plxscripting is not installed.
+"""
+import pytest
+
+pytest.importorskip("plxscripting")
+
+from backend.plaxis_interactor import model_setup  # noqa: E402
+from backend.plaxis_interactor.interactor import PlaxisInteractor  # noqa: E402
+from backend.plaxis_interactor.synthetic_server import SyntheticPlaxis  # noqa: E402
+
+from workloads import LAYER_COUNTS, make_project  # noqa: E402
+
+
+@pytest.fixture
+def synthetic_plaxis():
+    with SyntheticPlaxis() as instance:
+        yield instance
+
+
+@pytest.mark.parametrize("n_layers", LAYER_COUNTS)
+def test_setup_model_over_http(benchmark, synthetic_plaxis, n_layers):
+    project = make_project(n_layers)
+    project.plaxis_api_input_port = synthetic_plaxis.input_port
+    project.plaxis_api_output_port = synthetic_plaxis.output_port
+    project.plaxis_api_password = ""
+    interactor = PlaxisInteractor(project_settings=project)
+    setup_callables = model_setup.generate_model_setup_callables(project)
+    interactor.setup_model_in_plaxis(setup_callables) # Connects; later rounds reuse the connection.
+
+    try:
+        requests_before = sum(synthetic_plaxis.request_counts.values())
+        benchmark.pedantic(interactor.setup_model_in_plaxis, args=(setup_callables,), rounds=5, iterations=1)
+        benchmark.extra_info["plaxis_requests"] = (sum(synthetic_plaxis.request_counts.values()) - requests_before) // 5
+    finally:
+        interactor.close_all_connections()
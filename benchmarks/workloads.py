@@ -0,0 +1,36 @@
+"""
+Benchmark workloads: project sizes and synthetic projects.
+"""
+from backend.models import (
+    ProjectSettings, SpudcanGeometry, SoilLayer, MaterialProperties, LoadingConditions, AnalysisResults
+)
+
+from inprocess_standin import synthetic_curve
+
+LAYER_COUNTS = [1, 10, 100]
+CURVE_STEP_COUNTS = [1_000, 10_000, 100_000]
+
+
+def make_project(n_layers: int, n_curve_points: int = 0) -> ProjectSettings:
+    """Spudcan project with `n_layers` 2 m clay layers (distinct materials) and optionally stored results."""
+    layers = [
+        SoilLayer(name=f"Layer {i + 1}", thickness=2.0,
+                  material=MaterialProperties(model_name="MohrCoulomb", Identification=f"Clay {i + 1}",
+                                              gammaUnsat=17.0, gammaSat=18.0, Eref=10000.0 + 500.0 * i,
+                                              nu=0.3, cRef=10.0 + 1.5 * i, phi=0.0, psi=0.0))
+        for i in range(n_layers)
+    ]
+    project = ProjectSettings(
+        project_name=f"Benchmark {n_layers} layers",
+        spudcan=SpudcanGeometry(diameter=12.0, height_cone_angle=30.0),
+        soil_stratigraphy=layers,
+        water_table_depth=0.0,
+        loading=LoadingConditions(vertical_preload=50000.0, target_penetration_or_load=5.0, target_type="penetration"),
+    )
+    if n_curve_points:
+        displacements, loads = synthetic_curve(n_curve_points)
+        curve = [{'penetration': abs(d), 'load': abs(f)} for d, f in zip(displacements, loads)]
+        project.analysis_results = AnalysisResults(final_penetration_depth=curve[-1]['penetration'],
+                                                   peak_vertical_resistance=max(p['load'] for p in curve),
+                                                   load_penetration_curve_data=curve)
+    return project
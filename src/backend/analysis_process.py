@@ -0,0 +1,396 @@
+"""
+Analysis pipeline in a separate worker process.
+
+The GUI used to run the whole pipeline in a QThread of its own process: PLAXIS
+requests, JSON parsing, decryption and results compilation. Heavy parsing then
+competed with the UI for the GIL, and a hung `requests` call could not be
+interrupted. `AnalysisProcess` runs `run_analysis_pipeline` in a child process
+(multiprocessing, "spawn" by default, so no Qt state is forked) and streams events
+back over a pipe:
+    ("stage", name)                  analysis stage changes ("setup_start", ...)
+    ("progress", value, maximum)     interactor progress
+    ("curve", [(pen, load), ...])    new live load-penetration curve points
+    ("finished", AnalysisResults)    terminal: success
+    ("error", title, message)        terminal: failure (user-facing title and message)
+    ("cancelled",)                   terminal: stopped by `request_stop`/`kill`
+The child's log records are re-emitted to the parent's loggers, so the GUI log pane
+and log file see them as before.
+
+Cancellation is two-step. `request_stop` asks the child to stop the calculation
+(`breakcalculation`). If the child has not exited after a grace period, it is
+terminated and then killed, so a hung request never keeps the UI waiting.
+"""
+
+import logging
+import threading
+import multiprocessing
+from typing import List, Optional, Any, Callable, Iterator, Tuple
+
+from .models import ProjectSettings, AnalysisResults
+from .exceptions import (
+    PlaxisAutomationError, PlaxisConnectionError, PlaxisConfigurationError,
+    PlaxisCalculationError, PlaxisOutputError, PlaxisCliError, ProjectValidationError
+)
+from .run_trace import RunTracer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STOP_GRACE_S = 10.0 # Time the child gets to stop the calculation before it is killed.
+TERMINAL_EVENTS = ("finished", "error", "cancelled")
+
+Event = Tuple[Any, ...]
+
+
+class AnalysisEvents:
+    """Callbacks of `run_analysis_pipeline`. The base class ignores events and never cancels."""
+
+    def stage(self, name: str) -> None:
+        pass
+
+    def progress(self, value: int, maximum: int) -> None:
+        pass
+
+    def live_curve_points(self, points: List[Tuple[float, float]]) -> None:
+        pass
+
+    def interactor_created(self, interactor: Any) -> None:
+        pass
+
+    def cancelled(self) -> bool:
+        return False
+
+
+# (plaxis_path, project_settings, events, tracer) -> results, or None if cancelled.
+AnalysisPipeline = Callable[[Optional[str], ProjectSettings, AnalysisEvents, Optional[RunTracer]],
+                            Optional[AnalysisResults]]
+
+
+def run_analysis_pipeline(plaxis_path: Optional[str], project_settings: ProjectSettings, events: AnalysisEvents,
+                          tracer: Optional[RunTracer] = None) -> Optional[AnalysisResults]:
+    """
+    Full analysis of `project_settings`: model setup, calculation (with live curve polling)
+    and results, or a mesh convergence study if enabled. Returns None if `events.cancelled()`
+    turned true between stages.
+    """
+    from .plaxis_interactor.interactor import PlaxisInteractor # Deferred: imports plxscripting.
+    from .plaxis_interactor import (
+        calculation_builder, results_parser, mesh_cache, mesh_convergence, model_setup, live_curve
+    )
+
+    interactor = PlaxisInteractor(plaxis_path, project_settings, tracer=tracer)
+    events.interactor_created(interactor)
+    interactor.signals.analysis_stage_changed.connect(events.stage)
+    interactor.signals.progress_updated.connect(events.progress)
+    try:
+        if events.cancelled():
+            return None
+
+        if project_settings.analysis_control.mesh_convergence_study:
+            # Runs the coarseness ladder and reports the results of the cheapest converged mesh.
+            events.stage("calculation_start")
+            study = mesh_convergence.run_mesh_convergence_study(
+                project_settings, mesh_convergence.build_interactor_analysis_runner(plaxis_path, should_stop=events.cancelled),
+                should_stop=events.cancelled)
+            events.stage("results_end")
+            logger.info(f"Mesh convergence study selected '{study.selected_coarseness}' "
+                        f"(converged={study.converged}, changes={study.relative_changes}).")
+            return None if events.cancelled() else study.selected_results
+
+        # 1. Model setup
+        events.stage("setup_start")
+        if project_settings.analysis_control.reuse_mesh_template:
+            # Mesh template cache: on a hit the meshed base project is opened and only
+            # run-specific data (materials, water, loads, phases) is applied.
+            mesh_plan, model_setup_callables, calculation_run_callables = \
+                mesh_cache.generate_cached_workflow_callables(project_settings)
+            interactor.setup_model_in_plaxis(model_setup_callables, is_new_project=True,
+                                             template_path=mesh_plan.template_path if mesh_plan.cache_hit else None)
+        else:
+            interactor.setup_model_in_plaxis(model_setup.generate_model_setup_callables(project_settings),
+                                             is_new_project=True)
+            calculation_run_callables = calculation_builder.generate_analysis_control_callables(
+                project_settings.analysis_control, project_settings.loading,
+                leg_names=model_setup.get_leg_names(project_settings))
+        events.stage("setup_end")
+        if events.cancelled():
+            return None
+
+        # 2. Calculation, with the partial curve polled from PLAXIS Output meanwhile
+        events.stage("calculation_start")
+        poller = _start_live_curve_poller(interactor, project_settings, events, live_curve)
+        try:
+            interactor.run_calculation(calculation_run_callables)
+        finally:
+            if poller:
+                poller.stop()
+        events.stage("calculation_end")
+        if events.cancelled():
+            return None
+
+        # 3. Results
+        events.stage("results_start")
+        raw_results_data = interactor.extract_results(results_parser.get_standard_results_commands(project_settings))
+        compiled_results = results_parser.compile_analysis_results(raw_results_data, project_settings)
+        events.stage("results_end")
+        return None if events.cancelled() else compiled_results
+    finally:
+        interactor.close_all_connections()
+
+
+def _start_live_curve_poller(interactor: Any, project_settings: ProjectSettings, events: AnalysisEvents,
+                             live_curve: Any) -> Optional[Any]:
+    """Starts polling the partial load-penetration curve, unless disabled or unavailable."""
+    interval = project_settings.analysis_control.live_curve_poll_interval
+    if not interval or interval <= 0:
+        return None
+    fetch = interactor.create_live_curve_fetcher()
+    if fetch is None:
+        return None
+
+    def fetch_and_forward(first_step: int) -> Tuple[List[Tuple[float, float]], int]:
+        points, next_step = fetch(first_step)
+        if points:
+            events.live_curve_points(list(points))
+        return points, next_step
+
+    poller = live_curve.LiveCurvePoller(fetch_and_forward, live_curve.CurveRingBuffer(capacity=1024), interval,
+                                        on_stop=interactor.close_live_curve_connection)
+    poller.start()
+    return poller
+
+
+def describe_analysis_error(e: BaseException) -> Tuple[str, str]:
+    """User-facing (title, message) for an exception from the analysis pipeline."""
+    if isinstance(e, PlaxisConnectionError):
+        return ("PLAXIS Connection Error",
+                f"Could not connect to PLAXIS services:\n{e}\n\n"
+                "Ensure PLAXIS is running, API service enabled, and connection details are correct.")
+    if isinstance(e, PlaxisConfigurationError):
+        return ("PLAXIS Configuration Error",
+                f"Model or analysis configuration issue for PLAXIS:\n{e}\n\n"
+                "Check input parameters, soil definitions, and analysis settings.")
+    if isinstance(e, PlaxisCalculationError):
+        return ("PLAXIS Calculation Error",
+                f"PLAXIS reported an error during calculation:\n{e}\n\n"
+                "This may be due to numerical issues or model instability. Check PLAXIS output.")
+    if isinstance(e, PlaxisOutputError):
+        return "PLAXIS Output Error", f"Could not retrieve or parse results from PLAXIS:\n{e}"
+    if isinstance(e, PlaxisCliError):
+        return "PLAXIS Scripting Error", f"Error running PLAXIS script (CLI):\n{e}"
+    if isinstance(e, ProjectValidationError):
+        return "Input Validation Error", f"Issue with provided input data:\n{e}\n\nPlease review inputs."
+    if isinstance(e, PlaxisAutomationError):
+        return "PLAXIS Automation Error", f"An automation error occurred:\n{e}"
+    return "Unexpected Application Error", f"An unexpected error occurred:\n{e}\n\nCheck logs for details."
+
+
+# --- Child process ---
+
+class _PipeEvents(AnalysisEvents):
+    """Sends pipeline events to the parent; a control thread receives stop requests."""
+
+    def __init__(self, events_conn: Any, control_conn: Any):
+        self._events_conn = events_conn
+        self._control_conn = control_conn
+        self._send_lock = threading.Lock() # Events come from the pipeline, poller and logging threads.
+        self._stop = threading.Event()
+        self._interactor: Optional[Any] = None
+
+    def send(self, event: Event) -> None:
+        with self._send_lock:
+            self._events_conn.send(event)
+
+    def stage(self, name: str) -> None:
+        self.send(("stage", name))
+
+    def progress(self, value: int, maximum: int) -> None:
+        self.send(("progress", value, maximum))
+
+    def live_curve_points(self, points: List[Tuple[float, float]]) -> None:
+        self.send(("curve", points))
+
+    def interactor_created(self, interactor: Any) -> None:
+        self._interactor = interactor
+        if self._stop.is_set():
+            interactor.attempt_stop_calculation()
+
+    def cancelled(self) -> bool:
+        return self._stop.is_set()
+
+    def listen_for_stop(self) -> None:
+        try:
+            message = self._control_conn.recv()
+        except (EOFError, OSError):
+            return # Parent gone or closed the control pipe.
+        if message == "stop":
+            logger.info("Analysis process: stop requested.")
+            self._stop.set()
+            if self._interactor is not None:
+                self._interactor.attempt_stop_calculation()
+
+
+class _PipeLogHandler(logging.Handler):
+    """Forwards the child's log records to the parent as ("log", record attributes)."""
+
+    def __init__(self, events: _PipeEvents):
+        super().__init__()
+        self._events = events
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            attrs = dict(record.__dict__, msg=record.getMessage(), args=None, exc_info=None,
+                         exc_text=self.formatter.formatException(record.exc_info) if record.exc_info else None)
+            self._events.send(("log", attrs))
+        except Exception:
+            self.handleError(record)
+
+
+def _child_main(events_conn: Any, control_conn: Any, pipeline: AnalysisPipeline, plaxis_path: Optional[str],
+                project_settings: ProjectSettings, trace_path: Optional[str], log_level: int) -> None:
+    events = _PipeEvents(events_conn, control_conn)
+    handler = _PipeLogHandler(events)
+    handler.setFormatter(logging.Formatter())
+    root = logging.getLogger()
+    for existing in list(root.handlers): # Inherited handlers (fork) would write the parent's files twice.
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(log_level)
+    threading.Thread(target=events.listen_for_stop, name="AnalysisStopListener", daemon=True).start()
+
+    tracer = None
+    try:
+        if trace_path:
+            tracer = RunTracer(trace_path, project_name=project_settings.project_name)
+        results = pipeline(plaxis_path, project_settings, events, tracer)
+        events.send(("cancelled",) if results is None or events.cancelled() else ("finished", results))
+    except BaseException as e:
+        if events.cancelled():
+            events.send(("cancelled",))
+        else:
+            logger.error(f"Analysis process: {type(e).__name__}: {e}", exc_info=True)
+            events.send(("error",) + describe_analysis_error(e))
+    finally:
+        if tracer:
+            tracer.close()
+        root.removeHandler(handler)
+        events_conn.close()
+
+
+# --- Parent side ---
+
+class AnalysisProcess:
+    """
+    Runs an analysis pipeline in a child process and streams its events back.
+
+    Args:
+        plaxis_path, project_settings: The analysis to run (both are pickled to the child).
+        trace_path: Run trace (JSONL) written by the child, if set.
+        pipeline: Module-level function run in the child; defaults to `run_analysis_pipeline`.
+        log_level: Level of the child's root logger.
+        context: multiprocessing context; defaults to "spawn".
+    """
+
+    def __init__(self, plaxis_path: Optional[str], project_settings: ProjectSettings,
+                 trace_path: Optional[str] = None, pipeline: AnalysisPipeline = run_analysis_pipeline,
+                 log_level: int = logging.INFO, context: Optional[Any] = None):
+        self._context = context or multiprocessing.get_context("spawn")
+        self._events_reader, events_writer = self._context.Pipe(duplex=False)
+        control_reader, self._control_writer = self._context.Pipe(duplex=False)
+        self._process = self._context.Process(
+            target=_child_main, name="AnalysisProcess", daemon=True,
+            args=(events_writer, control_reader, pipeline, plaxis_path, project_settings, trace_path, log_level))
+        self._child_conns = (events_writer, control_reader)
+        self._kill_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self.stop_requested = False
+        self.killed = False
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid
+
+    @property
+    def exitcode(self) -> Optional[int]:
+        return self._process.exitcode
+
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def start(self) -> "AnalysisProcess":
+        self._process.start()
+        for conn in self._child_conns: # The child holds its own copies; closing ours makes EOF detectable.
+            conn.close()
+        logger.info(f"Analysis process started (pid {self.pid}).")
+        return self
+
+    def events(self, poll_interval_s: float = 0.2) -> Iterator[Event]:
+        """
+        Yields the child's events until its terminal event, or until it exits without one
+        (killed or crashed; reported as "cancelled" after a stop request, otherwise "error").
+        Log records are re-emitted to the parent's loggers instead of being yielded.
+        """
+        while True:
+            try:
+                if not self._events_reader.poll(poll_interval_s):
+                    if self._process.is_alive():
+                        continue
+                    if not self._events_reader.poll(0):
+                        raise EOFError
+                event = self._events_reader.recv()
+            except (EOFError, OSError):
+                self._process.join(5.0)
+                yield self._exit_event()
+                return
+            if event[0] == "log":
+                record = logging.makeLogRecord(event[1])
+                logging.getLogger(record.name).handle(record)
+                continue
+            yield event
+            if event[0] in TERMINAL_EVENTS:
+                self._process.join(5.0)
+                return
+
+    def _exit_event(self) -> Event:
+        if self.stop_requested or self.killed:
+            return ("cancelled",)
+        return ("error", "Analysis Process Terminated",
+                f"The analysis process exited unexpectedly (exit code {self.exitcode}).\n\nCheck logs for details.")
+
+    def request_stop(self, grace_s: float = DEFAULT_STOP_GRACE_S) -> None:
+        """Asks the child to stop the calculation; kills it if it has not exited after `grace_s`."""
+        with self._lock:
+            if self.stop_requested:
+                if grace_s <= 0:
+                    self.kill()
+                return
+            self.stop_requested = True
+        try:
+            self._control_writer.send("stop")
+        except (OSError, ValueError):
+            pass # Child already gone.
+        if grace_s <= 0:
+            self.kill()
+        else:
+            self._kill_timer = threading.Timer(grace_s, self.kill)
+            self._kill_timer.daemon = True
+            self._kill_timer.start()
+
+    def kill(self, terminate_timeout_s: float = 2.0) -> None:
+        """Terminates the child (SIGTERM, then SIGKILL); its events end with "cancelled"."""
+        if self._kill_timer is not None:
+            self._kill_timer.cancel()
+        if not self._process.is_alive():
+            return
+        self.killed = True
+        logger.warning(f"Analysis process (pid {self.pid}) did not stop; terminating it.")
+        self._process.terminate()
+        self._process.join(terminate_timeout_s)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+
+    def close(self) -> None:
+        """Kills the child if needed and releases the pipes."""
+        self.kill()
+        self._events_reader.close()
+        self._control_writer.close()
@@ -0,0 +1,517 @@
+"""
+CPT import and automatic layer lumping.
+
+Reads cone penetration test profiles (CSV text or AGS4 SCPT groups), derives an
+undrained shear strength (su) or effective friction angle (phi') profile from
+the qc/fs/u2 samples, and lumps the profile into the smallest number of uniform
+layers whose error stays within a tolerance. A CPT with thousands of samples
+becomes a handful of `SoilLayer`s, which keeps the PLAXIS stratigraphy (and the
+mesh) small.
+
+Files are read line by line, so large exports are never held as text. NumPy is
+used for the profile arithmetic when installed; a pure Python path gives the
+same results without it.
+
+Correlations (SI units, stresses in kPa):
+    qt  = qc + (1 - a) * u2                                  (net area ratio a)
+    su  = (qt - sigma_v0) / Nkt
+    phi' = 17.6 + 11 * log10((qt / pa) / sqrt(sigma'_v0 / pa))  (Kulhawy & Mayne, 1990)
+with sigma_v0 = gamma * z below the seabed/ground surface and hydrostatic pore
+pressure below the water table.
+"""
+
+import os
+import csv
+import math
+import logging
+import dataclasses
+from dataclasses import dataclass, field
+from typing import List, Optional, Iterator, Tuple, Dict, Iterable, Sequence
+
+from .models import SoilLayer, MaterialProperties, Borehole
+from .exceptions import ProjectValidationError
+from .plaxis_interactor.soil_builder import merge_linear_gradient_layers
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError: # Optional: the pure Python path below is used instead.
+    np = None
+
+ATMOSPHERIC_PRESSURE = 100.0 # kPa
+GAMMA_WATER = 10.0 # kN/m^3
+CPT_PARAMETERS = ("su", "phi")
+
+DEFAULT_LUMPING_TOLERANCE = 0.10 # Relative RMS error of the lumped profile.
+DEFAULT_MIN_LAYER_THICKNESS = 0.5 # m; also the resolution of the layer boundaries.
+
+# Accepted CSV header names (lower case, units in brackets stripped).
+_CSV_COLUMN_ALIASES = {
+    "depth": ("depth", "z", "penetration", "scpt_dpth"),
+    "qc": ("qc", "cone resistance", "scpt_res"),
+    "fs": ("fs", "sleeve friction", "scpt_fres"),
+    "u2": ("u2", "pore pressure", "scpt_pwp2"),
+}
+_UNIT_TO_KPA = {"kpa": 1.0, "mpa": 1000.0, "pa": 0.001, "kn/m2": 1.0}
+
+
+@dataclass
+class CPTSample:
+    depth: float          # m below the seabed/ground surface.
+    qc: float             # Cone resistance (kPa).
+    fs: Optional[float] = None   # Sleeve friction (kPa).
+    u2: Optional[float] = None   # Pore pressure behind the cone (kPa).
+
+
+@dataclass
+class CPTProfile:
+    """A CPT sounding, samples sorted by depth. Stresses in kPa."""
+    name: str = "CPT1"
+    x: float = 0.0
+    y: float = 0.0
+    depth: List[float] = field(default_factory=list)
+    qc: List[float] = field(default_factory=list)
+    fs: List[Optional[float]] = field(default_factory=list)
+    u2: List[Optional[float]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.depth)
+
+    def append(self, sample: CPTSample) -> None:
+        self.depth.append(sample.depth)
+        self.qc.append(sample.qc)
+        self.fs.append(sample.fs)
+        self.u2.append(sample.u2)
+
+
+@dataclass
+class LumpedLayer:
+    """One layer of a lumped profile: depths in m, `value` is the mean su (kPa) or phi' (deg)."""
+    top: float
+    bottom: float
+    value: float
+    sample_count: int
+
+    @property
+    def thickness(self) -> float:
+        return self.bottom - self.top
+
+
+# --- Reading ---
+
+def _header_key(header: str) -> str:
+    return header.split("(")[0].split("[")[0].strip().strip('"').lower()
+
+
+def _header_unit(header: str) -> Optional[str]:
+    for opening, closing in (("(", ")"), ("[", "]")):
+        if opening in header and closing in header:
+            return header[header.index(opening) + 1:header.index(closing)].strip().lower()
+    return None
+
+
+def _to_float(text: str) -> Optional[float]:
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _to_kpa(value: Optional[float], unit: Optional[str], default_factor: float) -> Optional[float]:
+    if value is None:
+        return None
+    return value * _UNIT_TO_KPA.get(unit, default_factor) if unit else value * default_factor
+
+
+def _resolve_columns(headers: Sequence[str], path: str) -> Dict[str, int]:
+    keys = [_header_key(h) for h in headers]
+    columns: Dict[str, int] = {}
+    for name, aliases in _CSV_COLUMN_ALIASES.items():
+        for i, key in enumerate(keys):
+            if key in aliases:
+                columns[name] = i
+                break
+    if "depth" not in columns or "qc" not in columns:
+        raise ProjectValidationError(f"CPT file '{path}' needs depth and qc columns; found headers {list(headers)}.")
+    return columns
+
+
+def _iter_csv_samples(lines: Iterable[str], path: str, qc_unit: str) -> Iterator[CPTSample]:
+    """CSV with one header row; qc in `qc_unit` unless the header states a unit, fs/u2 in kPa."""
+    columns: Optional[Dict[str, int]] = None
+    units: Dict[str, Optional[str]] = {}
+    for row in csv.reader(line for line in lines if line.strip() and not line.lstrip().startswith("#")):
+        if columns is None:
+            columns = _resolve_columns(row, path)
+            units = {name: _header_unit(row[i]) for name, i in columns.items()}
+            continue
+        depth = _to_float(row[columns["depth"]])
+        qc = _to_float(row[columns["qc"]])
+        if depth is None or qc is None: # Blank or non-numeric rows are skipped.
+            continue
+        yield CPTSample(
+            depth=depth,
+            qc=_to_kpa(qc, units.get("qc"), _UNIT_TO_KPA[qc_unit.lower()]),
+            fs=_to_kpa(_to_float(row[columns["fs"]]), units.get("fs"), 1.0) if "fs" in columns else None,
+            u2=_to_kpa(_to_float(row[columns["u2"]]), units.get("u2"), 1.0) if "u2" in columns else None,
+        )
+
+
+def _iter_ags_samples(lines: Iterable[str], path: str, location: Optional[str]) -> Iterator[Tuple[str, CPTSample]]:
+    """AGS4 SCPT group rows as (LOCA_ID, sample); units from the group's UNIT row."""
+    in_scpt = False
+    columns: Dict[str, int] = {}
+    units: Dict[str, Optional[str]] = {}
+    loca_column: Optional[int] = None
+    for row in csv.reader(line for line in lines if line.strip()):
+        descriptor = row[0].strip().upper()
+        if descriptor == "GROUP":
+            in_scpt = len(row) > 1 and row[1].strip().upper() == "SCPT"
+        elif not in_scpt:
+            continue
+        elif descriptor == "HEADING":
+            columns = _resolve_columns(row, path)
+            loca_column = next((i for i, h in enumerate(row) if h.strip().upper() == "LOCA_ID"), None)
+        elif descriptor == "UNIT":
+            units = {name: (row[i].strip().lower() or None) for name, i in columns.items()}
+        elif descriptor == "DATA" and columns:
+            loca_id = row[loca_column].strip() if loca_column is not None else ""
+            if location is not None and loca_id != location:
+                continue
+            depth = _to_float(row[columns["depth"]])
+            qc = _to_float(row[columns["qc"]])
+            if depth is None or qc is None:
+                continue
+            yield loca_id, CPTSample(
+                depth=depth,
+                qc=_to_kpa(qc, units.get("qc"), 1000.0), # AGS4 SCPT_RES is in MPa
+                fs=_to_kpa(_to_float(row[columns["fs"]]), units.get("fs"), 1.0) if "fs" in columns else None,
+                u2=_to_kpa(_to_float(row[columns["u2"]]), units.get("u2"), 1.0) if "u2" in columns else None,
+            )
+
+
+def _is_ags_file(path: str) -> bool:
+    if path.lower().endswith(".ags"):
+        return True
+    with open(path, "r", newline="") as f:
+        for line in f:
+            if line.strip():
+                return line.lstrip().upper().startswith('"GROUP"')
+    return False
+
+
+def read_cpt_profile(filepath: str, location: Optional[str] = None, qc_unit: str = "MPa") -> CPTProfile:
+    """
+    Reads a CPT sounding from a CSV or AGS4 file.
+
+    Args:
+        filepath: CSV file (header row with depth, qc and optionally fs, u2 columns) or AGS4 file.
+        location: AGS LOCA_ID to read; defaults to the first location in the file.
+        qc_unit: Unit of qc in CSV files without a unit in the header ("MPa" or "kPa").
+
+    Raises:
+        ProjectValidationError: If the file cannot be read, lacks depth/qc columns or has no samples.
+    """
+    if qc_unit.lower() not in _UNIT_TO_KPA:
+        raise ProjectValidationError(f"Unsupported qc unit '{qc_unit}'.")
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    profile = CPTProfile(name=name)
+    try:
+        is_ags = _is_ags_file(filepath)
+        with open(filepath, "r", newline="") as f:
+            if is_ags:
+                for loca_id, sample in _iter_ags_samples(f, filepath, location):
+                    if location is None: # Lock onto the first location found.
+                        location = loca_id
+                        profile.name = loca_id or name
+                    elif loca_id != location:
+                        continue
+                    profile.append(sample)
+            else:
+                for sample in _iter_csv_samples(f, filepath, qc_unit):
+                    profile.append(sample)
+    except (IOError, UnicodeDecodeError, csv.Error) as e:
+        raise ProjectValidationError(f"Could not read CPT file '{filepath}': {e}")
+
+    if len(profile) == 0:
+        raise ProjectValidationError(f"No CPT samples found in '{filepath}'" + (f" for location '{location}'." if location else "."))
+    if any(b < a for a, b in zip(profile.depth, profile.depth[1:])):
+        order = sorted(range(len(profile)), key=profile.depth.__getitem__)
+        for attr in ("depth", "qc", "fs", "u2"):
+            values = getattr(profile, attr)
+            setattr(profile, attr, [values[i] for i in order])
+    logger.info(f"Read CPT '{profile.name}' from '{filepath}': {len(profile)} samples to {profile.depth[-1]:.2f} m.")
+    return profile
+
+
+# --- Interpretation ---
+
+def derive_strength_profile(
+    profile: CPTProfile,
+    parameter: str = "su",
+    gamma: float = 18.0,
+    water_table_depth: float = 0.0,
+    nkt: float = 15.0,
+    net_area_ratio: float = 0.8
+) -> Tuple[List[float], List[float]]:
+    """
+    Derives su (kPa) or phi' (degrees) at each sample depth.
+
+    Args:
+        parameter: "su" (undrained, clays) or "phi" (drained, sands).
+        gamma: Bulk unit weight of the soil (kN/m^3).
+        water_table_depth: Depth of the water table below the surface (m); 0 for offshore sites.
+        nkt: Cone factor for su.
+        net_area_ratio: Cone net area ratio `a` used to correct qc to qt with u2.
+
+    Returns:
+        (depths, values); samples where the value is undefined (e.g. qt <= sigma_v0) are dropped.
+
+    Raises:
+        ProjectValidationError: On an unknown parameter or non-positive gamma/nkt.
+    """
+    if parameter not in CPT_PARAMETERS:
+        raise ProjectValidationError(f"Unknown CPT parameter '{parameter}'. Must be one of {CPT_PARAMETERS}.")
+    if gamma <= 0 or nkt <= 0:
+        raise ProjectValidationError("CPT interpretation needs a positive unit weight and cone factor.")
+
+    u2 = [u if u is not None else 0.0 for u in profile.u2]
+    if np is not None:
+        z = np.asarray(profile.depth, dtype=float)
+        qt = np.asarray(profile.qc, dtype=float) + (1.0 - net_area_ratio) * np.asarray(u2, dtype=float)
+        sigma_v = gamma * z
+        sigma_v_eff = sigma_v - GAMMA_WATER * np.clip(z - water_table_depth, 0.0, None)
+        if parameter == "su":
+            values = (qt - sigma_v) / nkt
+            valid = values > 0
+        else:
+            valid = (qt > 0) & (sigma_v_eff > 0)
+            ratio = np.where(valid, qt / ATMOSPHERIC_PRESSURE / np.sqrt(np.where(valid, sigma_v_eff, 1.0) / ATMOSPHERIC_PRESSURE), 1.0)
+            values = 17.6 + 11.0 * np.log10(ratio)
+        return z[valid].tolist(), values[valid].tolist()
+
+    depths: List[float] = []
+    values_list: List[float] = []
+    for z, qc, u in zip(profile.depth, profile.qc, u2):
+        qt = qc + (1.0 - net_area_ratio) * u
+        sigma_v = gamma * z
+        sigma_v_eff = sigma_v - GAMMA_WATER * max(z - water_table_depth, 0.0)
+        if parameter == "su":
+            value = (qt - sigma_v) / nkt
+            if value <= 0:
+                continue
+        else:
+            if qt <= 0 or sigma_v_eff <= 0:
+                continue
+            value = 17.6 + 11.0 * math.log10(qt / ATMOSPHERIC_PRESSURE / math.sqrt(sigma_v_eff / ATMOSPHERIC_PRESSURE))
+        depths.append(z)
+        values_list.append(value)
+    return depths, values_list
+
+
+# --- Layer lumping ---
+
+def _bin_statistics(depths: Sequence[float], values: Sequence[float], bin_size: float) -> Tuple[List[float], List[Tuple[int, float, float]]]:
+    """
+    Groups samples into depth bins of `bin_size` (starting at 0) and returns the bin
+    bottom depths and per-bin (count, sum, sum of squares), skipping empty bins.
+    """
+    if np is not None:
+        z = np.asarray(depths, dtype=float)
+        v = np.asarray(values, dtype=float)
+        index = np.floor(z / bin_size).astype(int)
+        bins, inverse = np.unique(index, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=v)
+        sumsq = np.bincount(inverse, weights=v * v)
+        bottoms = ((bins + 1) * bin_size).tolist()
+        return bottoms, list(zip(counts.tolist(), sums.tolist(), sumsq.tolist()))
+
+    stats: Dict[int, List[float]] = {}
+    for z, v in zip(depths, values):
+        entry = stats.setdefault(int(math.floor(z / bin_size)), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += v
+        entry[2] += v * v
+    ordered = sorted(stats)
+    return [(i + 1) * bin_size for i in ordered], [(int(stats[i][0]), stats[i][1], stats[i][2]) for i in ordered]
+
+
+def lump_profile(
+    depths: Sequence[float],
+    values: Sequence[float],
+    tolerance: float = DEFAULT_LUMPING_TOLERANCE,
+    min_layer_thickness: float = DEFAULT_MIN_LAYER_THICKNESS,
+    max_layers: Optional[int] = None
+) -> List[LumpedLayer]:
+    """
+    Splits a depth profile into the fewest uniform layers whose relative RMS error
+    (RMS deviation from the layer means / mean |value|) is within `tolerance`.
+
+    Samples are first grouped into bins of `min_layer_thickness`, which bounds the
+    layer thickness and the problem size; the optimal boundaries for each layer
+    count are then found by dynamic programming over the bins. If no layer count up
+    to `max_layers` meets the tolerance, the best split with `max_layers` is returned.
+
+    Raises:
+        ProjectValidationError: If the profile is empty or the arguments are invalid.
+    """
+    if not depths or len(depths) != len(values):
+        raise ProjectValidationError("Cannot lump an empty or inconsistent CPT profile.")
+    if tolerance < 0 or min_layer_thickness <= 0 or (max_layers is not None and max_layers < 1):
+        raise ProjectValidationError("Lumping needs tolerance >= 0, min_layer_thickness > 0 and max_layers >= 1.")
+
+    bottoms, stats = _bin_statistics(depths, values, min_layer_thickness)
+    n_bins = len(stats)
+    prefix_n, prefix_s, prefix_ss = [0], [0.0], [0.0]
+    for count, total, total_sq in stats:
+        prefix_n.append(prefix_n[-1] + count)
+        prefix_s.append(prefix_s[-1] + total)
+        prefix_ss.append(prefix_ss[-1] + total_sq)
+
+    def sse(i: int, j: int) -> float: # Squared error of one layer spanning bins i..j-1
+        count = prefix_n[j] - prefix_n[i]
+        total = prefix_s[j] - prefix_s[i]
+        return max(prefix_ss[j] - prefix_ss[i] - total * total / count, 0.0)
+
+    n_samples = prefix_n[-1]
+    scale = sum(abs(v) for v in values) / n_samples or 1.0
+    limit = min(max_layers or n_bins, n_bins)
+
+    cost = [sse(0, j) if j > 0 else 0.0 for j in range(n_bins + 1)] # Best cost of bins 0..j-1 with k layers
+    splits: List[List[int]] = [[0] * (n_bins + 1)]
+    layer_count = 1
+    while math.sqrt(cost[n_bins] / n_samples) / scale > tolerance and layer_count < limit:
+        new_cost = [math.inf] * (n_bins + 1)
+        split_at = [0] * (n_bins + 1)
+        for j in range(layer_count + 1, n_bins + 1):
+            for i in range(layer_count, j):
+                candidate = cost[i] + sse(i, j)
+                if candidate < new_cost[j]:
+                    new_cost[j], split_at[j] = candidate, i
+        cost = new_cost
+        splits.append(split_at)
+        layer_count += 1
+
+    boundaries = [n_bins]
+    for k in range(layer_count - 1, 0, -1):
+        boundaries.append(splits[k][boundaries[-1]])
+    boundaries.append(0)
+    boundaries.reverse()
+
+    layers: List[LumpedLayer] = []
+    for i, j in zip(boundaries, boundaries[1:]):
+        count = prefix_n[j] - prefix_n[i]
+        top = layers[-1].bottom if layers else 0.0
+        bottom = bottoms[j - 1] if j < n_bins else max(depths)
+        layers.append(LumpedLayer(top=top, bottom=bottom, value=(prefix_s[j] - prefix_s[i]) / count, sample_count=count))
+    error = math.sqrt(cost[n_bins] / n_samples) / scale
+    logger.info(f"Lumped {n_samples} samples into {len(layers)} layers (relative RMS error {error:.3f}, tolerance {tolerance:.3f}).")
+    return layers
+
+
+# --- Stratigraphy ---
+
+def lumped_layers_to_soil_layers(
+    layers: List[LumpedLayer],
+    parameter: str = "su",
+    gamma: float = 18.0,
+    name_prefix: str = "CPT",
+    stiffness_ratio: Optional[float] = None
+) -> List[SoilLayer]:
+    """
+    Converts lumped layers into Mohr-Coulomb `SoilLayer`s: undrained (cRef = su,
+    phi = 0) for "su", drained (phi = phi', small cohesion) for "phi".
+    `stiffness_ratio` sets Eref = ratio * su (or ratio * 100 kPa * tan(phi') for "phi").
+    """
+    soil_layers: List[SoilLayer] = []
+    for i, layer in enumerate(layers, start=1):
+        name = f"{name_prefix}_L{i}"
+        if parameter == "su":
+            material = MaterialProperties(model_name="MohrCoulomb", Identification=f"{name}_su{layer.value:.0f}",
+                                          gammaUnsat=gamma, gammaSat=gamma, cRef=round(layer.value, 2), phi=0.0, psi=0.0,
+                                          Eref=stiffness_ratio * layer.value if stiffness_ratio else None)
+        else:
+            phi = round(layer.value, 1)
+            material = MaterialProperties(model_name="MohrCoulomb", Identification=f"{name}_phi{phi:.0f}",
+                                          gammaUnsat=gamma, gammaSat=gamma, cRef=1.0, phi=phi, psi=max(phi - 30.0, 0.0),
+                                          Eref=stiffness_ratio * ATMOSPHERIC_PRESSURE * math.tan(math.radians(phi)) if stiffness_ratio else None)
+        soil_layers.append(SoilLayer(name=name, thickness=round(layer.thickness, 3), material=material))
+    return soil_layers
+
+
+def import_cpt_stratigraphy(
+    filepath: str,
+    parameter: str = "su",
+    tolerance: float = DEFAULT_LUMPING_TOLERANCE,
+    min_layer_thickness: float = DEFAULT_MIN_LAYER_THICKNESS,
+    max_layers: Optional[int] = None,
+    gamma: float = 18.0,
+    water_table_depth: float = 0.0,
+    nkt: float = 15.0,
+    location: Optional[str] = None,
+    qc_unit: str = "MPa",
+    stiffness_ratio: Optional[float] = None,
+    merge_gradients: bool = True
+) -> List[SoilLayer]:
+    """
+    Reads a CPT file and returns a lumped `soil_stratigraphy` for ProjectSettings.
+    See `read_cpt_profile`, `derive_strength_profile` and `lump_profile` for the arguments.
+    With `merge_gradients`, runs of lumped layers whose su increases linearly with depth
+    (e.g. normally consolidated clay) become one layer with cRef/cInc (see
+    soil_builder.merge_linear_gradient_layers), so the staircase of uniform layers the
+    lumping produces for such profiles is not built in PLAXIS.
+
+    Raises:
+        ProjectValidationError: If the file is invalid or yields no usable samples.
+    """
+    profile = read_cpt_profile(filepath, location=location, qc_unit=qc_unit)
+    depths, values = derive_strength_profile(profile, parameter, gamma=gamma, water_table_depth=water_table_depth, nkt=nkt)
+    if not depths:
+        raise ProjectValidationError(f"CPT '{profile.name}' gives no positive {parameter} values; check units and unit weight.")
+    lumped = lump_profile(depths, values, tolerance=tolerance, min_layer_thickness=min_layer_thickness, max_layers=max_layers)
+    soil_layers = lumped_layers_to_soil_layers(lumped, parameter, gamma=gamma, name_prefix=profile.name, stiffness_ratio=stiffness_ratio)
+    if not merge_gradients:
+        return soil_layers
+    merged = merge_linear_gradient_layers(soil_layers, tolerance=tolerance)
+    if len(merged) == len(soil_layers):
+        return soil_layers
+    # Renumber the layers and name gradient materials after their top value.
+    renamed: List[SoilLayer] = []
+    for i, layer in enumerate(merged, start=1):
+        name = f"{profile.name}_L{i}"
+        material = layer.material
+        if material.cInc:
+            material = dataclasses.replace(material, Identification=f"{name}_su{material.cRef:.0f}_inc")
+        else:
+            material = dataclasses.replace(material, Identification=material.Identification.replace(layer.name, name, 1))
+        renamed.append(SoilLayer(name=name, thickness=layer.thickness, material=material))
+    return renamed
+
+
+def cpt_to_borehole(filepath: str, x: float = 0.0, y: float = 0.0, water_table_depth: float = 0.0, **kwargs) -> Borehole:
+    """
+    Imports a CPT as a `Borehole` at (x, y) for multi-borehole site models; kwargs as
+    `import_cpt_stratigraphy`. The borehole head is the water table the strengths were
+    derived with.
+    """
+    layers = import_cpt_stratigraphy(filepath, water_table_depth=water_table_depth, **kwargs)
+    name = layers[0].name.rsplit("_L", 1)[0]
+    return Borehole(name=name, x=x, y=y, soil_layers=layers, water_table_depth=water_table_depth)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    import tempfile
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as tmp:
+        tmp.write("Depth (m),qc (MPa),fs (kPa),u2 (kPa)\n")
+        for k in range(1, 2001):
+            z = k * 0.01
+            tmp.write(f"{z:.2f},{0.3 + 0.03 * z + (1.5 if z > 12 else 0.0):.4f},{5 + z:.2f},{10 * z + 50:.2f}\n")
+    for soil_layer in import_cpt_stratigraphy(tmp.name, tolerance=0.05):
+        logger.info(f"{soil_layer.name}: {soil_layer.thickness:.2f} m, su = {soil_layer.material.cRef} kPa")
+    os.remove(tmp.name)
@@ -0,0 +1,187 @@
+"""
+Comparison of many load-penetration curves (e.g. the cases of a parameter sweep).
+
+Curves from different cases have different step counts and penetrations, so they
+are first resampled onto one common penetration grid. The envelopes (min, max,
+mean and percentiles of the load at each grid penetration) are then column-wise
+reductions of a cases x grid matrix, computed vectorized with numpy when it is
+installed. A curve contributes only within the penetration range it reached;
+beyond that its row holds NaN and is ignored by the reductions.
+
+`store_envelopes` computes the envelopes of every case of a result store without
+holding the curves: they are streamed from disk and only their resampled rows kept.
+"""
+
+import math
+import logging
+import warnings
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Sequence, Tuple, Iterable
+
+from .result_store import StoredCase, ResultStore
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError: # Optional: the pure Python path below is used instead.
+    np = None
+
+DEFAULT_GRID_POINTS = 200
+DEFAULT_PERCENTILES = (10.0, 50.0, 90.0)
+
+Curve = Tuple[Sequence[float], Sequence[float]] # (penetrations, loads)
+
+
+@dataclass
+class CurveEnvelopes:
+    """Envelopes of a set of curves on a common penetration grid."""
+    grid: List[float] = field(default_factory=list)
+    envelopes: Dict[str, List[float]] = field(default_factory=dict) # "min", "max", "mean", "p10", ... -> loads
+    counts: List[int] = field(default_factory=list) # Curves that reach each grid penetration.
+    case_ids: List[str] = field(default_factory=list)
+
+
+def percentile_key(q: float) -> str:
+    return f"p{q:g}"
+
+
+def common_penetration_grid(curves: Iterable[Curve], n_points: int = DEFAULT_GRID_POINTS) -> List[float]:
+    """Evenly spaced grid from 0 to the largest penetration reached by any curve."""
+    max_penetration = 0.0
+    for penetrations, _ in curves:
+        if len(penetrations):
+            max_penetration = max(max_penetration, max(penetrations))
+    return _grid_to(max_penetration, n_points)
+
+
+def _grid_to(max_penetration: float, n_points: int) -> List[float]:
+    if n_points < 2 or max_penetration <= 0:
+        return [0.0] if n_points >= 1 else []
+    step = max_penetration / (n_points - 1)
+    return [i * step for i in range(n_points)]
+
+
+def _sorted_curve(penetrations: Sequence[float], loads: Sequence[float]) -> Tuple[List[float], List[float]]:
+    order = sorted(range(len(penetrations)), key=penetrations.__getitem__)
+    return [penetrations[i] for i in order], [loads[i] for i in order]
+
+
+def _interp_python(grid: Sequence[float], x: List[float], y: List[float]) -> List[float]:
+    """Linear interpolation of (x, y) at `grid`; NaN outside [x[0], x[-1]]."""
+    out: List[float] = []
+    j = 0
+    for g in grid:
+        if not x or g < x[0] or g > x[-1]:
+            out.append(math.nan)
+            continue
+        while j < len(x) - 2 and x[j + 1] < g:
+            j += 1
+        x0, x1 = x[j], x[min(j + 1, len(x) - 1)]
+        y0, y1 = y[j], y[min(j + 1, len(x) - 1)]
+        out.append(y0 if x1 == x0 else y0 + (y1 - y0) * (g - x0) / (x1 - x0))
+    return out
+
+
+def resample_curves(curves: Sequence[Curve], grid: Sequence[float]) -> List[List[float]]:
+    """Rows of loads of each curve at `grid` (NaN outside the curve's penetration range)."""
+    rows: List[List[float]] = []
+    for penetrations, loads in curves:
+        x, y = _sorted_curve(list(penetrations), list(loads))
+        if np is not None and x:
+            rows.append(np.interp(grid, x, y, left=math.nan, right=math.nan).tolist())
+        else:
+            rows.append(_interp_python(grid, x, y))
+    return rows
+
+
+def _percentile_python(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolation percentile of sorted values (numpy's default method)."""
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def compute_envelopes(rows: Sequence[Sequence[float]], percentiles: Sequence[float] = DEFAULT_PERCENTILES
+                      ) -> Tuple[Dict[str, List[float]], List[int]]:
+    """
+    Column-wise min, max, mean and percentiles of `rows`, ignoring NaN.
+    Returns (envelopes, counts); columns without any value give NaN.
+    """
+    if not rows:
+        return {}, []
+    keys = ["min", "max", "mean"] + [percentile_key(q) for q in percentiles]
+    if np is not None:
+        matrix = np.asarray(rows, dtype=float)
+        with warnings.catch_warnings(): # All-NaN columns are expected beyond the shortest curves.
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            values = [np.nanmin(matrix, axis=0), np.nanmax(matrix, axis=0), np.nanmean(matrix, axis=0)]
+            if percentiles:
+                values.extend(np.nanpercentile(matrix, list(percentiles), axis=0))
+        counts = np.sum(~np.isnan(matrix), axis=0)
+        return {key: value.tolist() for key, value in zip(keys, values)}, counts.tolist()
+
+    envelopes: Dict[str, List[float]] = {key: [] for key in keys}
+    counts: List[int] = []
+    for column in zip(*rows):
+        present = sorted(v for v in column if not math.isnan(v))
+        counts.append(len(present))
+        if not present:
+            for key in keys:
+                envelopes[key].append(math.nan)
+            continue
+        envelopes["min"].append(present[0])
+        envelopes["max"].append(present[-1])
+        envelopes["mean"].append(sum(present) / len(present))
+        for q in percentiles:
+            envelopes[percentile_key(q)].append(_percentile_python(present, q))
+    return envelopes, counts
+
+
+def compare_curves(curves: Dict[str, Curve], n_points: int = DEFAULT_GRID_POINTS,
+                   percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> CurveEnvelopes:
+    """Resamples `curves` (case id -> curve) onto a common grid and computes their envelopes."""
+    case_ids = [case_id for case_id, (pen, _) in curves.items() if len(pen)]
+    selected = [curves[case_id] for case_id in case_ids]
+    grid = common_penetration_grid(selected, n_points)
+    envelopes, counts = compute_envelopes(resample_curves(selected, grid), percentiles)
+    logger.debug(f"Compared {len(case_ids)} curves on a {len(grid)}-point grid.")
+    return CurveEnvelopes(grid=grid, envelopes=envelopes, counts=counts, case_ids=case_ids)
+
+
+def store_envelopes(store: ResultStore, case_ids: Optional[List[str]] = None, n_points: int = DEFAULT_GRID_POINTS,
+                    percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> CurveEnvelopes:
+    """
+    Envelopes of every case of `store` (or of `case_ids`), like `compare_curves`.
+
+    The curves are streamed twice, one at a time and without filling the store's curve
+    cache: once for the grid extent and once to resample them. Only the cases x grid
+    matrix of resampled loads is held, however long the curves are.
+    """
+    if case_ids is None:
+        case_ids = [case.case_id for case in store.cases()]
+    reached: List[str] = []
+    max_penetration = 0.0
+    for case_id, (penetrations, _) in store.iter_curves(case_ids, cache=False):
+        if len(penetrations):
+            reached.append(case_id)
+            max_penetration = max(max_penetration, max(penetrations))
+    grid = _grid_to(max_penetration, n_points)
+    rows = [resample_curves([curve], grid)[0] for _, curve in store.iter_curves(reached, cache=False)]
+    envelopes, counts = compute_envelopes(rows, percentiles)
+    logger.debug(f"Streamed envelopes of {len(reached)} stored curves on a {len(grid)}-point grid.")
+    return CurveEnvelopes(grid=grid, envelopes=envelopes, counts=counts, case_ids=reached)
+
+
+def peak_vs_parameter(cases: Iterable[StoredCase], parameter: str) -> Tuple[List[float], List[float], List[str]]:
+    """
+    (parameter values, peak resistances, case ids) of the cases that have both, sorted
+    by parameter value. Uses only the store index; no curve is loaded.
+    """
+    points = sorted(
+        (case.parameters[parameter], case.peak_vertical_resistance, case.case_id)
+        for case in cases
+        if isinstance(case.parameters.get(parameter), (int, float)) and isinstance(case.peak_vertical_resistance, (int, float))
+    )
+    return [p[0] for p in points], [p[1] for p in points], [p[2] for p in points]
@@ -0,0 +1,125 @@
+"""
+Columnar load-penetration curves and downsampling for display.
+
+Calculations with many steps produce curves with tens of thousands of points.
+Drawing all of them costs time proportional to the step count while adding
+nothing visible, so the GUI plots a downsampled copy of constant size:
+
+- LTTB (Largest-Triangle-Three-Buckets) keeps the points that best preserve the
+  visual shape of the curve; it is the default.
+- Min-max keeps the lowest and highest load of each bucket, so peaks (the peak
+  resistance, punch-through drops) are never lost.
+
+The first and last points are always kept. Tables use the full columns.
+"""
+
+import math
+import logging
+from typing import List, Tuple, Sequence, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PLOT_POINTS = 2000
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+
+def extract_curve_columns(curve_data: Optional[Sequence[Any]]) -> Tuple[List[float], List[float]]:
+    """
+    Converts `AnalysisResults.load_penetration_curve_data` (a list of
+    {'penetration': ..., 'load': ...} dicts) to (penetrations, loads) columns in one
+    pass, skipping malformed points.
+    """
+    penetrations: List[float] = []
+    loads: List[float] = []
+    for item in curve_data or []:
+        if not isinstance(item, dict):
+            continue
+        pen, load = item.get('penetration'), item.get('load')
+        if isinstance(pen, (int, float)) and isinstance(load, (int, float)):
+            penetrations.append(float(pen))
+            loads.append(float(load))
+    return penetrations, loads
+
+
+def lttb_downsample(x: Sequence[float], y: Sequence[float], threshold: int) -> Tuple[List[float], List[float]]:
+    """
+    Largest-Triangle-Three-Buckets downsampling to `threshold` points.
+    Returns the input unchanged if it is not longer than `threshold`.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return list(x), list(y)
+
+    out_x, out_y = [x[0]], [y[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(math.floor(bucket * bucket_size)) + 1
+        end = int(math.floor((bucket + 1) * bucket_size)) + 1
+        # Average of the next bucket is the third triangle vertex.
+        next_start, next_end = end, min(int(math.floor((bucket + 2) * bucket_size)) + 1, n)
+        if next_start >= next_end: # Last bucket: use the last point.
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(x[next_start:next_end]) / count
+            avg_y = sum(y[next_start:next_end]) / count
+
+        ax, ay = x[selected], y[selected]
+        best_area, best_index = -1.0, start
+        for i in range(start, min(end, n - 1)):
+            area = abs((ax - avg_x) * (y[i] - ay) - (ax - x[i]) * (avg_y - ay))
+            if area > best_area:
+                best_area, best_index = area, i
+        out_x.append(x[best_index])
+        out_y.append(y[best_index])
+        selected = best_index
+
+    out_x.append(x[n - 1])
+    out_y.append(y[n - 1])
+    return out_x, out_y
+
+
+def minmax_downsample(x: Sequence[float], y: Sequence[float], max_points: int) -> Tuple[List[float], List[float]]:
+    """
+    Keeps the minimum and maximum y of each of `max_points // 2` buckets, in x order.
+    Returns the input unchanged if it is not longer than `max_points`.
+    """
+    n = len(x)
+    if max_points >= n or max_points < 4:
+        return list(x), list(y)
+
+    n_buckets = (max_points - 2) // 2
+    bucket_size = (n - 2) / n_buckets
+    indices = [0]
+    for bucket in range(n_buckets):
+        start = int(bucket * bucket_size) + 1
+        end = min(int((bucket + 1) * bucket_size) + 1, n - 1)
+        if start >= end:
+            continue
+        lo = min(range(start, end), key=y.__getitem__)
+        hi = max(range(start, end), key=y.__getitem__)
+        indices.extend(sorted({lo, hi}))
+    indices.append(n - 1)
+    return [x[i] for i in indices], [y[i] for i in indices]
+
+
+def downsample_curve(
+    x: Sequence[float],
+    y: Sequence[float],
+    max_points: int = DEFAULT_MAX_PLOT_POINTS,
+    method: str = "lttb"
+) -> Tuple[List[float], List[float]]:
+    """
+    Downsamples a curve for plotting with `method` ("lttb" or "minmax").
+
+    Raises:
+        ValueError: If the columns differ in length or the method is unknown.
+    """
+    if len(x) != len(y):
+        raise ValueError(f"Curve columns differ in length ({len(x)} vs {len(y)}).")
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}'. Must be one of {DOWNSAMPLING_METHODS}.")
+    if method == "minmax":
+        return minmax_downsample(x, y, max_points)
+    return lttb_downsample(x, y, max_points)
@@ -0,0 +1,122 @@
+"""
+Start-up import profiling with `python -X importtime`.
+
+Application start-up time is dominated by module imports (Qt, matplotlib, numpy,
+plxscripting). `measure_import_time` imports a module in a fresh interpreter with
+`-X importtime` and parses the per-module self/cumulative times, so the test suite
+can track the start-up budget and check that heavy packages stay deferred until
+first use (see MainWindow._ensure_results_page).
+
+Usage:
+    python -m src.backend.import_profile src.frontend.main_window
+"""
+
+import os
+import re
+import sys
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Packages that must not be imported while the main window starts.
+DEFERRED_STARTUP_PACKAGES = ("matplotlib", "numpy", "plxscripting.easy")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """One line of `-X importtime` output. Times are in microseconds."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int # Nesting level (0 = imported directly by the measured statement).
+
+
+@dataclass
+class ImportTimeReport:
+    records: List[ImportRecord] = field(default_factory=list)
+
+    @property
+    def total_us(self) -> int:
+        """Time spent importing all modules (sum of self times)."""
+        return sum(r.self_us for r in self.records)
+
+    def modules(self) -> List[str]:
+        return [r.module for r in self.records]
+
+    def imported(self, package: str) -> bool:
+        """True if `package` or any of its submodules was imported."""
+        return any(m == package or m.startswith(package + ".") for m in self.modules())
+
+    def cumulative_us(self, module: str) -> Optional[int]:
+        for record in self.records:
+            if record.module == module:
+                return record.cumulative_us
+        return None
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time per top-level package, largest first."""
+        totals: Dict[str, int] = {}
+        for record in self.records:
+            top = record.module.split(".")[0]
+            totals[top] = totals.get(top, 0) + record.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def format(self, top: int = 15) -> str:
+        lines = [f"Total import time: {self.total_us / 1000.0:.1f} ms ({len(self.records)} modules)"]
+        for package, us in list(self.by_package().items())[:top]:
+            lines.append(f"  {package:<40} {us / 1000.0:8.1f} ms")
+        return "\n".join(lines)
+
+
+def parse_importtime(text: str) -> ImportTimeReport:
+    """Parses the stderr of `python -X importtime`; other lines are ignored."""
+    report = ImportTimeReport()
+    for line in text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            report.records.append(ImportRecord(module=module, self_us=int(self_us), cumulative_us=int(cumulative_us),
+                                               depth=(len(indent) - 1) // 2))
+    return report
+
+
+def measure_import_time(module: str, python: str = sys.executable, cwd: Optional[str] = None,
+                        timeout: float = 120.0) -> ImportTimeReport:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime` and returns the report.
+    `cwd` (default: the repository root) is put on the module search path.
+
+    Raises:
+        ImportError: If the import fails in the child interpreter.
+    """
+    cwd = cwd or os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (cwd, os.environ.get("PYTHONPATH")) if p))
+    completed = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"], cwd=cwd, env=env,
+                               capture_output=True, text=True, timeout=timeout)
+    if completed.returncode != 0:
+        tail = "\n".join(line for line in completed.stderr.splitlines() if not line.startswith("import time:"))[-2000:]
+        raise ImportError(f"Importing '{module}' failed:\n{tail}")
+    report = parse_importtime(completed.stderr)
+    logger.debug(f"Import of '{module}': {report.total_us / 1000.0:.1f} ms.")
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = list(argv if argv is not None else sys.argv[1:]) or ["src.frontend.main_window"]
+    for module in args:
+        report = measure_import_time(module)
+        print(f"== {module}")
+        print(report.format())
+        deferred = [p for p in DEFERRED_STARTUP_PACKAGES if report.imported(p)]
+        if deferred:
+            print(f"  Eagerly imported (should be deferred): {', '.join(deferred)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
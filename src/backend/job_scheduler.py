@@ -0,0 +1,719 @@
+"""
+Local job scheduler for sharing a fixed number of PLAXIS licenses.
+
+Engineers submit analyses (a project plus owner and priority) to one scheduler daemon
+instead of each driving PLAXIS from their own GUI. The queue is a SQLite database,
+and each job's project is saved next to it as a project file. The daemon runs queued
+jobs on the configured PLAXIS instances (one Input/Output API port pair per license)
+via `mesh_convergence.run_interactor_analysis`. Results go to a `ResultStore`, and a
+summary (peak resistance, final penetration) is stored on the job.
+
+Dispatch order:
+- higher `priority` first;
+- among equal priorities, fair share: the owner with the fewest running jobs, then the
+  owner with the least PLAXIS time in the last `fair_share_window_s`, then submission order;
+- when no instance is free, a queued job that outranks a running *preemptible* job
+  (e.g. a parameter sweep) by at least `preemption_margin` stops that job's calculation.
+  The stopped job goes back to the queue and starts again from scratch later.
+
+Every attempt is logged in the `runs` table, and the fair share is computed from it.
+Jobs that were running when a daemon died are re-queued when the next one opens the
+database.
+
+HTTP/JSON API (`SchedulerAPIServer`, bound to localhost by default; `SchedulerClient`
+is the Python side the GUI polls with):
+    GET  /status                      job counts per state, instances, owner usage
+    GET  /jobs[?state=queued&owner=x] jobs, most recent first
+    GET  /jobs/<job_id>               one job
+    POST /jobs                        {"project": {...}, "owner": "...", "priority": 0, "preemptible": false}
+    POST /jobs/<job_id>/cancel        cancel a queued job or stop a running one
+
+Usage:
+    python -m src.backend.job_scheduler serve --db jobs.sqlite --instance 10000:10001 \\
+        --instance 10002:10003 [--http-port 8765] [--plaxis-path PATH]
+    python -m src.backend.job_scheduler submit project.json --priority 10 [--owner NAME] [--preemptible]
+    python -m src.backend.job_scheduler list [--state queued]
+    python -m src.backend.job_scheduler cancel JOB_ID
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import sqlite3
+import tempfile
+import getpass
+import logging
+import argparse
+import threading
+import functools
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, asdict, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Any, Callable, Sequence, Tuple
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+from .models import ProjectSettings, AnalysisResults
+from .exceptions import PlaxisAutomationError, PlaxisConnectionError, ProjectValidationError
+from .project_io import save_project, load_project, EnhancedJSONEncoder
+from .result_store import ResultStore, project_case_parameters
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_DB_VERSION = 1 # SQLite user_version; bump when the schema changes.
+DEFAULT_HTTP_PORT = 8765
+DEFAULT_FAIR_SHARE_WINDOW_S = 24 * 3600.0
+DEFAULT_PREEMPTION_MARGIN = 10
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+JOB_STATES = (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)
+
+# (settings with the instance's API ports, callback receiving the interactor, stop check) -> results.
+JobRunner = Callable[[ProjectSettings, Callable[[Any], None], Callable[[], bool]], AnalysisResults]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    preemptible INTEGER NOT NULL,
+    project_name TEXT,
+    project_file TEXT NOT NULL,
+    state TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    instance TEXT,
+    preemptions INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    peak_vertical_resistance REAL,
+    final_penetration_depth REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+CREATE TABLE IF NOT EXISTS runs (
+    job_id TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_owner ON runs (owner, finished_at);
+"""
+
+
+@dataclass
+class Job:
+    """One row of the queue. Times are UNIX timestamps."""
+    job_id: str
+    owner: str
+    priority: int = 0
+    preemptible: bool = False
+    project_name: Optional[str] = None
+    project_file: str = ""
+    state: str = QUEUED
+    submitted_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    instance: Optional[str] = None # Name of the PLAXIS instance while running / when finished.
+    preemptions: int = 0
+    error: Optional[str] = None
+    peak_vertical_resistance: Optional[float] = None
+    final_penetration_depth: Optional[float] = None
+
+
+@dataclass
+class PlaxisInstance:
+    """A licensed PLAXIS Input/Output server pair the scheduler may run jobs on."""
+    name: str
+    input_port: int
+    output_port: int
+    password: Optional[str] = None # None keeps the API password of the job's project.
+
+
+def parse_instance(spec: str) -> PlaxisInstance:
+    """'INPUT_PORT:OUTPUT_PORT' or 'NAME=INPUT_PORT:OUTPUT_PORT' -> PlaxisInstance."""
+    name, _, ports = spec.rpartition("=")
+    try:
+        input_port, output_port = (int(p) for p in ports.split(":"))
+    except ValueError:
+        raise PlaxisAutomationError(f"Invalid PLAXIS instance '{spec}' (expected [NAME=]INPUT_PORT:OUTPUT_PORT).")
+    return PlaxisInstance(name or f"plaxis-{input_port}", input_port, output_port)
+
+
+def fair_share_order(jobs: Sequence[Job], running_per_owner: Dict[str, int],
+                     usage_per_owner: Dict[str, float]) -> List[Job]:
+    """Queued jobs in dispatch order: priority, then fair share between owners, then submission time."""
+    return sorted(jobs, key=lambda job: (-job.priority, running_per_owner.get(job.owner, 0),
+                                         usage_per_owner.get(job.owner, 0.0), job.submitted_at))
+
+
+class _RunningJob:
+    """In-memory handle of a job the daemon is running."""
+
+    def __init__(self, job: Job, instance: PlaxisInstance):
+        self.job = job
+        self.instance = instance
+        self.started_at = time.time()
+        self.interactor: Optional[Any] = None
+        self.stop_reason: Optional[str] = None # "preempted", "cancelled" or "shutdown".
+        self.thread: Optional[threading.Thread] = None
+
+    def should_stop(self) -> bool:
+        """Checked by the runner between commands; `breakcalculation` cannot stop setup or meshing."""
+        return self.stop_reason is not None
+
+    def attach(self, interactor: Any) -> None:
+        self.interactor = interactor
+        if self.stop_reason:
+            self.stop_calculation()
+
+    def stop_calculation(self) -> None:
+        if self.interactor is None:
+            return # Not connected yet; the result is discarded when the run returns.
+        try:
+            self.interactor.attempt_stop_calculation()
+        except Exception as e:
+            logger.warning(f"Job scheduler: could not stop the calculation of job {self.job.job_id}: {e}")
+
+
+class JobScheduler:
+    """
+    SQLite-backed job queue and the dispatcher that runs it on PLAXIS instances.
+
+    Args:
+        db_path: SQLite database; job project files and results are kept next to it
+                 (`<db>.projects/`, `<db>.results/`).
+        instances: The PLAXIS instances jobs may run on (their number is the licence limit).
+        runner: Runs one job; defaults to a full PlaxisInteractor run with `plaxis_path`.
+        plaxis_path: PLAXIS executable for the default runner.
+        poll_interval_s: How often the dispatcher re-checks the queue when nothing wakes it.
+        fair_share_window_s: PLAXIS time of an owner within this window counts for the fair share.
+        preemption_margin: Priority difference needed to preempt a running preemptible job.
+
+    Raises:
+        ProjectValidationError: If the database has a newer schema than this version supports.
+    """
+
+    def __init__(self, db_path: str, instances: Sequence[PlaxisInstance], runner: Optional[JobRunner] = None,
+                 plaxis_path: Optional[str] = None, poll_interval_s: float = 2.0,
+                 fair_share_window_s: float = DEFAULT_FAIR_SHARE_WINDOW_S,
+                 preemption_margin: int = DEFAULT_PREEMPTION_MARGIN):
+        if runner is None:
+            from .plaxis_interactor.mesh_convergence import run_interactor_analysis # Deferred: imports plxscripting.
+            runner = functools.partial(run_interactor_analysis, plaxis_path)
+        self.db_path = os.path.abspath(db_path)
+        self.instances = list(instances)
+        self.runner = runner
+        self.poll_interval_s = poll_interval_s
+        self.fair_share_window_s = fair_share_window_s
+        self.preemption_margin = preemption_margin
+        self.projects_dir = self.db_path + ".projects"
+        self.results = ResultStore(self.db_path + ".results")
+        self._lock = threading.RLock()
+        self._running: Dict[str, _RunningJob] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._open_database()
+
+    def _open_database(self) -> None:
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEDULER_DB_VERSION:
+            raise ProjectValidationError(
+                f"Unsupported job database version {version} (supported: <= {SCHEDULER_DB_VERSION}).")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {SCHEDULER_DB_VERSION}")
+            # Jobs of a daemon that died while running them. When it died is unknown, so those
+            # runs are not charged to the fair share.
+            self._db.execute("UPDATE runs SET finished_at = started_at, outcome = 'interrupted' "
+                             "WHERE finished_at IS NULL")
+            orphans = self._db.execute("UPDATE jobs SET state = ?, started_at = NULL, instance = NULL WHERE state = ?",
+                                       (QUEUED, RUNNING)).rowcount
+        if orphans:
+            logger.warning(f"Job scheduler: re-queued {orphans} jobs interrupted by a previous shutdown.")
+
+    # --- Queue ---
+
+    def submit(self, project_settings: ProjectSettings, owner: str, priority: int = 0,
+               preemptible: bool = False) -> Job:
+        """
+        Queues a copy of `project_settings` (saved as a project file) and returns the job.
+
+        Raises:
+            ProjectValidationError: If the owner is empty or the project cannot be saved.
+        """
+        if not owner:
+            raise ProjectValidationError("A job needs an owner.")
+        os.makedirs(self.projects_dir, exist_ok=True)
+        job = Job(job_id=uuid.uuid4().hex[:12], owner=owner, priority=int(priority), preemptible=bool(preemptible),
+                  project_name=project_settings.project_name, submitted_at=time.time())
+        job.project_file = os.path.join(self.projects_dir, f"{job.job_id}.json")
+        if not save_project(project_settings, job.project_file):
+            raise ProjectValidationError(f"Could not save the project of job {job.job_id} to '{job.project_file}'.")
+        with self._lock, self._db:
+            self._db.execute(f"INSERT INTO jobs ({', '.join(f.name for f in fields(Job))}) "
+                             f"VALUES ({', '.join('?' * len(fields(Job)))})", tuple(asdict(job).values()))
+        logger.info(f"Job scheduler: queued job {job.job_id} ('{job.project_name}') for {owner}, priority {priority}"
+                    f"{' (preemptible)' if preemptible else ''}.")
+        self._wake.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return Job(**dict(row)) if row else None
+
+    def jobs(self, state: Optional[str] = None, owner: Optional[str] = None, limit: int = 500) -> List[Job]:
+        """Jobs, most recently submitted first, optionally filtered by state and owner."""
+        query, params = "SELECT * FROM jobs WHERE 1 = 1", []
+        if state:
+            query, params = query + " AND state = ?", params + [state]
+        if owner:
+            query, params = query + " AND owner = ?", params + [owner]
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY submitted_at DESC LIMIT ?", params + [limit]).fetchall()
+        return [Job(**dict(row)) for row in rows]
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancels a queued job, or stops the calculation of a running one (it is marked
+        cancelled when the run returns). Finished jobs are left as they are.
+
+        Raises:
+            KeyError: If there is no such job.
+        """
+        with self._lock:
+            job = self.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.state == QUEUED:
+                with self._db:
+                    self._db.execute("UPDATE jobs SET state = ?, finished_at = ? WHERE job_id = ?",
+                                     (CANCELLED, time.time(), job_id))
+                logger.info(f"Job scheduler: cancelled queued job {job_id}.")
+            elif job_id in self._running:
+                self._stop(self._running[job_id], "cancelled")
+            return self.get(job_id)
+
+    def owner_usage(self) -> Dict[str, float]:
+        """PLAXIS seconds per owner within the fair-share window, including running jobs."""
+        now = time.time()
+        since = now - self.fair_share_window_s
+        with self._lock:
+            rows = self._db.execute("SELECT owner, SUM(MIN(COALESCE(finished_at, ?), ?) - MAX(started_at, ?)) "
+                                    "FROM runs WHERE COALESCE(finished_at, ?) > ? GROUP BY owner",
+                                    (now, now, since, now, since)).fetchall()
+        return {owner: seconds for owner, seconds in rows}
+
+    def status(self) -> Dict[str, Any]:
+        """Summary for the HTTP API: job counts per state, instances and owner usage."""
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+            busy = {r.instance.name: r.job.job_id for r in self._running.values()}
+        return {
+            "jobs": {state: counts.get(state, 0) for state in JOB_STATES},
+            "instances": [{**asdict(i), "password": None, "job_id": busy.get(i.name)} for i in self.instances],
+            "owner_usage_s": self.owner_usage(),
+        }
+
+    # --- Dispatch ---
+
+    def dispatch(self) -> List[str]:
+        """
+        Starts queued jobs on free instances and preempts running jobs for higher-priority
+        ones. Returns the ids of the jobs started. Called by the daemon loop (`start`).
+        """
+        started: List[str] = []
+        with self._lock:
+            if self._stopping.is_set():
+                return started
+            busy = {r.instance.name for r in self._running.values()}
+            free = [i for i in self.instances if i.name not in busy]
+            running_per_owner: Dict[str, int] = {}
+            for r in self._running.values():
+                running_per_owner[r.job.owner] = running_per_owner.get(r.job.owner, 0) + 1
+            usage = self.owner_usage()
+            queued = self.jobs(QUEUED, limit=-1)
+            # Instances already being freed (preempted/cancelled runs) are promised to the next jobs in line.
+            promised = sum(1 for r in self._running.values() if r.stop_reason)
+            while queued:
+                job = fair_share_order(queued, running_per_owner, usage)[0]
+                queued.remove(job)
+                if free:
+                    self._start(job, free.pop(0))
+                    running_per_owner[job.owner] = running_per_owner.get(job.owner, 0) + 1
+                    started.append(job.job_id)
+                elif promised:
+                    promised -= 1
+                else:
+                    victim = self._preemption_victim(job)
+                    if victim is None:
+                        break # Nothing this job (or any lower-ranked one) may preempt.
+                    logger.info(f"Job scheduler: preempting job {victim.job.job_id} (priority {victim.job.priority}) "
+                                f"for job {job.job_id} (priority {job.priority}).")
+                    self._stop(victim, "preempted")
+        return started
+
+    def _preemption_victim(self, job: Job) -> Optional[_RunningJob]:
+        candidates = [r for r in self._running.values() if r.job.preemptible and not r.stop_reason
+                      and r.job.priority + self.preemption_margin <= job.priority]
+        # The lowest priority loses; among those the most recently started one loses the least work.
+        return min(candidates, key=lambda r: (r.job.priority, -r.started_at), default=None)
+
+    def _start(self, job: Job, instance: PlaxisInstance) -> None:
+        running = _RunningJob(job, instance)
+        with self._db:
+            self._db.execute("UPDATE jobs SET state = ?, started_at = ?, instance = ?, error = NULL WHERE job_id = ?",
+                             (RUNNING, running.started_at, instance.name, job.job_id))
+            self._db.execute("INSERT INTO runs (job_id, owner, instance, started_at) VALUES (?, ?, ?, ?)",
+                             (job.job_id, job.owner, instance.name, running.started_at))
+        self._running[job.job_id] = running
+        running.thread = threading.Thread(target=self._run, args=(running,), name=f"Job-{job.job_id}", daemon=True)
+        running.thread.start()
+        logger.info(f"Job scheduler: started job {job.job_id} for {job.owner} on {instance.name}.")
+
+    def _stop(self, running: _RunningJob, reason: str) -> None:
+        if running.stop_reason:
+            return
+        running.stop_reason = reason
+        running.stop_calculation()
+
+    def _run(self, running: _RunningJob) -> None:
+        results: Optional[AnalysisResults] = None
+        error: Optional[str] = None
+        try:
+            settings = load_project(running.job.project_file)
+            if settings is None:
+                raise ProjectValidationError(f"Could not load the project file '{running.job.project_file}'.")
+            settings.plaxis_api_input_port = running.instance.input_port
+            settings.plaxis_api_output_port = running.instance.output_port
+            if running.instance.password is not None:
+                settings.plaxis_api_password = running.instance.password
+            results = self.runner(settings, running.attach, running.should_stop)
+            if running.stop_reason is None:
+                self.results.add(running.job.job_id, results, project_case_parameters(settings))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if running.stop_reason is None:
+                logger.error(f"Job scheduler: job {running.job.job_id} failed: {error}", exc_info=True)
+        finally:
+            self._finish(running, results, error)
+
+    def _finish(self, running: _RunningJob, results: Optional[AnalysisResults], error: Optional[str]) -> None:
+        job_id, now = running.job.job_id, time.time()
+        outcome = running.stop_reason or (FAILED if error else SUCCEEDED)
+        with self._lock, self._db:
+            self._running.pop(job_id, None)
+            self._db.execute("UPDATE runs SET finished_at = ?, outcome = ? WHERE job_id = ? AND finished_at IS NULL",
+                             (now, outcome, job_id))
+            if outcome in ("preempted", "shutdown"):
+                self._db.execute("UPDATE jobs SET state = ?, started_at = NULL, instance = NULL, "
+                                 "preemptions = preemptions + ? WHERE job_id = ?",
+                                 (QUEUED, int(outcome == "preempted"), job_id))
+            elif outcome == CANCELLED:
+                self._db.execute("UPDATE jobs SET state = ?, finished_at = ? WHERE job_id = ?", (CANCELLED, now, job_id))
+            else:
+                self._db.execute("UPDATE jobs SET state = ?, finished_at = ?, error = ?, peak_vertical_resistance = ?, "
+                                 "final_penetration_depth = ? WHERE job_id = ?",
+                                 (outcome, now, error, getattr(results, "peak_vertical_resistance", None),
+                                  getattr(results, "final_penetration_depth", None), job_id))
+        logger.info(f"Job scheduler: job {job_id} on {running.instance.name} finished: {outcome} "
+                    f"after {now - running.started_at:.1f} s.")
+        self._wake.set()
+
+    # --- Daemon ---
+
+    def start(self) -> "JobScheduler":
+        """Starts the dispatcher loop in a background thread."""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="JobScheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Job scheduler: dispatching '{self.db_path}' on {len(self.instances)} PLAXIS instances.")
+        return self
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.dispatch()
+            except Exception as e:
+                logger.error(f"Job scheduler: dispatch failed: {e}", exc_info=True)
+            self._wake.wait(self.poll_interval_s)
+            self._wake.clear()
+
+    def wait_idle(self, timeout_s: Optional[float] = None) -> bool:
+        """Waits until no job is running; returns False on timeout."""
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        while True:
+            with self._lock:
+                threads = [r.thread for r in self._running.values() if r.thread is not None]
+            if not threads:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            threads[0].join(remaining)
+
+    def stop(self, timeout_s: float = 30.0) -> None:
+        """Stops dispatching and the running calculations; their jobs are re-queued."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            for running in list(self._running.values()):
+                self._stop(running, "shutdown")
+        if not self.wait_idle(timeout_s):
+            logger.warning("Job scheduler: stopped with jobs still running; they are re-queued on the next start.")
+            return # Their threads still record the outcome; the database closes with the process.
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "JobScheduler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+# --- HTTP API ---
+
+class _SchedulerHandler(BaseHTTPRequestHandler):
+    server: "_SchedulerHTTPServer"
+
+    def _reply(self, status: int, data: Any) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        scheduler = self.server.scheduler
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if parts == ["status"]:
+            self._reply(200, scheduler.status())
+        elif parts == ["jobs"]:
+            self._reply(200, [asdict(j) for j in scheduler.jobs(query.get("state"), query.get("owner"))])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = scheduler.get(parts[1])
+            if job is None:
+                self._reply(404, {"error": f"No job '{parts[1]}'."})
+            else:
+                self._reply(200, asdict(job))
+        else:
+            self._reply(404, {"error": f"Unknown resource '{url.path}'."})
+
+    def do_POST(self):
+        scheduler = self.server.scheduler
+        parts = [p for p in urlsplit(self.path).path.split("/") if p]
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            data = json.loads(self.rfile.read(length) or b"{}")
+            if parts == ["jobs"]:
+                job = scheduler.submit(_project_from_json(data.get("project")), data.get("owner") or "",
+                                       int(data.get("priority", 0)), bool(data.get("preemptible", False)))
+                self._reply(201, asdict(job))
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+                self._reply(200, asdict(scheduler.cancel(parts[1])))
+            else:
+                self._reply(404, {"error": f"Unknown resource '{self.path}'."})
+        except KeyError as e:
+            self._reply(404, {"error": f"No job {e}."})
+        except (ProjectValidationError, ValueError, TypeError, AttributeError) as e:
+            self._reply(400, {"error": str(e)})
+
+    def log_message(self, format, *args): # Routed to logging instead of stderr.
+        logger.debug("Job scheduler API: " + format, *args)
+
+
+class _SchedulerHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    scheduler: JobScheduler
+
+
+def _project_from_json(data: Any) -> ProjectSettings:
+    """Project sent to the API (the JSON of a project file) -> ProjectSettings, via `load_project`."""
+    if not isinstance(data, dict):
+        raise ProjectValidationError("The job needs a 'project' object (the contents of a project file).")
+    fd, tmp_path = tempfile.mkstemp(suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        project_settings = load_project(tmp_path)
+    finally:
+        os.remove(tmp_path)
+    if project_settings is None:
+        raise ProjectValidationError("The submitted project could not be read as a project file.")
+    return project_settings
+
+
+class SchedulerAPIServer:
+    """
+    Serves a `JobScheduler` over HTTP/JSON.
+
+    Args:
+        scheduler: The scheduler to expose.
+        host, port: Address to listen on; port 0 picks a free port (see `port`).
+    """
+
+    def __init__(self, scheduler: JobScheduler, host: str = "127.0.0.1", port: int = DEFAULT_HTTP_PORT):
+        self._httpd = _SchedulerHTTPServer((host, port), _SchedulerHandler)
+        self._httpd.scheduler = scheduler
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> "SchedulerAPIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="SchedulerAPI", daemon=True)
+        self._thread.start()
+        logger.info(f"Job scheduler API listening on port {self.port}.")
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SchedulerAPIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class SchedulerClient:
+    """
+    Client of the scheduler's HTTP API, e.g. for the GUI to submit jobs and poll their status.
+
+    Raises (all methods):
+        PlaxisConnectionError: If the scheduler is not reachable.
+        ProjectValidationError: If the scheduler rejects a submitted job.
+        KeyError: For unknown job ids.
+    """
+
+    def __init__(self, url: str = f"http://127.0.0.1:{DEFAULT_HTTP_PORT}", timeout: float = 10.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, path: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        body = json.dumps(data, cls=EnhancedJSONEncoder).encode("utf-8") if data is not None else None
+        request = urllib.request.Request(self.url + path, data=body, method="POST" if body is not None else "GET",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            message = json.loads(e.read() or b"{}").get("error", e.reason)
+            if e.code == 404:
+                raise KeyError(message)
+            raise ProjectValidationError(f"Job scheduler rejected the request: {message}")
+        except (urllib.error.URLError, OSError) as e:
+            raise PlaxisConnectionError(f"Job scheduler at {self.url} is not reachable: {e}")
+
+    def submit(self, project_settings: ProjectSettings, owner: Optional[str] = None, priority: int = 0,
+               preemptible: bool = False) -> Job:
+        data = self._request("/jobs", {"project": project_settings, "owner": owner or getpass.getuser(),
+                                       "priority": priority, "preemptible": preemptible})
+        return Job(**data)
+
+    def jobs(self, state: Optional[str] = None, owner: Optional[str] = None) -> List[Job]:
+        query = urlencode({k: v for k, v in (("state", state), ("owner", owner)) if v})
+        return [Job(**item) for item in self._request("/jobs" + (f"?{query}" if query else ""))]
+
+    def job(self, job_id: str) -> Job:
+        return Job(**self._request(f"/jobs/{job_id}"))
+
+    def cancel(self, job_id: str) -> Job:
+        return Job(**self._request(f"/jobs/{job_id}/cancel", {}))
+
+    def status(self) -> Dict[str, Any]:
+        return self._request("/status")
+
+
+def _format_jobs(jobs: Sequence[Job]) -> str:
+    lines = [f"{'job':<13}{'state':<11}{'prio':>5}  {'owner':<12}{'instance':<14}project"]
+    for job in jobs:
+        lines.append(f"{job.job_id:<13}{job.state:<11}{job.priority:>5}  {job.owner:<12}{job.instance or '-':<14}"
+                     f"{job.project_name or ''}{'  (preemptible)' if job.preemptible else ''}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Queue PLAXIS analyses on a shared set of PLAXIS licenses.")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_HTTP_PORT}", help="Scheduler API (client commands).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Run the scheduler daemon and its HTTP API until interrupted.")
+    serve.add_argument("--db", required=True, help="SQLite job database (created if missing).")
+    serve.add_argument("--instance", action="append", required=True, metavar="[NAME=]INPUT_PORT:OUTPUT_PORT",
+                       help="A licensed PLAXIS Input/Output server pair; repeat per licence.")
+    serve.add_argument("--plaxis-path", default=None)
+    serve.add_argument("--http-host", default="127.0.0.1")
+    serve.add_argument("--http-port", type=int, default=DEFAULT_HTTP_PORT)
+    serve.add_argument("--preemption-margin", type=int, default=DEFAULT_PREEMPTION_MARGIN)
+    submit = sub.add_parser("submit", help="Queue a project file.")
+    submit.add_argument("project_file")
+    submit.add_argument("--owner", default=None)
+    submit.add_argument("--priority", type=int, default=0)
+    submit.add_argument("--preemptible", action="store_true", help="May be stopped for higher-priority jobs.")
+    listing = sub.add_parser("list", help="List jobs.")
+    listing.add_argument("--state", choices=JOB_STATES)
+    listing.add_argument("--owner")
+    cancel = sub.add_parser("cancel", help="Cancel a job.")
+    cancel.add_argument("job_id")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "serve":
+            instances = [parse_instance(spec) for spec in args.instance]
+            scheduler = JobScheduler(args.db, instances, plaxis_path=args.plaxis_path,
+                                     preemption_margin=args.preemption_margin).start()
+            api = SchedulerAPIServer(scheduler, args.http_host, args.http_port).start()
+            print(f"Scheduling on {len(instances)} PLAXIS instances; API on http://{args.http_host}:{api.port}. "
+                  "Ctrl+C to stop.")
+            try:
+                while True:
+                    time.sleep(1.0)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                api.stop()
+                scheduler.stop()
+            return 0
+
+        client = SchedulerClient(args.url)
+        if args.command == "submit":
+            project_settings = load_project(args.project_file)
+            if project_settings is None:
+                print(f"Could not load project file '{args.project_file}'.", file=sys.stderr)
+                return 1
+            job = client.submit(project_settings, args.owner, args.priority, args.preemptible)
+            print(f"Queued job {job.job_id}.")
+        elif args.command == "list":
+            print(_format_jobs(client.jobs(args.state, args.owner)))
+        elif args.command == "cancel":
+            print(f"Job {args.job_id}: {client.cancel(args.job_id).state}.")
+    except KeyError as e:
+        print(f"Unknown job: {e}", file=sys.stderr)
+        return 1
+    except PlaxisAutomationError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
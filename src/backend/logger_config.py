@@ -1,52 +1,182 @@
+"""
+Application logging configuration.
+
+Log calls on the analysis thread (the builders log every PLAXIS API call) must not
+wait for file or console I/O. `setup_logging` therefore puts only a `QueueHandler`
+on the root logger. A `QueueListener` thread formats the records and writes them to
+the console and the rotating log file. Per-module levels (`module_levels`, or the
+PLAXIS_AUTOMATION_LOG_LEVELS environment variable, e.g.
+"src.backend.plaxis_interactor=DEBUG,matplotlib=WARNING") keep noisy modules quiet
+without lowering the global level.
+
+`measure_logging_overhead` times a log call on the calling thread with the direct
+and the queued handler setup, on a private logger that leaves the application's alone:
+    python -m src.backend.logger_config --benchmark
+"""
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import sys
+import tempfile
+import time
+from typing import Dict, Optional, Union, List
 
 LOG_FILENAME = "plaxis_automation.log"
 LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
 LOG_BACKUP_COUNT = 5
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(module)s.%(funcName)s:%(lineno)d - %(message)s"
+LOG_LEVELS_ENV_VAR = "PLAXIS_AUTOMATION_LOG_LEVELS"
+
+# Third-party loggers that are chatty at DEBUG/INFO; overridable through module_levels.
+DEFAULT_MODULE_LEVELS: Dict[str, Union[int, str]] = {
+    "matplotlib": logging.WARNING,
+    "PIL": logging.WARNING,
+    "urllib3": logging.WARNING,
+}
+
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_module_levels(spec: str) -> Dict[str, str]:
+    """
+    Parses "name=LEVEL,name2=LEVEL2" into {name: LEVEL}.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown level.
+    """
+    levels: Dict[str, str] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, level = entry.partition("=")
+        level = level.strip().upper()
+        if not sep or not name.strip() or not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Invalid module log level entry '{entry}' (expected name=LEVEL).")
+        levels[name.strip()] = level
+    return levels
+
+
+def apply_module_levels(module_levels: Dict[str, Union[int, str]]) -> None:
+    """Sets the level of each named logger (and so of its children without an own level)."""
+    for name, level in module_levels.items():
+        logging.getLogger(name).setLevel(level)
+
+
+def _build_output_handlers(log_to_console: bool, log_to_file: bool, log_file_path: str) -> List[logging.Handler]:
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: List[logging.Handler] = []
+    if log_to_console:
+        handlers.append(logging.StreamHandler())
+    if log_to_file:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            log_file_path,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def shutdown_logging() -> None:
+    """Stops the writer thread after it has written all queued records. Safe to call repeatedly."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
 
-def setup_logging(log_level=logging.INFO, log_to_console=True, log_to_file=True):
+
+def setup_logging(log_level=logging.INFO, log_to_console=True, log_to_file=True,
+                  module_levels: Optional[Dict[str, Union[int, str]]] = None,
+                  log_file_path: str = LOG_FILENAME, use_queue: bool = True):
     """
     Configures logging for the application.
+
+    With `use_queue` (default), records are handed to a background writer thread;
+    otherwise the console/file handlers are attached to the root logger directly.
+    `module_levels` is applied on top of DEFAULT_MODULE_LEVELS, and the environment
+    variable LOG_LEVELS_ENV_VAR on top of both.
     """
     logger = logging.getLogger() # Get root logger
     logger.setLevel(log_level) # Set root logger level
 
     # Prevent adding multiple handlers if called multiple times (e.g. in tests or reloads)
+    shutdown_logging()
     if logger.hasHandlers():
         logger.handlers.clear()
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(module)s.%(funcName)s:%(lineno)d - %(message)s"
-    )
+    # For simplicity, the log file is in the current working directory unless a path is given.
+    output_handlers = _build_output_handlers(log_to_console, log_to_file, log_file_path)
+    if use_queue:
+        global _queue_listener
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _queue_listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+        _queue_listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    else:
+        for handler in output_handlers:
+            logger.addHandler(handler)
 
-    if log_to_console:
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+    levels: Dict[str, Union[int, str]] = dict(DEFAULT_MODULE_LEVELS)
+    levels.update(module_levels or {})
+    env_spec = os.environ.get(LOG_LEVELS_ENV_VAR)
+    if env_spec:
+        try:
+            levels.update(parse_module_levels(env_spec))
+        except ValueError as e:
+            logger.warning(f"Ignoring {LOG_LEVELS_ENV_VAR}: {e}")
+    apply_module_levels(levels)
 
-    if log_to_file:
-        # Ensure log directory exists (optional, if logs are in a subfolder)
-        # log_dir = "logs"
-        # os.makedirs(log_dir, exist_ok=True)
-        # log_file_path = os.path.join(log_dir, LOG_FILENAME)
+    logger.info("Logging setup complete.")
 
-        # For simplicity, log file in the current working directory or where the main script is run from
-        log_file_path = LOG_FILENAME
 
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_file_path,
-            maxBytes=LOG_MAX_BYTES,
-            backupCount=LOG_BACKUP_COUNT,
-            encoding='utf-8'
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+def measure_logging_overhead(n_calls: int = 5000, log_level=logging.DEBUG) -> Dict[str, float]:
+    """
+    Average time in microseconds that one `logger.debug(...)` call spends on the calling
+    thread, for the direct (file handler on the logger) and the queued setup.
+    Uses a private, non-propagating logger with its own queue and listener writing to a
+    temporary file, so the application's logging (root handlers, writer thread) keeps running.
+    """
+    bench_logger = logging.Logger("logger_config.benchmark", log_level) # Not registered with the logging manager.
+    bench_logger.propagate = False
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode, use_queue in (("direct", False), ("queued", True)):
+            output_handlers = _build_output_handlers(False, True, os.path.join(tmp_dir, f"{mode}.log"))
+            listener: Optional[logging.handlers.QueueListener] = None
+            if use_queue:
+                log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+                listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+                listener.start()
+                bench_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+            else:
+                bench_logger.handlers = list(output_handlers)
+            try:
+                start = time.perf_counter()
+                for i in range(n_calls):
+                    bench_logger.debug("Executing API command %d/%d: %s", i + 1, n_calls, "set_phase_property")
+                results[f"{mode}_us_per_call"] = (time.perf_counter() - start) / n_calls * 1e6
+            finally:
+                if listener is not None:
+                    listener.stop() # Drains the queue before the file is closed and the directory removed.
+                for handler in output_handlers:
+                    handler.close()
+                bench_logger.handlers = []
+    return results
+
+
+atexit.register(shutdown_logging)
 
-    logger.info("Logging setup complete.")
 
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        for key, value in measure_logging_overhead().items():
+            print(f"{key}: {value:.2f}")
+        sys.exit(0)
+
     setup_logging(log_level=logging.DEBUG)
     logging.debug("This is a debug message.")
     logging.info("This is an info message.")
@@ -0,0 +1,239 @@
+"""
+Project-level soil material library with parameter-hash deduplication.
+
+Layers frequently share one material definition (same model and parameters under
+different layer names). The library keys every material by a hash of its
+parameters, so each unique material is created once in PLAXIS and all layers that
+use it reference it by the library name. The library can be saved to a versioned
+JSON file and shared between projects, which keeps material names and parameters
+consistent across parameter sweeps.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import dataclasses
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Optional, Any
+
+from .models import MaterialProperties, SoilLayer
+from .exceptions import ProjectValidationError
+
+logger = logging.getLogger(__name__)
+
+MATERIAL_LIBRARY_FORMAT_VERSION = 1 # Bump when the file layout changes.
+_HASH_FLOAT_PRECISION = 9 # Decimal places used when hashing floats.
+
+
+def _canonical_value(value: Any) -> Any:
+    if isinstance(value, float):
+        return round(value, _HASH_FLOAT_PRECISION)
+    if isinstance(value, dict):
+        return {str(k): _canonical_value(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(v) for v in value]
+    return value
+
+
+def compute_material_hash(material: MaterialProperties) -> str:
+    """
+    Hash of the material's model and parameters. The `Identification` (name) is not
+    part of the hash, so identical definitions under different names deduplicate.
+    Parameters left at None are ignored, also inside `other_params`.
+    """
+    params = {k: v for k, v in asdict(material).items() if k != "Identification" and v is not None}
+    params["other_params"] = {k: v for k, v in (material.other_params or {}).items() if v is not None}
+    canonical = json.dumps(_canonical_value(params), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _base_material_name(material: MaterialProperties) -> str:
+    """Same fallback naming as soil_builder.generate_material_callables."""
+    if material.Identification:
+        return material.Identification
+    if material.model_name:
+        name = "".join(c if c.isalnum() else '_' for c in material.model_name)
+        return name if name and not name[0].isdigit() else "Mat_" + name
+    raise ProjectValidationError("MaterialProperties must have either 'Identification' or 'model_name' specified.")
+
+
+@dataclass
+class MaterialLibraryEntry:
+    """One unique material in the library."""
+    name: str                       # PLAXIS material name (unique within the library).
+    material_hash: str              # compute_material_hash of `material`.
+    material: MaterialProperties    # Stored with Identification == name.
+    description: Optional[str] = None
+
+
+@dataclass
+class MaterialLibrary:
+    """
+    Unique materials keyed by parameter hash, with unique names.
+
+    `version` is incremented whenever the content changes, so files shared between
+    projects can be compared; `format_version` describes the file layout.
+    """
+    entries: Dict[str, MaterialLibraryEntry] = field(default_factory=dict) # hash -> entry
+    version: int = 0
+    format_version: int = MATERIAL_LIBRARY_FORMAT_VERSION
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def names(self) -> List[str]:
+        return [entry.name for entry in self.entries.values()]
+
+    def get(self, name: str) -> Optional[MaterialLibraryEntry]:
+        for entry in self.entries.values():
+            if entry.name == name:
+                return entry
+        return None
+
+    def _unique_name(self, base_name: str) -> str:
+        taken = set(self.names())
+        if base_name not in taken:
+            return base_name
+        suffix = 2
+        while f"{base_name}_{suffix}" in taken:
+            suffix += 1
+        return f"{base_name}_{suffix}"
+
+    def add(self, material: MaterialProperties, description: Optional[str] = None) -> str:
+        """
+        Adds `material` unless an identical definition exists, and returns the library
+        name to reference it by. A different material whose name is already taken is
+        stored under a suffixed name (e.g. 'Clay_2').
+        """
+        material_hash = compute_material_hash(material)
+        existing = self.entries.get(material_hash)
+        if existing:
+            return existing.name
+        name = self._unique_name(_base_material_name(material))
+        self.entries[material_hash] = MaterialLibraryEntry(
+            name=name, material_hash=material_hash,
+            material=dataclasses.replace(material, Identification=name), description=description)
+        self.version += 1
+        logger.debug(f"Material library: added '{name}' ({material_hash}).")
+        return name
+
+    def remove(self, name: str) -> bool:
+        entry = self.get(name)
+        if entry is None:
+            return False
+        del self.entries[entry.material_hash]
+        self.version += 1
+        return True
+
+    def assign_layers(self, soil_layers: List[SoilLayer]) -> List[SoilLayer]:
+        """
+        Registers the materials of `soil_layers` and returns copies of the layers whose
+        material carries the library name, so layers with identical definitions share one
+        PLAXIS material. The input layers are not modified.
+        """
+        assigned: List[SoilLayer] = []
+        for layer in soil_layers:
+            name = self.add(layer.material)
+            entry = self.get(name)
+            assigned.append(dataclasses.replace(layer, material=entry.material))
+            if name != layer.material.Identification:
+                logger.debug(f"Layer '{layer.name}' references library material '{name}'.")
+        return assigned
+
+    def unique_materials(self, soil_layers: Optional[List[SoilLayer]] = None) -> List[MaterialProperties]:
+        """All library materials, or only those used by `soil_layers`, in first-use order."""
+        if soil_layers is None:
+            return [entry.material for entry in self.entries.values()]
+        used: Dict[str, MaterialProperties] = {}
+        for layer in soil_layers:
+            entry = self.entries.get(compute_material_hash(layer.material))
+            if entry and entry.material_hash not in used:
+                used[entry.material_hash] = entry.material
+        return list(used.values())
+
+    # --- Versioned file ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format_version": self.format_version,
+            "version": self.version,
+            "materials": [
+                {"name": e.name, "hash": e.material_hash, "description": e.description, "material": asdict(e.material)}
+                for e in self.entries.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MaterialLibrary":
+        """
+        Raises:
+            ProjectValidationError: If the file was written by a newer format version or is malformed.
+        """
+        format_version = data.get("format_version")
+        if not isinstance(format_version, int) or format_version > MATERIAL_LIBRARY_FORMAT_VERSION:
+            raise ProjectValidationError(
+                f"Unsupported material library format version {format_version} (supported: <= {MATERIAL_LIBRARY_FORMAT_VERSION}).")
+        library = cls()
+        try:
+            for item in data.get("materials", []):
+                material = MaterialProperties(**item["material"])
+                material_hash = compute_material_hash(material)
+                if item.get("hash") and item["hash"] != material_hash:
+                    logger.warning(f"Material library: stored hash of '{item['name']}' is stale; recomputed.")
+                library.entries[material_hash] = MaterialLibraryEntry(
+                    name=item["name"], material_hash=material_hash,
+                    material=dataclasses.replace(material, Identification=item["name"]),
+                    description=item.get("description"))
+        except (KeyError, TypeError) as e:
+            raise ProjectValidationError(f"Malformed material library entry: {e}")
+        library.version = int(data.get("version", 0))
+        return library
+
+    def save(self, filepath: str) -> None:
+        """Writes the library atomically, so a shared file is never seen half-written."""
+        directory = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, filepath)
+        logger.info(f"Material library v{self.version} ({len(self)} materials) saved to '{filepath}'.")
+
+    @classmethod
+    def load(cls, filepath: str) -> "MaterialLibrary":
+        """
+        Raises:
+            ProjectValidationError: If the file cannot be read or has an unsupported format.
+        """
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            raise ProjectValidationError(f"Could not read material library '{filepath}': {e}")
+        library = cls.from_dict(data)
+        logger.info(f"Material library v{library.version} ({len(library)} materials) loaded from '{filepath}'.")
+        return library
+
+
+def load_project_material_library(library_path: Optional[str]) -> MaterialLibrary:
+    """Loads the shared library at `library_path`, or returns an empty one if unset or missing."""
+    if library_path and os.path.exists(library_path):
+        return MaterialLibrary.load(library_path)
+    if library_path:
+        logger.warning(f"Material library '{library_path}' not found; starting with an empty library.")
+    return MaterialLibrary()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    clay = MaterialProperties(model_name="MohrCoulomb", Identification="Clay", cRef=20.0, phi=0.0)
+    layers = [
+        SoilLayer(name="Upper Clay", thickness=4.0, material=clay),
+        SoilLayer(name="Lower Clay", thickness=6.0, material=dataclasses.replace(clay, Identification="Clay copy")),
+        SoilLayer(name="Stiff Clay", thickness=8.0, material=dataclasses.replace(clay, cRef=60.0)),
+    ]
+    lib = MaterialLibrary()
+    for layer in lib.assign_layers(layers):
+        logger.info(f"{layer.name}: material '{layer.material.Identification}'")
+    logger.info(f"Unique materials: {lib.names()} (library version {lib.version})")
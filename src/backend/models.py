@@ -64,6 +64,12 @@ class MaterialProperties:
     # Note: SoftSoil also uses nu (as nu_ur), cRef, phi, psi from common properties.
     # Advanced SoftSoil parameters like M, K0NC for creep are not explicitly listed here but can go in other_params.
 
+    # Depth-dependent parameters (Mohr-Coulomb advanced): value(z) = ref + inc * (z_ref - z) below z_ref.
+    # Lets one layer represent strength/stiffness increasing with depth (e.g. su in NC clay).
+    cInc: Optional[float] = None        # Increase of cRef (or su) per meter depth (e.g., kPa/m).
+    EInc: Optional[float] = None        # Increase of Eref per meter depth (e.g., kPa/m).
+    z_ref: Optional[float] = None       # Reference elevation for cInc/EInc (m). None = top of the layer using the material.
+
     other_params: Dict[str, Any] = field(default_factory=dict) # For additional or model-specific parameters.
 
 @dataclass
@@ -76,6 +82,29 @@ class SoilLayer:
     thickness: Optional[float] = None       # Thickness of the soil layer (e.g., meters).
     material: MaterialProperties = field(default_factory=MaterialProperties) # Material properties for this layer.
 
+@dataclass
+class SpudcanLeg:
+    """
+    One leg of a multi-leg (jack-up) site model. The spudcan sits with its tip on the
+    seabed at plan position (x, y).
+    """
+    name: str = "Leg1"                          # Used as suffix for the PLAXIS object names of this leg.
+    x: float = 0.0                              # Plan x-coordinate of the leg axis (m).
+    y: float = 0.0                              # Plan y-coordinate of the leg axis (m).
+    spudcan: Optional[SpudcanGeometry] = None   # Leg-specific geometry; None uses ProjectSettings.spudcan.
+
+@dataclass
+class Borehole:
+    """
+    A borehole (e.g. from a CPT location) with its own stratigraphy for multi-borehole site models.
+    Layers are matched across boreholes by name; a layer missing from a borehole gets zero thickness there.
+    """
+    name: str = "BH1"
+    x: float = 0.0
+    y: float = 0.0
+    soil_layers: List[SoilLayer] = field(default_factory=list) # Top to bottom.
+    water_table_depth: Optional[float] = None # None uses ProjectSettings.water_table_depth.
+
 @dataclass
 class LoadingConditions:
     """
@@ -94,6 +123,23 @@ class AnalysisControlParameters:
     """
     meshing_global_coarseness: Optional[str] = "Medium" # Global mesh coarseness setting in PLAXIS.
     meshing_refinement_spudcan: Optional[bool] = False  # Whether to apply local mesh refinement to the spudcan area.
+    refinement_cone_coarseness_factor: Optional[float] = 0.25 # Relative coarseness factor on the spudcan volume when refining.
+    refinement_zone_coarseness_factor: Optional[float] = 0.5  # Relative coarseness factor on the soil cylinder around the spudcan.
+    refinement_zone_radius_factor: Optional[float] = 1.0      # Refinement cylinder radius as a multiple of the spudcan diameter.
+    refinement_zone_depth_factor: Optional[float] = 1.5       # Refinement cylinder depth (below target penetration) as a multiple of the diameter.
+
+    # Model domain sizing (see geometry_builder.compute_model_domain).
+    domain_auto_size: Optional[bool] = False                  # Size the soil contour and depth from the spudcan instead of PLAXIS defaults (opt-in; off keeps saved projects unchanged).
+    domain_lateral_factor: Optional[float] = 5.0              # Distance from the spudcan axis to the lateral boundaries, in diameters.
+    domain_depth_factor: Optional[float] = 4.0                # Model depth below the target penetration, in diameters.
+    symmetry: Optional[str] = "full"                          # "full" or "quarter" (x>=0, y>=0 quadrant; vertical-only loading, forces scaled back x4).
+
+    # Mesh convergence study (see mesh_convergence.py): run a ladder of coarseness levels and
+    # pick the coarsest one whose peak resistance is within tolerance of the next finer level.
+    mesh_convergence_study: Optional[bool] = False
+    mesh_convergence_levels: Optional[List[str]] = None       # Coarseness ladder; None uses Coarse -> VeryFine.
+    mesh_convergence_tolerance: Optional[float] = 0.02        # Max relative change in peak resistance to accept a level.
+    mesh_convergence_max_workers: Optional[int] = 2           # Levels analysed in parallel (one PLAXIS server each).
 
     initial_stress_method: Optional[str] = "K0Procedure" # Method for initial stress calculation (e.g., "K0Procedure", "GravityLoading").
 
@@ -109,6 +155,13 @@ class AnalysisControlParameters:
     ResetDispToZero: Optional[bool] = False      # Reset displacements to zero before a calculation phase.
     TimeInterval: Optional[float] = None         # Time interval for consolidation/dynamic phases (e.g., seconds or days).
 
+    # Mesh template cache (see plaxis_interactor.mesh_cache).
+    reuse_mesh_template: Optional[bool] = False  # Reuse a cached meshed base project when geometry and mesh settings match.
+    mesh_template_cache_dir: Optional[str] = None # Directory for cached mesh templates. None uses the per-user default.
+
+    # Live load-penetration curve (see plaxis_interactor.live_curve).
+    live_curve_poll_interval: Optional[float] = 2.0 # Seconds between polls of PLAXIS Output during calculation; 0/None disables.
+
 @dataclass
 class ProjectSettings:
     """
@@ -124,9 +177,16 @@ class ProjectSettings:
     soil_stratigraphy: List[SoilLayer] = field(default_factory=list)
     water_table_depth: Optional[float] = None # Depth of the water table from ground surface (e.g., meters, positive downwards). PRD 4.1.2.2.3
 
+    # Multi-leg site model. When `legs` is empty, a single spudcan is modelled at the origin.
+    # When `boreholes` is empty, `soil_stratigraphy` is used as one borehole at the origin.
+    legs: List[SpudcanLeg] = field(default_factory=list)
+    boreholes: List[Borehole] = field(default_factory=list)
+
     loading: LoadingConditions = field(default_factory=LoadingConditions)
     analysis_control: AnalysisControlParameters = field(default_factory=AnalysisControlParameters)
 
+    material_library_path: Optional[str] = None # Shared material library file (see material_library.py); None uses a per-run library.
+
     # Application-specific configuration
     plaxis_installation_path: Optional[str] = None # Path to PLAXIS executable. PRD 4.1.7.1
     units_system: Optional[str] = "SI"             # Selected unit system (e.g., "SI"). PRD 4.1.7.3
@@ -154,6 +214,9 @@ class AnalysisResults:
     # 'load' values are typically absolute vertical forces (e.g., kN).
     load_penetration_curve_data: Optional[List[Dict[str, float]]] = None
 
+    # Multi-leg models: results per leg name (curve, peak and final penetration of that leg).
+    leg_results: Optional[Dict[str, 'AnalysisResults']] = None
+
     # Placeholder for other potential results:
     # soil_pressures_at_points: Optional[Dict[str, float]] = None # e.g. {'point_name': pressure_value}
     # contour_plot_image_path: Optional[str] = None # Path to a saved contour plot image
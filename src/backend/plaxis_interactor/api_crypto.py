@@ -0,0 +1,49 @@
+"""
+Encryption of PLAXIS API traffic, as done by plxscripting's `encryption` module.
+
+With an API password, request and response JSON travel Blowfish-CBC encrypted and
+base64 encoded, next to the base64 initialization vector ("Code"). The plaintext is
+space padded to the block size and right-stripped after decryption. Each request
+carries a random "ReplyCode" that the response must echo, so the client can tell
+that the server decrypted it.
+
+Needs pycryptodome; `Blowfish` is None without it.
+"""
+
+import os
+import base64
+from typing import Tuple
+
+try:
+    from Crypto.Cipher import Blowfish
+    Blowfish.key_size = range(1, 56 + 1) # As in plxscripting: PLAXIS passwords may be shorter than Blowfish's minimum key.
+except ImportError:
+    Blowfish = None
+
+CODE_KEY = "Code"
+REQUEST_DATA_KEY = "RequestData"
+RESPONSE_KEY = "Response"
+REPLY_CODE_KEY = "ReplyCode"
+
+
+def _cipher(key: str, iv: bytes):
+    if len(iv) != Blowfish.block_size:
+        iv = bytes(Blowfish.block_size)
+    return Blowfish.new(key.encode("utf-8"), Blowfish.MODE_CBC, iv)
+
+
+def encrypt(text: str, key: str) -> Tuple[str, str]:
+    """(base64 data, base64 iv) of `text`."""
+    iv = os.urandom(Blowfish.block_size)
+    data = text.encode("utf-8")
+    data += b" " * (Blowfish.block_size - len(data) % Blowfish.block_size)
+    return base64.b64encode(_cipher(key, iv).encrypt(data)).decode("ascii"), base64.b64encode(iv).decode("ascii")
+
+
+def decrypt(data_b64: str, iv_b64: str, key: str) -> str:
+    """Plaintext of an `encrypt` result, or "" if it cannot be decrypted with `key`."""
+    try:
+        data = _cipher(key, base64.b64decode(iv_b64)).decrypt(base64.b64decode(data_b64))
+        return data.decode("utf-8").rstrip()
+    except (ValueError, UnicodeDecodeError):
+        return ""
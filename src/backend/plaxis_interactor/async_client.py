@@ -0,0 +1,376 @@
+"""
+asyncio client for the PLAXIS HTTP API.
+
+plxscripting's `HTTPConnection` posts through a blocking `requests` session, so every
+PLAXIS instance that is driven concurrently costs an OS thread that mostly waits on
+the network. `AsyncHTTPConnection` speaks the same protocol on asyncio streams:
+- the same resources and JSON payloads (`request_commands`, `request_members`,
+  `request_propertyvalues`, `request_list`, ...);
+- the same Blowfish encryption and reply code check when a password is set;
+- keep-alive HTTP/1.1.
+Each connection holds a small pool of streams, so reads can be in flight in parallel
+while one event loop drives many sessions.
+
+`AsyncPlaxisServer` is the thin layer above it that plxscripting's `Server` provides
+for the synchronous API: it builds command lines from Python values, sends several
+commands in one request, and turns the feedback into results or `PlxScriptingError`.
+It hands out `PlxObjectRef`s (guid, type, listable) instead of proxies. Attribute
+access on proxies cannot be awaited, so code that walks the object model does
+explicit `get_members`/`get_property` calls instead.
+
+Example:
+    connection = AsyncHTTPConnection("localhost", 10000, password="secret")
+    server = AsyncPlaxisServer(connection)
+    await server.new()
+    cone_volume, _ = await server.call("cone", 2.0, 1.0, (0, 0, 0), (0, 0, -1))
+    await server.call("rename", cone_volume, "Spudcan")
+    await connection.close()
+"""
+
+import json
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Tuple, Sequence
+
+from ..exceptions import PlaxisConnectionError, PlaxisConfigurationError
+from .retry_policy import RetryPolicy, RetryStats, CircuitBreaker, TRANSIENT_STATUS_CODES, run_with_retries_async
+from .api_crypto import Blowfish, encrypt, decrypt, CODE_KEY, REQUEST_DATA_KEY, RESPONSE_KEY, REPLY_CODE_KEY
+
+logger = logging.getLogger(__name__)
+
+NULL_GUID = "{00000000-0000-0000-0000-000000000000}"
+GLOBAL_GUID = ""
+DEFAULT_MAX_STREAMS = 4
+STRING_WRAPPERS = ('"', "'", '"""', "'''") # Tried in order, as in plxscripting's InputProcessor.
+
+
+class PlxScriptingError(Exception):
+    """
+    A request or command PLAXIS rejected. Named like plxscripting's error, so
+    `interactor._map_plaxis_sdk_exception_to_custom` maps it the same way.
+    """
+
+
+@dataclass(frozen=True)
+class PlxObjectRef:
+    """A PLAXIS object (or intrinsic property) as returned by the API."""
+    guid: str
+    plx_type: str
+    islistable: bool = False
+
+    def get_cmd_line_repr(self) -> str:
+        return self.guid
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "PlxObjectRef":
+        return cls(data["guid"], str(data.get("type", "")), bool(data.get("islistable", False)))
+
+
+class AsyncHTTPConnection:
+    """
+    asyncio counterpart of plxscripting's `HTTPConnection`.
+
+    Args:
+        host, port: Address of the PLAXIS Input or Output server.
+        password: API password; requests and responses are encrypted when set.
+        timeout: Seconds to establish a TCP connection.
+        request_timeout: Seconds to wait for a response (None waits indefinitely, as
+                         `calculate` can take hours).
+        max_streams: Concurrent requests (TCP connections) to this server.
+        retry_policy: Retries/backoff of failed read-only requests (see retry_policy); None disables them.
+        circuit_breaker: Fails requests fast while the server is down (e.g. `retry_policy.breaker_for`).
+        retry_stats: Collects the retry counters.
+
+    Raises:
+        PlaxisConfigurationError: If a password is given but pycryptodome is not installed.
+    """
+
+    def __init__(self, host: str, port: int, password: str = "", timeout: float = 5.0,
+                 request_timeout: Optional[float] = None, max_streams: int = DEFAULT_MAX_STREAMS,
+                 retry_policy: Optional[RetryPolicy] = None, circuit_breaker: Optional[CircuitBreaker] = None,
+                 retry_stats: Optional[RetryStats] = None):
+        if password and Blowfish is None:
+            raise PlaxisConfigurationError("Encrypted PLAXIS API connections need pycryptodome (pip install pycryptodome).")
+        self.host = host
+        self.port = port
+        self._password = password
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self.max_streams = max_streams
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.retry_stats = retry_stats
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.request_count = 0
+
+    # --- Transport ---
+
+    async def _open_stream(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        try:
+            return await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise PlaxisConnectionError(f"Cannot connect to PLAXIS API at {self.host}:{self.port}: {e or 'timed out'}")
+
+    async def _exchange(self, stream: Tuple[asyncio.StreamReader, asyncio.StreamWriter], resource: str,
+                        body: bytes) -> Tuple[int, str, Dict[str, str], bytes]:
+        reader, writer = stream
+        writer.write((f"POST /{resource} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                      f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                      f"Connection: keep-alive\r\n\r\n").encode("ascii") + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the server")
+        _, status, reason = (status_line.decode("iso-8859-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+        headers: Dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("iso-8859-1").rstrip("\r\n")
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            content = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                content += chunk[:-2]
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await reader.read()
+            headers["connection"] = "close"
+        return int(status), reason, headers, content
+
+    async def _post(self, resource: str, body: str) -> Tuple[int, str, Dict[str, str], bytes]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_streams)
+        async with self._slots:
+            for attempt in range(2):
+                reused = attempt == 0 and bool(self._idle)
+                stream = self._idle.pop() if reused else await self._open_stream()
+                try:
+                    result = await asyncio.wait_for(self._exchange(stream, resource, body.encode("utf-8")),
+                                                    self.request_timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    stream[1].close()
+                    if reused:
+                        continue # The server dropped an idle keep-alive connection; retry on a fresh one.
+                    raise PlaxisConnectionError(f"PLAXIS API at {self.host}:{self.port} closed the connection: {e}")
+                except BaseException:
+                    stream[1].close() # Timeout or cancellation leaves the stream mid-response.
+                    raise
+                if result[2].get("connection", "").lower() == "close":
+                    stream[1].close()
+                else:
+                    self._idle.append(stream)
+                self.request_count += 1
+                return result
+        raise PlaxisConnectionError(f"PLAXIS API at {self.host}:{self.port} closed the connection.") # Not reached.
+
+    async def _send_request(self, resource: str, payload: Dict[str, Any]) -> Tuple[str, Any]:
+        """Posts `payload` (encrypted if needed) and returns (reason, decrypted response JSON)."""
+        reply_code = ""
+        if self._password:
+            reply_code = uuid.uuid4().hex
+            data, iv = encrypt(json.dumps({**payload, REPLY_CODE_KEY: reply_code}), self._password)
+            body = json.dumps({CODE_KEY: iv, REQUEST_DATA_KEY: data})
+        else:
+            body = json.dumps(payload)
+        if self.retry_policy is None:
+            status, reason, headers, content = await self._post(resource, body)
+        else:
+            status, reason, headers, content = await run_with_retries_async(
+                self.retry_policy, lambda: self._post(resource, body), lambda result: result[0] in TRANSIENT_STATUS_CODES,
+                resource, payload, self.circuit_breaker, self.retry_stats, errors=(PlaxisConnectionError,))
+        text = content.decode("utf-8")
+        response: Any = None
+        if text and "json" in headers.get("content-type", ""):
+            response = json.loads(text)
+            if self._password and isinstance(response, dict) and RESPONSE_KEY in response:
+                decrypted = decrypt(response[RESPONSE_KEY], response[CODE_KEY], self._password)
+                if not decrypted:
+                    raise PlxScriptingError("Couldn't decrypt response.")
+                response = json.loads(decrypted)
+                if response.pop(REPLY_CODE_KEY, None) != reply_code:
+                    raise PlxScriptingError("Reply code is different from what was sent! Server might be spoofed!")
+        if status != 200:
+            bug_report = response.get("bugreport", "") if isinstance(response, dict) else ""
+            raise PlxScriptingError("\n".join(filter(None, [reason, bug_report])))
+        return reason, response
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # --- Resources (same names and payloads as plxscripting's HTTPConnection) ---
+
+    async def request_environment(self, command_string: str, filename: str = "") -> str:
+        reason, _ = await self._send_request("environment", {"action": {"name": command_string, "filename": filename}})
+        return reason
+
+    async def request_commands(self, *commands: str) -> Dict[str, Any]:
+        return (await self._send_request("commands", {"action": {"commands": list(commands)}}))[1]
+
+    async def request_members(self, *guids: str) -> Dict[str, Any]:
+        return (await self._send_request("members", {"action": {"members": list(guids)}}))[1]
+
+    async def request_namedobjects(self, *object_names: str) -> Dict[str, Any]:
+        return (await self._send_request("namedobjects", {"action": {"namedobjects": list(object_names)}}))[1]
+
+    async def request_propertyvalues(self, owner_guids: Sequence[str], property_name: str,
+                                     phase_guid: str = "") -> Dict[str, Any]:
+        queries: Any = [{"owner": g, "propertyname": property_name, "phaseguid": phase_guid} for g in owner_guids]
+        if len(queries) == 1:
+            queries = queries[0] # Legacy single-owner form, like plxscripting.
+        return (await self._send_request("propertyvalues", {"action": {"propertyvalues": queries}}))[1]
+
+    async def request_list(self, *list_queries: Dict[str, Any]) -> Dict[str, Any]:
+        return (await self._send_request("list", {"action": {"listqueries": list(list_queries)}}))[1]
+
+    async def request_enumeration(self, *guids: str) -> Dict[str, Any]:
+        return (await self._send_request("enumeration", {"action": {"enumeration": list(guids)}}))[1]
+
+    async def request_selection(self, command: str, *guids: str) -> Dict[str, Any]:
+        return (await self._send_request("selection", {"action": {"name": command, "objects": list(guids)}}))[1]
+
+    async def request_exceptions(self, clear: bool = True) -> str:
+        _, response = await self._send_request("exceptions", {"action": {"name": "getlast" if clear else "peeklast"}})
+        return (response or {}).get("exceptions", [""])[-1]
+
+
+def param_to_string(param: Any) -> str:
+    """Command line form of a parameter, as plxscripting's `InputProcessor.param_to_string`."""
+    if hasattr(param, "get_cmd_line_repr"):
+        return param.get_cmd_line_repr()
+    if isinstance(param, str):
+        for wrapper in STRING_WRAPPERS:
+            if wrapper not in param:
+                return wrapper + param + wrapper
+        raise PlxScriptingError(f"Cannot convert string parameter to valid Plaxis string representation: {param}")
+    if isinstance(param, (tuple, list)):
+        return "(" + " ".join(param_to_string(p) for p in param) + ")"
+    return str(param)
+
+
+def method_call_cmd(method_name: str, *params: Any, target: Optional[Any] = None) -> str:
+    """'method [target] params', e.g. method_call_cmd("move", 1, 2, 3, target=point) -> 'move {guid} 1 2 3'."""
+    parts = [method_name]
+    if target is not None and param_to_string(target):
+        parts.append(param_to_string(target))
+    parts.extend(param_to_string(p) for p in params)
+    return " ".join(parts)
+
+
+def _json_to_value(data: Any) -> Any:
+    if isinstance(data, dict) and "guid" in data:
+        return PlxObjectRef.from_json(data)
+    return None if data == NULL_GUID else data
+
+
+class AsyncPlaxisServer:
+    """
+    Commands and queries on one PLAXIS server (Input or Output) over an `AsyncHTTPConnection`.
+
+    Command results follow plxscripting: the returned objects (one object unwrapped),
+    else the returned values, else the extra info text, else True.
+    """
+
+    def __init__(self, connection: AsyncHTTPConnection):
+        self.connection = connection
+
+    @staticmethod
+    def _handle_feedback(feedback: Dict[str, Any]) -> Any:
+        if not feedback.get("success"):
+            raise PlxScriptingError("Unsuccessful command:\n" + str(feedback.get("extrainfo", "")))
+        objects = [PlxObjectRef.from_json(o) for o in feedback.get("returnedobjects") or []]
+        if objects:
+            return objects[0] if len(objects) == 1 else objects
+        if feedback.get("returnedvalues"):
+            return feedback["returnedvalues"]
+        return feedback.get("extrainfo") or True
+
+    async def call_commands(self, *commands: str) -> List[Any]:
+        """Sends command lines in one request; raises on the first unsuccessful one."""
+        response = await self.connection.request_commands(*commands)
+        return [self._handle_feedback(c["feedback"]) for c in (response or {}).get("commands", [])]
+
+    async def call(self, method_name: str, *params: Any, target: Optional[Any] = None) -> Any:
+        """One command, e.g. `await server.call("phase", initial_phase)`."""
+        results = await self.call_commands(method_call_cmd(method_name, *params, target=target))
+        return results[0] if results else None
+
+    async def new(self) -> str:
+        return await self.connection.request_environment("new")
+
+    async def open(self, filename: str) -> str:
+        return await self.connection.request_environment("open", filename)
+
+    async def close(self) -> str:
+        return await self.connection.request_environment("close")
+
+    async def get_named_objects(self, *names: str) -> Dict[str, Optional[PlxObjectRef]]:
+        """Objects by name in one request; None for names PLAXIS does not know."""
+        response = await self.connection.request_namedobjects(*names)
+        found = {}
+        for name in names:
+            entry = response["namedobjects"].get(name, {})
+            found[name] = PlxObjectRef.from_json(entry["returnedobject"]) if entry.get("success") else None
+        return found
+
+    async def get_named_object(self, name: str) -> PlxObjectRef:
+        obj = (await self.get_named_objects(name))[name]
+        if obj is None:
+            raise PlxScriptingError(f"Requested object '{name}' not found")
+        return obj
+
+    async def get_members(self, obj: Any) -> Dict[str, Any]:
+        """{"commands": [...], "properties": {name: PlxObjectRef of the intrinsic property}}."""
+        guid = getattr(obj, "guid", obj)
+        members = (await self.connection.request_members(guid))["queries"][guid]
+        return {"commands": list(members.get("commands", [])),
+                "properties": {name: PlxObjectRef.from_json(ip) for name, ip in members.get("properties", {}).items()}}
+
+    async def get_properties(self, owners: Sequence[Any], property_name: str,
+                             phase: Optional[Any] = None) -> List[Any]:
+        """Value of `property_name` for each owner, in one request (None where missing)."""
+        guids = [getattr(o, "guid", o) for o in owners]
+        if not guids:
+            return []
+        response = await self.connection.request_propertyvalues(guids, property_name,
+                                                                 getattr(phase, "guid", phase) or "")
+        queries = response["queries"]
+        entries = [queries[guids[0]]] if len(guids) == 1 else [queries[i][g] for i, g in enumerate(guids)]
+        return [_json_to_value(e.get("properties", {}).get(property_name, NULL_GUID)) for e in entries]
+
+    async def get_property(self, owner: Any, property_name: str, phase: Optional[Any] = None) -> Any:
+        return (await self.get_properties([owner], property_name, phase))[0]
+
+    async def _list_query(self, listable: Any, method: str, start: Optional[int] = None,
+                          stop: Optional[int] = None) -> Any:
+        query: Dict[str, Any] = {"guid": getattr(listable, "guid", listable), "method": method}
+        if start is not None:
+            query["startindex"] = start
+        if stop is not None:
+            query["stopindex"] = stop
+        result = (await self.connection.request_list(query))["listqueries"][0]
+        if not result.get("success"):
+            raise PlxScriptingError("Unsuccessful command:\n" + str(result.get("extrainfo", "")))
+        return result["outputdata"]
+
+    async def count(self, listable: Any) -> int:
+        return await self._list_query(listable, "count")
+
+    async def sublist(self, listable: Any, start: Optional[int] = None, stop: Optional[int] = None) -> List[PlxObjectRef]:
+        return [PlxObjectRef.from_json(o) for o in await self._list_query(listable, "sublist", start, stop)]
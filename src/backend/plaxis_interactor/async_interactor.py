@@ -0,0 +1,200 @@
+"""
+asyncio facade over `PlaxisInteractor`.
+
+`AsyncPlaxisInteractor` lets one event loop orchestrate many PLAXIS sessions. Its
+own PLAXIS traffic runs on `async_client` connections, without a thread per session:
+- connecting and checking the connection;
+- pipelined command lists;
+- step results (both result types in one request).
+
+The model setup, calculation and extraction stages still run the builder callables,
+which are written against the synchronous plxscripting proxies (`g_i.Volumes[...]`,
+`phase.Deform.MaxSteps`, ...). The facade runs those stages in an executor on a
+wrapped `PlaxisInteractor`. Their error mapping, tracing and session recording are
+unchanged.
+
+Example:
+    async def run_all(projects):
+        sessions = [AsyncPlaxisInteractor(project) for project in projects]
+        await asyncio.gather(*(s.connect_input() for s in sessions))
+        ...
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from typing import List, Any, Optional, Callable, Sequence, Tuple
+
+from ..exceptions import PlaxisConnectionError, PlaxisOutputError
+from ..models import ProjectSettings
+from ..run_trace import RunTracer
+from .async_client import AsyncHTTPConnection, AsyncPlaxisServer, PlxObjectRef, DEFAULT_MAX_STREAMS
+from .interactor import PlaxisInteractor, _map_plaxis_sdk_exception_to_custom
+from .retry_policy import RetryPolicy, breaker_for
+from .session_replay import SessionRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPlaxisInteractor:
+    """
+    Coroutine versions of the `PlaxisInteractor` stages plus native async API access.
+
+    Attributes:
+        interactor (PlaxisInteractor): The wrapped synchronous interactor (credentials,
+                                       stages, signals, `g_i`/`g_o`).
+        input (Optional[AsyncPlaxisServer]): Async Input session after `connect_input`.
+        output (Optional[AsyncPlaxisServer]): Async Output session after `connect_output`.
+    """
+
+    def __init__(self, project_settings: Optional[ProjectSettings] = None, plaxis_path: Optional[str] = None,
+                 tracer: Optional[RunTracer] = None, recorder: Optional[SessionRecorder] = None,
+                 executor: Optional[Executor] = None, max_streams: int = DEFAULT_MAX_STREAMS,
+                 request_timeout: Optional[float] = None, retry_policy: Optional[RetryPolicy] = None):
+        """
+        Args:
+            project_settings, plaxis_path, tracer, recorder, retry_policy: As for `PlaxisInteractor`;
+                the async sessions share the wrapped interactor's retry policy, counters and breakers.
+            executor: Runs the synchronous stages; None uses the event loop's default executor.
+            max_streams: Concurrent requests per async connection.
+            request_timeout: Seconds to wait for an async response (None waits indefinitely).
+        """
+        self.interactor = PlaxisInteractor(plaxis_path, project_settings, tracer=tracer, recorder=recorder,
+                                           retry_policy=retry_policy)
+        self.executor = executor
+        self.max_streams = max_streams
+        self.request_timeout = request_timeout
+        self.input: Optional[AsyncPlaxisServer] = None
+        self.output: Optional[AsyncPlaxisServer] = None
+
+    async def _run_stage(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(method, *args, **kwargs))
+
+    async def _connect(self, port: int, host: str, password: str, server_name: str) -> AsyncPlaxisServer:
+        server = AsyncPlaxisServer(AsyncHTTPConnection(
+            host, port, password=password, max_streams=self.max_streams, request_timeout=self.request_timeout,
+            retry_policy=self.interactor.retry_policy, circuit_breaker=breaker_for(host, port),
+            retry_stats=self.interactor.retry_stats))
+        try:
+            if server_name == "Input":
+                project = await server.get_named_object("Project")
+                title = await server.get_property(project, "Title")
+                logger.info(f"Async connection to PLAXIS Input API on {host}:{port}. Current project title: '{title}'.")
+            else:
+                await server.get_named_object("ResultTypes")
+                logger.info(f"Async connection to PLAXIS Output API on {host}:{port}.")
+        except Exception as e:
+            await server.connection.close()
+            raise _map_plaxis_sdk_exception_to_custom(e, f"connecting to {server_name} API ({host}:{port})")
+        return server
+
+    async def connect_input(self) -> AsyncPlaxisServer:
+        """Opens (or returns) the async Input session."""
+        if self.input is None:
+            host, input_port, _, password = self.interactor._get_api_credentials()
+            self.input = await self._connect(input_port, host, password, "Input")
+        return self.input
+
+    async def connect_output(self, project_file_to_open: Optional[str] = None) -> AsyncPlaxisServer:
+        """Opens (or returns) the async Output session, opening `project_file_to_open` if given."""
+        if self.output is None:
+            host, _, output_port, password = self.interactor._get_api_credentials()
+            self.output = await self._connect(output_port, host, password, "Output")
+        if project_file_to_open:
+            try:
+                await self.output.open(project_file_to_open)
+            except Exception as e:
+                raise _map_plaxis_sdk_exception_to_custom(e, f"opening '{project_file_to_open}' in Output")
+        return self.output
+
+    async def run_commands(self, commands: Sequence[str], server_name: str = "Input") -> List[Any]:
+        """Sends command lines to Input (or Output) in one request and returns their results."""
+        server = await (self.connect_input() if server_name == "Input" else self.connect_output())
+        try:
+            return await server.call_commands(*commands)
+        except Exception as e:
+            raise _map_plaxis_sdk_exception_to_custom(e, f"executing {len(commands)} pipelined commands on {server_name}")
+
+    async def fetch_step_results(self, reference_object_name: Optional[str] = None, phase_name: Optional[str] = None,
+                                 result_types: Tuple[str, str] = ("Uy", "Fz")) -> Tuple[List[float], List[float]]:
+        """
+        Step results of two `ResultTypes.RigidBody` components (default displacement, load)
+        of a phase (default the last), for an Output object (default the spudcan's
+        `plaxis_output_name`). Both `getresults` calls go out in one request.
+
+        Raises:
+            PlaxisOutputError: If the phase, object or result types cannot be found.
+        """
+        output = await self.connect_output()
+        settings = self.interactor.project_settings
+        if reference_object_name is None:
+            spudcan = getattr(settings, 'spudcan', None)
+            reference_object_name = getattr(spudcan, 'plaxis_output_name', None) or "Spudcan"
+        try:
+            named = await output.get_named_objects("Phases", "ResultTypes", reference_object_name)
+            if named["Phases"] is None or named["ResultTypes"] is None or named[reference_object_name] is None:
+                missing = [name for name, obj in named.items() if obj is None]
+                raise PlaxisOutputError(f"Output objects not found: {missing}")
+            phase = await self._find_phase(output, named["Phases"], phase_name)
+            rigid_body = await output.get_property(named["ResultTypes"], "RigidBody")
+            properties = (await output.get_members(rigid_body))["properties"]
+            disp_type, load_type = (properties[name] for name in result_types)
+            disp, load = await output.call_commands(
+                *(f"getresults {named[reference_object_name].guid} {phase.guid} {rt.guid} \"step\""
+                  for rt in (disp_type, load_type)))
+        except PlaxisOutputError:
+            raise
+        except KeyError as e:
+            raise PlaxisOutputError(f"Result type {e} not found under ResultTypes.RigidBody.")
+        except Exception as e:
+            raise _map_plaxis_sdk_exception_to_custom(e, "fetching step results")
+        if not isinstance(disp, list) or not isinstance(load, list) or len(disp) != len(load):
+            raise PlaxisOutputError(f"Unexpected step results: {type(disp).__name__}, {type(load).__name__}.")
+        return [float(v) for v in disp], [float(v) for v in load]
+
+    @staticmethod
+    async def _find_phase(output: AsyncPlaxisServer, phases_listable: PlxObjectRef,
+                          phase_name: Optional[str]) -> PlxObjectRef:
+        phases = await output.sublist(phases_listable)
+        if not phases:
+            raise PlaxisOutputError("The Output project has no phases.")
+        if phase_name is None:
+            return phases[-1]
+        identifications = await output.get_properties(phases, "Identification")
+        names = await output.get_properties(phases, "Name")
+        for phase, identification, name in zip(phases, identifications, names):
+            if phase_name in (identification, name):
+                return phase
+        raise PlaxisOutputError(f"Phase '{phase_name}' not found in Output.")
+
+    # --- Synchronous stages, run in the executor ---
+
+    async def setup_model_in_plaxis(self, model_setup_callables: List[Callable[[Any], None]],
+                                    is_new_project: bool = True, template_path: Optional[str] = None) -> None:
+        await self._run_stage(self.interactor.setup_model_in_plaxis, model_setup_callables,
+                              is_new_project=is_new_project, template_path=template_path)
+
+    async def run_calculation(self, calculation_run_callables: List[Callable[[Any], None]]) -> None:
+        await self._run_stage(self.interactor.run_calculation, calculation_run_callables)
+
+    async def extract_results(self, results_extraction_callables: List[Callable[[Any, Optional[Any]], Any]]) -> List[Any]:
+        return await self._run_stage(self.interactor.extract_results, results_extraction_callables)
+
+    async def attempt_stop_calculation(self) -> None:
+        """Sends `breakcalculation` on the async Input session, so it works while a stage blocks `g_i`."""
+        if self.input is None:
+            raise PlaxisConnectionError("No async Input session to stop the calculation on.")
+        try:
+            await self.input.call("breakcalculation")
+        except Exception as e:
+            raise _map_plaxis_sdk_exception_to_custom(e, "stopping the calculation")
+
+    async def close(self) -> None:
+        """Closes the async sessions and the wrapped interactor's connections."""
+        for server in (self.input, self.output):
+            if server is not None:
+                await server.connection.close()
+        self.input = self.output = None
+        await self._run_stage(self.interactor.close_all_connections)
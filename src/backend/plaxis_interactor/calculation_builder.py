@@ -11,21 +11,29 @@ output requests within the PLAXIS model.
 """
 
 import logging
-from ..models import LoadingConditions, AnalysisControlParameters
+from ..models import LoadingConditions, AnalysisControlParameters, SpudcanLeg
 from ..exceptions import PlaxisConfigurationError # Import custom exception
+from .geometry_builder import SPUDCAN_REFINEMENT_ZONE_NAME, SPUDCAN_VOLUME_NAME, leg_object_name
 from typing import List, Callable, Any, Optional, Tuple # Added Tuple
 
 logger = logging.getLogger(__name__)
 
+MESH_COARSENESS_LEVELS = ["VeryCoarse", "Coarse", "Medium", "Fine", "VeryFine"] # Ordered coarse to fine.
+
 # --- Loading Conditions ---
 
 def generate_loading_condition_callables(
     loading_model: LoadingConditions,
-    spudcan_ref_point: Tuple[float, float, float] = (0,0,0)
+    spudcan_ref_point: Tuple[float, float, float] = (0,0,0),
+    symmetry_factor: float = 1.0,
+    leg_name: Optional[str] = None
 ) -> List[Callable[[Any], None]]:
     """
     Generates PLAXIS API callables for defining loading conditions.
     (Args and Returns are per original spec, assumptions also largely hold)
+    symmetry_factor: Full spudcan / modelled part (4.0 for a quarter model). Point loads
+                     on the spudcan axis are divided by it; prescribed displacements are not.
+    leg_name: Suffix for the load object names in multi-leg models.
     Raises:
         PlaxisConfigurationError: If loading_model contains invalid parameters (e.g., negative preload if not allowed by convention).
                                  Currently, this function doesn't perform extensive validation beyond type checks implied by model.
@@ -45,14 +53,14 @@ def generate_loading_condition_callables(
         pass # For now, allow negative, abs() is used later. Stricter validation could raise here.
 
     if loading_model.vertical_preload is not None and loading_model.vertical_preload != 0:
-        preload_value_fz = -abs(loading_model.vertical_preload) # Convention: negative Z is downward force
-        preload_name = "Spudcan_Preload"
+        preload_value_fz = -abs(loading_model.vertical_preload) / symmetry_factor # Convention: negative Z is downward force
+        preload_name = leg_object_name("Spudcan_Preload", leg_name)
 
         def define_preload_callable(g_i: Any) -> None:
             logger.info(f"  API CALL: Defining PointLoad '{preload_name}' at {load_application_point} with Fz={preload_value_fz}")
             try:
                 g_i.pointload(load_application_point, Name=preload_name, Fz=preload_value_fz)
-                logger.debug(f"    PointLoad '{preload_name}' defined.")
+                logger.debug("    PointLoad '%s' defined.", preload_name)
             except Exception as e: # Catch PlxScriptingError or other
                 logger.error(f"    ERROR defining PointLoad '{preload_name}': {e}", exc_info=True)
                 raise # Re-raise to be mapped by PlaxisInteractor
@@ -71,14 +79,14 @@ def generate_loading_condition_callables(
        loading_model.target_penetration_or_load is not None and \
        loading_model.target_penetration_or_load != 0:
         target_displacement_uz = -abs(loading_model.target_penetration_or_load) # Convention: negative Z is downward displacement
-        displacement_name = "Spudcan_TargetPenetration"
+        displacement_name = leg_object_name("Spudcan_TargetPenetration", leg_name)
 
         def define_target_displacement_callable(g_i: Any) -> None:
             logger.info(f"  API CALL: Defining PointDisplacement '{displacement_name}' at {load_application_point} with uz={target_displacement_uz}")
             try:
                 # Ensure Displacement_z="Prescribed" or similar is correct for PLAXIS version
                 g_i.pointdispl(load_application_point, Name=displacement_name, uz=target_displacement_uz, Displacement_z="Prescribed")
-                logger.debug(f"    PointDisplacement '{displacement_name}' defined using pointdispl.")
+                logger.debug("    PointDisplacement '%s' defined using pointdispl.", displacement_name)
             except Exception as e: # Catch PlxScriptingError or other
                 logger.error(f"    ERROR defining PointDisplacement '{displacement_name}': {e}", exc_info=True)
                 raise # Re-raise
@@ -89,15 +97,49 @@ def generate_loading_condition_callables(
 
     return callables
 
+def generate_multi_leg_loading_callables(
+    loading_model: LoadingConditions,
+    legs: List[SpudcanLeg],
+    symmetry_factor: float = 1.0
+) -> List[Callable[[Any], None]]:
+    """
+    Generates a single callable that defines the preload and target displacement of every
+    leg (objects named with the leg suffix, applied at the leg position on the seabed).
+    The legs' load commands are issued one by one: they set properties by keyword, which
+    a `CommandBatch` cannot queue.
+    symmetry_factor: As for `generate_loading_condition_callables` (only a single leg on the
+                     origin can be quarter-modelled, see geometry_builder.get_symmetry_factor).
+    """
+    leg_callables: List[Callable[[Any], None]] = []
+    for leg in legs:
+        leg_callables += generate_loading_condition_callables(
+            loading_model, (leg.x, leg.y, 0), symmetry_factor=symmetry_factor, leg_name=leg.name)
+
+    def define_leg_loads_callable(g_i: Any) -> None:
+        logger.info(f"API CALL: Defining loads for {len(legs)} legs.")
+        for func in leg_callables:
+            func(g_i)
+
+    return [define_leg_loads_callable] if leg_callables else []
+
 # --- Analysis Control (Meshing, Phases) ---
 
 def generate_analysis_control_callables(
     control_model: AnalysisControlParameters,
-    loading_conditions_model: Optional[LoadingConditions] = None
+    loading_conditions_model: Optional[LoadingConditions] = None,
+    skip_meshing: bool = False,
+    post_mesh_callables: Optional[List[Callable[[Any], None]]] = None,
+    leg_names: Optional[List[str]] = None
 ) -> List[Callable[[Any], None]]:
     """
     Generates PLAXIS API callables for analysis control.
-    Args are per original spec.
+    Args are per original spec, plus:
+        skip_meshing: If True, the model is assumed to be an already meshed template
+                      (see `mesh_cache`); only the switch to staged construction is emitted.
+        post_mesh_callables: Callables inserted right after meshing and before any phase
+                             is defined (e.g. saving a mesh template).
+        leg_names: Legs of a multi-leg model; the spudcan, load and refinement objects of
+                   every leg are activated/refined together so one calculation covers all legs.
     Raises:
         PlaxisConfigurationError: If critical parameters are missing or invalid (e.g. unknown mesh coarseness).
                                  Currently, relies on default values or simple mappings. More validation can be added.
@@ -107,13 +149,15 @@ def generate_analysis_control_callables(
                 f"InitialStress={control_model.initial_stress_method}")
 
     # Example validation for mesh coarseness
-    valid_coarseness = ["VeryCoarse", "Coarse", "Medium", "Fine", "VeryFine"]
+    valid_coarseness = MESH_COARSENESS_LEVELS
     if control_model.meshing_global_coarseness and control_model.meshing_global_coarseness not in valid_coarseness:
         msg = f"Invalid meshing_global_coarseness: '{control_model.meshing_global_coarseness}'. Must be one of {valid_coarseness}."
         logger.error(msg)
         raise PlaxisConfigurationError(msg)
 
 
+    object_leg_names: List[Optional[str]] = list(leg_names) if leg_names else [None]
+
     # --- Meshing Callables ---
     def mesh_generation_callable(g_i: Any) -> None:
         logger.info("API CALL: Setting up and generating mesh.")
@@ -129,19 +173,46 @@ def generate_analysis_control_callables(
             # No need to raise here if not in map, as we validated above or it defaults.
             coarseness_factor = mesh_coarseness_map.get(coarseness_setting, 0.05) # Default if somehow missed validation
 
+            if control_model.meshing_refinement_spudcan:
+                # Local refinement: relative coarseness factors on the spudcan and the
+                # surrounding soil cylinder (created by geometry_builder.generate_refinement_zone_callables).
+                refinement_targets = []
+                for leg_name in object_leg_names:
+                    refinement_targets += [
+                        (leg_object_name(SPUDCAN_VOLUME_NAME, leg_name), control_model.refinement_cone_coarseness_factor),
+                        (leg_object_name(SPUDCAN_REFINEMENT_ZONE_NAME, leg_name), control_model.refinement_zone_coarseness_factor),
+                    ]
+                for volume_name, local_factor in refinement_targets:
+                    if local_factor is None:
+                        continue
+                    if hasattr(g_i, 'Volumes') and volume_name in g_i.Volumes:
+                        g_i.set(g_i.Volumes[volume_name].CoarsenessFactor, local_factor)
+                        logger.info(f"  Local refinement: CoarsenessFactor of '{volume_name}' set to {local_factor}.")
+                    else:
+                        logger.warning(f"  Volume '{volume_name}' not found in mesh mode; local refinement skipped for it.")
+
             g_i.mesh("Coarseness", coarseness_factor)
             logger.info(f"  Mesh generation triggered with Coarseness Factor: {coarseness_factor} (for '{coarseness_setting}').")
 
-            if control_model.meshing_refinement_spudcan:
-                spudcan_volume_name = "Spudcan_ConeVolume"
-                logger.info(f"  Conceptual: Local mesh refinement for '{spudcan_volume_name}' would be applied here (e.g., g_i.refinemesh).")
-
             g_i.gotostages()
             logger.info("  Switched back to staged construction mode.")
         except Exception as e: # Catch PlxScriptingError or other
             logger.error(f"  ERROR during mesh generation: {e}", exc_info=True)
             raise # Re-raise
-    callables.append(mesh_generation_callable)
+    def enter_staged_construction_callable(g_i: Any) -> None:
+        logger.info("API CALL: Reusing existing mesh from template; switching to staged construction.")
+        try:
+            g_i.gotostages()
+        except Exception as e: # Catch PlxScriptingError or other
+            logger.error(f"  ERROR switching to staged construction on template: {e}", exc_info=True)
+            raise # Re-raise
+
+    if skip_meshing:
+        callables.append(enter_staged_construction_callable)
+    else:
+        callables.append(mesh_generation_callable)
+        if post_mesh_callables:
+            callables.extend(post_mesh_callables)
 
     phase_objects_map = {}
     initial_phase_name = "InitialPhase"
@@ -186,8 +257,6 @@ def generate_analysis_control_callables(
 
     if loading_conditions_model and loading_conditions_model.vertical_preload is not None and loading_conditions_model.vertical_preload != 0:
         preload_phase_name = "PreloadPhase"
-        spudcan_geom_name = "Spudcan_ConeVolume"
-        preload_load_name = "Spudcan_Preload"
 
         def preload_phase_setup_callable(g_i: Any) -> None:
             nonlocal phase_objects_map
@@ -203,12 +272,15 @@ def generate_analysis_control_callables(
                 logger.info(f"  Phase '{preload_phase_name}' created after '{initial_phase_name}'.")
 
                 g_i.set(current_phase_obj.DeformCalcType, "Plastic")
-                if hasattr(g_i, 'Volumes') and spudcan_geom_name in g_i.Volumes:
-                    g_i.activate(g_i.Volumes[spudcan_geom_name], current_phase_obj)
-                else: logger.warning(f"  Spudcan geometry '{spudcan_geom_name}' not found for activation in {preload_phase_name}.")
-                if hasattr(g_i, 'PointLoads') and preload_load_name in g_i.PointLoads:
-                    g_i.activate(g_i.PointLoads[preload_load_name], current_phase_obj)
-                else: logger.warning(f"  Preload object '{preload_load_name}' not found for activation in {preload_phase_name}.")
+                for leg_name in object_leg_names:
+                    spudcan_geom_name = leg_object_name(SPUDCAN_VOLUME_NAME, leg_name)
+                    preload_load_name = leg_object_name("Spudcan_Preload", leg_name)
+                    if hasattr(g_i, 'Volumes') and spudcan_geom_name in g_i.Volumes:
+                        g_i.activate(g_i.Volumes[spudcan_geom_name], current_phase_obj)
+                    else: logger.warning(f"  Spudcan geometry '{spudcan_geom_name}' not found for activation in {preload_phase_name}.")
+                    if hasattr(g_i, 'PointLoads') and preload_load_name in g_i.PointLoads:
+                        g_i.activate(g_i.PointLoads[preload_load_name], current_phase_obj)
+                    else: logger.warning(f"  Preload object '{preload_load_name}' not found for activation in {preload_phase_name}.")
                 logger.info(f"  '{preload_phase_name}' configured (Plastic analysis, spudcan & preload activated).")
             except Exception as e: # Catch PlxScriptingError or other
                 logger.error(f"  ERROR during '{preload_phase_name}' setup: {e}", exc_info=True)
@@ -217,8 +289,6 @@ def generate_analysis_control_callables(
         current_previous_phase_name_for_map = preload_phase_name
 
     penetration_phase_name = "PenetrationPhase"
-    spudcan_geom_name = "Spudcan_ConeVolume"
-    target_disp_name = "Spudcan_TargetPenetration"
 
     def penetration_phase_setup_callable(g_i: Any) -> None:
         nonlocal phase_objects_map
@@ -235,22 +305,25 @@ def generate_analysis_control_callables(
 
             g_i.set(current_phase_obj.DeformCalcType, "Plastic")
 
-            if hasattr(g_i, 'Volumes') and spudcan_geom_name in g_i.Volumes:
-                 g_i.activate(g_i.Volumes[spudcan_geom_name], current_phase_obj)
-            else: logger.warning(f"  Spudcan geometry '{spudcan_geom_name}' not found for activation in {penetration_phase_name}.")
-
-            if loading_conditions_model:
-                if loading_conditions_model.target_type == "penetration" and \
-                   target_disp_name and hasattr(g_i, 'PointDisplacements') and target_disp_name in g_i.PointDisplacements:
-                    g_i.activate(g_i.PointDisplacements[target_disp_name], current_phase_obj)
-                    logger.info(f"    Activated PointDisplacement '{target_disp_name}'.")
-                elif loading_conditions_model.target_type == "load":
-                    main_load_name = "Spudcan_Preload"
-                    if hasattr(g_i, 'PointLoads') and main_load_name in g_i.PointLoads:
-                        g_i.activate(g_i.PointLoads[main_load_name], current_phase_obj)
-                        logger.info(f"    Activated PointLoad '{main_load_name}' for target load control.")
-                    else:
-                        logger.warning(f"    Load object for target type 'load' (e.g., '{main_load_name}') not found for activation.")
+            for leg_name in object_leg_names:
+                spudcan_geom_name = leg_object_name(SPUDCAN_VOLUME_NAME, leg_name)
+                target_disp_name = leg_object_name("Spudcan_TargetPenetration", leg_name)
+                if hasattr(g_i, 'Volumes') and spudcan_geom_name in g_i.Volumes:
+                     g_i.activate(g_i.Volumes[spudcan_geom_name], current_phase_obj)
+                else: logger.warning(f"  Spudcan geometry '{spudcan_geom_name}' not found for activation in {penetration_phase_name}.")
+
+                if loading_conditions_model:
+                    if loading_conditions_model.target_type == "penetration" and \
+                       target_disp_name and hasattr(g_i, 'PointDisplacements') and target_disp_name in g_i.PointDisplacements:
+                        g_i.activate(g_i.PointDisplacements[target_disp_name], current_phase_obj)
+                        logger.info(f"    Activated PointDisplacement '{target_disp_name}'.")
+                    elif loading_conditions_model.target_type == "load":
+                        main_load_name = leg_object_name("Spudcan_Preload", leg_name)
+                        if hasattr(g_i, 'PointLoads') and main_load_name in g_i.PointLoads:
+                            g_i.activate(g_i.PointLoads[main_load_name], current_phase_obj)
+                            logger.info(f"    Activated PointLoad '{main_load_name}' for target load control.")
+                        else:
+                            logger.warning(f"    Load object for target type 'load' (e.g., '{main_load_name}') not found for activation.")
 
             if control_model.MaxStepsStored is not None:
                 g_i.set(current_phase_obj.MaxStepsStored, control_model.MaxStepsStored)
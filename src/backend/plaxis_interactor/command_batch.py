@@ -0,0 +1,121 @@
+"""
+Pipelined PLAXIS command requests.
+
+Every `g_i.<command>(...)` call through plxscripting is one HTTP request to the
+PLAXIS server. The server's command resource accepts a list of command strings
+in a single request (`Server.call_and_handle_commands`), so builders that issue
+many independent commands (materials, borehole layers and levels) can queue them
+in a `CommandBatch` and send them in one round trip.
+
+When `g_i` is not backed by a plxscripting server (mock objects in tests, other
+execution backends), the batch falls back to calling the queued methods on `g_i`
+one by one, with the same results.
+
+Reading an attribute of a new object proxy costs one more request (its members
+are loaded on first access); `prefetch_members` loads them for many proxies at once.
+"""
+
+import logging
+from typing import List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def get_command_server(g_i: Any) -> Optional[Any]:
+    """
+    Returns the plxscripting Server behind the global proxy `g_i`, or None if `g_i`
+    is not a proxy (or its server cannot pipeline commands).
+
+    Only the instance dict is inspected, so mock objects that fabricate attributes
+    on access are never mistaken for a server.
+    """
+    server = getattr(g_i, '__dict__', {}).get('_server')
+    if server is None:
+        return None
+    if not (hasattr(server, 'call_and_handle_commands') and hasattr(server, 'input_proc')):
+        return None
+    return server
+
+
+class CommandBatch:
+    """
+    Queue of PLAXIS commands sent to the server in one request.
+
+    Commands whose parameters reference objects created by another command in the
+    same batch cannot be queued together: object proxies only exist once the batch
+    has been executed.
+    """
+
+    def __init__(self, g_i: Any):
+        self.g_i = g_i
+        self._server = get_command_server(g_i)
+        self._commands: List[Tuple[Optional[Any], str, Tuple[Any, ...]]] = [] # (target, method_name, params)
+
+    @property
+    def pipelined(self) -> bool:
+        """True if the batch is sent as a single request to a plxscripting server."""
+        return self._server is not None
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def add(self, method_name: str, *params: Any, target: Optional[Any] = None) -> None:
+        """Queues `target.<method_name>(*params)`; a None target means the global object."""
+        self._commands.append((target, method_name, params))
+
+    def execute(self) -> List[Any]:
+        """
+        Sends the queued commands and clears the queue.
+
+        Returns:
+            One result per queued command, in order.
+
+        Raises:
+            PlxScriptingError (or the error of the fallback call) on the first failing command.
+        """
+        commands, self._commands = self._commands, []
+        if not commands:
+            return []
+        if self._server is not None:
+            command_strings = [
+                self._server.input_proc.create_method_call_cmd(target, method_name, params)
+                for target, method_name, params in commands
+            ]
+            logger.debug("  Sending %d commands in one request.", len(command_strings))
+            return list(self._server.call_and_handle_commands(*command_strings))
+
+        results = []
+        for target, method_name, params in commands:
+            owner = self.g_i if target is None else target
+            results.append(getattr(owner, method_name)(*params))
+        return results
+
+
+def prefetch_members(objects: List[Any]) -> int:
+    """
+    Fills the attribute caches of plxscripting object proxies with one members request.
+
+    A proxy loads its attributes (e.g. a layer's `Material`) from the server on first
+    access, one request per object. Prefetching the proxies read in a loop turns those
+    N requests into one. Proxies whose cache is already filled, objects that are not
+    plxscripting proxies and servers that cannot answer a multi-object query are
+    skipped; their attributes then load on access as before.
+
+    Returns:
+        The number of proxies whose cache was filled.
+    """
+    pending = [obj for obj in objects
+               if '_guid' in getattr(obj, '__dict__', {}) and obj.__dict__.get('_attr_cache') == {}]
+    if not pending:
+        return 0
+    server = pending[0].__dict__.get('_server')
+    connection = getattr(server, 'connection', None)
+    if not (hasattr(connection, 'request_members') and hasattr(server, 'result_handler')):
+        return 0
+    pending = [obj for obj in pending if obj.__dict__.get('_server') is server]
+    guids = list(dict.fromkeys(obj._guid for obj in pending))
+    response = connection.request_members(*guids)
+    for obj in pending:
+        obj._attr_cache = server.result_handler.handle_members_response(response["queries"][obj._guid], obj)
+    logger.debug("  Prefetched the members of %d objects in one request.", len(guids))
+    return len(pending)
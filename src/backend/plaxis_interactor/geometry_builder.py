@@ -10,25 +10,27 @@ to create or modify geometry in the PLAXIS model.
 
 import math
 import logging
-from typing import List, Callable, Any
-from ..models import SpudcanGeometry
+from dataclasses import dataclass, fields
+from typing import List, Callable, Any, Optional, Tuple
+from ..models import SpudcanGeometry, AnalysisControlParameters, LoadingConditions, SoilLayer, SpudcanLeg
 from ..exceptions import PlaxisConfigurationError # Import custom exception
+from .command_batch import CommandBatch
 
 logger = logging.getLogger(__name__)
 
-# --- Main Function to Generate Spudcan Geometry Callables ---
+SPUDCAN_VOLUME_NAME = "Spudcan_ConeVolume"
+
+def leg_object_name(base_name: str, leg_name: Optional[str] = None) -> str:
+    """PLAXIS object name for a leg; the plain base name is used for single-spudcan models."""
+    return f"{base_name}_{leg_name}" if leg_name else base_name
 
-def generate_spudcan_geometry_callables(spudcan_model: SpudcanGeometry) -> List[Callable[[Any], None]]:
+def _cone_dimensions(spudcan_model: SpudcanGeometry) -> Tuple[float, float]:
     """
-    Generates a list of Python callables to create the spudcan geometry in PLAXIS.
-    (Args and Returns are per original spec, assumptions also largely hold)
+    Returns (radius, height) of the spudcan cone.
+
     Raises:
-        PlaxisConfigurationError: If essential parameters are missing or invalid.
+        PlaxisConfigurationError: If the diameter or cone angle is missing or invalid.
     """
-    callables: List[Callable[[Any], None]] = []
-    logger.info(f"Generating spudcan geometry callables for diameter: {spudcan_model.diameter}, angle/height: {spudcan_model.height_cone_angle}")
-
-    # --- Input Validation ---
     if spudcan_model.diameter is None or spudcan_model.diameter <= 0:
         msg = "Spudcan diameter must be defined and positive."
         logger.error(msg)
@@ -40,19 +42,36 @@ def generate_spudcan_geometry_callables(spudcan_model: SpudcanGeometry) -> List[
         logger.error(msg)
         raise PlaxisConfigurationError(msg)
 
-    # --- Parameter Calculation ---
     radius = spudcan_model.diameter / 2.0
-    cone_angle_deg = spudcan_model.height_cone_angle
-    cone_angle_rad = math.radians(cone_angle_deg)
-    height = radius / math.tan(cone_angle_rad)
-    spudcan_volume_name = "Spudcan_ConeVolume"
+    height = radius / math.tan(math.radians(spudcan_model.height_cone_angle))
+    return radius, height
+
+# --- Main Function to Generate Spudcan Geometry Callables ---
+
+def generate_spudcan_geometry_callables(
+    spudcan_model: SpudcanGeometry,
+    base_center: Tuple[float, float, float] = (0,0,0),
+    volume_name: str = SPUDCAN_VOLUME_NAME
+) -> List[Callable[[Any], None]]:
+    """
+    Generates a list of Python callables to create the spudcan geometry in PLAXIS.
+    (Args and Returns are per original spec, assumptions also largely hold)
+    base_center and volume_name place and name the cone (used for multi-leg models).
+    Raises:
+        PlaxisConfigurationError: If essential parameters are missing or invalid.
+    """
+    callables: List[Callable[[Any], None]] = []
+    logger.info(f"Generating spudcan geometry callables for diameter: {spudcan_model.diameter}, angle/height: {spudcan_model.height_cone_angle}")
+
+    radius, height = _cone_dimensions(spudcan_model)
+    spudcan_volume_name = volume_name
 
     # --- Callable for Creating the Cone ---
     def create_cone_callable(g_i: Any) -> None:
         logger.info(f"API CALL: Creating cone for spudcan '{spudcan_volume_name}'.")
-        logger.debug(f"  Parameters: Radius={radius}, Height={height:.3f}, BaseCenter=(0,0,0), Axis=(0,0,-1)")
+        logger.debug("  Parameters: Radius=%s, Height=%.3f, BaseCenter=%s, Axis=(0,0,-1)", radius, height, base_center)
         try:
-            cone_objects = g_i.cone(radius, height, (0,0,0), (0,0,-1))
+            cone_objects = g_i.cone(radius, height, base_center, (0,0,-1))
             if not cone_objects: # Should ideally not happen if g_i.cone is successful
                 # This might indicate an issue with the PLAXIS environment or a very unusual API return
                 raise PlaxisConfigurationError("g_i.cone command did not return any objects, though no direct PlxScriptingError was raised.")
@@ -74,6 +93,346 @@ def generate_spudcan_geometry_callables(spudcan_model: SpudcanGeometry) -> List[
     return callables
 
 
+# --- Local Mesh Refinement Zone ---
+
+SPUDCAN_REFINEMENT_ZONE_NAME = "Spudcan_RefinementZone"
+
+def generate_refinement_zone_callables(
+    spudcan_model: SpudcanGeometry,
+    radius_factor: float = 1.0,
+    depth_factor: float = 1.5,
+    extra_depth: float = 0.0,
+    top_center: Tuple[float, float, float] = (0,0,0),
+    zone_name: str = SPUDCAN_REFINEMENT_ZONE_NAME
+) -> List[Callable[[Any], None]]:
+    """
+    Generates callables that create a soil cylinder around the spudcan used as a local
+    mesh refinement zone. The cylinder splits the soil volumes it intersects, so the
+    enclosed soil can be given a finer coarseness factor in mesh mode.
+
+    Args:
+        spudcan_model: Spudcan geometry; the zone is sized by its diameter.
+        radius_factor: Zone radius as a multiple of the spudcan diameter.
+        depth_factor: Zone depth below the seabed as a multiple of the spudcan diameter.
+        extra_depth: Additional depth (e.g. target penetration) added to the zone depth.
+        top_center: Centre of the cylinder top face on the seabed (the leg position).
+        zone_name: PLAXIS name of the zone volume.
+    Raises:
+        PlaxisConfigurationError: If the diameter or factors are missing or not positive.
+    """
+    if spudcan_model.diameter is None or spudcan_model.diameter <= 0:
+        msg = "Spudcan diameter must be defined and positive to size the refinement zone."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+    if radius_factor <= 0 or depth_factor <= 0:
+        msg = f"Refinement zone factors must be positive (radius_factor={radius_factor}, depth_factor={depth_factor})."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+
+    zone_radius = radius_factor * spudcan_model.diameter
+    zone_depth = depth_factor * spudcan_model.diameter + max(extra_depth, 0.0)
+
+    def create_refinement_zone_callable(g_i: Any) -> None:
+        logger.info(f"API CALL: Creating refinement zone '{zone_name}'.")
+        logger.debug("  Parameters: Radius=%.3f, Depth=%.3f, TopCenter=%s, Axis=(0,0,-1)", zone_radius, zone_depth, top_center)
+        try:
+            cylinder_objects = g_i.cylinder(zone_radius, zone_depth, top_center, (0,0,-1))
+            if not cylinder_objects:
+                raise PlaxisConfigurationError("g_i.cylinder command did not return any objects for the refinement zone.")
+            g_i.rename(cylinder_objects[0], zone_name)
+            logger.info(f"  Refinement zone created and renamed to '{zone_name}'.")
+        except Exception as e: # Catch PlxScriptingError or other Python errors
+            logger.error(f"ERROR during refinement zone creation: {e}", exc_info=True)
+            raise
+
+    logger.info(f"Generated refinement zone callable (R={zone_radius:.2f} m, depth={zone_depth:.2f} m).")
+    return [create_refinement_zone_callable]
+
+
+def generate_spudcan_refinement_callables(
+    spudcan_model: SpudcanGeometry,
+    control_model: AnalysisControlParameters,
+    loading_model: Optional[LoadingConditions] = None,
+    legs: Optional[List[SpudcanLeg]] = None
+) -> List[Callable[[Any], None]]:
+    """
+    Returns the refinement zone callables configured by `control_model`, or an empty
+    list if `meshing_refinement_spudcan` is off. The zone extends below the target
+    penetration when the analysis is penetration controlled. With `legs`, one zone is
+    created around each leg.
+    """
+    if not control_model.meshing_refinement_spudcan:
+        return []
+    target_depth = 0.0
+    if loading_model and loading_model.target_type == "penetration" and loading_model.target_penetration_or_load:
+        target_depth = abs(loading_model.target_penetration_or_load)
+    if not legs:
+        return generate_refinement_zone_callables(
+            spudcan_model,
+            radius_factor=control_model.refinement_zone_radius_factor or 1.0,
+            depth_factor=control_model.refinement_zone_depth_factor or 1.5,
+            extra_depth=target_depth)
+    callables: List[Callable[[Any], None]] = []
+    for leg in legs:
+        callables += generate_refinement_zone_callables(
+            leg.spudcan or spudcan_model,
+            radius_factor=control_model.refinement_zone_radius_factor or 1.0,
+            depth_factor=control_model.refinement_zone_depth_factor or 1.5,
+            extra_depth=target_depth,
+            top_center=(leg.x, leg.y, 0),
+            zone_name=leg_object_name(SPUDCAN_REFINEMENT_ZONE_NAME, leg.name))
+    return callables
+
+
+# --- Multi-Leg Spudcans ---
+
+def validate_legs(legs: List[SpudcanLeg]) -> None:
+    """
+    Checks that leg names are unique and non-empty (they become PLAXIS object name suffixes).
+
+    Raises:
+        PlaxisConfigurationError: On empty or duplicate leg names.
+    """
+    names = [leg.name for leg in legs]
+    if any(not name for name in names) or len(set(names)) != len(names):
+        msg = f"Leg names must be unique and non-empty, got {names}."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+
+
+def generate_multi_leg_geometry_callables(
+    legs: List[SpudcanLeg],
+    default_spudcan: SpudcanGeometry
+) -> List[Callable[[Any], None]]:
+    """
+    Generates a single callable that creates the spudcan cones of all legs in two command
+    batches (see `command_batch.CommandBatch`): the cones of all legs in one request, then
+    their renames in another. Each cone is named `Spudcan_ConeVolume_<leg name>` and placed
+    with its tip at (x, y, 0). A leg without its own geometry uses `default_spudcan`.
+
+    Raises:
+        PlaxisConfigurationError: If a leg geometry is invalid or leg names are not unique.
+    """
+    validate_legs(legs)
+    leg_cones = [(_cone_dimensions(leg.spudcan or default_spudcan), (leg.x, leg.y, 0),
+                  leg_object_name(SPUDCAN_VOLUME_NAME, leg.name)) for leg in legs]
+
+    def create_leg_cones_callable(g_i: Any) -> None:
+        logger.info(f"API CALL: Creating spudcan cones for {len(legs)} legs.")
+        batch = CommandBatch(g_i)
+        try:
+            for (radius, height), base_center, _ in leg_cones:
+                batch.add("cone", radius, height, base_center, (0,0,-1))
+            cone_results = batch.execute()
+            for cone_objects, (_, _, volume_name) in zip(cone_results, leg_cones):
+                if not cone_objects:
+                    raise PlaxisConfigurationError(f"g_i.cone command did not return any objects for '{volume_name}'.")
+                batch.add("rename", cone_objects[0], volume_name)
+            batch.execute()
+            logger.info(f"  Leg cones created{' (pipelined)' if batch.pipelined else ''}: {[cone[2] for cone in leg_cones]}")
+        except Exception as e: # Catch PlxScriptingError or other Python errors
+            logger.error(f"ERROR during leg cone creation: {e}", exc_info=True)
+            raise
+
+    logger.info(f"Generated batched geometry callable for legs {[leg.name for leg in legs]}.")
+    return [create_leg_cones_callable]
+
+
+# --- Model Domain Sizing ---
+
+@dataclass
+class ModelDomain:
+    """
+    Plan extents and depth of the soil model. Coordinates in meters, z positive upwards
+    with the seabed at z=0 and the spudcan axis along x=0, y=0.
+    """
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+    bottom_z: float                 # Model bottom elevation (negative).
+    quarter_symmetry: bool = False  # True if only the x>=0, y>=0 quadrant is modelled.
+
+    @property
+    def depth(self) -> float:
+        return -self.bottom_z
+
+
+VERTICAL_LOADING_FIELDS = ("vertical_preload", "target_penetration_or_load", "target_type")
+
+def is_vertical_only_loading(loading_model: Optional[LoadingConditions]) -> bool:
+    """
+    True if the spudcan is loaded purely vertically along its axis, which makes the
+    problem symmetric about the x=0 and y=0 planes. The fields of LoadingConditions
+    (VERTICAL_LOADING_FIELDS) are all vertical; any other non-zero field of the loading
+    model, such as a horizontal load or moment, breaks that symmetry.
+    """
+    if loading_model is None:
+        return True
+    for loading_field in fields(loading_model):
+        if loading_field.name not in VERTICAL_LOADING_FIELDS and getattr(loading_model, loading_field.name):
+            return False
+    return True
+
+
+SYMMETRY_MODES = {"full": 1.0, "quarter": 4.0} # Mode -> factor from modelled part to the full spudcan.
+
+def get_symmetry_factor(
+    control_model: AnalysisControlParameters,
+    loading_model: Optional[LoadingConditions] = None,
+    legs: Optional[List[SpudcanLeg]] = None
+) -> float:
+    """
+    Returns the ratio between the full spudcan and the modelled part (4.0 for a quarter
+    model, 1.0 otherwise). Quarter symmetry is only used for vertical-only loading of a
+    single spudcan on the origin; otherwise the full model is used and a warning is logged.
+
+    Raises:
+        PlaxisConfigurationError: If `control_model.symmetry` is not a known mode.
+    """
+    mode = (control_model.symmetry or "full").lower()
+    if mode not in SYMMETRY_MODES:
+        msg = f"Unknown symmetry mode '{control_model.symmetry}'. Must be one of {list(SYMMETRY_MODES)}."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+    if mode == "quarter" and not is_vertical_only_loading(loading_model):
+        logger.warning("Quarter symmetry requested but loading is not vertical-only; using the full model.")
+        return 1.0
+    if mode == "quarter" and legs and (len(legs) > 1 or legs[0].x != 0 or legs[0].y != 0):
+        logger.warning("Quarter symmetry requested for a multi-leg model; using the full model.")
+        return 1.0
+    return SYMMETRY_MODES[mode]
+
+
+def compute_model_domain(
+    spudcan_model: SpudcanGeometry,
+    loading_model: Optional[LoadingConditions],
+    soil_layers: List[SoilLayer],
+    control_model: AnalysisControlParameters,
+    legs: Optional[List[SpudcanLeg]] = None
+) -> Optional[ModelDomain]:
+    """
+    Derives the model extents from the spudcan diameter, target penetration and the
+    stratigraphy thickness, instead of relying on the (often much larger) PLAXIS default.
+
+    Lateral boundaries are placed `domain_lateral_factor` diameters from the spudcan axis.
+    The bottom is `domain_depth_factor` diameters below the target penetration (or below
+    the seabed for load-controlled runs), capped at the bottom of the stratigraphy.
+    With `legs`, the plan extents enclose every leg and the largest leg diameter is used.
+    With quarter symmetry (see `get_symmetry_factor`), only the x>=0, y>=0 quadrant is
+    modelled. The spudcan and refinement zone are still created as full solids: PLAXIS
+    only meshes the geometry inside the soil contour, so the contour through the spudcan
+    axis cuts them to exactly one quarter (plan area and volume). The default deformation
+    boundary conditions (normally fixed at x_min and y_min) are the symmetry conditions.
+    The spudcan plan area inside the domain is checked against the symmetry factor (see
+    `plan_area_fraction_in_domain`), so forces scaled back by that factor match the model.
+
+    Returns:
+        The ModelDomain, or None if `domain_auto_size` is off.
+    Raises:
+        PlaxisConfigurationError: If the diameter, factors or layer thicknesses are invalid,
+                                  quarter symmetry is requested without domain sizing, or the
+                                  domain cuts off more of a spudcan than the symmetry accounts for.
+    """
+    quarter = get_symmetry_factor(control_model, loading_model, legs) == SYMMETRY_MODES["quarter"]
+    if not control_model.domain_auto_size:
+        if quarter:
+            msg = "Quarter symmetry requires 'domain_auto_size' to place the symmetry planes at x=0 and y=0."
+            logger.error(msg)
+            raise PlaxisConfigurationError(msg)
+        return None
+    leg_spudcans = [leg.spudcan or spudcan_model for leg in legs] if legs else [spudcan_model]
+    if any(spudcan.diameter is None or spudcan.diameter <= 0 for spudcan in leg_spudcans):
+        msg = "Spudcan diameter must be defined and positive to size the model domain."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+
+    lateral_factor = control_model.domain_lateral_factor or 5.0
+    depth_factor = control_model.domain_depth_factor or 4.0
+    if lateral_factor <= 0 or depth_factor <= 0:
+        msg = f"Model domain factors must be positive (lateral_factor={lateral_factor}, depth_factor={depth_factor})."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+    if any(layer.thickness is None or layer.thickness <= 0 for layer in soil_layers):
+        msg = "All soil layers need a positive thickness to size the model domain."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+
+    diameter = max(spudcan.diameter for spudcan in leg_spudcans)
+    leg_xs = [leg.x for leg in legs] if legs else [0.0]
+    leg_ys = [leg.y for leg in legs] if legs else [0.0]
+    target_depth = 0.0
+    if loading_model and loading_model.target_type == "penetration" and loading_model.target_penetration_or_load:
+        target_depth = abs(loading_model.target_penetration_or_load)
+
+    half_width = lateral_factor * diameter
+    required_depth = target_depth + depth_factor * diameter
+    stratigraphy_depth = sum(layer.thickness for layer in soil_layers)
+    depth = min(required_depth, stratigraphy_depth) if stratigraphy_depth > 0 else required_depth
+    if 0 < stratigraphy_depth < required_depth:
+        logger.warning(f"Stratigraphy depth ({stratigraphy_depth:.2f} m) is less than the recommended model depth "
+                       f"({required_depth:.2f} m); the model bottom is set at the base of the stratigraphy.")
+
+    domain = ModelDomain(
+        x_min=0.0 if quarter else min(leg_xs) - half_width, x_max=max(leg_xs) + half_width,
+        y_min=0.0 if quarter else min(leg_ys) - half_width, y_max=max(leg_ys) + half_width,
+        bottom_z=-depth, quarter_symmetry=quarter)
+    expected_fraction = 1.0 / SYMMETRY_MODES["quarter" if quarter else "full"]
+    for spudcan, center in zip(leg_spudcans, zip(leg_xs, leg_ys)):
+        fraction = plan_area_fraction_in_domain(domain, center, spudcan.diameter / 2.0)
+        if abs(fraction - expected_fraction) > 1e-3:
+            msg = (f"The model domain contains {fraction:.3f} of the spudcan at {center} instead of {expected_fraction:.3f}; "
+                   f"increase 'domain_lateral_factor' ({lateral_factor}).")
+            logger.error(msg)
+            raise PlaxisConfigurationError(msg)
+    logger.info(f"Model domain: x=[{domain.x_min:.2f}, {domain.x_max:.2f}], y=[{domain.y_min:.2f}, {domain.y_max:.2f}], "
+                f"depth={domain.depth:.2f} m{' (quarter symmetry)' if quarter else ''}.")
+    return domain
+
+
+def plan_area_fraction_in_domain(domain: ModelDomain, center: Tuple[float, float], radius: float,
+                                 n_strips: int = 2000) -> float:
+    """
+    Fraction of the plan area of a circle (a spudcan of `radius` at `center`) that lies
+    inside the domain extents. For a cut through the spudcan axis, as with quarter
+    symmetry, this is also the fraction of its volume that is modelled.
+    Integrated over `n_strips` strips parallel to the y axis.
+    """
+    cx, cy = center
+    x_lo, x_hi = max(cx - radius, domain.x_min), min(cx + radius, domain.x_max)
+    if x_hi <= x_lo or radius <= 0:
+        return 0.0
+    width = (x_hi - x_lo) / n_strips
+    area = 0.0
+    for i in range(n_strips):
+        x = x_lo + (i + 0.5) * width
+        half_chord = math.sqrt(max(radius ** 2 - (x - cx) ** 2, 0.0))
+        area += max(min(cy + half_chord, domain.y_max) - max(cy - half_chord, domain.y_min), 0.0) * width
+    return area / (math.pi * radius ** 2)
+
+
+def generate_model_domain_callables(domain: Optional[ModelDomain]) -> List[Callable[[Any], None]]:
+    """
+    Generates the callable that sets the rectangular soil contour to the domain extents.
+    Must run before the boreholes are created. Returns an empty list if `domain` is None.
+    """
+    if domain is None:
+        return []
+
+    def set_soil_contour_callable(g_i: Any) -> None:
+        logger.info("API CALL: Setting rectangular soil contour.")
+        logger.debug("  Parameters: xmin=%.3f, ymin=%.3f, xmax=%.3f, ymax=%.3f", domain.x_min, domain.y_min, domain.x_max, domain.y_max)
+        try:
+            g_i.gotosoil()
+            g_i.SoilContour.initializerectangular(domain.x_min, domain.y_min, domain.x_max, domain.y_max)
+            logger.info("  Soil contour set.")
+        except Exception as e: # Catch PlxScriptingError or other Python errors
+            logger.error(f"ERROR during soil contour definition: {e}", exc_info=True)
+            raise
+
+    return [set_soil_contour_callable]
+
+
 # --- Example Usage (for testing this module directly) ---
 if __name__ == '__main__':
     logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
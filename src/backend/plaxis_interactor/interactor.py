@@ -13,15 +13,24 @@ PRD Ref: Tasks 3.7 (PLAXIS Process Execution & Monitoring), 3.9 (Error Mapping)
 import os
 import re
 import logging
+import functools
+import contextlib
 from typing import List, Dict, Any, Optional, Callable, Tuple
 import subprocess
 import time # For potential timeouts or delays if ever needed
+import threading
 
 from ..exceptions import (
     PlaxisAutomationError, PlaxisConnectionError, PlaxisConfigurationError,
     PlaxisCalculationError, PlaxisOutputError, PlaxisCliError
 )
 from ..models import ProjectSettings # For type hinting project_settings
+from ..run_trace import RunTracer
+from .session_replay import SessionRecorder
+from .retry_policy import RetryPolicy, RetryStats, attach_retry_policy, breaker_for, wait_for_server
+from . import live_curve
+from .geometry_builder import get_symmetry_factor
+from .model_setup import plaxis_project_path
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +53,9 @@ except ImportError:
 try:
     from plxscripting.easy import new_server
     from plxscripting.plx_scripting_exceptions import PlxScriptingError
+    _plxscripting_available = True
 except ImportError:
+    _plxscripting_available = False
     logger.warning("plxscripting library not found. PlaxisInteractor will not be able to connect to PLAXIS API.")
     class PlxScriptingError(Exception): # type: ignore
         """Placeholder for PlxScriptingError if plxscripting library is not available."""
@@ -145,6 +156,17 @@ def _map_plaxis_sdk_exception_to_custom(e: Exception, context: str = "PLAXIS ope
     return PlaxisAutomationError(f"An unexpected Python error ({type(e).__name__}) occurred during {context}: {e}")
 
 
+def _traced_stage(stage_name: str):
+    """Records the decorated PlaxisInteractor method as a stage span of the interactor's tracer."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._span(stage_name, "stage"):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class PlaxisInteractor:
     """
     Manages interaction with PLAXIS for model setup, calculation, and result extraction.
@@ -162,14 +184,23 @@ class PlaxisInteractor:
         s_o (Optional[Any]): PLAXIS output server object.
         g_o (Optional[Any]): PLAXIS output global object.
         signals (InteractorSignals): Qt signals for progress and stage updates.
+        tracer (Optional[RunTracer]): Records stage and command spans (with PLAXIS request counts) if set.
+        recorder (Optional[SessionRecorder]): Records the PLAXIS API traffic for later replay if set.
+        retry_policy (RetryPolicy): Retries, backoff and circuit breaking of the PLAXIS API requests.
+        retry_stats (RetryStats): Counters of `retry_policy` (also recorded on the tracer's spans).
     """
-    def __init__(self, plaxis_path: Optional[str] = None, project_settings: Optional[ProjectSettings] = None):
+    def __init__(self, plaxis_path: Optional[str] = None, project_settings: Optional[ProjectSettings] = None,
+                 tracer: Optional[RunTracer] = None, recorder: Optional[SessionRecorder] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
         """
         Initializes the PlaxisInteractor.
 
         Args:
             plaxis_path: Path to the PLAXIS input executable.
             project_settings: Project settings containing model data and API configurations.
+            tracer: Optional run tracer for per-stage/per-command timings (see run_trace).
+            recorder: Optional recorder of the Input/Output API sessions (see session_replay).
+            retry_policy: Retry/backoff policy for API requests (see retry_policy); defaults to `RetryPolicy()`.
         """
         self.plaxis_path: Optional[str] = plaxis_path
         self.project_settings: Optional[ProjectSettings] = project_settings
@@ -177,10 +208,17 @@ class PlaxisInteractor:
         self.g_i: Optional[Any] = None
         self.s_o: Optional[Any] = None
         self.g_o: Optional[Any] = None
+        self._live_curve_s_o: Optional[Any] = None # Output connection of the live curve fetcher.
+        self._live_curve_lock = threading.Lock()
+        self._calculation_file_saved = threading.Event() # Set once the project being calculated is on disk.
         self._default_input_port: int = 10000
         self._default_output_port: int = 10001
         self._default_api_password: str = "YOUR_API_PASSWORD"
         self.plaxis_process: Optional[subprocess.Popen] = None
+        self.tracer: Optional[RunTracer] = tracer
+        self.recorder: Optional[SessionRecorder] = recorder
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.retry_stats: RetryStats = RetryStats(tracer)
 
         self.signals = PlaxisInteractor.InteractorSignals()
 
@@ -191,6 +229,24 @@ class PlaxisInteractor:
         analysis_stage_changed = Signal(str)
         progress_updated = Signal(int, int)
 
+    def _span(self, name: str, kind: str, **attrs: Any):
+        """Span of `self.tracer`, or a no-op context when tracing is off."""
+        if self.tracer is None:
+            return contextlib.nullcontext()
+        return self.tracer.span(name, kind, **attrs)
+
+    def _new_server(self, host: str, port: int, password: str) -> Tuple[Any, Any]:
+        """
+        `new_server` with the interactor's hooks (session recorder, tracer, retry policy)
+        attached to the connection. Waits for the port with backoff first, so plxscripting's
+        own 0.1 s polling loop finds the server up.
+        """
+        if _plxscripting_available and not wait_for_server(host, port, self.retry_policy, self.retry_stats):
+            logger.warning(f"PLAXIS API port {host}:{port} not reachable after {self.retry_policy.connect_timeout_s} s.")
+        server, global_object = new_server(host, port, password=password)
+        attach_retry_policy(server, self.retry_policy, breaker_for(host, port), self.retry_stats)
+        return server, global_object
+
     def _get_api_credentials(self) -> Tuple[str, int, int, str]:
         """
         Retrieves API connection credentials (host, ports, password).
@@ -232,7 +288,11 @@ class PlaxisInteractor:
         host, input_port, _, password = self._get_api_credentials()
         logger.info(f"Attempting to connect to PLAXIS Input API on {host}:{input_port}...")
         try:
-            self.s_i, self.g_i = new_server(host, input_port, password=password)
+            self.s_i, self.g_i = self._new_server(host, input_port, password=password)
+            if self.recorder:
+                self.recorder.attach(self.s_i, "input")
+            if self.tracer:
+                self.tracer.attach_connection(self.s_i)
             project_title_value = self.g_i.Project.Title.value # Verify connection with a command
             logger.info(f"Successfully connected to PLAXIS Input API. Current project title: '{project_title_value}'.")
         except Exception as e:
@@ -266,7 +326,11 @@ class PlaxisInteractor:
         host, _, output_port, password = self._get_api_credentials()
         logger.info(f"Attempting to connect to PLAXIS Output API on {host}:{output_port}...")
         try:
-            self.s_o, self.g_o = new_server(host, output_port, password=password)
+            self.s_o, self.g_o = self._new_server(host, output_port, password=password)
+            if self.recorder:
+                self.recorder.attach(self.s_o, "output")
+            if self.tracer:
+                self.tracer.attach_connection(self.s_o)
             _ = self.g_o.ResultTypes # Verify connection
             logger.info(f"Successfully connected to PLAXIS Output API on {host}:{output_port}.")
 
@@ -422,18 +486,22 @@ class PlaxisInteractor:
             raise PlaxisConnectionError(f"{server_name} global object (g_i/g_o) is not available for executing API commands.")
 
         logger.info(f"Executing {len(commands)} API commands on {server_name} server...")
-        for i, cmd_callable in enumerate(commands):
-            # Try to get a meaningful name for the callable for logging
-            command_name = getattr(cmd_callable, '__name__', f"lambda_or_partial_cmd_at_index_{i+1}")
-            logger.debug(f"  Executing API command {i+1}/{len(commands)}: {command_name}")
-            try:
-                cmd_callable(server_global_object)
-            except Exception as e: # Catch PlxScriptingError or other Python errors from the callable
-                # Map to our custom exception hierarchy for consistent error handling upstream
-                raise _map_plaxis_sdk_exception_to_custom(e, f"executing API command '{command_name}' on {server_name}")
+        with self._span(server_name, "group", commands=len(commands)):
+            for i, cmd_callable in enumerate(commands):
+                # Try to get a meaningful name for the callable for logging
+                command_name = getattr(cmd_callable, '__name__', f"lambda_or_partial_cmd_at_index_{i+1}")
+                logger.debug("  Executing API command %d/%d: %s", i + 1, len(commands), command_name)
+                try:
+                    with self._span(command_name, "command"):
+                        cmd_callable(server_global_object)
+                except Exception as e: # Catch PlxScriptingError or other Python errors from the callable
+                    # Map to our custom exception hierarchy for consistent error handling upstream
+                    raise _map_plaxis_sdk_exception_to_custom(e, f"executing API command '{command_name}' on {server_name}")
         logger.info(f"Successfully executed all {len(commands)} API commands on {server_name} server.")
 
-    def setup_model_in_plaxis(self, model_setup_callables: List[Callable[[Any], None]], is_new_project: bool = True) -> None:
+    @_traced_stage("setup")
+    def setup_model_in_plaxis(self, model_setup_callables: List[Callable[[Any], None]], is_new_project: bool = True,
+                              template_path: Optional[str] = None) -> None:
         """
         Sets up the PLAXIS model using a list of command callables on the Input server (g_i).
         Handles project creation (new or open) and execution of model definition commands.
@@ -442,6 +510,11 @@ class PlaxisInteractor:
             model_setup_callables: List of callables that define the model (geometry, soil, etc.).
             is_new_project: If True, creates a new PLAXIS project. If False, attempts to open
                             an existing project based on `project_settings.project_file_path`.
+            template_path: Optional path to a meshed base project from the mesh template cache.
+                           When given, it is opened instead of creating/opening the project and
+                           `model_setup_callables` are expected to only re-apply run-specific data.
+                           The template is saved under the project file right after opening, so
+                           the cached file itself is never modified.
 
         Raises:
             PlaxisConfigurationError: If project_settings are missing or project file issues.
@@ -453,11 +526,25 @@ class PlaxisInteractor:
 
         self.signals.analysis_stage_changed.emit("setup_start")
         self.signals.progress_updated.emit(1, 4) # Example progress update
+        self._calculation_file_saved.clear()
 
-        self._connect_to_input_server() # Ensures g_i is available
+        with self._span("connect_input", "command"):
+            self._connect_to_input_server() # Ensures g_i is available
         logger.info(f"Setting up PLAXIS model via API. New project: {is_new_project}")
 
-        if is_new_project:
+        if template_path:
+            if not os.path.exists(template_path):
+                raise PlaxisConfigurationError(f"Mesh template project does not exist: '{template_path}'")
+            if not self.s_i or not hasattr(self.s_i, 'open'):
+                 raise PlaxisConnectionError("Input server object (s_i) unavailable or lacks 'open' method for opening mesh template.")
+            try:
+                logger.info(f"Opening mesh template '{template_path}' (remeshing will be skipped).")
+                with self._span("open_mesh_template", "command"):
+                    self.s_i.open(template_path) # type: ignore
+            except Exception as e:
+                raise _map_plaxis_sdk_exception_to_custom(e, f"opening mesh template '{template_path}'")
+            self._save_project_as(plaxis_project_path(self.project_settings), "Save Template As Project")
+        elif is_new_project:
             initial_api_commands: List[Callable[[Any], None]] = [lambda gi_param: gi_param.new()]
             if self.project_settings.project_name:
                  initial_api_commands.append(lambda gi_param: gi_param.settitle(self.project_settings.project_name))
@@ -486,11 +573,14 @@ class PlaxisInteractor:
         self.signals.analysis_stage_changed.emit("setup_end")
 
 
+    @_traced_stage("calculation")
     def run_calculation(self, calculation_run_callables: List[Callable[[Any], None]]) -> None:
         """
         Runs the PLAXIS calculation sequence using command callables on the Input server (g_i).
         This typically includes meshing, setting up calculation phases, and executing `g_i.calculate()`.
-        Also attempts to save the project after calculation.
+        The project is saved to its project file before the sequence, so PLAXIS calculates into
+        that file and Output (e.g. the live curve fetcher) can open it during the calculation,
+        and saved again afterwards.
 
         Args:
             calculation_run_callables: List of callables that define and run the calculation.
@@ -508,37 +598,37 @@ class PlaxisInteractor:
         self.signals.analysis_stage_changed.emit("calculation_start")
         self.signals.progress_updated.emit(2, 4) # Example progress
 
+        project_save_path = plaxis_project_path(self.project_settings)
+        if not getattr(self.project_settings, 'project_file_path', None):
+            logger.warning(f"`project_file_path` not set in ProjectSettings. Saving to default: {project_save_path}")
+        self._save_project_as(project_save_path, "Save Project")
+        self._calculation_file_saved.set()
+
         logger.info("Running PLAXIS calculation sequence via API...")
         self._execute_api_commands(calculation_run_callables, self.g_i, "Input (g_i) - Calculation Sequence")
         logger.info("Calculation sequence (including g_i.calculate() if present) reported success by PLAXIS.")
         self.signals.analysis_stage_changed.emit("calculation_end")
 
         # Attempt to save project after calculation
-        project_save_path = self.project_settings.project_file_path
-        if not project_save_path: # If no path was set (e.g. for a new unsaved project)
-            default_filename = (self.project_settings.project_name or "UntitledPlaxisProject") + ".p3dxml" # Or .p2dxml
-            # Save in current working directory or a configured output directory
-            project_save_path = os.path.join(os.getcwd(), default_filename)
-            logger.warning(f"`project_file_path` not set in ProjectSettings. Attempting to save to default: {project_save_path}")
-            # Optionally update project_settings with this path if save is successful
-            # self.project_settings.project_file_path = project_save_path
-
         logger.info(f"Attempting to save project to '{project_save_path}' after calculation...")
-        if self.g_i and hasattr(self.g_i, 'save') and callable(self.g_i.save):
-            save_cmd_callable: Callable[[Any], None] = lambda gi_param: gi_param.save(project_save_path)
-            try:
-                self._execute_api_commands([save_cmd_callable], self.g_i, "Input (g_i) - Save Project")
-                logger.info(f"Project successfully saved to '{project_save_path}' after calculation.")
-                # Update project_settings if it was a default path
-                if not self.project_settings.project_file_path:
-                     self.project_settings.project_file_path = project_save_path
-            except PlaxisAutomationError as e_save: # Catch errors during save
-               logger.warning(f"Failed to save project to '{project_save_path}' after calculation: {e_save}", exc_info=True)
-               # Decide if this should re-raise or just be a warning
-        else:
-            logger.warning("`g_i.save` method not available or not callable. Cannot save project after calculation.")
+        try:
+            self._save_project_as(project_save_path, "Save Project")
+            logger.info(f"Project successfully saved to '{project_save_path}' after calculation.")
+        except PlaxisAutomationError as e_save: # Catch errors during save
+            logger.warning(f"Failed to save project to '{project_save_path}' after calculation: {e_save}", exc_info=True)
         logger.info("PLAXIS calculation and subsequent save attempt finished.")
 
+    def _save_project_as(self, project_path: str, context: str) -> None:
+        """
+        Saves the open Input project to `project_path` and records it as the project file.
+        `g_i.save(path)` acts as save-as: later edits and the calculation go to that file.
+        """
+        def save_project_callable(gi_param: Any) -> None:
+            gi_param.save(project_path)
+        self._execute_api_commands([save_project_callable], self.g_i, f"Input (g_i) - {context}")
+        self.project_settings.project_file_path = project_path
+
+    @_traced_stage("results")
     def extract_results(self, results_extraction_callables: List[Callable[[Any, Optional[Any]], Any]]) -> List[Any]:
         """
         Extracts results from PLAXIS Output using a list of command callables.
@@ -566,7 +656,8 @@ class PlaxisInteractor:
         if not os.path.exists(calculated_project_path):
             raise PlaxisOutputError(f"Calculated project file for results not found: {calculated_project_path}")
 
-        self._connect_to_output_server(project_file_to_open=calculated_project_path) # Ensures g_o is available
+        with self._span("open_output_project", "command"):
+            self._connect_to_output_server(project_file_to_open=calculated_project_path) # Ensures g_o is available
         logger.info(f"Extracting results via API from PLAXIS Output for project: {calculated_project_path}")
 
         extracted_data_list: List[Any] = []
@@ -576,9 +667,10 @@ class PlaxisInteractor:
         for i, cmd_callable in enumerate(results_extraction_callables):
             command_name = getattr(cmd_callable, '__name__', f"lambda_or_partial_res_cmd_at_index_{i+1}")
             try:
-                logger.debug(f"  Executing result extraction command {i+1}/{len(results_extraction_callables)}: {command_name}")
+                logger.debug("  Executing result extraction command %d/%d: %s", i + 1, len(results_extraction_callables), command_name)
                 # Pass g_i as well, in case the result callable needs context from input model (e.g. for get_equivalent)
-                result_piece = cmd_callable(self.g_o, self.g_i)
+                with self._span(command_name, "command"):
+                    result_piece = cmd_callable(self.g_o, self.g_i)
                 extracted_data_list.append(result_piece)
             except Exception as e: # Catch errors from individual result callables
                 logger.error(f"Result extraction command '{command_name}' failed: {e}", exc_info=True)
@@ -591,6 +683,69 @@ class PlaxisInteractor:
         self.signals.progress_updated.emit(4, 4) # Example progress
         return extracted_data_list
 
+    def create_live_curve_fetcher(self) -> Optional[Callable[[int], Tuple[List[Tuple[float, float]], int]]]:
+        """
+        Returns a step fetcher for the live load-penetration curve (see live_curve.py),
+        or None without project settings.
+
+        The fetcher opens the project file `run_calculation` saved right before calculating,
+        i.e. the file PLAXIS is calculating into. Until that save, polls raise (and are
+        retried), so a stale file of a previous run is never shown. As in the final results,
+        the curve of the last phase is shown.
+
+        The fetcher uses its own Output connection, opened on the first poll, because
+        the Input connection is blocked in `calculate()` while polling runs. For the same
+        reason the spudcan is looked up by its Output name rather than via `g_i.get_equivalent`.
+        Close that connection with `close_live_curve_connection` once polling has stopped.
+
+        Loads are scaled to the full spudcan like `results_parser.compile_analysis_results`
+        does, so a quarter-symmetry model plots the same loads live and in the final results.
+        """
+        if not self.project_settings:
+            logger.info("No project settings; live load-penetration curve is not available for this run.")
+            return None
+        output_name = getattr(self.project_settings.spudcan, 'plaxis_output_name', "Spudcan")
+        symmetry_factor = get_symmetry_factor(self.project_settings.analysis_control, self.project_settings.loading,
+                                              self.project_settings.legs)
+        state: Dict[str, Any] = {}
+
+        def fetch(first_step: int) -> Tuple[List[Tuple[float, float]], int]:
+            if 'fetch' not in state:
+                if not self._calculation_file_saved.is_set():
+                    raise LookupError("The project has not been saved for this calculation yet.")
+                project_path = self.project_settings.project_file_path
+                with self._live_curve_lock:
+                    host, _, output_port, password = self._get_api_credentials()
+                    s_o, g_o = self._new_server(host, output_port, password=password)
+                    self._live_curve_s_o = s_o
+                    s_o.open(project_path) # type: ignore
+                    state['fetch'] = live_curve.make_output_step_fetcher(g_o, None, None, output_name)
+                logger.info(f"Live curve polling connected to PLAXIS Output on {host}:{output_port}.")
+            points, next_step = state['fetch'](first_step)
+            if symmetry_factor != 1.0:
+                points = [(penetration, load * symmetry_factor) for penetration, load in points]
+            return points, next_step
+
+        return fetch
+
+    def close_live_curve_connection(self) -> None:
+        """Closes the project and the HTTP session of the live curve fetcher's Output connection, if opened."""
+        with self._live_curve_lock:
+            s_o, self._live_curve_s_o = self._live_curve_s_o, None
+        if s_o is None:
+            return
+        try:
+            s_o.close() # Closes the project view the poller opened in Output.
+        except Exception as e:
+            logger.debug(f"Live curve Output connection: closing the project failed: {e}")
+        session = getattr(getattr(s_o, 'connection', None), 'session', None)
+        if session is not None:
+            try:
+                session.close()
+            except Exception as e:
+                logger.debug(f"Live curve Output connection: closing the HTTP session failed: {e}")
+        logger.info("Live curve Output connection closed.")
+
     def close_all_connections(self) -> None:
         """
         Cleans up by nullifying server/global objects and attempting to terminate
@@ -598,6 +753,8 @@ class PlaxisInteractor:
         """
         logger.info("Attempting to close all PLAXIS connections and processes initiated by this interactor...")
 
+        self.close_live_curve_connection()
+
         # Nullify API objects
         if self.s_i or self.g_i:
             logger.info("Nullifying Input server objects (s_i, g_i). Actual server may remain running if started externally.")
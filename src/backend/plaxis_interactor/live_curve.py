@@ -0,0 +1,186 @@
+"""
+Live load-penetration curve during a calculation.
+
+While `g_i.calculate()` blocks the analysis thread, a `LiveCurvePoller` thread
+reads the spudcan displacement and reaction of newly stored steps from PLAXIS
+Output and appends them to a `CurveRingBuffer`. The GUI drains the buffer with a
+cursor (`read_since`) and extends its plot incrementally, so engineers can see
+divergence or punch-through early and stop the calculation.
+
+Polling is best-effort: a failed poll (Output busy, step not written yet) is
+logged and retried on the next tick and never affects the calculation itself.
+The fetch function is injected, so the polling logic is testable without PLAXIS.
+"""
+
+import threading
+import logging
+from collections import deque
+from typing import List, Tuple, Callable, Any, Optional
+
+from .results_parser import find_output_reference_object
+
+logger = logging.getLogger(__name__)
+
+CurvePoint = Tuple[float, float] # (penetration, load)
+# fetch(first_step_index) -> (points of the new steps, index of the next unread step)
+StepFetcher = Callable[[int], Tuple[List[CurvePoint], int]]
+
+DEFAULT_LIVE_CURVE_CAPACITY = 20000
+DEFAULT_POLL_INTERVAL = 2.0 # Seconds
+
+
+class CurveRingBuffer:
+    """
+    Thread-safe, fixed-capacity buffer of curve points.
+
+    Points are numbered by a running sequence number, so readers can fetch only
+    what was appended since their last read. When the capacity is exceeded the
+    oldest points are dropped; a reader that fell behind resumes at the oldest
+    point still held.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LIVE_CURVE_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("CurveRingBuffer capacity must be positive.")
+        self.capacity = capacity
+        self._points: deque = deque(maxlen=capacity)
+        self._total = 0 # Number of points ever appended.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._points)
+
+    @property
+    def total(self) -> int:
+        """Sequence number of the next point (number of points ever appended)."""
+        with self._lock:
+            return self._total
+
+    def extend(self, points: List[CurvePoint]) -> int:
+        """Appends points and returns the new `total`."""
+        with self._lock:
+            self._points.extend(points)
+            self._total += len(points)
+            return self._total
+
+    def read_since(self, cursor: int) -> Tuple[List[float], List[float], int]:
+        """
+        Returns (penetrations, loads, new_cursor) for the points appended since `cursor`.
+        """
+        with self._lock:
+            first_held = self._total - len(self._points)
+            start = max(cursor, first_held) - first_held
+            chunk = list(self._points)[start:] if start < len(self._points) else []
+            new_cursor = self._total
+        return [p[0] for p in chunk], [p[1] for p in chunk], new_cursor
+
+    def snapshot(self) -> Tuple[List[float], List[float]]:
+        """Returns all points held as (penetrations, loads)."""
+        penetrations, loads, _ = self.read_since(0)
+        return penetrations, loads
+
+    def clear(self) -> None:
+        with self._lock:
+            self._points.clear()
+            self._total = 0
+
+
+class LiveCurvePoller:
+    """
+    Polls `fetch` every `interval` seconds on a daemon thread and appends new
+    points to `buffer`. `on_chunk(n_new_points)` is called after each non-empty
+    poll (e.g. to emit a Qt signal). `on_stop()` is called by `stop`, e.g. to close
+    the connection the fetcher opened.
+    """
+
+    def __init__(self, fetch: StepFetcher, buffer: CurveRingBuffer, interval: float = DEFAULT_POLL_INTERVAL,
+                 on_chunk: Optional[Callable[[int], None]] = None, on_stop: Optional[Callable[[], None]] = None):
+        self.fetch = fetch
+        self.buffer = buffer
+        self.interval = interval
+        self.on_chunk = on_chunk
+        self.on_stop = on_stop
+        self.next_step = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll_once(self) -> int:
+        """Fetches the steps stored since the last poll. Returns the number of new points."""
+        try:
+            points, next_step = self.fetch(self.next_step)
+        except Exception as e: # Output may be busy or the step not yet written.
+            logger.debug(f"Live curve poll from step {self.next_step} failed (will retry): {e}")
+            return 0
+        self.next_step = max(self.next_step, next_step)
+        if points:
+            self.buffer.extend(points)
+            if self.on_chunk:
+                self.on_chunk(len(points))
+        return len(points)
+
+    def _run(self) -> None:
+        logger.info(f"Live curve polling started (interval {self.interval} s).")
+        while not self._stop_event.wait(self.interval):
+            self.poll_once()
+        logger.info(f"Live curve polling stopped after {self.next_step} steps ({self.buffer.total} points).")
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="LiveCurvePoller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stops polling; a fetch in progress is allowed to finish within `timeout`."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.on_stop:
+            try:
+                self.on_stop()
+            except Exception as e:
+                logger.warning(f"Live curve poller cleanup failed: {e}")
+
+
+def make_output_step_fetcher(g_o: Any, g_i: Optional[Any] = None, input_spudcan_ref: Optional[Any] = "Spudcan",
+                             spudcan_output_object_name: Optional[str] = "Spudcan") -> StepFetcher:
+    """
+    Returns a `StepFetcher` reading the spudcan Uy/Fz of the stored steps of the
+    last phase from PLAXIS Output. That is the phase the final load-penetration curve
+    is read from (see results_parser); while earlier phases (initial, preload) are
+    calculated it has no steps yet, so they are not plotted.
+
+    Only the unread steps are requested (one sublist query plus two
+    `getcurveresults` calls per new step). The reference object and result types
+    are resolved on the first successful call and reused afterwards.
+    """
+    resolved: dict = {}
+
+    def fetch(first_step: int) -> Tuple[List[CurvePoint], int]:
+        if not resolved:
+            ref_object, name = find_output_reference_object(g_o, g_i, input_spudcan_ref, spudcan_output_object_name)
+            if ref_object is None:
+                raise LookupError(f"Spudcan output object '{spudcan_output_object_name}' not found.")
+            rigid_body = g_o.ResultTypes.RigidBody
+            resolved.update(ref=ref_object, name=name, disp=rigid_body.Uy, load=rigid_body.Fz)
+
+        phase = g_o.Phases[-1]
+        new_steps = list(phase.Steps[first_step:])
+        points: List[CurvePoint] = []
+        for step in new_steps:
+            disp = g_o.getcurveresults(resolved['ref'], step, resolved['disp'])
+            load = g_o.getcurveresults(resolved['ref'], step, resolved['load'])
+            try:
+                points.append((abs(float(disp)), abs(float(load))))
+            except (TypeError, ValueError):
+                logger.debug("Skipping non-numeric live curve step result: disp='%s', load='%s'.", disp, load)
+        return points, first_step + len(new_steps)
+
+    return fetch
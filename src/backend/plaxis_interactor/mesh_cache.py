@@ -0,0 +1,353 @@
+"""
+Mesh-template cache for reusing meshed base projects across runs.
+
+Parameter sweeps that only vary soil strength, preload or calculation settings
+share identical geometry and mesh settings, yet every run would otherwise pay the
+full meshing cost again. This module derives a cache key from everything that
+influences the mesh (spudcan geometry, model domain, layer boundaries, coarseness,
+refinement and the load/displacement objects that are part of the geometry), stores a meshed
+base project per key, and generates the callables needed to either save a new
+template (cache miss) or re-apply only the run-specific data onto an opened
+template (cache hit).
+
+Typical workflow:
+    cache = MeshTemplateCache()
+    plan, setup_callables, calc_callables = generate_cached_workflow_callables(settings, cache)
+    interactor.setup_model_in_plaxis(setup_callables, template_path=plan.template_path if plan.cache_hit else None)
+    interactor.run_calculation(calc_callables)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import dataclasses
+from dataclasses import dataclass
+from typing import List, Callable, Any, Optional, Dict, Tuple
+
+from ..models import ProjectSettings, SoilLayer, LoadingConditions
+from ..exceptions import PlaxisConfigurationError
+from ..material_library import load_project_material_library
+from .model_setup import (
+    resolve_model_domain_and_layers, resolve_site_boreholes, is_site_model, get_leg_names,
+    generate_model_setup_callables, plaxis_project_path
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MESH_TEMPLATE_DIR = os.path.join(os.path.expanduser("~"), ".plaxis_spudcan_automation", "mesh_templates")
+MESH_TEMPLATE_INDEX_FILENAME = "mesh_templates_index.json"
+MESH_TEMPLATE_FILE_EXTENSION = ".p3d"
+_KEY_FLOAT_PRECISION = 6 # Decimal places used when hashing float inputs, avoids 1e-15 noise changing the key.
+
+# Names of the PLAXIS objects created by the builders that are baked into a template.
+SPUDCAN_PRELOAD_NAME = "Spudcan_Preload"
+SPUDCAN_TARGET_DISPLACEMENT_NAME = "Spudcan_TargetPenetration"
+
+
+@dataclass
+class MeshReusePlan:
+    """
+    Outcome of a mesh-template cache lookup for one run.
+    """
+    cache_key: str                  # Hash of the mesh-relevant inputs.
+    template_path: str              # Where the template lives (or will be saved on a miss).
+    cache_hit: bool                 # True if a valid template already exists for the key.
+    key_components: Dict[str, Any]  # The raw inputs the key was computed from (stored in the index).
+
+
+def _round_or_none(value: Optional[float]) -> Optional[float]:
+    return round(float(value), _KEY_FLOAT_PRECISION) if value is not None else None
+
+
+def get_mesh_key_components(project_settings: ProjectSettings) -> Dict[str, Any]:
+    """
+    Collects every input that influences the generated mesh.
+
+    Material parameters, water table, load magnitudes and phase settings are
+    deliberately excluded; they can be changed on a meshed project without remeshing.
+    Whether a preload / prescribed displacement object exists is included, because
+    these objects are geometry and adding them later would invalidate the mesh.
+
+    Raises:
+        PlaxisConfigurationError: If the spudcan geometry or a layer thickness is missing.
+    """
+    spudcan = project_settings.spudcan
+    if spudcan is None or spudcan.diameter is None or spudcan.height_cone_angle is None:
+        raise PlaxisConfigurationError("Spudcan diameter and cone angle are required to compute a mesh template key.")
+
+    for i, layer in enumerate(project_settings.soil_stratigraphy):
+        if layer.thickness is None or layer.thickness <= 0:
+            raise PlaxisConfigurationError(f"Layer '{layer.name or i+1}' has invalid thickness ({layer.thickness}); cannot compute mesh template key.")
+    domain, layers = resolve_model_domain_and_layers(project_settings)
+
+    layer_boundaries: List[float] = [0.0]
+    current_z = 0.0
+    for layer in layers:
+        current_z -= layer.thickness
+        layer_boundaries.append(round(current_z, _KEY_FLOAT_PRECISION))
+
+    control = project_settings.analysis_control
+    loading = project_settings.loading or LoadingConditions()
+    has_preload = loading.vertical_preload is not None and loading.vertical_preload != 0
+    has_target_displacement = loading.target_type == "penetration" and \
+                              loading.target_penetration_or_load is not None and \
+                              loading.target_penetration_or_load != 0
+
+    return {
+        "spudcan_diameter": _round_or_none(spudcan.diameter),
+        "spudcan_cone_angle": _round_or_none(spudcan.height_cone_angle),
+        "layer_boundaries": layer_boundaries,
+        "coarseness": (control.meshing_global_coarseness if control else None) or "Medium",
+        "refinement_spudcan": bool(control.meshing_refinement_spudcan) if control else False,
+        "refinement_factors": [
+            _round_or_none(control.refinement_cone_coarseness_factor), _round_or_none(control.refinement_zone_coarseness_factor),
+            _round_or_none(control.refinement_zone_radius_factor), _round_or_none(control.refinement_zone_depth_factor),
+            _round_or_none(abs(loading.target_penetration_or_load or 0.0)) if has_target_displacement else None,
+        ] if control and control.meshing_refinement_spudcan else None,
+        "load_objects": {"preload": has_preload, "target_displacement": has_target_displacement},
+        "legs": [[leg.name, _round_or_none(leg.x), _round_or_none(leg.y),
+                  _round_or_none((leg.spudcan or spudcan).diameter), _round_or_none((leg.spudcan or spudcan).height_cone_angle)]
+                 for leg in project_settings.legs] or None,
+        "boreholes": [[bh.name, _round_or_none(bh.x), _round_or_none(bh.y),
+                       [_round_or_none(layer.thickness) for layer in bh.soil_layers]]
+                      for bh in resolve_site_boreholes(project_settings, domain)] or None,
+        "domain": [_round_or_none(domain.x_min), _round_or_none(domain.x_max), _round_or_none(domain.y_min),
+                   _round_or_none(domain.y_max), _round_or_none(domain.bottom_z)] if domain else None,
+    }
+
+
+def compute_mesh_template_key(key_components: Dict[str, Any]) -> str:
+    """Returns a stable, filesystem-safe hash for the given mesh key components."""
+    canonical = json.dumps(key_components, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+
+
+class MeshTemplateCache:
+    """
+    On-disk store of meshed base projects, indexed by mesh template key.
+
+    The index is a small JSON file next to the templates recording when each
+    template was created and from which inputs, so stale or orphaned entries
+    can be detected and the cache can be inspected by hand.
+    """
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir: str = cache_dir or DEFAULT_MESH_TEMPLATE_DIR
+        self.index_path: str = os.path.join(self.cache_dir, MESH_TEMPLATE_INDEX_FILENAME)
+
+    def template_path(self, key: str) -> str:
+        """Absolute path of the template project file for `key` (may not exist yet)."""
+        return os.path.abspath(os.path.join(self.cache_dir, f"mesh_template_{key}{MESH_TEMPLATE_FILE_EXTENSION}"))
+
+    def _read_index(self) -> Dict[str, Any]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            logger.warning(f"Mesh template index '{self.index_path}' unreadable ({e}). Treating cache as empty.")
+            return {}
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Returns the template path for `key` if it is indexed and present on disk.
+        Index entries whose file has disappeared are pruned.
+        """
+        index = self._read_index()
+        entry = index.get(key)
+        if not entry:
+            return None
+        path = entry.get("template_path") or self.template_path(key)
+        if not os.path.exists(path):
+            logger.warning(f"Mesh template for key {key} is indexed but missing on disk ('{path}'). Removing stale entry.")
+            index.pop(key, None)
+            self._write_index(index)
+            return None
+        return path
+
+    def register(self, key: str, key_components: Dict[str, Any]) -> None:
+        """Records a freshly saved template in the index."""
+        index = self._read_index()
+        index[key] = {
+            "template_path": self.template_path(key),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "key_components": key_components,
+        }
+        self._write_index(index)
+        logger.info(f"Registered mesh template {key} in cache index '{self.index_path}'.")
+
+    def invalidate(self, key: str) -> None:
+        """Removes a template (file and index entry), e.g. after it failed to open."""
+        index = self._read_index()
+        entry = index.pop(key, None)
+        path = (entry or {}).get("template_path") or self.template_path(key)
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not remove mesh template file '{path}': {e}")
+        self._write_index(index)
+
+    def plan(self, project_settings: ProjectSettings) -> MeshReusePlan:
+        """Computes the mesh key for `project_settings` and checks whether a template exists."""
+        components = get_mesh_key_components(project_settings)
+        key = compute_mesh_template_key(components)
+        existing_path = self.lookup(key)
+        plan = MeshReusePlan(
+            cache_key=key,
+            template_path=existing_path or self.template_path(key),
+            cache_hit=existing_path is not None,
+            key_components=components,
+        )
+        logger.info(f"Mesh template cache {'HIT' if plan.cache_hit else 'MISS'} for key {key} ({plan.template_path}).")
+        return plan
+
+
+# --- Callables ---
+
+def generate_mesh_template_save_callables(cache: MeshTemplateCache, plan: MeshReusePlan,
+                                          project_path: str) -> List[Callable[[Any], None]]:
+    """
+    Generates the callable that saves the freshly meshed base project as a template.
+    Intended to run right after meshing and before any phase is defined.
+
+    `g_i.save(path)` is a save-as: PLAXIS keeps editing the file saved last. The project
+    is therefore saved to `project_path` again right after the template, so phases and
+    calculation results are written there and the cached template is never modified.
+    """
+    def save_mesh_template_callable(g_i: Any) -> None:
+        logger.info(f"API CALL: Saving meshed base project as template '{plan.template_path}'.")
+        try:
+            os.makedirs(os.path.dirname(plan.template_path), exist_ok=True)
+            g_i.save(plan.template_path)
+            g_i.save(project_path)
+        except Exception as e:
+            logger.error(f"  ERROR saving mesh template '{plan.template_path}': {e}", exc_info=True)
+            raise
+        cache.register(plan.cache_key, plan.key_components)
+    return [save_mesh_template_callable]
+
+
+def generate_template_reuse_callables(
+    soil_layers: List[SoilLayer],
+    water_table_depth: Optional[float],
+    loading_model: Optional[LoadingConditions],
+    borehole_name: str = "BH1",
+    symmetry_factor: float = 1.0
+) -> List[Callable[[Any], None]]:
+    """
+    Generates callables that re-apply run-specific data onto an opened mesh template:
+    removes the template's materials, re-assigns layer materials (new materials are
+    created by `soil_builder.generate_stratigraphy_material_callables`), sets the water head and
+    updates load magnitudes on the existing load objects. None of these touch geometry,
+    so the stored mesh stays valid.
+
+    Must be placed after the material callables in the setup sequence; the material
+    purge is returned separately as the first element so callers can run it before them.
+    The preload is divided by `symmetry_factor`, as in `generate_loading_condition_callables`.
+    The opened template must first be saved under the run's project file (see
+    `PlaxisInteractor.setup_model_in_plaxis`), so these edits do not reach the cache.
+    """
+    layer_material_names: List[str] = []
+    for i, layer_model in enumerate(soil_layers):
+        material_props = layer_model.material
+        if not (material_props.Identification or material_props.model_name):
+            raise PlaxisConfigurationError(f"Material for layer '{layer_model.name or i+1}' is missing 'Identification' or 'model_name'.")
+        name = material_props.Identification or "".join(c if c.isalnum() else '_' for c in material_props.model_name)
+        if name[0].isdigit():
+            name = "Mat_" + name
+        layer_material_names.append(name)
+
+    def purge_template_materials_callable(g_i: Any) -> None:
+        logger.info("API CALL: Removing soil materials stored in the mesh template.")
+        existing = list(getattr(g_i, 'SoilMaterials', None) or [])
+        for mat in existing:
+            g_i.delete(mat)
+        logger.debug(f"  Deleted {len(existing)} template materials.")
+
+    def reassign_layers_callable(g_i: Any) -> None:
+        logger.info(f"API CALL: Re-assigning materials on template borehole '{borehole_name}'.")
+        try:
+            g_i.gotosoil()
+            bh = g_i.Boreholes[borehole_name]
+            plaxis_layers = bh.SoilLayers
+            if len(plaxis_layers) < len(layer_material_names):
+                raise PlaxisConfigurationError(
+                    f"Template borehole '{borehole_name}' has {len(plaxis_layers)} layers, expected {len(layer_material_names)}.")
+            for idx, mat_name in enumerate(layer_material_names):
+                g_i.set(plaxis_layers[idx].Material, mat_name)
+            if water_table_depth is not None:
+                g_i.set(bh.Head, -abs(water_table_depth))
+            logger.info(f"  Assigned {len(layer_material_names)} layer materials on template.")
+        except Exception as e:
+            logger.error(f"  ERROR re-assigning template layers: {e}", exc_info=True)
+            raise
+
+    def update_load_values_callable(g_i: Any) -> None:
+        if loading_model is None:
+            return
+        logger.info("API CALL: Updating load magnitudes on template load objects.")
+        try:
+            g_i.gotostructures()
+            if loading_model.vertical_preload:
+                g_i.set(g_i.PointLoads[SPUDCAN_PRELOAD_NAME].Fz, -abs(loading_model.vertical_preload) / symmetry_factor)
+            if loading_model.target_type == "penetration" and loading_model.target_penetration_or_load:
+                g_i.set(g_i.PointDisplacements[SPUDCAN_TARGET_DISPLACEMENT_NAME].uz, -abs(loading_model.target_penetration_or_load))
+        except Exception as e:
+            logger.error(f"  ERROR updating template load values: {e}", exc_info=True)
+            raise
+
+    return [purge_template_materials_callable, reassign_layers_callable, update_load_values_callable]
+
+
+def generate_cached_workflow_callables(
+    project_settings: ProjectSettings,
+    cache: Optional[MeshTemplateCache] = None
+) -> Tuple[MeshReusePlan, List[Callable[[Any], None]], List[Callable[[Any], None]]]:
+    """
+    Builds the model-setup and calculation callables for a run, reusing a mesh
+    template when one matches.
+
+    Returns:
+        (plan, model_setup_callables, calculation_callables). On a cache hit the
+        caller must open `plan.template_path` instead of creating a new project.
+    """
+    from . import geometry_builder, soil_builder, calculation_builder
+
+    cache = cache or MeshTemplateCache(getattr(project_settings.analysis_control, 'mesh_template_cache_dir', None))
+    plan = cache.plan(project_settings)
+    symmetry_factor = geometry_builder.get_symmetry_factor(
+        project_settings.analysis_control, project_settings.loading, project_settings.legs)
+
+    if is_site_model(project_settings):
+        # The template reuse callables assume one borehole and one set of load objects.
+        logger.warning("Mesh template reuse is not supported for multi-leg/multi-borehole models; building the model in full.")
+        plan = dataclasses.replace(plan, cache_hit=False, template_path=cache.template_path(plan.cache_key))
+        return plan, generate_model_setup_callables(project_settings), calculation_builder.generate_analysis_control_callables(
+            project_settings.analysis_control, project_settings.loading,
+            leg_names=get_leg_names(project_settings))
+
+    if plan.cache_hit:
+        _, layers = resolve_model_domain_and_layers(
+            project_settings, load_project_material_library(project_settings.material_library_path))
+        purge, *reapply = generate_template_reuse_callables(
+            layers, project_settings.water_table_depth, project_settings.loading, symmetry_factor=symmetry_factor)
+        setup_callables = [purge] + soil_builder.generate_stratigraphy_material_callables(layers) + reapply
+        calc_callables = calculation_builder.generate_analysis_control_callables(
+            project_settings.analysis_control, project_settings.loading, skip_meshing=True)
+    else:
+        setup_callables = generate_model_setup_callables(project_settings)
+        calc_callables = calculation_builder.generate_analysis_control_callables(
+            project_settings.analysis_control, project_settings.loading,
+            post_mesh_callables=generate_mesh_template_save_callables(cache, plan, plaxis_project_path(project_settings)))
+
+    return plan, setup_callables, calc_callables
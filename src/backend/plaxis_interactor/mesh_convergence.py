@@ -0,0 +1,256 @@
+"""
+Mesh convergence study for spudcan penetration analyses.
+
+Instead of defaulting to a fine mesh, the same model is analysed on a ladder of
+global coarseness levels (coarse to fine). Levels are run in parallel batches, one
+PLAXIS server per worker, and the study stops as soon as two consecutive levels
+give peak vertical resistances within a relative tolerance. The coarser level of
+that pair is selected: it is the cheapest mesh that is accurate enough.
+
+The actual analysis of one level is delegated to an `AnalysisRunner`
+(ProjectSettings -> AnalysisResults), so the study logic can be tested without
+PLAXIS and reused with any execution backend.
+"""
+
+import os
+import copy
+import functools
+import queue
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Any, Optional, Dict, Tuple
+
+from ..models import ProjectSettings, AnalysisResults
+from ..exceptions import PlaxisAutomationError, PlaxisConfigurationError, PlaxisCalculationError
+from .calculation_builder import MESH_COARSENESS_LEVELS
+
+logger = logging.getLogger(__name__)
+
+AnalysisRunner = Callable[[ProjectSettings], AnalysisResults]
+
+DEFAULT_CONVERGENCE_LEVELS = ["Coarse", "Medium", "Fine", "VeryFine"]
+DEFAULT_CONVERGENCE_TOLERANCE = 0.02
+
+
+@dataclass
+class MeshLevelResult:
+    """Outcome of the analysis on one coarseness level."""
+    coarseness: str
+    peak_vertical_resistance: Optional[float] = None
+    results: Optional[AnalysisResults] = None
+    error: Optional[str] = None  # Error message if the analysis for this level failed.
+
+
+@dataclass
+class MeshConvergenceResult:
+    """
+    Summary of a mesh convergence study.
+    """
+    levels: List[MeshLevelResult] = field(default_factory=list) # Analysed levels, coarse to fine.
+    converged: bool = False
+    selected_coarseness: Optional[str] = None
+    relative_changes: Dict[str, float] = field(default_factory=dict) # "Coarse->Medium": 0.05, ...
+
+    @property
+    def selected_results(self) -> Optional[AnalysisResults]:
+        for level in self.levels:
+            if level.coarseness == self.selected_coarseness:
+                return level.results
+        return None
+
+
+def _relative_change(coarse_value: float, fine_value: float) -> float:
+    if fine_value == 0:
+        return 0.0 if coarse_value == 0 else float("inf")
+    return abs(fine_value - coarse_value) / abs(fine_value)
+
+
+def _evaluate_convergence(levels: List[MeshLevelResult], tolerance: float,
+                          relative_changes: Dict[str, float]) -> Optional[str]:
+    """
+    Walks consecutive successful level pairs (coarse to fine) and returns the first
+    coarser level whose peak is within tolerance of the next finer one.
+    """
+    for coarse, fine in zip(levels, levels[1:]):
+        if coarse.peak_vertical_resistance is None or fine.peak_vertical_resistance is None:
+            continue
+        change = _relative_change(coarse.peak_vertical_resistance, fine.peak_vertical_resistance)
+        relative_changes[f"{coarse.coarseness}->{fine.coarseness}"] = change
+        if change <= tolerance:
+            return coarse.coarseness
+    return None
+
+
+def _settings_for_level(project_settings: ProjectSettings, coarseness: str) -> ProjectSettings:
+    """Deep-copies the settings and applies the coarseness level and a per-level project file."""
+    level_settings = copy.deepcopy(project_settings)
+    level_settings.analysis_control.meshing_global_coarseness = coarseness
+    level_settings.analysis_control.mesh_convergence_study = False # Never recurse into a study.
+    base_path = getattr(project_settings, 'project_file_path', None)
+    if base_path:
+        root, ext = os.path.splitext(base_path)
+        level_settings.project_file_path = f"{root}_mesh_{coarseness}{ext or '.p3d'}"
+    level_settings.project_name = f"{project_settings.project_name or 'Project'}_mesh_{coarseness}"
+    return level_settings
+
+
+def _check_stop(should_stop: Optional[Callable[[], bool]]) -> None:
+    if should_stop is not None and should_stop():
+        raise PlaxisCalculationError("Calculation stopped by user.")
+
+
+def run_mesh_convergence_study(
+    project_settings: ProjectSettings,
+    run_analysis: AnalysisRunner,
+    levels: Optional[List[str]] = None,
+    tolerance: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None
+) -> MeshConvergenceResult:
+    """
+    Runs the coarseness ladder in parallel batches until the peak resistance converges.
+
+    Args:
+        project_settings: Base settings; the coarseness is overridden per level.
+        run_analysis: Runs one full analysis and returns its AnalysisResults.
+        levels: Coarseness ladder (coarse to fine). Defaults to `analysis_control.mesh_convergence_levels`
+                or Coarse -> VeryFine.
+        tolerance: Max relative change in peak resistance between consecutive levels.
+        max_workers: Number of levels analysed concurrently.
+        should_stop: Checked before and after each batch, e.g. the cancel check of the
+                     analysis; pass it to `run_analysis` as well to stop the running levels.
+
+    Returns:
+        MeshConvergenceResult. If the ladder is exhausted without convergence, the finest
+        successful level is selected and `converged` is False.
+
+    Raises:
+        PlaxisConfigurationError: If the ladder contains unknown levels or fewer than two levels.
+        PlaxisAutomationError: If every level failed.
+        PlaxisCalculationError: If `should_stop` returned True.
+    """
+    control = project_settings.analysis_control
+    ladder = list(levels or control.mesh_convergence_levels or DEFAULT_CONVERGENCE_LEVELS)
+    tol = tolerance if tolerance is not None else (control.mesh_convergence_tolerance or DEFAULT_CONVERGENCE_TOLERANCE)
+    workers = max(1, max_workers or control.mesh_convergence_max_workers or 1)
+
+    unknown = [lvl for lvl in ladder if lvl not in MESH_COARSENESS_LEVELS]
+    if unknown:
+        raise PlaxisConfigurationError(f"Unknown coarseness level(s) in convergence ladder: {unknown}. Must be among {MESH_COARSENESS_LEVELS}.")
+    if len(ladder) < 2:
+        raise PlaxisConfigurationError("A mesh convergence study needs at least two coarseness levels.")
+    ladder.sort(key=MESH_COARSENESS_LEVELS.index)
+
+    logger.info(f"Starting mesh convergence study: levels={ladder}, tolerance={tol:.3%}, workers={workers}.")
+    study = MeshConvergenceResult()
+
+    def run_level(coarseness: str) -> MeshLevelResult:
+        logger.info(f"Mesh convergence: analysing level '{coarseness}'.")
+        try:
+            results = run_analysis(_settings_for_level(project_settings, coarseness))
+            peak = results.peak_vertical_resistance if results else None
+            logger.info(f"Mesh convergence: level '{coarseness}' peak resistance = {peak}.")
+            return MeshLevelResult(coarseness, peak, results)
+        except Exception as e: # One failing level should not abort the whole study.
+            logger.error(f"Mesh convergence: level '{coarseness}' failed: {e}", exc_info=True)
+            return MeshLevelResult(coarseness, error=str(e))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mesh-convergence") as executor:
+        for batch_start in range(0, len(ladder), workers):
+            batch = ladder[batch_start:batch_start + workers]
+            _check_stop(should_stop)
+            study.levels.extend(executor.map(run_level, batch)) # map preserves ladder order
+            _check_stop(should_stop)
+            selected = _evaluate_convergence(study.levels, tol, study.relative_changes)
+            if selected:
+                study.converged = True
+                study.selected_coarseness = selected
+                break
+
+    if not study.converged:
+        successful = [lvl for lvl in study.levels if lvl.peak_vertical_resistance is not None]
+        if not successful:
+            raise PlaxisAutomationError(f"Mesh convergence study failed: no level produced a peak resistance ({[l.error for l in study.levels]}).")
+        study.selected_coarseness = successful[-1].coarseness
+        logger.warning(f"Mesh convergence not reached within tolerance {tol:.3%}; using finest analysed level '{study.selected_coarseness}'.")
+    else:
+        logger.info(f"Mesh convergence reached: selected '{study.selected_coarseness}' (changes: {study.relative_changes}).")
+    return study
+
+
+def _stoppable(callables: List[Callable[[Any], None]],
+               should_stop: Optional[Callable[[], bool]]) -> List[Callable[[Any], None]]:
+    """Wraps command callables so that each first checks `should_stop`."""
+    if should_stop is None:
+        return callables
+
+    def wrap(func: Callable[[Any], None]) -> Callable[[Any], None]:
+        @functools.wraps(func)
+        def checked(g_i: Any) -> None:
+            _check_stop(should_stop)
+            func(g_i)
+        return checked
+    return [wrap(func) for func in callables]
+
+
+def run_interactor_analysis(plaxis_path: Optional[str], settings: ProjectSettings,
+                            on_interactor: Optional[Callable[[Any], None]] = None,
+                            should_stop: Optional[Callable[[], bool]] = None) -> AnalysisResults:
+    """
+    Complete PLAXIS run (model setup, calculation, results) of `settings` via PlaxisInteractor,
+    on the API ports set in `settings`. `on_interactor` receives the interactor before
+    the run starts, e.g. to stop its calculation from another thread. `should_stop` is
+    checked before each setup and calculation command and before the results are
+    extracted, since `breakcalculation` only stops a calculation that is already running;
+    when it returns True the run raises PlaxisCalculationError.
+    """
+    from .interactor import PlaxisInteractor
+    from . import calculation_builder, results_parser
+    from .model_setup import generate_model_setup_callables, get_leg_names
+
+    interactor = PlaxisInteractor(plaxis_path, settings)
+    try:
+        if on_interactor is not None:
+            on_interactor(interactor)
+        _check_stop(should_stop)
+        interactor.setup_model_in_plaxis(_stoppable(generate_model_setup_callables(settings), should_stop),
+                                         is_new_project=True)
+        interactor.run_calculation(_stoppable(calculation_builder.generate_analysis_control_callables(
+            settings.analysis_control, settings.loading,
+            leg_names=get_leg_names(settings)), should_stop))
+        _check_stop(should_stop)
+        raw_results = interactor.extract_results(results_parser.get_standard_results_commands(settings))
+        return results_parser.compile_analysis_results(raw_results, settings)
+    finally:
+        interactor.close_all_connections()
+
+
+def build_interactor_analysis_runner(
+    plaxis_path: Optional[str],
+    api_ports: Optional[List[Tuple[int, int]]] = None,
+    should_stop: Optional[Callable[[], bool]] = None
+) -> AnalysisRunner:
+    """
+    Returns an AnalysisRunner that performs a complete PLAXIS run via PlaxisInteractor.
+
+    Each concurrent run needs its own PLAXIS Input/Output server pair; `api_ports`
+    lists the available (input_port, output_port) pairs and acts as a pool, so the
+    number of pairs bounds the effective parallelism. Without `api_ports`, each run
+    keeps the ports set in its settings (the user's PLAXIS instance), one run at a time.
+    `should_stop` is passed to each `run_interactor_analysis`.
+    """
+    port_pool: "queue.Queue[Optional[Tuple[int, int]]]" = queue.Queue()
+    for ports in (api_ports or [None]):
+        port_pool.put(ports)
+
+    def run(level_settings: ProjectSettings) -> AnalysisResults:
+        ports = port_pool.get()
+        try:
+            if ports is not None:
+                level_settings.plaxis_api_input_port, level_settings.plaxis_api_output_port = ports
+            return run_interactor_analysis(plaxis_path, level_settings, should_stop=should_stop)
+        finally:
+            port_pool.put(ports)
+
+    return run
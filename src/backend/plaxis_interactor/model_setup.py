@@ -0,0 +1,117 @@
+"""
+Model setup for a new PLAXIS project: resolves the model domain, the clipped
+stratigraphy and the site boreholes of a `ProjectSettings`, and assembles the
+geometry, soil and load callables of the builders into one setup sequence.
+
+The mesh-template cache (mesh_cache.py) reuses these when it builds a template
+and when it keys one, so both derive the layers from the same inputs.
+"""
+
+import os
+import logging
+import dataclasses
+from typing import List, Callable, Any, Optional, Tuple
+
+from ..models import ProjectSettings, SoilLayer, Borehole
+from ..material_library import MaterialLibrary, load_project_material_library
+from . import geometry_builder, soil_builder, calculation_builder
+from .geometry_builder import ModelDomain
+
+logger = logging.getLogger(__name__)
+
+
+def plaxis_project_path(project_settings: ProjectSettings) -> str:
+    """
+    PLAXIS project file a run is saved to and calculated in: `project_file_path` when
+    set, else `<project name>.p3dxml` in the working directory.
+    """
+    path = getattr(project_settings, 'project_file_path', None)
+    if path:
+        return path
+    return os.path.join(os.getcwd(), (project_settings.project_name or "UntitledPlaxisProject") + ".p3dxml")
+
+
+def resolve_model_domain_and_layers(
+    project_settings: ProjectSettings,
+    library: Optional[MaterialLibrary] = None
+) -> Tuple[Optional[ModelDomain], List[SoilLayer]]:
+    """
+    Returns the auto-sized model domain (None if disabled) and the stratigraphy clipped
+    to the domain depth, with the reference level of depth-dependent materials resolved.
+    Every builder path must use these layers so that the layer indices in PLAXIS match
+    the layers the materials are assigned to.
+    With a `library`, layer materials are replaced by their deduplicated library entries.
+    """
+    reference_layers = project_settings.soil_stratigraphy
+    if project_settings.boreholes: # The shallowest borehole limits the model depth.
+        reference_layers = min((bh.soil_layers for bh in project_settings.boreholes),
+                               key=lambda layers: sum(layer.thickness or 0.0 for layer in layers))
+    domain = geometry_builder.compute_model_domain(
+        project_settings.spudcan, project_settings.loading,
+        reference_layers, project_settings.analysis_control, legs=project_settings.legs or None)
+    layers = soil_builder.clip_soil_layers_to_depth(project_settings.soil_stratigraphy, domain.depth if domain else None)
+    layers = soil_builder.resolve_depth_reference_levels(layers)
+    if library is not None:
+        layers = library.assign_layers(layers)
+    return domain, layers
+
+
+def resolve_site_boreholes(
+    project_settings: ProjectSettings,
+    domain: Optional[ModelDomain],
+    library: Optional[MaterialLibrary] = None
+) -> List[Borehole]:
+    """
+    Returns `project_settings.boreholes` with each stratigraphy clipped to the domain depth
+    and, with a `library`, layer materials replaced by their library entries.
+    """
+    depth = domain.depth if domain else None
+    boreholes = []
+    for bh in project_settings.boreholes:
+        layers = soil_builder.resolve_depth_reference_levels(soil_builder.clip_soil_layers_to_depth(bh.soil_layers, depth))
+        boreholes.append(dataclasses.replace(bh, soil_layers=library.assign_layers(layers) if library is not None else layers))
+    return boreholes
+
+
+def is_site_model(project_settings: ProjectSettings) -> bool:
+    """True for multi-leg and/or multi-borehole models."""
+    return bool(project_settings.legs or project_settings.boreholes)
+
+
+def get_leg_names(project_settings: ProjectSettings) -> Optional[List[str]]:
+    """Leg names for the phase/mesh callables, or None for a single-spudcan model."""
+    return [leg.name for leg in project_settings.legs] if project_settings.legs else None
+
+
+def generate_model_setup_callables(project_settings: ProjectSettings) -> List[Callable[[Any], None]]:
+    """
+    Builds the full model-setup sequence for a new project: soil contour, spudcan,
+    refinement zone, materials, clipped stratigraphy and load objects.
+    """
+    library = load_project_material_library(project_settings.material_library_path)
+    domain, layers = resolve_model_domain_and_layers(project_settings, library)
+    legs = project_settings.legs
+    symmetry_factor = geometry_builder.get_symmetry_factor(project_settings.analysis_control, project_settings.loading, legs)
+    setup_callables = geometry_builder.generate_model_domain_callables(domain)
+    if legs:
+        setup_callables += geometry_builder.generate_multi_leg_geometry_callables(legs, project_settings.spudcan)
+    else:
+        setup_callables += geometry_builder.generate_spudcan_geometry_callables(project_settings.spudcan)
+    setup_callables += geometry_builder.generate_spudcan_refinement_callables(
+        project_settings.spudcan, project_settings.analysis_control, project_settings.loading, legs=legs or None)
+    if project_settings.boreholes:
+        boreholes = resolve_site_boreholes(project_settings, domain, library)
+        setup_callables += soil_builder.generate_stratigraphy_material_callables(
+            [layer for bh in boreholes for layer in bh.soil_layers])
+        setup_callables += soil_builder.generate_multi_borehole_stratigraphy_callables(
+            boreholes, project_settings.water_table_depth)
+    else:
+        setup_callables += soil_builder.generate_stratigraphy_material_callables(layers)
+        setup_callables += soil_builder.generate_soil_stratigraphy_callables(layers, project_settings.water_table_depth)
+    if legs:
+        setup_callables += calculation_builder.generate_multi_leg_loading_callables(
+            project_settings.loading, legs, symmetry_factor=symmetry_factor)
+    else:
+        setup_callables += calculation_builder.generate_loading_condition_callables(
+            project_settings.loading, symmetry_factor=symmetry_factor)
+    return setup_callables
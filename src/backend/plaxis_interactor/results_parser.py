@@ -10,6 +10,7 @@ from typing import List, Dict, Any, Optional, Tuple, Callable
 
 from ..models import AnalysisResults, ProjectSettings # For type hinting
 from ..exceptions import PlaxisOutputError # For reporting issues during parsing
+from .geometry_builder import get_symmetry_factor, leg_object_name
 
 # Placeholder for PlxScriptingError if plxscripting is not available
 try:
@@ -21,6 +22,55 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+def find_output_reference_object(
+    g_o: Any,
+    g_i: Optional[Any],
+    input_spudcan_ref: Optional[Any],
+    spudcan_output_object_name: Optional[str]
+) -> Tuple[Optional[Any], str]:
+    """
+    Finds the PLAXIS Output object whose step results describe the spudcan.
+
+    Tries `g_i.get_equivalent(input_spudcan_ref, g_o)` first and falls back to
+    looking up `spudcan_output_object_name` in the usual Output collections.
+
+    Returns:
+        (object or None, name used for logging).
+    """
+    ref_object_for_step_results = None
+    effective_object_name_for_log = "N/A"
+
+    if g_i and input_spudcan_ref and hasattr(g_i, 'get_equivalent'):
+        try:
+            logger.info(f"Attempting to find output object via g_i.get_equivalent for input ref: {input_spudcan_ref}")
+            equivalent_output_obj = g_i.get_equivalent(input_spudcan_ref, g_o)
+            if isinstance(equivalent_output_obj, list) and equivalent_output_obj:
+                ref_object_for_step_results = equivalent_output_obj[0]
+            elif not isinstance(equivalent_output_obj, list) and equivalent_output_obj:
+                 ref_object_for_step_results = equivalent_output_obj
+            if ref_object_for_step_results:
+                effective_object_name_for_log = getattr(ref_object_for_step_results, "Name", str(ref_object_for_step_results))
+                logger.info(f"Found output object '{effective_object_name_for_log}' using get_equivalent.")
+            else:
+                logger.warning(f"g_i.get_equivalent for '{input_spudcan_ref}' returned empty. Trying fallback name.")
+        except Exception as e_equiv:
+            logger.warning(f"Error using g_i.get_equivalent for '{input_spudcan_ref}': {e_equiv}. Trying fallback name.", exc_info=True)
+
+    if not ref_object_for_step_results and spudcan_output_object_name:
+        effective_object_name_for_log = spudcan_output_object_name
+        logger.info(f"Using fallback object name '{spudcan_output_object_name}' for step-by-step curve.")
+        # Common collections where a spudcan might be found
+        for collection_name in ['RigidBodies', 'Plates', 'PointLoads', 'PointDisplacements']: # Add more if needed
+            if hasattr(g_o, collection_name):
+                collection = getattr(g_o, collection_name)
+                if spudcan_output_object_name in collection:
+                    ref_object_for_step_results = collection[spudcan_output_object_name]
+                    logger.debug(f"Found '{spudcan_output_object_name}' in g_o.{collection_name}")
+                    break
+
+    return ref_object_for_step_results, effective_object_name_for_log
+
+
 def parse_load_penetration_curve(
     g_o: Any,
     g_i: Optional[Any] = None,
@@ -121,36 +171,8 @@ def parse_load_penetration_curve(
            step_disp_component_result_type and step_load_component_result_type:
             logger.info("Attempting step-by-step curve construction from object results.")
             # ... (rest of step-by-step logic, unchanged but ensure logging clarity)
-            ref_object_for_step_results = None
-            effective_object_name_for_log = "N/A"
-
-            if g_i and input_spudcan_ref and hasattr(g_i, 'get_equivalent'):
-                try:
-                    logger.info(f"Attempting to find output object via g_i.get_equivalent for input ref: {input_spudcan_ref}")
-                    equivalent_output_obj = g_i.get_equivalent(input_spudcan_ref, g_o)
-                    if isinstance(equivalent_output_obj, list) and equivalent_output_obj:
-                        ref_object_for_step_results = equivalent_output_obj[0]
-                    elif not isinstance(equivalent_output_obj, list) and equivalent_output_obj:
-                         ref_object_for_step_results = equivalent_output_obj
-                    if ref_object_for_step_results:
-                        effective_object_name_for_log = getattr(ref_object_for_step_results, "Name", str(ref_object_for_step_results))
-                        logger.info(f"Found output object '{effective_object_name_for_log}' using get_equivalent.")
-                    else:
-                        logger.warning(f"g_i.get_equivalent for '{input_spudcan_ref}' returned empty. Trying fallback name.")
-                except Exception as e_equiv:
-                    logger.warning(f"Error using g_i.get_equivalent for '{input_spudcan_ref}': {e_equiv}. Trying fallback name.", exc_info=True)
-
-            if not ref_object_for_step_results and spudcan_output_object_name:
-                effective_object_name_for_log = spudcan_output_object_name
-                logger.info(f"Using fallback object name '{spudcan_output_object_name}' for step-by-step curve.")
-                # Common collections where a spudcan might be found
-                for collection_name in ['RigidBodies', 'Plates', 'PointLoads', 'PointDisplacements']: # Add more if needed
-                    if hasattr(g_o, collection_name):
-                        collection = getattr(g_o, collection_name)
-                        if spudcan_output_object_name in collection:
-                            ref_object_for_step_results = collection[spudcan_output_object_name]
-                            logger.debug(f"Found '{spudcan_output_object_name}' in g_o.{collection_name}")
-                            break
+            ref_object_for_step_results, effective_object_name_for_log = find_output_reference_object(
+                g_o, g_i, input_spudcan_ref, spudcan_output_object_name)
 
             if not ref_object_for_step_results:
                 logger.error(f"Spudcan reference object for step-by-step curve not found (tried get_equivalent and fallback name '{spudcan_output_object_name}').")
@@ -318,7 +340,7 @@ def parse_peak_vertical_resistance(load_penetration_data: List[Dict[str, float]]
                 if peak_abs_load is None or current_abs_load > peak_abs_load:
                     peak_abs_load = current_abs_load
             else:
-                logger.debug(f"Non-numeric or missing 'load' value in point: {point}")
+                logger.debug("Non-numeric or missing 'load' value in point: %s", point)
 
         if peak_abs_load is not None:
             logger.info(f"Peak vertical resistance determined: {peak_abs_load}")
@@ -352,6 +374,23 @@ def parse_structural_forces(g_o: Any,
 
 
 # --- Main Compilation Function ---
+def _get_result_symmetry_factor(project_settings: Optional[ProjectSettings]) -> float:
+    """Factor from the modelled part to the full spudcan; 1.0 without settings."""
+    control = getattr(project_settings, 'analysis_control', None)
+    if control is None:
+        return 1.0
+    return get_symmetry_factor(control, getattr(project_settings, 'loading', None), getattr(project_settings, 'legs', None))
+
+
+def _scale_curve_to_full_spudcan(curve: List[Dict[str, Any]], symmetry_factor: float) -> List[Dict[str, Any]]:
+    """Loads of a curve of the modelled part scaled back to the full spudcan."""
+    if symmetry_factor == 1.0:
+        return curve
+    logger.info(f"  Scaled loads by symmetry factor {symmetry_factor} to the full spudcan.")
+    return [dict(item, load=item['load'] * symmetry_factor) if isinstance(item['load'], (int, float)) else item
+            for item in curve]
+
+
 def compile_analysis_results(
     raw_results_list: List[Any],
     project_settings: Optional[ProjectSettings] = None # Type hinted ProjectSettings
@@ -366,7 +405,9 @@ def compile_analysis_results(
         raw_results_list: List of results data pieces. Expected order:
                           0: Load-penetration curve data (List[Dict[str, float]])
                           1: Final penetration depth (float)
-        project_settings: Optional project settings for context (currently unused here).
+                          2..: Per-leg load-penetration curves, in `project_settings.legs` order
+        project_settings: Optional project settings. For a quarter-symmetry model, loads are
+                          scaled back to the full spudcan (see geometry_builder.get_symmetry_factor).
 
     Returns:
         An AnalysisResults object populated with the compiled data.
@@ -376,6 +417,7 @@ def compile_analysis_results(
     # from ..models import AnalysisResults # Already imported at top level
 
     compiled = AnalysisResults()
+    symmetry_factor = _get_result_symmetry_factor(project_settings)
     logger.info(f"Compiling {len(raw_results_list)} raw analysis result pieces into AnalysisResults object.")
 
     # 1. Load-penetration curve data
@@ -384,6 +426,7 @@ def compile_analysis_results(
         if isinstance(curve_data_raw, list):
             # Further check if all items are dicts with expected keys (optional, can be strict)
             if all(isinstance(item, dict) and 'penetration' in item and 'load' in item for item in curve_data_raw):
+                curve_data_raw = _scale_curve_to_full_spudcan(curve_data_raw, symmetry_factor)
                 compiled.load_penetration_curve_data = curve_data_raw
                 logger.debug(f"  Assigned load_penetration_curve_data with {len(compiled.load_penetration_curve_data)} points.")
                 # Calculate peak resistance from this curve data
@@ -412,6 +455,23 @@ def compile_analysis_results(
             logger.warning(f"  Unexpected type for final_penetration_depth (index 1): {type(final_pen_raw)}. Expected float, int, or None.")
     elif len(raw_results_list) == 1 : # Only curve data was present
         logger.warning("  Not enough data in raw_results_list to get final_penetration_depth (index 1 missing).")
+
+    # 3. Per-leg curves (multi-leg models)
+    legs = getattr(project_settings, 'legs', None) or []
+    if legs:
+        compiled.leg_results = {}
+        for leg, leg_curve_raw in zip(legs, raw_results_list[2:]):
+            leg_result = AnalysisResults()
+            if isinstance(leg_curve_raw, list) and all(isinstance(item, dict) and 'penetration' in item and 'load' in item for item in leg_curve_raw):
+                leg_curve_raw = _scale_curve_to_full_spudcan(leg_curve_raw, symmetry_factor)
+                leg_result.load_penetration_curve_data = leg_curve_raw
+                leg_result.peak_vertical_resistance = parse_peak_vertical_resistance(leg_curve_raw)
+                if leg_curve_raw and isinstance(leg_curve_raw[-1].get('penetration'), (int, float)):
+                    leg_result.final_penetration_depth = float(leg_curve_raw[-1]['penetration'])
+            else:
+                logger.warning(f"  Invalid or missing load-penetration data for leg '{leg.name}': {type(leg_curve_raw)}.")
+            compiled.leg_results[leg.name] = leg_result
+        logger.debug(f"  Assigned results for legs {list(compiled.leg_results)}.")
     # If raw_results_list is empty, already logged above.
 
 
@@ -447,8 +507,10 @@ def get_standard_results_commands(project_settings: ProjectSettings) -> List[Cal
     output_spudcan_name_fallback = getattr(ps.spudcan, 'plaxis_output_name', "Spudcan")     # Example
 
     # 1. Load-Penetration Curve
-    def get_lp_curve(g_o_param: Any, g_i_param: Optional[Any]) -> List[Dict[str, float]]:
-        logger.debug("Callable: get_lp_curve executing.")
+    def get_lp_curve(g_o_param: Any, g_i_param: Optional[Any],
+                     input_ref: Any = input_spudcan_ref_for_get_equivalent,
+                     output_name: str = output_spudcan_name_fallback) -> List[Dict[str, float]]:
+        logger.debug(f"Callable: get_lp_curve executing for '{output_name}'.")
         # Dynamically try to get common ResultType objects from g_o if available
         step_disp_type = None
         step_load_type = None
@@ -470,8 +532,8 @@ def get_standard_results_commands(project_settings: ProjectSettings) -> List[Cal
             predefined_curve_name=None,
             curve_x_axis_result_type=None,
             curve_y_axis_result_type=None,
-            input_spudcan_ref=input_spudcan_ref_for_get_equivalent,
-            spudcan_output_object_name=output_spudcan_name_fallback,
+            input_spudcan_ref=input_ref,
+            spudcan_output_object_name=output_name,
             step_disp_component_result_type=step_disp_type,
             step_load_component_result_type=step_load_type
         )
@@ -497,6 +559,14 @@ def get_standard_results_commands(project_settings: ProjectSettings) -> List[Cal
         )
     callables.append(get_final_pen)
 
+    # 3. Per-leg load-penetration curves (multi-leg models), in leg order after the standard results.
+    for leg in (getattr(ps, 'legs', None) or []):
+        leg_ref = leg_object_name(input_spudcan_ref_for_get_equivalent, leg.name)
+        leg_output = leg_object_name(output_spudcan_name_fallback, leg.name)
+        def get_leg_lp_curve(g_o_param: Any, g_i_param: Optional[Any], _ref=leg_ref, _out=leg_output) -> List[Dict[str, float]]:
+            return get_lp_curve(g_o_param, g_i_param, input_ref=_ref, output_name=_out)
+        callables.append(get_leg_lp_curve)
+
     logger.info(f"Generated {len(callables)} standard results extraction commands.")
     return callables
 
@@ -0,0 +1,372 @@
+"""
+Retry, backoff and circuit breaking for PLAXIS API requests.
+
+plxscripting's `HTTPConnection` handles failures in three ways:
+- it retries a failed request `NUMBER_OF_RETRIES` times after a fixed
+  `SECONDS_DELAY_BEFORE_RETRY`;
+- `_make_request` re-issues a request whose body is shorter than its Content-Length,
+  with no limit;
+- `_wait_for_server` polls every 0.1 s.
+Under load this gives latency spikes and, against a misbehaving server, unbounded
+recursion.
+
+`RetryPolicy` gives every retry a bounded number of attempts, exponential backoff
+with jitter and idempotency awareness:
+- read-only queries (members, namedobjects, propertyvalues, list, enumeration,
+  selection "get", exceptions "peeklast") are retried automatically;
+- commands and environment actions change the project and are only retried when
+  the connection's error mode asks for it.
+A `CircuitBreaker` per server (host, port) fails fast while PLAXIS is down. It opens
+after consecutive failures and lets one trial request through after the reset timeout.
+
+`attach_retry_policy(s_i, policy)` installs the policy on a plxscripting server's
+connection, like the session recorder and run tracer hooks. `AsyncHTTPConnection`
+takes a policy directly. Counters (attempts, retries, give-ups, breaker rejections,
+backoff time) are kept in `RetryStats` and, with a `RunTracer`, recorded on the spans
+as "retry.*" counters.
+"""
+
+import time
+import asyncio
+import random
+import types
+import socket
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Any, Tuple, Callable, TypeVar, Awaitable
+from urllib.parse import urlsplit
+
+from ..exceptions import PlaxisConnectionError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+READ_ONLY_RESOURCES = frozenset({"members", "namedobjects", "propertyvalues", "list", "enumeration", "tokenizer"})
+# PLAXIS answers script errors with 500 and a bug report: those are not transient.
+TRANSIENT_STATUS_CODES = frozenset({502, 503, 504})
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def is_idempotent(resource: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+    """True for requests that do not change the PLAXIS project (safe to repeat)."""
+    resource = resource.strip("/").rsplit("/", 1)[-1]
+    if resource in READ_ONLY_RESOURCES:
+        return True
+    action = (payload or {}).get("action", {}) if isinstance(payload, dict) else {}
+    if resource == "selection":
+        return action.get("name") == "get"
+    if resource == "exceptions":
+        return action.get("name") == "peeklast" # "getlast" clears the last exception.
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Bounded retries with exponential backoff and jitter.
+
+    Attributes:
+        max_attempts: Attempts per request, including the first (1 disables retries).
+        base_delay_s: Backoff before the first retry.
+        max_delay_s: Upper bound of a single backoff.
+        multiplier: Backoff growth per retry.
+        jitter: Fraction of each backoff that is randomised (0 = fixed delays, 1 = "full jitter").
+        retry_non_idempotent: Also retry commands/environment actions automatically.
+        connect_timeout_s: How long `wait_for_server` waits for the server port.
+    """
+    max_attempts: int = 3
+    base_delay_s: float = 0.2
+    max_delay_s: float = 5.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    retry_non_idempotent: bool = False
+    connect_timeout_s: float = 5.0
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("RetryPolicy.max_attempts must be at least 1.")
+        if not 0.0 <= self.jitter <= 1.0:
+            raise ValueError("RetryPolicy.jitter must be between 0 and 1.")
+
+    def backoff_s(self, retry: int) -> float:
+        """Delay before retry number `retry` (1-based)."""
+        delay = min(self.max_delay_s, self.base_delay_s * self.multiplier ** (retry - 1))
+        return delay * (1.0 - self.jitter) + delay * self.jitter * self.rng.random()
+
+    def should_retry(self, resource: str, payload: Optional[Dict[str, Any]], explicit: bool = False) -> bool:
+        return explicit or self.retry_non_idempotent or is_idempotent(resource, payload)
+
+
+class RetryStats:
+    """Thread-safe retry counters, optionally mirrored to a `RunTracer` as "retry.<name>"."""
+
+    NAMES = ("attempts", "retries", "giveups", "truncated_responses", "breaker_opened", "breaker_rejected",
+             "backoff_s")
+
+    def __init__(self, tracer: Optional[Any] = None):
+        self.tracer = tracer
+        self._lock = threading.Lock()
+        self._values: Dict[str, float] = {name: 0 for name in self.NAMES}
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + value
+        if self.tracer is not None:
+            self.tracer.count(f"retry.{name}", value)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast after `failure_threshold` consecutive failures, for
+    `reset_timeout_s`; then one trial request decides whether it closes again.
+    """
+
+    def __init__(self, name: str = "", failure_threshold: int = 5, reset_timeout_s: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout_s:
+                return HALF_OPEN
+            return self._state
+
+    def before_request(self, stats: Optional[RetryStats] = None) -> None:
+        """
+        Raises:
+            PlaxisConnectionError: While the breaker is open (or its trial request is in flight).
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            remaining = self.reset_timeout_s - (self._clock() - self._opened_at)
+            if remaining <= 0 and not self._trial_in_flight:
+                self._state, self._trial_in_flight = HALF_OPEN, True
+                return
+        if stats is not None:
+            stats.add("breaker_rejected")
+        raise PlaxisConnectionError(f"PLAXIS API {self.name} is unavailable (circuit open after repeated failures; "
+                                    f"retry in {max(remaining, 0.0):.1f} s).")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state, self._failures, self._trial_in_flight = CLOSED, 0, False
+
+    def record_failure(self, stats: Optional[RetryStats] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                opened = self._state != OPEN
+                self._state, self._opened_at = OPEN, self._clock()
+            else:
+                opened = False
+        if opened:
+            logger.warning(f"Circuit breaker for PLAXIS API {self.name} opened after {self._failures} failures.")
+            if stats is not None:
+                stats.add("breaker_opened")
+
+
+_breakers: Dict[Tuple[str, int], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(host: str, port: int, **settings: Any) -> CircuitBreaker:
+    """The process-wide circuit breaker of a PLAXIS server; `settings` apply when it is created."""
+    with _breakers_lock:
+        breaker = _breakers.get((host, port))
+        if breaker is None:
+            breaker = _breakers[(host, port)] = CircuitBreaker(f"{host}:{port}", **settings)
+        return breaker
+
+
+class _Attempts:
+    """Bookkeeping shared by the sync and async retry loops."""
+
+    def __init__(self, policy: RetryPolicy, resource: str, payload: Optional[Dict[str, Any]],
+                 breaker: Optional[CircuitBreaker], stats: Optional[RetryStats], explicit: bool, prior_attempts: int):
+        self.policy, self.resource, self.breaker, self.stats = policy, resource, breaker, stats
+        self.retryable = policy.should_retry(resource, payload, explicit)
+        self.total = max(1, policy.max_attempts - prior_attempts) if self.retryable else 1
+        self.prior_attempts = prior_attempts
+
+    def __iter__(self):
+        for attempt in range(1, self.total + 1):
+            if self.breaker is not None:
+                self.breaker.before_request(self.stats)
+            if self.stats is not None:
+                self.stats.add("attempts")
+            yield attempt
+
+    def succeeded(self) -> None:
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def failed(self, attempt: int) -> Optional[float]:
+        """Records a failure; returns the backoff before the next attempt, or None to give up."""
+        if self.breaker is not None:
+            self.breaker.record_failure(self.stats)
+        if attempt == self.total:
+            if self.stats is not None and self.retryable:
+                self.stats.add("giveups")
+            return None
+        delay = self.policy.backoff_s(self.prior_attempts + attempt)
+        if self.stats is not None:
+            self.stats.add("retries")
+            self.stats.add("backoff_s", delay)
+        logger.debug(f"Retrying PLAXIS {self.resource} request (attempt {attempt + 1}/{self.total}) in {delay:.3f} s.")
+        return delay
+
+
+def run_with_retries(policy: RetryPolicy, request: Callable[[], T], is_transient: Callable[[T], bool],
+                     resource: str, payload: Optional[Dict[str, Any]] = None, breaker: Optional[CircuitBreaker] = None,
+                     stats: Optional[RetryStats] = None, explicit: bool = False, prior_attempts: int = 0,
+                     errors: Tuple[type, ...] = (OSError,), sleep: Callable[[float], None] = time.sleep) -> T:
+    """
+    Runs `request` under the policy. `errors` (default OSError, which includes the
+    `requests` connection errors) and results for which `is_transient` is true count as
+    failures. They are retried if the request may be retried (`explicit` forces that),
+    otherwise raised/returned as they are; the last transient result is returned when the
+    attempts run out. `prior_attempts` were already spent by the caller.
+    """
+    attempts = _Attempts(policy, resource, payload, breaker, stats, explicit, prior_attempts)
+    for attempt in attempts:
+        try:
+            result = request()
+        except errors:
+            delay = attempts.failed(attempt)
+            if delay is None:
+                raise
+        else:
+            if not is_transient(result):
+                attempts.succeeded()
+                return result
+            delay = attempts.failed(attempt)
+            if delay is None:
+                return result
+        sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def run_with_retries_async(policy: RetryPolicy, request: Callable[[], Awaitable[T]],
+                                 is_transient: Callable[[T], bool], resource: str,
+                                 payload: Optional[Dict[str, Any]] = None, breaker: Optional[CircuitBreaker] = None,
+                                 stats: Optional[RetryStats] = None, explicit: bool = False,
+                                 errors: Tuple[type, ...] = (OSError,)) -> T:
+    """`run_with_retries` for coroutines; backs off with `asyncio.sleep`."""
+    attempts = _Attempts(policy, resource, payload, breaker, stats, explicit, 0)
+    for attempt in attempts:
+        try:
+            result = await request()
+        except errors:
+            delay = attempts.failed(attempt)
+            if delay is None:
+                raise
+        else:
+            if not is_transient(result):
+                attempts.succeeded()
+                return result
+            delay = attempts.failed(attempt)
+            if delay is None:
+                return result
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def wait_for_server(host: str, port: int, policy: RetryPolicy, stats: Optional[RetryStats] = None,
+                    sleep: Callable[[float], None] = time.sleep) -> bool:
+    """
+    Waits (with backoff, not a busy poll) until `host:port` accepts TCP connections
+    or `policy.connect_timeout_s` passes. Returns whether the server is reachable.
+    """
+    deadline = time.monotonic() + policy.connect_timeout_s
+    retry = 0
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=max(0.1, min(1.0, deadline - time.monotonic()))):
+                return True
+        except OSError:
+            retry += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            delay = min(policy.backoff_s(retry), remaining)
+            if stats is not None:
+                stats.add("backoff_s", delay)
+            sleep(delay)
+
+
+def _status_is_transient(response: Any) -> bool:
+    return getattr(response, "status_code", 200) in TRANSIENT_STATUS_CODES
+
+
+def attach_retry_policy(server: Any, policy: RetryPolicy, breaker: Optional[CircuitBreaker] = None,
+                        stats: Optional[RetryStats] = None) -> bool:
+    """
+    Installs `policy` on the connection of a plxscripting server (`s_i`/`s_o`):
+    - requests go through `run_with_retries`;
+    - the fixed-delay `_retry_request` only runs the policy when the error mode asks for retries;
+    - truncated responses are re-requested at most `max_attempts - 1` times.
+    Returns False if `server` has no plxscripting connection (e.g. a mock).
+    """
+    connection = getattr(server, "connection", None)
+    send = getattr(connection, "_send_request_and_get_response", None)
+    if not isinstance(send, types.MethodType) or not hasattr(connection, "session"):
+        return False
+    host, port = getattr(connection, "host", ""), getattr(connection, "port", 0)
+    breaker = breaker if breaker is not None else breaker_for(host, int(port or 0))
+    stats = stats if stats is not None else RetryStats()
+
+    def send_with_policy(operation_address: str, payload: Dict[str, Any]) -> Any:
+        resource = urlsplit(operation_address).path
+        return run_with_retries(policy, lambda: send(operation_address, payload.copy()), _status_is_transient,
+                                resource, payload, breaker, stats)
+
+    def retry_request(operation_address: str, payload: Dict[str, Any]) -> Optional[Any]:
+        # Only called after a 500 (a PLAXIS script error) and only acted on when the error
+        # mode asks for retries. The first attempt is spent; the breaker is left alone, as the
+        # server itself is up.
+        if not getattr(getattr(connection, "error_mode", None), "should_retry", False):
+            return None
+        time.sleep(policy.backoff_s(1))
+        response = run_with_retries(policy, lambda: send(operation_address, payload.copy()),
+                                    lambda r: not getattr(r, "ok", False), urlsplit(operation_address).path, payload,
+                                    None, stats, explicit=True, prior_attempts=1)
+        return response if getattr(response, "ok", False) else None
+
+    def bounded_make_request(operation_address: str, json_payload: str) -> Any:
+        session = connection.session
+        for attempt in range(1, policy.max_attempts + 1):
+            response = session.post(operation_address, data=json_payload, headers={"content-type": "application/json"},
+                                    timeout=connection.request_timeout)
+            content_length = response.headers.get("content-length")
+            if not content_length or len(response.content) == int(content_length):
+                return response
+            stats.add("truncated_responses")
+            if attempt < policy.max_attempts:
+                time.sleep(policy.backoff_s(attempt))
+        raise PlaxisConnectionError(f"PLAXIS API {host}:{port} returned truncated responses "
+                                    f"{policy.max_attempts} times for {operation_address}.")
+
+    connection._send_request_and_get_response = send_with_policy
+    connection._retry_request = retry_request
+    connection._make_request = bounded_make_request
+    connection.retry_stats = stats
+    return True
@@ -0,0 +1,344 @@
+"""
+Record PLAXIS API sessions and replay them from a local HTTP server.
+
+Recording: `SessionRecorder.attach(s_i, "input")` installs a request logger on the
+plxscripting `HTTPConnection` (the `connection.logger` hook that `Server.enable_logging`
+also uses). That hook sees every request payload and response after decryption,
+together with the time PLAXIS took to answer. The recorder appends them to a gzipped
+JSONL archive. Encryption reply codes are stripped, so archives can be replayed without
+a password.
+
+Replay: `ReplayServer(archive, "input")` serves the recorded responses over HTTP. It
+matches requests on (endpoint, request JSON), and repeated identical requests get the
+recorded responses in recorded order. Latency can be injected as a multiple of the
+recorded response times plus a fixed delay. Pointing the interactor at a replay server
+(API password "" in the project settings, ports of the replay servers) runs the whole
+pipeline without PLAXIS. This works as long as the client sends the same requests as
+in the recorded session.
+
+Archive format (gzip, one JSON object per line):
+    {"type": "header", "format_version": 1, "recorded_at": ...}
+    {"type": "exchange", "channel": "input", "seq": 0, "endpoint": "/members",
+     "request": "<json>", "status": 200, "reason": "OK", "headers": {...},
+     "body": "<response text>", "elapsed_s": 0.012}
+
+Usage:
+    python -m src.backend.plaxis_interactor.session_replay info session.plxrec.gz
+    python -m src.backend.plaxis_interactor.session_replay serve session.plxrec.gz \\
+        --port input=10000 --port output=10001 [--latency-scale 1.0] [--fixed-latency 0.005]
+"""
+
+import sys
+import gzip
+import json
+import time
+import logging
+import datetime
+import argparse
+import threading
+from collections import deque, Counter
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Any, Deque, Tuple, Sequence
+from urllib.parse import urlsplit
+
+from ..exceptions import ProjectValidationError
+
+logger = logging.getLogger(__name__)
+
+SESSION_ARCHIVE_FORMAT_VERSION = 1
+REPLY_CODE_KEY = "ReplyCode" # plxscripting const.JSON_KEY_REPLY_CODE; random per encrypted request.
+RECORDED_HEADERS = ("Content-Type", "Server")
+
+
+@dataclass
+class Exchange:
+    """One recorded request/response pair (both decrypted)."""
+    channel: str
+    seq: int
+    endpoint: str
+    request: str
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    body: str
+    elapsed_s: float
+
+
+def normalize_request(payload: str) -> str:
+    """Canonical form of a request payload for matching (sorted keys, no reply code)."""
+    try:
+        data = json.loads(payload) if payload else None
+    except json.JSONDecodeError:
+        return payload
+    if isinstance(data, dict):
+        data.pop(REPLY_CODE_KEY, None)
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def _strip_reply_code(text: str) -> str:
+    if REPLY_CODE_KEY not in text:
+        return text
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return text
+    if isinstance(data, dict) and data.pop(REPLY_CODE_KEY, None) is not None:
+        return json.dumps(data)
+    return text
+
+
+class _RecordingHook:
+    """`HTTPConnection.logger` that records exchanges, forwarding to a wrapped logger if present."""
+
+    def __init__(self, recorder: "SessionRecorder", channel: str, wrapped: Optional[Any] = None):
+        self._recorder = recorder
+        self._channel = channel
+        self._wrapped = wrapped
+        self._local = threading.local()
+
+    def log_request_start(self, payload: str) -> None:
+        self._local.payload = payload
+        self._local.start = time.perf_counter()
+        if self._wrapped is not None:
+            self._wrapped.log_request_start(payload)
+
+    def log_request_end(self, response: Any) -> None:
+        elapsed = time.perf_counter() - getattr(self._local, "start", time.perf_counter())
+        self._recorder.record(self._channel, getattr(self._local, "payload", ""), response, elapsed)
+        if self._wrapped is not None:
+            self._wrapped.log_request_end(response)
+
+
+class SessionRecorder:
+    """
+    Appends the exchanges of attached plxscripting connections to a session archive.
+
+    Raises:
+        ProjectValidationError: If the archive cannot be created.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._seq: Counter = Counter()
+        try:
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+        except OSError as e:
+            raise ProjectValidationError(f"Could not create session archive '{path}': {e}")
+        self._write({"type": "header", "format_version": SESSION_ARCHIVE_FORMAT_VERSION,
+                     "recorded_at": datetime.datetime.now().isoformat(timespec="seconds")})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def attach(self, server: Any, channel: str) -> bool:
+        """Records the traffic of a plxscripting server (`s_i`/`s_o`) as `channel`. False if not a real server."""
+        connection = getattr(server, "connection", None)
+        if connection is None or not hasattr(connection, "logger"):
+            return False
+        connection.logger = _RecordingHook(self, channel, connection.logger)
+        return True
+
+    def record(self, channel: str, payload: str, response: Any, elapsed_s: float) -> None:
+        headers = getattr(response, "headers", {}) or {}
+        with self._lock:
+            if self._file is None:
+                return
+            exchange = Exchange(
+                channel=channel, seq=self._seq[channel], endpoint=urlsplit(getattr(response, "url", "") or "").path or "/",
+                request=normalize_request(payload), status=int(getattr(response, "status_code", 200)),
+                reason=str(getattr(response, "reason", "") or ""),
+                headers={k: headers[k] for k in RECORDED_HEADERS if k in headers},
+                body=_strip_reply_code(getattr(response, "text", "") or ""), elapsed_s=round(elapsed_s, 6))
+            self._seq[channel] += 1
+            self._write({"type": "exchange", **asdict(exchange)})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_session(path: str) -> List[Exchange]:
+    """
+    Reads all exchanges of a session archive.
+
+    Raises:
+        ProjectValidationError: If the archive is unreadable, malformed or of an unsupported version.
+    """
+    exchanges: List[Exchange] = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                kind = record.pop("type", None)
+                if kind == "header":
+                    version = record.get("format_version")
+                    if not isinstance(version, int) or version > SESSION_ARCHIVE_FORMAT_VERSION:
+                        raise ProjectValidationError(
+                            f"Unsupported session archive format version {version} (supported: <= {SESSION_ARCHIVE_FORMAT_VERSION}).")
+                elif kind == "exchange":
+                    exchanges.append(Exchange(**record))
+    except (OSError, EOFError, json.JSONDecodeError, TypeError) as e:
+        raise ProjectValidationError(f"Could not read session archive '{path}': {e}")
+    return exchanges
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: "_ReplayHTTPServer"
+    protocol_version = "HTTP/1.1" # Keep-alive, like the PLAXIS server and requests.Session.
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length).decode("utf-8") if length else ""
+        exchange = self.server.replay.next_response(urlsplit(self.path).path, payload)
+        if exchange is None:
+            body = json.dumps({"error": "request not in recorded session"}).encode("utf-8")
+            self.send_response(404, "Request not in recorded session")
+            self.send_header("Content-Type", "application/json")
+        else:
+            delay = self.server.replay.delay_for(exchange)
+            if delay > 0:
+                time.sleep(delay)
+            body = exchange.body.encode("utf-8")
+            self.send_response(exchange.status, exchange.reason or None)
+            for name, value in exchange.headers.items():
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args): # Routed to logging instead of stderr.
+        logger.debug("Replay server: " + format, *args)
+
+
+class _ReplayHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    replay: "ReplayServer"
+
+
+class ReplayServer:
+    """
+    Serves the exchanges of one channel of a recorded session over HTTP.
+
+    Args:
+        exchanges: Recorded exchanges (e.g. from `load_session`); other channels are ignored.
+        channel: The channel to serve ("input" or "output").
+        host, port: Address to listen on; port 0 picks a free port (see `port`).
+        latency_scale: Each response is delayed by its recorded time multiplied by this factor.
+        fixed_latency_s: Additional delay per response.
+    """
+
+    def __init__(self, exchanges: Sequence[Exchange], channel: str = "input", host: str = "127.0.0.1", port: int = 0,
+                 latency_scale: float = 0.0, fixed_latency_s: float = 0.0):
+        self.channel = channel
+        self.latency_scale = latency_scale
+        self.fixed_latency_s = fixed_latency_s
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str], Deque[Exchange]] = {}
+        self._last: Dict[Tuple[str, str], Exchange] = {}
+        self.served = 0
+        self.misses = 0
+        for exchange in sorted((e for e in exchanges if e.channel == channel), key=lambda e: e.seq):
+            self._queues.setdefault((exchange.endpoint, exchange.request), deque()).append(exchange)
+        self._httpd = _ReplayHTTPServer((host, port), _ReplayHandler)
+        self._httpd.replay = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def next_response(self, endpoint: str, payload: str) -> Optional[Exchange]:
+        """Next recorded response for this request; the last one is repeated once they are used up."""
+        key = (endpoint, normalize_request(payload))
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                exchange = self._last[key] = queue.popleft()
+            else:
+                exchange = self._last.get(key)
+            if exchange is None:
+                self.misses += 1
+                logger.warning(f"Replay server ({self.channel}): unrecorded request to {endpoint}: {payload[:200]}")
+            else:
+                self.served += 1
+            return exchange
+
+    def delay_for(self, exchange: Exchange) -> float:
+        return exchange.elapsed_s * self.latency_scale + self.fixed_latency_s
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"ReplayServer-{self.channel}", daemon=True)
+        self._thread.start()
+        logger.info(f"Replay server ({self.channel}) listening on port {self.port}.")
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _session_summary(exchanges: Sequence[Exchange]) -> str:
+    lines = []
+    for channel in sorted({e.channel for e in exchanges}):
+        channel_exchanges = [e for e in exchanges if e.channel == channel]
+        elapsed = sum(e.elapsed_s for e in channel_exchanges)
+        size = sum(len(e.request) + len(e.body) for e in channel_exchanges)
+        lines.append(f"{channel}: {len(channel_exchanges)} requests, {elapsed:.3f} s server time, {size / 1024.0:.1f} KB payload")
+        for endpoint, count in Counter(e.endpoint for e in channel_exchanges).most_common():
+            lines.append(f"  {endpoint:<30} {count:>7}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or replay a recorded PLAXIS API session.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Summarise a session archive.")
+    info.add_argument("archive")
+    serve = sub.add_parser("serve", help="Serve a session archive until interrupted.")
+    serve.add_argument("archive")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", action="append", default=[], metavar="CHANNEL=PORT",
+                       help="Channel to serve and its port (default: input=10000 output=10001).")
+    serve.add_argument("--latency-scale", type=float, default=0.0)
+    serve.add_argument("--fixed-latency", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    try:
+        exchanges = load_session(args.archive)
+    except ProjectValidationError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if args.command == "info":
+        print(_session_summary(exchanges))
+        return 0
+
+    ports = dict(item.split("=", 1) for item in (args.port or ["input=10000", "output=10001"]))
+    servers = [ReplayServer(exchanges, channel, args.host, int(port), args.latency_scale, args.fixed_latency).start()
+               for channel, port in ports.items()]
+    print(", ".join(f"{s.channel} on {args.host}:{s.port}" for s in servers) + ". Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for s in servers:
+            s.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
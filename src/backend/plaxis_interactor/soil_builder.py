@@ -9,14 +9,69 @@ or build the soil stratigraphy within a borehole.
 """
 
 import logging
-from ..models import SoilLayer, MaterialProperties
+import dataclasses
+from ..models import SoilLayer, MaterialProperties, Borehole
 from ..exceptions import PlaxisConfigurationError # Import custom exception
-from typing import List, Callable, Any, Optional
+from .command_batch import CommandBatch, prefetch_members
+from typing import List, Callable, Any, Optional, Dict
 
 logger = logging.getLogger(__name__)
 
 # --- Material Definition ---
 
+# MaterialProperties attribute -> PLAXIS property name, in the order they are set.
+_MATERIAL_PROPERTY_KEYS = (
+    ("gammaUnsat", "gammaUnsat"), ("gammaSat", "gammaSat"), ("eInit", "eInit"),
+    # Common to MohrCoulomb / HardeningSoil / SoftSoil
+    ("Eref", "ERef"), ("nu", "nu"), ("cRef", "cRef"), ("phi", "phi"), ("psi", "psi"),
+    # Hardening Soil ('nu' for HS is often nu_ur, handled by the common 'nu' for now)
+    ("E50ref", "E50Ref"), ("Eoedref", "EoedRef"), ("Eurref", "EurRef"), ("m", "m"),
+    ("pRef", "pRef"), ("K0NC", "K0NC"), ("Rf", "Rf"),
+    # Soft Soil (PLAXIS uses lambda* / kappa*)
+    ("lambda_star", "lambda*"), ("kappa_star", "kappa*"),
+    # Depth-dependent strength/stiffness (Mohr-Coulomb advanced)
+    ("cInc", "cInc"), ("EInc", "EInc"), ("z_ref", "zRef"),
+)
+
+
+def build_material_property_map(material_model: MaterialProperties, material_name: str) -> Dict[str, Any]:
+    """
+    Maps a material to the PLAXIS properties to set, in order: Identification,
+    SoilModel, the direct attributes, then `other_params`. An `other_params` key
+    that matches an already set property (case-insensitively) does not override it.
+    """
+    props_to_set: Dict[str, Any] = {
+        "Identification": material_name,
+        "SoilModel": material_model.model_name.replace(" ", "") if material_model.model_name else "MohrCoulomb",
+    }
+    for attr_name, plaxis_key in _MATERIAL_PROPERTY_KEYS:
+        value = getattr(material_model, attr_name)
+        if value is not None:
+            props_to_set[plaxis_key] = value
+
+    if material_model.other_params:
+        set_keys_lower = {k.lower(): k for k in props_to_set} # Built once; O(1) lookups below.
+        for key, value in material_model.other_params.items():
+            if value is None:
+                continue
+            existing_key = set_keys_lower.get(key.lower())
+            if existing_key is None:
+                props_to_set[key] = value
+                set_keys_lower[key.lower()] = key
+            elif props_to_set[existing_key] != value:
+                logger.warning(f"  Parameter '{key}' from other_params conflicts with a direct attribute for '{material_name}'. Using direct attribute's value.")
+    return props_to_set
+
+
+def flatten_property_map(props_to_set: Dict[str, Any]) -> List[Any]:
+    """{'a': 1, 'b': 2} -> ['a', 1, 'b', 2], the argument layout of soilmat/setproperties."""
+    params_flat: List[Any] = []
+    for key, value in props_to_set.items():
+        params_flat.append(key)
+        params_flat.append(value)
+    return params_flat
+
+
 def generate_material_callables(material_model: MaterialProperties) -> List[Callable[[Any], None]]:
     """
     Generates a list of Python callables for defining a single soil material in PLAXIS.
@@ -40,6 +95,8 @@ def generate_material_callables(material_model: MaterialProperties) -> List[Call
         logger.error(msg)
         raise PlaxisConfigurationError(msg)
 
+    props_to_set = build_material_property_map(material_model, sanitized_mat_name)
+    params_flat = flatten_property_map(props_to_set)
 
     logger.info(f"Preparing material callables for '{sanitized_mat_name}' (PLAXIS Model: {material_model.model_name or 'DefaultMohrCoulomb'})")
 
@@ -47,66 +104,12 @@ def generate_material_callables(material_model: MaterialProperties) -> List[Call
         logger.info(f"API CALL: Creating material '{sanitized_mat_name}' with model '{material_model.model_name or 'DefaultMohrCoulomb'}'.")
         try:
             mat_obj = g_i.soilmat()
-            logger.debug(f"  Material object created via g_i.soilmat() for '{sanitized_mat_name}'.")
+            logger.debug("  Material object created via g_i.soilmat() for '%s'.", sanitized_mat_name)
         except Exception as e:
             logger.error(f"  ERROR: Failed to create material object for '{sanitized_mat_name}' using g_i.soilmat(): {e}", exc_info=True)
             raise # Re-raise to be mapped by PlaxisInteractor
 
-        logger.debug(f"  Setting properties for material '{sanitized_mat_name}'...")
-        props_to_set: Dict[str, Any] = {}
-        props_to_set["Identification"] = sanitized_mat_name
-
-        if material_model.model_name:
-            plaxis_model_name = material_model.model_name.replace(" ", "")
-            props_to_set["SoilModel"] = plaxis_model_name
-        else:
-            props_to_set["SoilModel"] = "MohrCoulomb"
-
-        if material_model.gammaUnsat is not None: props_to_set["gammaUnsat"] = material_model.gammaUnsat
-        if material_model.gammaSat is not None: props_to_set["gammaSat"] = material_model.gammaSat
-
-        if material_model.eInit is not None: props_to_set["eInit"] = material_model.eInit
-
-        if material_model.Eref is not None: props_to_set["ERef"] = material_model.Eref # Common, mapped
-        if material_model.nu is not None: props_to_set["nu"] = material_model.nu # Common
-        if material_model.cRef is not None: props_to_set["cRef"] = material_model.cRef # Common
-        if material_model.phi is not None: props_to_set["phi"] = material_model.phi # Common
-        if material_model.psi is not None: props_to_set["psi"] = material_model.psi # Common
-
-        # Hardening Soil specific parameters - map to typical PLAXIS API names
-        if material_model.E50ref is not None: props_to_set["E50Ref"] = material_model.E50ref
-        if material_model.Eoedref is not None: props_to_set["EoedRef"] = material_model.Eoedref
-        if material_model.Eurref is not None: props_to_set["EurRef"] = material_model.Eurref # Common mapping EurRef or EURRef
-        if material_model.m is not None: props_to_set["m"] = material_model.m
-        if material_model.pRef is not None: props_to_set["pRef"] = material_model.pRef # often p_ref or pref
-        if material_model.K0NC is not None: props_to_set["K0NC"] = material_model.K0NC
-        if material_model.Rf is not None: props_to_set["Rf"] = material_model.Rf
-        # 'nu' for HS is often nu_ur, handled by the common 'nu' for now.
-
-        # Soft Soil specific parameters - map to typical PLAXIS API names
-        if material_model.lambda_star is not None: props_to_set["lambda*"] = material_model.lambda_star # PLAXIS uses lambda*
-        if material_model.kappa_star is not None: props_to_set["kappa*"] = material_model.kappa_star   # PLAXIS uses kappa*
-        # SoftSoil also uses cRef, phi, psi, nu which are covered by common properties.
-
-        # Always process other_params last so they can override if specific model params are also put there by mistake
-        if material_model.other_params:
-            for key, value in material_model.other_params.items():
-                if value is not None:
-                    # Basic check to avoid overwriting already set standard/known params if key matches case-insensitively
-                    # and the standard param was already set from a direct attribute.
-                    # This is a simple safeguard; more robust handling might involve a predefined list of "standard" keys.
-                    already_set_keys_lower = {k.lower() for k in props_to_set.keys()}
-                    if key.lower() not in already_set_keys_lower or props_to_set.get(key) is None : # Allow override if standard was None
-                        props_to_set[key] = value
-                    elif props_to_set.get(key) != value : # If standard was set and other_params has different value
-                        logger.warning(f"  Parameter '{key}' from other_params conflicts with a direct attribute for '{sanitized_mat_name}'. Using direct attribute's value.")
-            logger.debug(f"  Processed other_params for '{sanitized_mat_name}'.")
-
-        params_flat = []
-        for key, value in props_to_set.items():
-            params_flat.append(key)
-            params_flat.append(value)
-
+        logger.debug("  Setting properties for material '%s'...", sanitized_mat_name)
         try:
             g_i.setproperties(mat_obj, *params_flat)
             logger.info(f"  Properties set for material '{sanitized_mat_name}'. Applied: {props_to_set}")
@@ -118,8 +121,183 @@ def generate_material_callables(material_model: MaterialProperties) -> List[Call
     callables.append(create_and_set_material_props_callable)
     return callables
 
+def generate_bulk_material_callables(materials: List[MaterialProperties]) -> List[Callable[[Any], None]]:
+    """
+    Generates a single callable that creates all `materials` in one pipelined command
+    request (see `command_batch.CommandBatch`). Each material is one `soilmat` command
+    carrying its properties, instead of a `soilmat()` + `setproperties` round trip pair.
+    Materials with a name already in the list are skipped; property maps are built here,
+    so the callable only issues commands.
+
+    Raises:
+        PlaxisConfigurationError: If a material has neither Identification nor model_name.
+    """
+    material_params: Dict[str, List[Any]] = {} # name -> flat soilmat parameters, first occurrence wins
+    for material_model in materials:
+        if not (material_model.Identification or material_model.model_name):
+            msg = "MaterialProperties must have either 'Identification' or 'model_name' specified."
+            logger.error(msg)
+            raise PlaxisConfigurationError(msg)
+        name = _layer_material_name(material_model)
+        if name not in material_params:
+            material_params[name] = flatten_property_map(build_material_property_map(material_model, name))
+    logger.info(f"Preparing bulk material creation for {len(material_params)} materials: {list(material_params)}")
+
+    def create_materials_batch_callable(g_i: Any) -> None:
+        logger.info(f"API CALL: Creating {len(material_params)} materials in one command batch.")
+        batch = CommandBatch(g_i)
+        for params_flat in material_params.values():
+            batch.add("soilmat", *params_flat)
+        try:
+            batch.execute()
+            logger.info(f"  Materials created{' (pipelined)' if batch.pipelined else ''}: {list(material_params)}")
+        except Exception as e: # Catch PlxScriptingError or other Python errors
+            logger.error(f"  ERROR: Failed to create materials {list(material_params)}: {e}", exc_info=True)
+            raise # Re-raise to be mapped by PlaxisInteractor
+
+    return [create_materials_batch_callable]
+
+
+def generate_stratigraphy_material_callables(soil_layers: List[SoilLayer]) -> List[Callable[[Any], None]]:
+    """
+    Generates the material callable for all layers of a stratigraphy, creating each
+    material (by Identification, or model_name if no ID) only once, in one command batch.
+    """
+    if not soil_layers:
+        return []
+    return generate_bulk_material_callables([layer.material for layer in soil_layers])
+
 # --- Soil Stratigraphy Definition ---
 
+def clip_soil_layers_to_depth(soil_layers: List[SoilLayer], depth: Optional[float]) -> List[SoilLayer]:
+    """
+    Returns the layers above `depth` (meters below the seabed), with the last layer
+    shortened so the stratigraphy ends exactly at `depth`. Layers entirely below are
+    dropped. The input layers are not modified. If `depth` is None, or the stratigraphy
+    is not deeper than `depth`, the layers are returned unchanged.
+    """
+    if depth is None or depth <= 0:
+        return list(soil_layers)
+    clipped: List[SoilLayer] = []
+    top = 0.0
+    for layer in soil_layers:
+        if top >= depth:
+            break
+        if layer.thickness is None: # Left for generate_soil_stratigraphy_callables to reject.
+            clipped.append(layer)
+            continue
+        bottom = top + layer.thickness
+        if bottom > depth:
+            clipped.append(dataclasses.replace(layer, thickness=depth - top))
+            logger.debug("  Layer '%s' clipped to %.3f m at model bottom (%.3f m).", layer.name, depth - top, depth)
+        else:
+            clipped.append(layer)
+        top = bottom
+    if len(clipped) < len(soil_layers):
+        logger.info(f"Stratigraphy clipped to model depth {depth:.2f} m: {len(soil_layers) - len(clipped)} layer(s) below the model bottom dropped.")
+    return clipped
+
+
+def is_depth_dependent(material_model: MaterialProperties) -> bool:
+    """True if the material's strength or stiffness increases with depth (cInc/EInc)."""
+    return bool(material_model.cInc or material_model.EInc)
+
+
+def resolve_depth_reference_levels(soil_layers: List[SoilLayer]) -> List[SoilLayer]:
+    """
+    Returns the layers with `z_ref` of depth-dependent materials set to the top
+    elevation of their layer where it was left unset. A material shared by layers at
+    different depths thus becomes distinct materials (with different zRef), which the
+    material library keeps apart. The input layers are not modified.
+    """
+    resolved: List[SoilLayer] = []
+    top = 0.0
+    for layer in soil_layers:
+        if layer.material.z_ref is None and is_depth_dependent(layer.material):
+            layer = dataclasses.replace(layer, material=dataclasses.replace(layer.material, z_ref=top))
+        resolved.append(layer)
+        top -= layer.thickness or 0.0
+    return resolved
+
+
+def _linear_fit(xs: List[float], ys: List[float]) -> tuple:
+    """Least-squares (intercept, slope, max abs residual) of ys over xs."""
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx if sxx > 0 else 0.0
+    intercept = mean_y - slope * mean_x
+    return intercept, slope, max(abs(intercept + slope * x - y) for x, y in zip(xs, ys))
+
+
+def _gradient_base(material_model: MaterialProperties) -> MaterialProperties:
+    """The material without the parameters a gradient layer replaces; equal bases can be merged."""
+    return dataclasses.replace(material_model, Identification=None, cRef=None, Eref=None, cInc=None, EInc=None, z_ref=None)
+
+
+def merge_linear_gradient_layers(
+    soil_layers: List[SoilLayer],
+    tolerance: float = 0.05,
+    min_layers: int = 3
+) -> List[SoilLayer]:
+    """
+    Replaces runs of at least `min_layers` consecutive layers that differ only in cRef
+    (and Eref), with values varying linearly with depth, by one layer with cRef/cInc
+    (and Eref/EInc) at the top of the run. A run is linear if every layer's value at
+    its mid-depth is within `tolerance` (relative to the largest value) of the fit.
+    Only runs whose fitted values do not decrease with depth and are non-negative at the
+    top are merged, as PLAXIS applies cInc/EInc as an increase below zRef. Layers that
+    already use cInc/EInc are left as they are. The input is not modified.
+    """
+    merged: List[SoilLayer] = []
+    i = 0
+    while i < len(soil_layers):
+        first = soil_layers[i]
+        if first.thickness is None or first.material.cRef is None or is_depth_dependent(first.material):
+            merged.append(first)
+            i += 1
+            continue
+        base = _gradient_base(first.material)
+        tops = [0.0]
+        best_end, best_fit = i + 1, None
+        j = i
+        while j < len(soil_layers):
+            layer = soil_layers[j]
+            if (layer.thickness is None or layer.material.cRef is None or is_depth_dependent(layer.material)
+                    or _gradient_base(layer.material) != base
+                    or (layer.material.Eref is None) != (first.material.Eref is None)):
+                break
+            run = soil_layers[i:j + 1]
+            mids = [tops[k] + run[k].thickness / 2.0 for k in range(len(run))]
+            fits = [_linear_fit(mids, [l.material.cRef for l in run])]
+            if first.material.Eref is not None:
+                fits.append(_linear_fit(mids, [l.material.Eref for l in run]))
+            scales = [max(abs(l.material.cRef) for l in run) or 1.0]
+            if first.material.Eref is not None:
+                scales.append(max(abs(l.material.Eref) for l in run) or 1.0)
+            if any(fit[2] / scale > tolerance for fit, scale in zip(fits, scales)):
+                break
+            if all(intercept >= 0.0 and slope >= 0.0 for intercept, slope, _ in fits):
+                best_end, best_fit = j + 1, fits
+            tops.append(tops[-1] + layer.thickness)
+            j += 1
+
+        if best_end - i < min_layers or best_fit is None:
+            merged.append(first)
+            i += 1
+            continue
+        run = soil_layers[i:best_end]
+        (c_top, c_inc, _), *e_fit = best_fit
+        material = dataclasses.replace(first.material, cRef=round(c_top, 3), cInc=round(c_inc, 4), z_ref=None)
+        if e_fit:
+            material = dataclasses.replace(material, Eref=round(e_fit[0][0], 1), EInc=round(e_fit[0][1], 2))
+        merged.append(SoilLayer(name=first.name, thickness=sum(l.thickness for l in run), material=material))
+        logger.info(f"Merged {len(run)} layers '{run[0].name}'..'{run[-1].name}' into one gradient layer "
+                    f"(cRef={material.cRef}, cInc={material.cInc}).")
+        i = best_end
+    return merged
+
+
 def generate_soil_stratigraphy_callables(
     soil_layers: List[SoilLayer],
     water_table_depth: Optional[float],
@@ -146,6 +324,13 @@ def generate_soil_stratigraphy_callables(
              logger.error(msg)
              raise PlaxisConfigurationError(msg)
 
+    # Boundary elevations (top first) and layer materials, computed up front so the
+    # callable only issues commands.
+    levels = [0.0]
+    for layer_model in soil_layers:
+        levels.append(levels[-1] - layer_model.thickness)
+    material_names = [_layer_material_name(layer_model.material) for layer_model in soil_layers]
+    water_head_elevation = -abs(water_table_depth) if water_table_depth is not None else None
 
     def create_borehole_and_layers_callable(g_i: Any) -> None:
         logger.info(f"API CALL: Creating borehole '{borehole_name}' at ({borehole_coords[0]}, {borehole_coords[1]})")
@@ -157,81 +342,194 @@ def generate_soil_stratigraphy_callables(
             logger.error(f"  ERROR: Failed to create borehole '{borehole_name}': {e}", exc_info=True)
             raise # Re-raise to be mapped by PlaxisInteractor
 
-        if not soil_layers: # Should not happen if validation above is strict, but good check
-            logger.warning(f"  No soil layers provided for borehole '{borehole_name}'. Borehole created empty.")
-            # Set water head even for empty borehole if specified
-            if water_table_depth is not None and hasattr(bh, 'Head'):
-                water_head_elevation = -abs(water_table_depth)
-                try:
-                    g_i.set(bh.Head, water_head_elevation)
-                    logger.info(f"  Set water head for empty borehole '{borehole_name}' at Z={water_head_elevation:.2f}")
-                except Exception as e_wh:
-                    logger.error(f"  ERROR: Failed to set water head for empty borehole '{borehole_name}': {e_wh}", exc_info=True)
-            return
-
-        logger.info(f"  Adding {len(soil_layers)} soil layers to borehole '{borehole_name}' by thickness...")
-        for i, layer_model in enumerate(soil_layers):
-            # Thickness already validated
-            try:
-                g_i.soillayer(bh, layer_model.thickness) # type: ignore
-                logger.debug(f"    Added layer {i+1} ('{layer_model.name}') of thickness {layer_model.thickness}m.")
-            except Exception as e: # Catch PlxScriptingError or other Python errors
-                logger.error(f"  ERROR: Failed to add layer {i+1} ('{layer_model.name}') to borehole '{borehole_name}': {e}", exc_info=True)
-                # Depending on severity, might want to raise here or try to continue
-
-        current_z_elevation = 0.0
-        logger.info(f"  Setting soil layer levels and materials for borehole '{borehole_name}'...")
+        batch = CommandBatch(g_i)
         try:
-            g_i.setsoillayerlevel(bh, 0, current_z_elevation)
-            logger.debug(f"    Set top of stratigraphy (Level 0) for '{borehole_name}' at Z={current_z_elevation:.2f}")
-        except Exception as e:
-            logger.error(f"  ERROR: Failed to set top level for borehole '{borehole_name}': {e}", exc_info=True)
-            raise # Re-raise, this is critical
-
-        valid_layers_processed_for_level_setting = 0
-        for i, layer_model in enumerate(soil_layers):
-            # Thickness already validated, material name/ID also validated
-            material_props = layer_model.material
-            sanitized_mat_name = material_props.Identification or \
-                                 ("".join(c if c.isalnum() else '_' for c in (material_props.model_name or 'DefaultMat'))) # Fallback logic for name
-            if not sanitized_mat_name or (sanitized_mat_name[0].isdigit() and len(sanitized_mat_name) > 0):
-                sanitized_mat_name = "Mat_" + sanitized_mat_name
-            if not sanitized_mat_name : sanitized_mat_name = "UnnamedMaterialForLayer"
-
-
-            current_z_elevation -= layer_model.thickness # type: ignore
-            layer_index_in_plaxis_list = valid_layers_processed_for_level_setting
-            level_index_for_boundary = valid_layers_processed_for_level_setting + 1
-
-            try:
-                g_i.setsoillayerlevel(bh, level_index_for_boundary, current_z_elevation)
-                if hasattr(bh, 'SoilLayers') and bh.SoilLayers and layer_index_in_plaxis_list < len(bh.SoilLayers):
-                    plaxis_layer_obj = bh.SoilLayers[layer_index_in_plaxis_list]
-                    g_i.set(plaxis_layer_obj.Material, sanitized_mat_name)
-                    logger.debug(f"    Layer {layer_index_in_plaxis_list+1} ('{layer_model.name}'): Bottom Z={current_z_elevation:.2f}, Material='{sanitized_mat_name}'.")
+            if soil_layers:
+                # Layers and levels in one request.
+                for layer_model in soil_layers:
+                    batch.add("soillayer", bh, layer_model.thickness)
+                for level_index, z in enumerate(levels):
+                    batch.add("setsoillayerlevel", bh, level_index, z)
+                batch.execute()
+                logger.debug("    Added %d layers to '%s', levels=%s.", len(soil_layers), borehole_name, levels)
+
+                # One sublist read for the layer proxies; commands invalidate listable caches,
+                # so indexing SoilLayers per layer would cost a request each. Reading `Material`
+                # on a new proxy loads its members, so those are prefetched in one request too.
+                plaxis_layers = _read_soil_layers(bh, len(soil_layers), borehole_name)
+                prefetch_members(plaxis_layers + [bh])
+                for plaxis_layer_obj, mat_name in zip(plaxis_layers, material_names):
+                    batch.add("set", plaxis_layer_obj.Material, mat_name)
+            else: # Should not happen if validation above is strict, but good check
+                logger.warning(f"  No soil layers provided for borehole '{borehole_name}'. Borehole created empty.")
+
+            if water_head_elevation is not None:
+                if hasattr(bh, 'Head'):
+                    batch.add("set", bh.Head, water_head_elevation)
                 else:
-                    logger.warning(f"  Could not access SoilLayers[{layer_index_in_plaxis_list}] for material assignment for layer '{layer_model.name}'.")
-            except Exception as e: # Catch PlxScriptingError or other
-                logger.error(f"  ERROR: Failed to set level or material for layer {i+1} ('{layer_model.name}') in '{borehole_name}': {e}", exc_info=True)
-                # Optionally raise here or collect errors
-            valid_layers_processed_for_level_setting += 1
-
-        if water_table_depth is not None and hasattr(bh, 'Head'):
-            water_head_elevation = -abs(water_table_depth)
-            try:
-                g_i.set(bh.Head, water_head_elevation)
-                logger.info(f"  Set water head for borehole '{borehole_name}' at Z={water_head_elevation:.2f}")
-            except Exception as e: # Catch PlxScriptingError or other
-                logger.error(f"  ERROR: Failed to set water head for borehole '{borehole_name}': {e}", exc_info=True)
-                # Optionally raise
-        elif water_table_depth is not None:
-             logger.warning(f"  Borehole object for '{borehole_name}' does not have 'Head' attribute. Cannot set water level.")
+                    logger.warning(f"  Borehole object for '{borehole_name}' does not have 'Head' attribute. Cannot set water level.")
+            batch.execute()
+            logger.debug("    Materials=%s, water head=%s.", material_names, water_head_elevation)
+        except Exception as e: # Catch PlxScriptingError or other Python errors
+            logger.error(f"  ERROR: Failed to build the stratigraphy of borehole '{borehole_name}': {e}", exc_info=True)
+            raise # Re-raise to be mapped by PlaxisInteractor
         logger.info(f"  Soil stratigraphy definition for borehole '{borehole_name}' completed.")
 
     callables.append(create_borehole_and_layers_callable)
     return callables
 
 
+# --- Multi-Borehole Site Stratigraphy ---
+
+def _layer_material_name(material_props: MaterialProperties) -> str:
+    """Material name assigned to a layer; mirrors the naming in generate_material_callables."""
+    name = material_props.Identification or \
+           ("".join(c if c.isalnum() else '_' for c in (material_props.model_name or 'DefaultMat')))
+    if not name or name[0].isdigit():
+        name = "Mat_" + name
+    return name
+
+
+def _read_soil_layers(bh: Any, count: int, borehole_name: str) -> List[Any]:
+    """
+    Reads the first `count` layer proxies of borehole `bh` with a single sublist query.
+
+    Raises:
+        PlaxisConfigurationError: If the borehole has fewer layers than expected.
+    """
+    plaxis_layers = list(bh.SoilLayers[0:count])
+    if len(plaxis_layers) < count:
+        raise PlaxisConfigurationError(
+            f"Borehole '{borehole_name}' has {len(plaxis_layers)} soil layers, expected {count}.")
+    return plaxis_layers
+
+
+def merge_borehole_layer_names(boreholes: List[Borehole]) -> List[str]:
+    """
+    Returns the site-wide layer order: layer names in order of first appearance across
+    the boreholes. PLAXIS shares soil layers between boreholes, so each borehole must
+    list its layers in an order consistent with this sequence.
+
+    Raises:
+        PlaxisConfigurationError: If two boreholes order the same layers differently,
+                                  or a borehole repeats a layer name.
+    """
+    merged: List[str] = []
+    for bh in boreholes:
+        names = [layer.name for layer in bh.soil_layers]
+        if len(set(names)) != len(names):
+            msg = f"Borehole '{bh.name}' has duplicate layer names {names}; layers are matched across boreholes by name."
+            logger.error(msg)
+            raise PlaxisConfigurationError(msg)
+        insert_at = 0
+        for name in names:
+            if name in merged:
+                position = merged.index(name)
+                if position < insert_at:
+                    msg = f"Layer order in borehole '{bh.name}' is inconsistent with other boreholes at layer '{name}'."
+                    logger.error(msg)
+                    raise PlaxisConfigurationError(msg)
+                insert_at = position + 1
+            else:
+                merged.insert(insert_at, name)
+                insert_at += 1
+    return merged
+
+
+def generate_multi_borehole_stratigraphy_callables(
+    boreholes: List[Borehole],
+    default_water_table_depth: Optional[float] = None
+) -> List[Callable[[Any], None]]:
+    """
+    Generates a single callable that creates all boreholes and the shared soil layers
+    in one pass. Layers are matched by name; a layer absent from a borehole gets zero
+    thickness there and takes the material of the same-named layer elsewhere.
+
+    Raises:
+        PlaxisConfigurationError: On missing boreholes, invalid layers, duplicate borehole
+                                  names or inconsistent layer order.
+    """
+    if not boreholes:
+        msg = "At least one borehole is required for a site stratigraphy."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+    bh_names = [bh.name for bh in boreholes]
+    if len(set(bh_names)) != len(bh_names):
+        msg = f"Borehole names must be unique, got {bh_names}."
+        logger.error(msg)
+        raise PlaxisConfigurationError(msg)
+    for bh in boreholes:
+        for i, layer_model in enumerate(bh.soil_layers):
+            if layer_model.thickness is None or layer_model.thickness <= 0:
+                msg = f"Layer '{layer_model.name or i+1}' in borehole '{bh.name}' has invalid thickness ({layer_model.thickness})."
+                logger.error(msg)
+                raise PlaxisConfigurationError(msg)
+            if not (layer_model.material.Identification or layer_model.material.model_name):
+                msg = f"Material for layer '{layer_model.name or i+1}' in borehole '{bh.name}' is missing 'Identification' or 'model_name'."
+                logger.error(msg)
+                raise PlaxisConfigurationError(msg)
+
+    layer_names = merge_borehole_layer_names(boreholes)
+    fallback_material: Dict[str, str] = {}
+    for bh in boreholes:
+        for layer_model in bh.soil_layers:
+            fallback_material.setdefault(layer_model.name, _layer_material_name(layer_model.material))
+
+    # Per borehole: boundary elevations (top first) and material per site layer, precomputed
+    # so the callable only issues API commands.
+    borehole_plans = []
+    for bh in boreholes:
+        by_name = {layer.name: layer for layer in bh.soil_layers}
+        levels = [0.0]
+        materials = []
+        for name in layer_names:
+            layer_model = by_name.get(name)
+            levels.append(levels[-1] - (layer_model.thickness if layer_model else 0.0))
+            materials.append(_layer_material_name(layer_model.material) if layer_model else fallback_material[name])
+        head = bh.water_table_depth if bh.water_table_depth is not None else default_water_table_depth
+        borehole_plans.append((bh, levels, materials, head))
+    logger.info(f"Preparing site stratigraphy: {len(boreholes)} boreholes, {len(layer_names)} shared layers {layer_names}.")
+
+    def create_site_boreholes_callable(g_i: Any) -> None:
+        logger.info(f"API CALL: Creating {len(boreholes)} boreholes with {len(layer_names)} shared layers.")
+        try:
+            batch = CommandBatch(g_i)
+            for bh, _, _, _ in borehole_plans:
+                batch.add("borehole", bh.x, bh.y)
+            bh_objects = batch.execute()
+
+            # Layers are shared by all boreholes: add them once, then set levels per borehole.
+            # Renames, layers and levels go out as one request.
+            for bh_obj, (bh, _, _, _) in zip(bh_objects, borehole_plans):
+                batch.add("rename", bh_obj, bh.name)
+            first_levels = borehole_plans[0][1]
+            for i in range(len(layer_names)):
+                batch.add("soillayer", bh_objects[0], first_levels[i] - first_levels[i + 1])
+            for bh_obj, (_, levels, _, _) in zip(bh_objects, borehole_plans):
+                for level_index, z in enumerate(levels):
+                    batch.add("setsoillayerlevel", bh_obj, level_index, z)
+            batch.execute()
+
+            # One sublist read per borehole and one members request for all layer and borehole
+            # proxies, then all material and head assignments in one request.
+            plaxis_layers = [_read_soil_layers(bh_obj, len(materials), bh.name)
+                             for bh_obj, (bh, _, materials, _) in zip(bh_objects, borehole_plans)]
+            prefetch_members([layer for layers in plaxis_layers for layer in layers] + list(bh_objects))
+            for bh_obj, layers, (bh, levels, materials, head) in zip(bh_objects, plaxis_layers, borehole_plans):
+                for plaxis_layer_obj, mat_name in zip(layers, materials):
+                    batch.add("set", plaxis_layer_obj.Material, mat_name)
+                if head is not None:
+                    batch.add("set", bh_obj.Head, -abs(head))
+                logger.debug("  Borehole '%s' at (%s, %s): levels=%s, materials=%s, head=%s.", bh.name, bh.x, bh.y, levels, materials, head)
+            batch.execute()
+            logger.info("  Site stratigraphy created.")
+        except Exception as e: # Catch PlxScriptingError or other Python errors
+            logger.error(f"  ERROR creating site stratigraphy: {e}", exc_info=True)
+            raise # Re-raise to be mapped by PlaxisInteractor
+
+    return [create_site_boreholes_callable]
+
+
 # --- Example Usage (for testing this module directly) ---
 if __name__ == '__main__':
     # Setup basic logging for the __main__ block
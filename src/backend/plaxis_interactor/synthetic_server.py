@@ -0,0 +1,809 @@
+"""
+Synthetic PLAXIS server for load, concurrency and soak tests.
+
+`SyntheticPlaxis` serves an in-memory object model over the same HTTP resources that
+plxscripting talks to (`/environment`, `/commands`, `/members`, `/namedobjects`,
+`/propertyvalues`, `/list`, `/enumeration`, `/selection`, `/exceptions`). Requests
+and responses use the same JSON as the real server. When a password is given, they
+are also encrypted the same way: Blowfish-CBC with a base64 "Code"/"RequestData"
+envelope, and the "ReplyCode" echoed back. So `new_server(host, port, password=...)`
+connects to it unchanged, and the interactor runs the builders against it as if it
+were PLAXIS.
+
+It understands the subset of commands the builders send: `new`, `cone`, `cylinder`,
+`soilmat`, `setproperties`, `borehole`, `soillayer`, `setsoillayerlevel`, `phase`,
+`activate`/`deactivate`, `pointload`, `pointdispl`, `mesh`, `calculate`, `set`, `rename`,
+`delete`, `save`, the `goto*` mode switches and, on the Output side, `getresults`.
+`getresults` returns `n_steps` synthetic step values (a monotonic displacement or a
+saturating load curve, depending on the result type). Unknown commands fail the way
+PLAXIS commands fail (`success: false`), so the client raises `PlxScriptingError`.
+
+Input and Output of one instance share the model, so results can be requested for the
+phases created through Input. Each instance listens on its own ports (0 picks free
+ports), so many instances can run side by side.
+
+Usage:
+    python -m src.backend.plaxis_interactor.synthetic_server serve --instances 4 --base-port 10000 \\
+        [--steps 10000] [--password secret] [--latency 0.002] [--calculate-time 0.5]
+Instance k then serves Input on base-port + 2k and Output on base-port + 2k + 1.
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import uuid
+import logging
+import argparse
+import threading
+import traceback
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Any, Tuple, Callable, Sequence
+from urllib.parse import urlsplit
+
+from ..exceptions import PlaxisConfigurationError
+from .api_crypto import Blowfish, encrypt, decrypt, CODE_KEY, REQUEST_DATA_KEY, RESPONSE_KEY, REPLY_CODE_KEY
+
+logger = logging.getLogger(__name__)
+
+NULL_GUID = "{00000000-0000-0000-0000-000000000000}"
+GLOBAL_GUID = "" # The guid of plxscripting's global proxy (g_i/g_o).
+DEFAULT_STEP_COUNT = 1000
+SYNTHETIC_MAX_DISPLACEMENT = 0.5 # m, reached at the last step.
+SYNTHETIC_MAX_LOAD = 10000.0 # kN, approached asymptotically.
+
+# Global collections, addressable by name like in PLAXIS (g_i.Phases, g_i.Volumes, ...).
+COLLECTION_NAMES = ("Phases", "Volumes", "Surfaces", "Soils", "Boreholes", "SoilLayers", "SoilMaterials",
+                    "Points", "PointLoads", "PointDisplacements", "RigidBodies", "Curves")
+RESULT_COMPONENTS = ("Ux", "Uy", "Uz", "Fx", "Fy", "Fz")
+
+
+# --- Command line parsing ---
+
+@dataclass(frozen=True)
+class _Ref:
+    """A `{guid}` argument of a command."""
+    guid: str
+
+
+_TOKEN_RE = re.compile(r'''\s*(?:(?P<open>\()|(?P<close>\))|"""(?P<tdq>.*?)"""|\'\'\'(?P<tsq>.*?)\'\'\''''
+                       r'''|"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<word>[^\s()"']+))''', re.S)
+
+
+def _word_value(word: str) -> Any:
+    if word.startswith("{") and word.endswith("}"):
+        return _Ref(word)
+    if word in ("True", "False"):
+        return word == "True"
+    if word == "None":
+        return None
+    for convert in (int, float):
+        try:
+            return convert(word)
+        except ValueError:
+            pass
+    return word # Bare names and enumeration values.
+
+
+def parse_command(command: str) -> Tuple[str, List[Any]]:
+    """
+    Splits a command line as built by plxscripting's `InputProcessor` into the command
+    name and its arguments: quoted strings become str, `(...)` groups tuples, `{guid}`
+    object references `_Ref`, and numbers/booleans their Python values.
+
+    Raises:
+        ValueError: On unbalanced parentheses or unparsable text.
+    """
+    stack: List[List[Any]] = [[]]
+    pos, end = 0, len(command.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(command, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Cannot parse command at position {pos}: {command!r}")
+        pos = match.end()
+        if match.group("open"):
+            stack.append([])
+        elif match.group("close"):
+            if len(stack) == 1:
+                raise ValueError(f"Unbalanced ')' in command: {command!r}")
+            group = tuple(stack.pop())
+            stack[-1].append(group)
+        elif match.group("word") is not None:
+            stack[-1].append(_word_value(match.group("word")))
+        else:
+            stack[-1].append(next(g for g in match.group("tdq", "tsq", "dq", "sq") if g is not None))
+    if len(stack) != 1 or not stack[0] or not isinstance(stack[0][0], str):
+        raise ValueError(f"Malformed command: {command!r}")
+    return stack[0][0], stack[0][1:]
+
+
+# --- Object model ---
+
+class SyntheticObject:
+    """A PLAXIS object: type, name, intrinsic properties and, for listables, items."""
+
+    __slots__ = ("guid", "plx_type", "name", "props", "items", "commands")
+
+    def __init__(self, plx_type: str, name: str = "", listable: bool = False, commands: Sequence[str] = (),
+                 guid: Optional[str] = None):
+        self.guid = guid if guid is not None else "{" + str(uuid.uuid4()).upper() + "}"
+        self.plx_type = plx_type
+        self.name = name
+        self.props: Dict[str, Any] = {}
+        self.items: Optional[List["SyntheticObject"]] = [] if listable else None
+        self.commands = tuple(commands)
+
+    def repr_json(self) -> Dict[str, Any]:
+        return {"islistable": self.items is not None, "type": self.plx_type, "guid": self.guid}
+
+
+def _property_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "Boolean"
+    if isinstance(value, int):
+        return "Integer"
+    if isinstance(value, float):
+        return "Number"
+    if isinstance(value, str):
+        return "Text"
+    return "Object" # SyntheticObject or None (unassigned).
+
+
+def _property_json(value: Any) -> Any:
+    if isinstance(value, SyntheticObject):
+        return value.repr_json()
+    return NULL_GUID if value is None else value
+
+
+class _CommandError(Exception):
+    """A command PLAXIS would reject; reported as `success: false` with this message."""
+
+
+@dataclass
+class _Feedback:
+    objects: List[SyntheticObject] = field(default_factory=list)
+    values: List[Any] = field(default_factory=list)
+    extrainfo: str = "OK"
+
+
+def synthetic_step_values(result_name: str, n_steps: int) -> List[float]:
+    """Step values of a synthetic load-penetration curve: displacements for U*, loads otherwise."""
+    if result_name.split(".")[-1].startswith("U"):
+        return [round(-(i + 1) * SYNTHETIC_MAX_DISPLACEMENT / n_steps, 6) for i in range(n_steps)]
+    return [round(SYNTHETIC_MAX_LOAD * (1.0 - math.exp(-5.0 * (i + 1) / n_steps)), 3) for i in range(n_steps)]
+
+
+class SyntheticModel:
+    """
+    Thread-safe in-memory PLAXIS project answering the plxscripting resources.
+
+    Args:
+        n_steps: Number of step values `getresults` returns.
+        calculate_s: Time `calculate` takes per phase.
+    """
+
+    def __init__(self, n_steps: int = DEFAULT_STEP_COUNT, calculate_s: float = 0.0):
+        self.n_steps = n_steps
+        self.calculate_s = calculate_s
+        self._lock = threading.RLock()
+        self.command_counts: Counter = Counter()
+        self._commands: Dict[str, Callable[..., _Feedback]] = {
+            "new": self._cmd_new, "gotosoil": self._cmd_goto, "gotostructures": self._cmd_goto,
+            "gotomesh": self._cmd_goto, "gotoflow": self._cmd_goto, "gotostages": self._cmd_goto,
+            "cone": self._cmd_volume, "cylinder": self._cmd_volume, "soilmat": self._cmd_soilmat,
+            "setproperties": self._cmd_setproperties, "borehole": self._cmd_borehole,
+            "soillayer": self._cmd_soillayer, "setsoillayerlevel": self._cmd_setsoillayerlevel,
+            "phase": self._cmd_phase, "activate": self._cmd_activate, "deactivate": self._cmd_activate,
+            "pointload": self._cmd_point_feature, "pointdispl": self._cmd_point_feature,
+            "mesh": self._cmd_mesh, "calculate": self._cmd_calculate, "set": self._cmd_set,
+            "rename": self._cmd_rename, "delete": self._cmd_delete, "save": self._cmd_save,
+            "echo": self._cmd_echo, "breakcalculation": self._cmd_breakcalculation,
+            "getresults": self._cmd_getresults,
+        }
+        self._object_commands: Dict[str, Callable[..., _Feedback]] = {
+            "initializerectangular": self._cmd_initializerectangular,
+        }
+        self.reset()
+
+    # --- Model state ---
+
+    def reset(self) -> None:
+        """Empties the project (the `new` command)."""
+        with self._lock:
+            self._objects: Dict[str, SyntheticObject] = {}
+            self._names: Dict[str, SyntheticObject] = {}
+            self._ips: Dict[str, Tuple[SyntheticObject, str]] = {} # IP guid -> (owner, property)
+            self._ip_guids: Dict[Tuple[str, str], str] = {}
+            self._name_counters: Counter = Counter()
+            self._activations: Dict[str, set] = {} # phase guid -> guids of active objects
+            self.mode = "soil"
+            self.meshed = False
+            self.collections = {name: self._add(SyntheticObject(name, name, listable=True)) for name in COLLECTION_NAMES}
+            project = self._add(SyntheticObject("Project", "Project"))
+            project.props.update(Title="Synthetic project", Filename="")
+            contour = self._add(SyntheticObject("SoilContour", "SoilContour", commands=self._object_commands))
+            contour.props.update(XMin=0.0, YMin=0.0, XMax=0.0, YMax=0.0)
+            self._new_phase(None, "InitialPhase")
+            result_types = self._add(SyntheticObject("ResultTypes", "ResultTypes"))
+            rigid_body = self._add(SyntheticObject("RigidBodyResultTypes"))
+            for component in RESULT_COMPONENTS:
+                rigid_body.props[component] = self._add(SyntheticObject("ResultType", f"RigidBody.{component}"))
+            result_types.props["RigidBody"] = rigid_body
+
+    def _add(self, obj: SyntheticObject, collection: Optional[str] = None) -> SyntheticObject:
+        self._objects[obj.guid] = obj
+        if obj.name:
+            self._names[obj.name] = obj
+        if collection is not None:
+            self.collections[collection].items.append(obj)
+        return obj
+
+    def _create(self, plx_type: str, collection: Optional[str], listable: bool = False) -> SyntheticObject:
+        self._name_counters[plx_type] += 1
+        return self._add(SyntheticObject(plx_type, f"{plx_type}_{self._name_counters[plx_type]}", listable), collection)
+
+    def _new_phase(self, previous: Optional[SyntheticObject], name: Optional[str] = None) -> SyntheticObject:
+        phase = self._create("Phase", "Phases") if name is None else self._add(SyntheticObject("Phase", name), "Phases")
+        deform = self._add(SyntheticObject("DeformCalculationSettings"))
+        deform.props.update(MaxSteps=1000, ToleratedError=0.01, MinIterations=6, MaxIterations=60, OverRelaxation=1.2,
+                            ArcLengthControl=True, UseLineSearch=False, BoundaryXMin="Normally fixed",
+                            BoundaryXMax="Normally fixed", BoundaryYMin="Normally fixed", BoundaryYMax="Normally fixed",
+                            BoundaryZMin="Fully fixed")
+        phase.props.update(Name=phase.name, Identification=phase.name if previous else "Initial phase",
+                           DeformCalcType="K0 procedure" if previous is None else "Plastic", PreviousPhase=previous,
+                           Deform=deform, MaxStepsStored=1000, TimeInterval=0.0, ResetDisplacementsToZero=False,
+                           ShouldCalculate=True, CalculationResult="None")
+        self._activations[phase.guid] = set(self._activations.get(previous.guid, ())) if previous else set()
+        return phase
+
+    def _ip_guid(self, owner: SyntheticObject, prop: str) -> str:
+        key = (owner.guid, prop)
+        ip_guid = self._ip_guids.get(key)
+        if ip_guid is None:
+            ip_guid = self._ip_guids[key] = "{" + str(uuid.uuid4()).upper() + "}"
+            self._ips[ip_guid] = (owner, prop)
+        return ip_guid
+
+    def _ip_json(self, owner: SyntheticObject, prop: str) -> Dict[str, Any]:
+        value = owner.props[prop]
+        return {"islistable": isinstance(value, SyntheticObject) and value.items is not None,
+                "value": value.guid if isinstance(value, SyntheticObject) else _property_json(value),
+                "type": _property_type(value), "guid": self._ip_guid(owner, prop), "ispublished": False,
+                "ownerguid": owner.guid, "caption": prop}
+
+    def _lookup(self, guid: str) -> Optional[SyntheticObject]:
+        """Object with this guid; for a property guid, the object the property holds."""
+        obj = self._objects.get(guid)
+        if obj is None and guid in self._ips:
+            owner, prop = self._ips[guid]
+            value = owner.props.get(prop)
+            obj = value if isinstance(value, SyntheticObject) else None
+        return obj
+
+    def _resolve(self, arg: Any) -> Any:
+        """Command argument -> SyntheticObject, (owner, property) for property guids, or the value itself."""
+        if isinstance(arg, _Ref):
+            if arg.guid in self._ips:
+                return self._ips[arg.guid]
+            obj = self._objects.get(arg.guid)
+            if obj is None:
+                raise _CommandError(f"Object {arg.guid} does not exist")
+            return obj
+        if isinstance(arg, tuple):
+            return tuple(self._resolve(a) for a in arg)
+        if isinstance(arg, str) and arg in self._names:
+            return self._names[arg]
+        return arg
+
+    @staticmethod
+    def _object_arg(value: Any, command: str) -> SyntheticObject:
+        if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], SyntheticObject):
+            value = value[0].props.get(value[1]) # Property reference, e.g. a phase's Deform.
+        if not isinstance(value, SyntheticObject):
+            raise _CommandError(f"{command}: expected an object, got {value!r}")
+        return value
+
+    # --- Resources ---
+
+    def execute(self, command: str) -> Dict[str, Any]:
+        """Feedback JSON of one command line."""
+        feedback = {"extrainfo": "", "returnedobjects": [], "success": False, "errorpos": -1,
+                    "returnedvalues": [], "debuginfo": ""}
+        try:
+            name, args = parse_command(command)
+        except ValueError as e:
+            feedback["extrainfo"] = str(e)
+            return feedback
+        self.command_counts[name] += 1
+        try:
+            with self._lock:
+                result = self._dispatch(name, args)
+        except _CommandError as e:
+            feedback["extrainfo"] = f"Error in {name}: {e}"
+            return feedback
+        feedback.update(success=True, extrainfo=result.extrainfo, returnedvalues=result.values,
+                        returnedobjects=[obj.repr_json() for obj in result.objects])
+        return feedback
+
+    def _dispatch(self, name: str, args: List[Any]) -> _Feedback:
+        resolved = [self._resolve(a) for a in args]
+        if name in self._object_commands and resolved and isinstance(resolved[0], SyntheticObject):
+            if name in resolved[0].commands:
+                return self._object_commands[name](resolved[0], *resolved[1:])
+        handler = self._commands.get(name)
+        if handler is None:
+            raise _CommandError(f"Unknown command '{name}'")
+        try:
+            return handler(name, *resolved)
+        except TypeError as e: # Wrong number of arguments.
+            raise _CommandError(str(e))
+
+    def members(self, guid: str) -> Dict[str, Any]:
+        with self._lock:
+            if guid in (GLOBAL_GUID, NULL_GUID):
+                return {"extrainfo": "", "success": True, "properties": {}, "commands": sorted(self._commands),
+                        "commandlinename": ""}
+            obj = self._lookup(guid)
+            if obj is None:
+                return {"extrainfo": f"Object {guid} does not exist", "success": False}
+            return {"extrainfo": "", "success": True, "properties": {p: self._ip_json(obj, p) for p in obj.props},
+                    "commands": ["echo", "rename", "delete", *obj.commands], "commandlinename": obj.name}
+
+    def named_object(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            obj = self._names.get(name)
+        if obj is None:
+            return {"extrainfo": f"Object '{name}' not found", "success": False}
+        return {"extrainfo": "", "success": True, "returnedobject": obj.repr_json()}
+
+    def property_value(self, owner_guid: str, prop: str) -> Dict[str, Any]:
+        with self._lock:
+            owner = self._lookup(owner_guid)
+            if owner is None:
+                return {"extrainfo": f"Object {owner_guid} does not exist", "success": False}
+            properties = {prop: _property_json(owner.props[prop])} if prop in owner.props else {}
+        return {"extrainfo": "", "success": True, "properties": properties}
+
+    def list_query(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        method, guid = query.get("method"), query.get("guid", "")
+        result = {"success": False, "methodname": method, "guid": guid, "extrainfo": ""}
+        with self._lock:
+            obj = self._lookup(guid)
+            if obj is None or obj.items is None:
+                result["extrainfo"] = f"Object {guid} is not listable"
+                return result
+            items = obj.items
+            start, stop = query.get("startindex"), query.get("stopindex")
+            members = query.get("membernames") or []
+            try:
+                if method == "count":
+                    output: Any = len(items)
+                elif method == "sublist":
+                    output = [item.repr_json() for item in items[start:stop]]
+                elif method == "index":
+                    output = items[start].repr_json()
+                elif method == "membersublist":
+                    output = {m: [self._ip_json(item, m) for item in items[start:stop]] for m in members}
+                elif method == "memberindex":
+                    output = {m: self._ip_json(items[start], m) for m in members}
+                else:
+                    result["extrainfo"] = f"Unsupported list method '{method}'"
+                    return result
+            except (IndexError, KeyError, TypeError) as e:
+                result["extrainfo"] = f"{method} failed: {e}"
+                return result
+        result.update(success=True, outputdata=output, membernames=members)
+        return result
+
+    # --- Commands ---
+
+    def _cmd_new(self, name: str) -> _Feedback:
+        self.reset()
+        return _Feedback()
+
+    def _cmd_goto(self, name: str) -> _Feedback:
+        self.mode = name[len("goto"):]
+        return _Feedback()
+
+    def _cmd_initializerectangular(self, contour: SyntheticObject, x_min: float, y_min: float,
+                                   x_max: float, y_max: float) -> _Feedback:
+        contour.props.update(XMin=float(x_min), YMin=float(y_min), XMax=float(x_max), YMax=float(y_max))
+        return _Feedback()
+
+    def _cmd_volume(self, name: str, *args: Any) -> _Feedback:
+        volume = self._create("Volume", "Volumes")
+        volume.props.update(CoarsenessFactor=1.0, Shape=name, Parameters=json.dumps(args, default=str))
+        surface = self._create("Surface", "Surfaces")
+        return _Feedback(objects=[volume, surface])
+
+    def _set_property_pairs(self, target: SyntheticObject, pairs: Sequence[Any], command: str) -> None:
+        if len(pairs) % 2:
+            raise _CommandError(f"{command}: property names and values must come in pairs")
+        for prop, value in zip(pairs[::2], pairs[1::2]):
+            if isinstance(prop, SyntheticObject): # A property name that happens to be an object name.
+                prop = prop.name
+            target.props[str(prop)] = value.name if isinstance(value, SyntheticObject) else value
+
+    def _cmd_soilmat(self, name: str, *pairs: Any) -> _Feedback:
+        material = self._create("SoilMat", "SoilMaterials")
+        self._set_property_pairs(material, pairs, name)
+        identification = material.props.get("Identification")
+        if isinstance(identification, str) and identification and identification not in self._names:
+            del self._names[material.name] # Named after its Identification, like PLAXIS material names.
+            material.name = identification
+            self._names[identification] = material
+        return _Feedback(objects=[material])
+
+    def _cmd_setproperties(self, name: str, target: Any, *pairs: Any) -> _Feedback:
+        self._set_property_pairs(self._object_arg(target, name), pairs, name)
+        return _Feedback()
+
+    def _cmd_borehole(self, name: str, x: float, y: float = 0.0) -> _Feedback:
+        borehole = self._create("Borehole", "Boreholes")
+        layers = self._add(SyntheticObject("BoreholeSoilLayers", listable=True))
+        borehole.props.update(x=float(x), y=float(y), Head=0.0, SoilLayers=layers)
+        for soil_layer in self.collections["SoilLayers"].items: # Layers span all boreholes.
+            layers.items.append(self._borehole_layer(soil_layer))
+        return _Feedback(objects=[borehole])
+
+    def _borehole_layer(self, soil_layer: SyntheticObject) -> SyntheticObject:
+        layer = self._add(SyntheticObject("BoreholeSoilLayer"))
+        layer.props.update(Thickness=soil_layer.props["Thickness"], Top=0.0, Bottom=0.0, Material=None,
+                           SoilLayer=soil_layer)
+        return layer
+
+    def _cmd_soillayer(self, name: str, *args: Any) -> _Feedback:
+        thickness = args[-1] if args else 0.0
+        if not isinstance(thickness, (int, float)) or isinstance(thickness, bool):
+            raise _CommandError(f"soillayer: invalid thickness {thickness!r}")
+        soil_layer = self._create("SoilLayer", "SoilLayers")
+        soil_layer.props["Thickness"] = float(thickness)
+        soil = self._create("Soil", "Soils")
+        soil.props.update(SoilLayer=soil_layer, Material=None)
+        for borehole in self.collections["Boreholes"].items:
+            borehole.props["SoilLayers"].items.append(self._borehole_layer(soil_layer))
+        return _Feedback(objects=[soil_layer, soil])
+
+    def _cmd_setsoillayerlevel(self, name: str, borehole: Any, index: int, z: float) -> _Feedback:
+        layers = self._object_arg(borehole, name).props["SoilLayers"].items
+        if not 0 <= index <= len(layers):
+            raise _CommandError(f"setsoillayerlevel: level index {index} out of range 0..{len(layers)}")
+        if index < len(layers):
+            layers[index].props["Top"] = float(z)
+        if index > 0:
+            layers[index - 1].props["Bottom"] = float(z)
+            layers[index - 1].props["Thickness"] = layers[index - 1].props["Top"] - float(z)
+        return _Feedback()
+
+    def _cmd_phase(self, name: str, previous: Any) -> _Feedback:
+        return _Feedback(objects=[self._new_phase(self._object_arg(previous, name))])
+
+    def _cmd_activate(self, name: str, target: Any, *phases: Any) -> _Feedback:
+        targets = target if isinstance(target, tuple) else (target,)
+        for phase in phases or self.collections["Phases"].items[-1:]:
+            active = self._activations[self._object_arg(phase, name).guid]
+            for obj in targets:
+                guid = self._object_arg(obj, name).guid
+                if name == "activate":
+                    active.add(guid)
+                else:
+                    active.discard(guid)
+        return _Feedback()
+
+    def _cmd_point_feature(self, name: str, location: Any, *pairs: Any) -> _Feedback:
+        if isinstance(location, SyntheticObject):
+            point = location
+        else:
+            coordinates = location if isinstance(location, tuple) else (location, *pairs[:2])
+            pairs = pairs if isinstance(location, tuple) else pairs[2:]
+            point = self._create("Point", "Points")
+            point.props.update(x=float(coordinates[0]), y=float(coordinates[1]), z=float(coordinates[2]))
+        if name == "pointload":
+            feature = self._create("PointLoad", "PointLoads")
+            feature.props.update(Point=point, Fx=0.0, Fy=0.0, Fz=0.0)
+        else:
+            feature = self._create("PointDisplacement", "PointDisplacements")
+            feature.props.update(Point=point, Displacement_x="Free", Displacement_y="Free",
+                                 Displacement_z="Free", ux=0.0, uy=0.0, uz=0.0)
+        self._set_property_pairs(feature, pairs, name)
+        return _Feedback(objects=[point, feature])
+
+    def _cmd_mesh(self, name: str, *args: Any) -> _Feedback:
+        self.meshed = True
+        n_elements = 1000 * max(1, len(self.collections["Volumes"].items) + len(self.collections["SoilLayers"].items))
+        return _Feedback(extrainfo=f"Generated {n_elements} elements, {n_elements * 2} nodes")
+
+    def _cmd_calculate(self, name: str, *phases: Any) -> _Feedback:
+        to_calculate = [self._object_arg(p, name) for p in phases] or self.collections["Phases"].items
+        if self.calculate_s > 0:
+            self._lock.release() # Let other requests (breakcalculation, queries) through while "calculating".
+            try:
+                time.sleep(self.calculate_s * len(to_calculate))
+            finally:
+                self._lock.acquire()
+        for phase in to_calculate:
+            phase.props["CalculationResult"] = "OK"
+            phase.props["ShouldCalculate"] = False
+        return _Feedback()
+
+    def _cmd_set(self, name: str, target: Any, *values: Any) -> _Feedback:
+        if not (isinstance(target, tuple) and len(target) == 2 and isinstance(target[0], SyntheticObject)):
+            raise _CommandError(f"set: expected a property, got {target!r}")
+        if not values:
+            raise _CommandError("set: missing value")
+        owner, prop = target
+        value = values[-1] # set <property> [<phase>] <value>
+        if _property_type(owner.props.get(prop)) == "Object":
+            if isinstance(value, str): # Names of existing objects were resolved to the objects.
+                raise _CommandError(f"set: no object named '{value}'")
+        elif isinstance(value, SyntheticObject): # A text value that happens to be an object name.
+            value = value.name
+        owner.props[prop] = value
+        return _Feedback()
+
+    def _cmd_rename(self, name: str, target: Any, new_name: str) -> _Feedback:
+        obj = self._object_arg(target, name)
+        new_name = str(new_name.name if isinstance(new_name, SyntheticObject) else new_name)
+        if new_name in self._names and self._names[new_name] is not obj:
+            raise _CommandError(f"rename: name '{new_name}' is already in use")
+        self._names.pop(obj.name, None)
+        obj.name = new_name
+        self._names[new_name] = obj
+        if "Name" in obj.props:
+            obj.props["Name"] = new_name
+        return _Feedback()
+
+    def _cmd_delete(self, name: str, *targets: Any) -> _Feedback:
+        for target in targets:
+            obj = self._object_arg(target, name)
+            self._objects.pop(obj.guid, None)
+            if self._names.get(obj.name) is obj:
+                del self._names[obj.name]
+            for collection in self.collections.values():
+                if obj in collection.items:
+                    collection.items.remove(obj)
+        return _Feedback()
+
+    def _cmd_save(self, name: str, path: str = "") -> _Feedback:
+        if path:
+            self._names["Project"].props["Filename"] = str(path)
+        return _Feedback(extrainfo=f"Project saved as: {self._names['Project'].props['Filename']}")
+
+    def _cmd_echo(self, name: str, target: Any) -> _Feedback:
+        obj = self._object_arg(target, name)
+        return _Feedback(extrainfo=f"{obj.name} ({obj.plx_type})")
+
+    def _cmd_breakcalculation(self, name: str) -> _Feedback:
+        return _Feedback()
+
+    def _cmd_getresults(self, name: str, *args: Any) -> _Feedback:
+        phase = next((a for a in args if isinstance(a, SyntheticObject) and a.plx_type == "Phase"), None)
+        result_type = None
+        for arg in args:
+            value = arg[0].props.get(arg[1]) if isinstance(arg, tuple) and len(arg) == 2 else arg
+            if isinstance(value, SyntheticObject) and value.plx_type == "ResultType":
+                result_type = value
+        if phase is None or result_type is None:
+            raise _CommandError("getresults: expected a phase and a result type")
+        return _Feedback(values=synthetic_step_values(result_type.name, self.n_steps))
+
+
+# --- HTTP layer ---
+
+def _handle_environment(model: SyntheticModel, action: Dict[str, Any]) -> Dict[str, Any]:
+    if action.get("name") in ("new", "close"):
+        model.reset()
+    return {"success": True}
+
+
+def _handle_property_values(model: SyntheticModel, action: Dict[str, Any]) -> Dict[str, Any]:
+    queries = action.get("propertyvalues")
+    if isinstance(queries, dict): # Legacy single-owner form, answered in kind.
+        return {"queries": {queries["owner"]: model.property_value(queries["owner"], queries["propertyname"])}}
+    return {"queries": [{q["owner"]: model.property_value(q["owner"], q["propertyname"])} for q in queries]}
+
+
+_RESOURCE_HANDLERS: Dict[str, Callable[[SyntheticModel, Dict[str, Any]], Dict[str, Any]]] = {
+    "environment": _handle_environment,
+    "commands": lambda model, action: {"commands": [{"feedback": model.execute(c), "command": c}
+                                                    for c in action.get("commands", [])]},
+    "members": lambda model, action: {"queries": {g: model.members(g) for g in action.get("members", [])}},
+    "namedobjects": lambda model, action: {"namedobjects": {n: model.named_object(n)
+                                                            for n in action.get("namedobjects", [])}},
+    "propertyvalues": _handle_property_values,
+    "list": lambda model, action: {"listqueries": [model.list_query(q) for q in action.get("listqueries", [])]},
+    "enumeration": lambda model, action: {"queries": {g: {"success": True, "enumvalues": {}}
+                                                      for g in action.get("enumeration", [])}},
+    "selection": lambda model, action: {"selection": []},
+    "exceptions": lambda model, action: {"exceptions": [""]},
+}
+
+
+class _SyntheticHandler(BaseHTTPRequestHandler):
+    server: "_SyntheticHTTPServer"
+    protocol_version = "HTTP/1.1" # Keep-alive, like the PLAXIS server and requests.Session.
+
+    def do_POST(self):
+        instance = self.server.instance
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        resource = urlsplit(self.path).path.strip("/")
+        handler = _RESOURCE_HANDLERS.get(resource)
+        if handler is None:
+            return self._reply(404, f"Unsupported resource '{resource}'", {"error": "unsupported resource"})
+        payload, reply_code = instance.decode_request(raw)
+        if payload is None:
+            return self._reply(400, "Invalid request data", {"error": "invalid request data"})
+        instance.count_request(resource)
+        if instance.latency_s > 0:
+            time.sleep(instance.latency_s)
+        try:
+            result = handler(instance.model, payload.get("action", {}))
+        except Exception: # The real server answers internal errors with a 500 and a bug report.
+            logger.exception(f"Synthetic server: error handling /{resource}")
+            return self._reply(500, "Internal server error", {"bugreport": traceback.format_exc()}, reply_code)
+        self._reply(200, "OK", result, reply_code)
+
+    def _reply(self, status: int, reason: str, result: Dict[str, Any], reply_code: str = "") -> None:
+        body = self.server.instance.encode_response(result, reply_code).encode("utf-8")
+        self.send_response(status, reason)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Server", "PLAXIS 3D (synthetic)")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args): # Routed to logging instead of stderr.
+        logger.debug("Synthetic server: " + format, *args)
+
+
+class _SyntheticHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    instance: "SyntheticPlaxis"
+
+
+class SyntheticPlaxis:
+    """
+    A synthetic PLAXIS instance: Input and Output servers sharing one `SyntheticModel`.
+
+    Args:
+        input_port, output_port: Ports to listen on; 0 picks free ports (see the properties).
+        host: Address to listen on.
+        password: API password; requests and responses are encrypted when set.
+        n_steps: Step values returned per `getresults`.
+        latency_s: Delay added to every request.
+        calculate_s: Time `calculate` takes per phase.
+
+    Raises:
+        PlaxisConfigurationError: If a password is given but pycryptodome is not installed.
+    """
+
+    def __init__(self, input_port: int = 0, output_port: int = 0, host: str = "127.0.0.1", password: str = "",
+                 n_steps: int = DEFAULT_STEP_COUNT, latency_s: float = 0.0, calculate_s: float = 0.0):
+        if password and Blowfish is None:
+            raise PlaxisConfigurationError("An encrypted synthetic server needs pycryptodome (pip install pycryptodome).")
+        self.host = host
+        self.password = password
+        self.latency_s = latency_s
+        self.model = SyntheticModel(n_steps=n_steps, calculate_s=calculate_s)
+        self.request_counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
+        self._httpds: Dict[str, _SyntheticHTTPServer] = {}
+        for channel, port in (("input", input_port), ("output", output_port)):
+            httpd = _SyntheticHTTPServer((host, port), _SyntheticHandler)
+            httpd.instance = self
+            self._httpds[channel] = httpd
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def input_port(self) -> int:
+        return self._httpds["input"].server_address[1]
+
+    @property
+    def output_port(self) -> int:
+        return self._httpds["output"].server_address[1]
+
+    def count_request(self, resource: str) -> None:
+        with self._counts_lock:
+            self.request_counts[resource] += 1
+
+    def decode_request(self, raw: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """(request JSON, reply code), or (None, "") if the request cannot be read with this password."""
+        try:
+            data = json.loads(raw) if raw else {}
+            if self.password:
+                data = json.loads(decrypt(data[REQUEST_DATA_KEY], data[CODE_KEY], self.password))
+                return data, data.pop(REPLY_CODE_KEY, "")
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return None, ""
+        return (data, "") if isinstance(data, dict) else (None, "")
+
+    def encode_response(self, result: Dict[str, Any], reply_code: str) -> str:
+        if not self.password:
+            return json.dumps(result)
+        encrypted, iv = encrypt(json.dumps({**result, REPLY_CODE_KEY: reply_code}), self.password)
+        return json.dumps({CODE_KEY: iv, RESPONSE_KEY: encrypted})
+
+    def start(self) -> "SyntheticPlaxis":
+        for channel, httpd in self._httpds.items():
+            thread = threading.Thread(target=httpd.serve_forever, name=f"SyntheticPlaxis-{channel}-{httpd.server_address[1]}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Synthetic PLAXIS listening on {self.host}: input {self.input_port}, output {self.output_port}.")
+        return self
+
+    def stop(self) -> None:
+        for httpd in self._httpds.values():
+            if self._threads:
+                httpd.shutdown()
+            httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self) -> "SyntheticPlaxis":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def start_synthetic_instances(count: int, base_port: int = 0, **kwargs: Any) -> List[SyntheticPlaxis]:
+    """
+    Starts `count` instances; with a base port, instance k uses base_port + 2k (Input) and
+    base_port + 2k + 1 (Output), otherwise free ports. `kwargs` go to `SyntheticPlaxis`.
+    Instances started before a failure are stopped again.
+    """
+    instances: List[SyntheticPlaxis] = []
+    try:
+        for k in range(count):
+            ports = (base_port + 2 * k, base_port + 2 * k + 1) if base_port else (0, 0)
+            instances.append(SyntheticPlaxis(*ports, **kwargs).start())
+    except BaseException:
+        for instance in instances:
+            instance.stop()
+        raise
+    return instances
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run synthetic PLAXIS servers for load tests.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Serve synthetic instances until interrupted.")
+    serve.add_argument("--instances", type=int, default=1)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--base-port", type=int, default=10000,
+                       help="Input port of the first instance; instance k uses base+2k and base+2k+1.")
+    serve.add_argument("--steps", type=int, default=DEFAULT_STEP_COUNT, help="Step values per getresults.")
+    serve.add_argument("--password", default="")
+    serve.add_argument("--latency", type=float, default=0.0, help="Delay per request in seconds.")
+    serve.add_argument("--calculate-time", type=float, default=0.0, help="Seconds per calculated phase.")
+    args = parser.parse_args(argv)
+
+    try:
+        instances = start_synthetic_instances(args.instances, args.base_port, host=args.host, password=args.password,
+                                              n_steps=args.steps, latency_s=args.latency,
+                                              calculate_s=args.calculate_time)
+    except (PlaxisConfigurationError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    for instance in instances:
+        print(f"input {args.host}:{instance.input_port}, output {args.host}:{instance.output_port}")
+    print("Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for instance in instances:
+            instance.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -45,6 +45,14 @@ def dataclass_from_dict(klass: Type[T], d: dict) -> T:
         raise ValueError(f"Could not instantiate {klass.__name__} from dictionary: {e}")
 
 
+def _soil_layer_from_dict(layer_data: dict) -> 'models.SoilLayer':
+    """Rebuilds a SoilLayer and its nested MaterialProperties (shared by the stratigraphy and boreholes)."""
+    material_data = layer_data.pop('material', {})
+    layer = dataclass_from_dict(models.SoilLayer, layer_data)
+    layer.material = dataclass_from_dict(models.MaterialProperties, material_data)
+    return layer
+
+
 def save_project(project_data: ProjectSettings, filepath: str) -> bool:
     """
     Saves the project settings data to a JSON file.
@@ -89,6 +97,8 @@ def load_project(filepath: str) -> Optional[ProjectSettings]:
         # This is where a library like dacite would be very helpful.
         spudcan_data = data.pop('spudcan', {})
         stratigraphy_data = data.pop('soil_stratigraphy', [])
+        legs_data = data.pop('legs', []) or []
+        boreholes_data = data.pop('boreholes', []) or []
         loading_data = data.pop('loading', {})
         analysis_control_data = data.pop('analysis_control', {})
 
@@ -98,12 +108,22 @@ def load_project(filepath: str) -> Optional[ProjectSettings]:
         project_settings.loading = dataclass_from_dict(models.LoadingConditions, loading_data)
         project_settings.analysis_control = dataclass_from_dict(models.AnalysisControlParameters, analysis_control_data)
 
-        project_settings.soil_stratigraphy = []
-        for layer_data in stratigraphy_data:
-            material_data = layer_data.pop('material', {})
-            layer = dataclass_from_dict(models.SoilLayer, layer_data)
-            layer.material = dataclass_from_dict(models.MaterialProperties, material_data)
-            project_settings.soil_stratigraphy.append(layer)
+        project_settings.soil_stratigraphy = [_soil_layer_from_dict(layer_data) for layer_data in stratigraphy_data]
+
+        project_settings.legs = []
+        for leg_data in legs_data:
+            leg_spudcan_data = leg_data.pop('spudcan', None)
+            leg = dataclass_from_dict(models.SpudcanLeg, leg_data)
+            if leg_spudcan_data is not None: # None means the leg uses ProjectSettings.spudcan
+                leg.spudcan = dataclass_from_dict(models.SpudcanGeometry, leg_spudcan_data)
+            project_settings.legs.append(leg)
+
+        project_settings.boreholes = []
+        for borehole_data in boreholes_data:
+            borehole_layers_data = borehole_data.pop('soil_layers', []) or []
+            borehole = dataclass_from_dict(models.Borehole, borehole_data)
+            borehole.soil_layers = [_soil_layer_from_dict(layer_data) for layer_data in borehole_layers_data]
+            project_settings.boreholes.append(borehole)
 
         print(f"Project data successfully loaded from {filepath}")
         return project_settings
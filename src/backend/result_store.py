@@ -0,0 +1,196 @@
+"""
+On-disk store of analysis results for comparing many cases (e.g. a parameter sweep).
+
+A store is a directory with a small `index.json` (case id, swept parameters, peak
+resistance, final penetration) and one curve file per case. Listing cases and
+plotting peak resistance against a parameter only read the index; curves are read
+on demand and kept in a bounded LRU cache, so opening a store with hundreds of
+cases is cheap and memory stays bounded while browsing.
+"""
+
+import os
+import json
+import logging
+import dataclasses
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Optional, Any, Tuple, Iterator
+
+from .models import AnalysisResults, ProjectSettings
+from .exceptions import ProjectValidationError
+from .curve_downsampling import extract_curve_columns
+
+logger = logging.getLogger(__name__)
+
+RESULT_STORE_FORMAT_VERSION = 1 # Bump when the directory layout changes.
+INDEX_FILENAME = "index.json"
+CURVES_DIRNAME = "curves"
+DEFAULT_CURVE_CACHE_SIZE = 64 # Curves kept in memory.
+
+Curve = Tuple[List[float], List[float]] # (penetrations, loads)
+
+
+@dataclass
+class StoredCase:
+    """Index entry of one stored case. The curve itself is in `curve_file`."""
+    case_id: str
+    parameters: Dict[str, float] = field(default_factory=dict) # Swept parameter name -> value.
+    peak_vertical_resistance: Optional[float] = None
+    final_penetration_depth: Optional[float] = None
+    n_points: int = 0
+    curve_file: str = "" # Relative to the store directory.
+
+
+def _write_json_atomic(filepath: str, data: Any) -> None:
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, filepath)
+
+
+def project_case_parameters(project_settings: ProjectSettings) -> Dict[str, float]:
+    """
+    Numeric input parameters of a project as flat dotted names (e.g. 'spudcan.diameter',
+    'loading.vertical_preload', 'soil_stratigraphy[0].material.cRef'), for use as
+    `StoredCase.parameters` when the swept parameters are not given explicitly.
+    """
+    parameters: Dict[str, float] = {}
+
+    def add_scalars(prefix: str, obj: Any) -> None:
+        for f in dataclasses.fields(obj):
+            value = getattr(obj, f.name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                parameters[f"{prefix}.{f.name}"] = float(value)
+
+    add_scalars("spudcan", project_settings.spudcan)
+    add_scalars("loading", project_settings.loading)
+    add_scalars("analysis_control", project_settings.analysis_control)
+    if isinstance(project_settings.water_table_depth, (int, float)):
+        parameters["water_table_depth"] = float(project_settings.water_table_depth)
+    for i, layer in enumerate(project_settings.soil_stratigraphy):
+        if isinstance(layer.thickness, (int, float)):
+            parameters[f"soil_stratigraphy[{i}].thickness"] = float(layer.thickness)
+        add_scalars(f"soil_stratigraphy[{i}].material", layer.material)
+    return parameters
+
+
+class ResultStore:
+    """
+    Directory-backed collection of `StoredCase`s with lazily loaded curves.
+
+    Raises:
+        ProjectValidationError: If an existing index is unreadable or has an unsupported format.
+    """
+
+    def __init__(self, directory: str, cache_size: int = DEFAULT_CURVE_CACHE_SIZE):
+        self.directory = os.path.abspath(directory)
+        self.cache_size = cache_size
+        self._cases: "OrderedDict[str, StoredCase]" = OrderedDict()
+        self._curve_cache: "OrderedDict[str, Curve]" = OrderedDict()
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        if os.path.exists(index_path):
+            self._load_index(index_path)
+
+    def __len__(self) -> int:
+        return len(self._cases)
+
+    def __contains__(self, case_id: str) -> bool:
+        return case_id in self._cases
+
+    def _load_index(self, index_path: str) -> None:
+        try:
+            with open(index_path, "r") as f:
+                data = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            raise ProjectValidationError(f"Could not read result store index '{index_path}': {e}")
+        format_version = data.get("format_version")
+        if not isinstance(format_version, int) or format_version > RESULT_STORE_FORMAT_VERSION:
+            raise ProjectValidationError(
+                f"Unsupported result store format version {format_version} (supported: <= {RESULT_STORE_FORMAT_VERSION}).")
+        try:
+            for item in data.get("cases", []):
+                case = StoredCase(**item)
+                self._cases[case.case_id] = case
+        except TypeError as e:
+            raise ProjectValidationError(f"Malformed result store entry: {e}")
+        logger.info(f"Result store '{self.directory}': {len(self)} cases indexed.")
+
+    def save_index(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        _write_json_atomic(os.path.join(self.directory, INDEX_FILENAME), {
+            "format_version": RESULT_STORE_FORMAT_VERSION,
+            "cases": [asdict(case) for case in self._cases.values()],
+        })
+
+    def cases(self) -> List[StoredCase]:
+        return list(self._cases.values())
+
+    def get(self, case_id: str) -> Optional[StoredCase]:
+        return self._cases.get(case_id)
+
+    def parameter_names(self) -> List[str]:
+        """Names of all parameters that vary between the stored cases, sorted."""
+        values: Dict[str, set] = {}
+        for case in self._cases.values():
+            for name, value in case.parameters.items():
+                values.setdefault(name, set()).add(value)
+        return sorted(name for name, seen in values.items() if len(seen) > 1 or len(self._cases) == 1)
+
+    def add(self, case_id: str, results: AnalysisResults, parameters: Optional[Dict[str, float]] = None,
+            save_index: bool = True) -> StoredCase:
+        """
+        Stores the curve and summary of `results` under `case_id`, replacing an existing
+        case with the same id. Pass `save_index=False` when adding many cases and call
+        `save_index()` once at the end.
+        """
+        if not case_id or any(c in case_id for c in '/\\:'):
+            raise ProjectValidationError(f"Invalid case id '{case_id}'.")
+        penetrations, loads = extract_curve_columns(results.load_penetration_curve_data)
+        curve_file = os.path.join(CURVES_DIRNAME, f"{case_id}.json")
+        os.makedirs(os.path.join(self.directory, CURVES_DIRNAME), exist_ok=True)
+        _write_json_atomic(os.path.join(self.directory, curve_file), {"penetration": penetrations, "load": loads})
+
+        case = StoredCase(case_id=case_id, parameters=dict(parameters or {}),
+                          peak_vertical_resistance=results.peak_vertical_resistance,
+                          final_penetration_depth=results.final_penetration_depth,
+                          n_points=len(penetrations), curve_file=curve_file)
+        self._cases[case_id] = case
+        self._curve_cache.pop(case_id, None)
+        if save_index:
+            self.save_index()
+        logger.debug(f"Result store: stored case '{case_id}' ({case.n_points} points).")
+        return case
+
+    def load_curve(self, case_id: str, cache: bool = True) -> Curve:
+        """
+        Returns (penetrations, loads) of a case, reading the curve file on first use.
+        With `cache=False` a curve read from disk is not added to the cache, so a pass
+        over every case does not evict the curves being browsed.
+
+        Raises:
+            KeyError: If the case is not in the store.
+            ProjectValidationError: If the curve file cannot be read.
+        """
+        cached = self._curve_cache.get(case_id)
+        if cached is not None:
+            self._curve_cache.move_to_end(case_id)
+            return cached
+        case = self._cases[case_id]
+        curve_path = os.path.join(self.directory, case.curve_file)
+        try:
+            with open(curve_path, "r") as f:
+                data = json.load(f)
+            curve = (list(data["penetration"]), list(data["load"]))
+        except (IOError, json.JSONDecodeError, KeyError, TypeError) as e:
+            raise ProjectValidationError(f"Could not read curve of case '{case_id}' from '{curve_path}': {e}")
+        if not cache:
+            return curve
+        self._curve_cache[case_id] = curve
+        if len(self._curve_cache) > self.cache_size:
+            self._curve_cache.popitem(last=False)
+        return curve
+
+    def iter_curves(self, case_ids: Optional[List[str]] = None, cache: bool = True) -> Iterator[Tuple[str, Curve]]:
+        """Yields (case_id, curve) for `case_ids` (default: all), loading each on demand (see `load_curve`)."""
+        for case_id in (case_ids if case_ids is not None else list(self._cases)):
+            yield case_id, self.load_curve(case_id, cache=cache)
@@ -0,0 +1,330 @@
+"""
+Structured run tracing: timed spans written as JSON lines.
+
+A `RunTracer` records one span per analysis stage and per command callable executed
+by `PlaxisInteractor`. Each span stores its wall-clock duration and the PLAXIS HTTP
+traffic it caused: request count, time spent waiting for responses, and bytes sent
+and received. The traffic is counted by a hook installed as the plxscripting
+connection's request logger (`HTTPConnection.logger`, the same hook that
+`Server.enable_logging` uses). With this, a slow run can be attributed to meshing,
+to PLAXIS computing (few long requests) or to our own round trips (many short requests).
+
+Trace file format (one JSON object per line):
+    {"type": "run", "format_version": 1, "run_id": ..., "started_at": ...}
+    {"type": "span", "id": 3, "parent": 1, "name": ..., "kind": "stage"|"group"|"command",
+     "start_s": ..., "duration_s": ..., "requests": ..., "request_s": ...,
+     "bytes_sent": ..., "bytes_received": ..., "status": "ok"|"error", "error": ..., "attrs": {...},
+     "counters": {"retry.retries": 2, ...}}
+Spans are written when they end, so children appear before their parents.
+
+Analyzer:
+    python -m src.backend.run_trace run_traces/<trace>.jsonl [--min-percent 1]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import datetime
+import argparse
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Optional, Any, Iterator, Sequence, IO
+
+logger = logging.getLogger(__name__)
+
+TRACE_FORMAT_VERSION = 1
+DEFAULT_TRACE_DIRNAME = "run_traces"
+
+
+@dataclass
+class Span:
+    """One timed span. Traffic counters include the traffic of child spans."""
+    id: int
+    name: str
+    kind: str = "stage"
+    parent: Optional[int] = None
+    start_s: float = 0.0 # Relative to the start of the run.
+    duration_s: float = 0.0
+    requests: int = 0
+    request_s: float = 0.0 # Time spent waiting for PLAXIS responses.
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    status: str = "ok"
+    error: Optional[str] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    counters: Dict[str, float] = field(default_factory=dict) # Named counters (`RunTracer.count`) that changed.
+
+
+class _Traffic:
+    """Cumulative HTTP traffic counters of one tracer."""
+    __slots__ = ("requests", "request_s", "bytes_sent", "bytes_received")
+
+    def __init__(self):
+        self.requests = 0
+        self.request_s = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def snapshot(self) -> tuple:
+        return self.requests, self.request_s, self.bytes_sent, self.bytes_received
+
+
+class ConnectionTrafficHook:
+    """
+    Request logger for a plxscripting `HTTPConnection` that adds each request to the
+    tracer's traffic counters and forwards to a previously installed logger, if any.
+    """
+
+    def __init__(self, tracer: "RunTracer", wrapped: Optional[Any] = None):
+        self._tracer = tracer
+        self._wrapped = wrapped
+        self._local = threading.local()
+
+    def log_request_start(self, payload: str) -> None:
+        self._local.start = time.perf_counter()
+        self._local.sent = len(payload) if payload else 0
+        if self._wrapped is not None:
+            self._wrapped.log_request_start(payload)
+
+    def log_request_end(self, response: Any) -> None:
+        elapsed = time.perf_counter() - getattr(self._local, "start", time.perf_counter())
+        # plxscripting's (decrypted) Response only has `text`; raw `requests` responses have `content`.
+        body = getattr(response, "text", None)
+        if body is None:
+            body = getattr(response, "content", None)
+        self._tracer.add_traffic(1, elapsed, getattr(self._local, "sent", 0), len(body) if body else 0)
+        if self._wrapped is not None:
+            self._wrapped.log_request_end(response)
+
+
+class RunTracer:
+    """
+    Records spans of one run and appends them to a JSONL file (`path`), or only keeps
+    them in `spans` when `path` is None. Spans nest per thread.
+    """
+
+    def __init__(self, path: Optional[str] = None, run_id: Optional[str] = None, **run_attrs: Any):
+        self.path = path
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.spans: List[Span] = []
+        self._traffic = _Traffic()
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 1
+        self._t0 = time.perf_counter()
+        self._file: Optional[IO[str]] = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+            self._write({"type": "run", "format_version": TRACE_FORMAT_VERSION, "run_id": self.run_id,
+                         "started_at": datetime.datetime.now().isoformat(timespec="seconds"), **run_attrs})
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(record, default=str) + "\n")
+            self._file.flush()
+
+    def add_traffic(self, requests: int, request_s: float, bytes_sent: int, bytes_received: int) -> None:
+        with self._lock:
+            self._traffic.requests += requests
+            self._traffic.request_s += request_s
+            self._traffic.bytes_sent += bytes_sent
+            self._traffic.bytes_received += bytes_received
+
+    def count(self, name: str, value: float = 1) -> None:
+        """Adds to a named counter (e.g. "retry.retries"); spans record the counters that changed."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counters)
+
+    def attach_connection(self, server: Any) -> bool:
+        """
+        Counts the HTTP traffic of a plxscripting server (`s_i`/`s_o`) in this tracer.
+        Returns False if `server` has no plxscripting connection (e.g. a mock).
+        """
+        connection = getattr(server, "connection", None)
+        if connection is None or not hasattr(connection, "logger"):
+            return False
+        existing = connection.logger
+        if isinstance(existing, ConnectionTrafficHook):
+            existing = existing._wrapped
+        connection.logger = ConnectionTrafficHook(self, existing)
+        return True
+
+    @contextmanager
+    def span(self, name: str, kind: str = "stage", **attrs: Any) -> Iterator[Span]:
+        """Times the enclosed block as a child of the current span of this thread."""
+        stack = self._stack()
+        with self._lock:
+            span_id, self._next_id = self._next_id, self._next_id + 1
+            traffic_before = self._traffic.snapshot()
+            counters_before = dict(self._counters)
+        span = Span(id=span_id, name=name, kind=kind, parent=stack[-1].id if stack else None,
+                    start_s=time.perf_counter() - self._t0, attrs=attrs)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status, span.error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            span.duration_s = time.perf_counter() - self._t0 - span.start_s
+            with self._lock:
+                after = self._traffic.snapshot()
+                span.requests = after[0] - traffic_before[0]
+                span.request_s = after[1] - traffic_before[1]
+                span.bytes_sent = after[2] - traffic_before[2]
+                span.bytes_received = after[3] - traffic_before[3]
+                span.counters = {name: value - counters_before.get(name, 0) for name, value in self._counters.items()
+                                 if value != counters_before.get(name, 0)}
+                self.spans.append(span)
+                self._write({"type": "span", **asdict(span)})
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def new_trace_path(directory: str, label: str = "run") -> str:
+    """Timestamped trace file path in `directory`, e.g. '<dir>/20240501-142310_MyProject.jsonl'."""
+    safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label) or "run"
+    return os.path.join(directory, f"{datetime.datetime.now():%Y%m%d-%H%M%S}_{safe_label}.jsonl")
+
+
+# --- Analyzer ---
+
+def load_trace(path: str) -> List[Span]:
+    """
+    Reads the spans of a trace file. Lines of unknown type are skipped.
+
+    Raises:
+        ValueError: If a line is not valid JSON or a span is malformed.
+    """
+    spans: List[Span] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if record.get("type") == "span":
+                    record.pop("type")
+                    spans.append(Span(**record))
+            except (json.JSONDecodeError, TypeError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid trace record: {e}")
+    return spans
+
+
+@dataclass
+class BreakdownNode:
+    """Spans with the same name under the same (merged) parent, as in a flame graph."""
+    name: str
+    kind: str
+    count: int = 0
+    duration_s: float = 0.0
+    requests: int = 0
+    request_s: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    errors: int = 0
+    children: Dict[str, "BreakdownNode"] = field(default_factory=dict)
+
+    @property
+    def self_s(self) -> float:
+        return max(0.0, self.duration_s - sum(c.duration_s for c in self.children.values()))
+
+
+def build_breakdown(spans: Sequence[Span]) -> List[BreakdownNode]:
+    """Merges sibling spans by name into a tree of `BreakdownNode`s (roots in start order)."""
+    by_parent: Dict[Optional[int], List[Span]] = {}
+    for span in spans:
+        by_parent.setdefault(span.parent, []).append(span)
+    known_ids = {span.id for span in spans}
+
+    def merge(into: Dict[str, BreakdownNode], span_group: List[Span]) -> None:
+        for span in sorted(span_group, key=lambda s: s.start_s):
+            node = into.get(span.name)
+            if node is None:
+                node = into[span.name] = BreakdownNode(name=span.name, kind=span.kind)
+            node.count += 1
+            node.duration_s += span.duration_s
+            node.requests += span.requests
+            node.request_s += span.request_s
+            node.bytes_sent += span.bytes_sent
+            node.bytes_received += span.bytes_received
+            node.errors += span.status != "ok"
+            merge(node.children, by_parent.get(span.id, []))
+
+    roots: Dict[str, BreakdownNode] = {}
+    merge(roots, [s for s in spans if s.parent is None or s.parent not in known_ids])
+    return list(roots.values())
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024 or unit == "MB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+    return f"{n:.1f} MB"
+
+
+def format_breakdown(roots: Sequence[BreakdownNode], min_percent: float = 0.0) -> str:
+    """
+    Flame-style text breakdown: one line per node with total and self time, share of
+    the run, HTTP requests and the time spent waiting for them, and transferred bytes.
+    Nodes below `min_percent` of the run are summarised per parent.
+    """
+    total = sum(root.duration_s for root in roots) or 1e-12
+    lines = [f"{'span':<60} {'total s':>9} {'self s':>9} {'%':>6} {'req':>6} {'req s':>9} {'sent':>9} {'recv':>9}"]
+
+    def emit(node: BreakdownNode, depth: int) -> None:
+        label = "  " * depth + node.name + (f" x{node.count}" if node.count > 1 else "") + (" [error]" if node.errors else "")
+        lines.append(f"{label[:60]:<60} {node.duration_s:>9.3f} {node.self_s:>9.3f} {100.0 * node.duration_s / total:>6.1f} "
+                     f"{node.requests:>6} {node.request_s:>9.3f} {_format_bytes(node.bytes_sent):>9} "
+                     f"{_format_bytes(node.bytes_received):>9}")
+        hidden = 0
+        for child in sorted(node.children.values(), key=lambda c: c.duration_s, reverse=True):
+            if 100.0 * child.duration_s / total < min_percent:
+                hidden += 1
+                continue
+            emit(child, depth + 1)
+        if hidden:
+            lines.append("  " * (depth + 1) + f"... {hidden} more below {min_percent:g}%")
+
+    for root in roots:
+        emit(root, 0)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print a flame-style breakdown of a run trace (JSONL).")
+    parser.add_argument("trace", help="Trace file written by RunTracer.")
+    parser.add_argument("--min-percent", type=float, default=0.5, help="Hide spans below this share of the run.")
+    args = parser.parse_args(argv)
+    try:
+        spans = load_trace(args.trace)
+    except (IOError, ValueError) as e:
+        print(f"Could not read trace: {e}", file=sys.stderr)
+        return 1
+    print(format_breakdown(build_breakdown(spans), args.min_percent))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
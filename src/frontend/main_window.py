@@ -4,7 +4,7 @@ Handles the main UI layout, project management, analysis execution flow,
 and display of results and logs.
 
 PRD Ref: Category 4 (Frontend Development: UI Shell & Framework)
-         Task 7.1.1 (QThread for UI Responsiveness)
+         Task 7.1.1 (QThread for UI Responsiveness; the analysis itself runs in a worker process)
          Task 9.4 (Input Validation Feedback)
          Task 9.5 (UI for Log Access)
 """
@@ -17,7 +17,7 @@ from PySide6.QtWidgets import (
     QMainWindow, QApplication, QWidget, QVBoxLayout, QLabel,
     QMenuBar, QToolBar, QStatusBar, QStackedWidget, QFileDialog,
     QMessageBox, QPushButton, QGroupBox, QFormLayout, QLineEdit,
-    QHBoxLayout, QTextEdit, QProgressBar, QFrame, QTableWidget, QHeaderView, QTableWidgetItem
+    QHBoxLayout, QPlainTextEdit, QProgressBar, QFrame, QTableView, QHeaderView, QAbstractItemView
 )
 from PySide6.QtGui import QAction, QIcon, QFont, QDesktopServices
 from PySide6.QtCore import Qt, QSize, Slot, QUrl, QObject, Signal, QRunnable, QThreadPool, QThread
@@ -28,25 +28,28 @@ from ..backend.models import (
 )
 from ..backend.project_io import save_project, load_project
 from ..backend.logger_config import LOG_FILENAME
+from ..backend.curve_downsampling import extract_curve_columns
+from ..backend.result_store import ResultStore, project_case_parameters
+from ..backend.run_trace import new_trace_path, DEFAULT_TRACE_DIRNAME
+from ..backend.analysis_process import AnalysisProcess, DEFAULT_STOP_GRACE_S
+from ..backend.material_library import MaterialLibrary
 
 from .widgets.spudcan_geometry_widget import SpudcanGeometryWidget
 from .widgets.soil_stratigraphy_widget import SoilStratigraphyWidget
 from .widgets.loading_conditions_widget import LoadingConditionsWidget
 from .widgets.analysis_control_widget import AnalysisControlWidget
-from .widgets.mpl_widget import MplWidget
-from .qt_logging_handler import QtLoggingHandler
+from .widgets.curve_table_model import CurveTableModel
+from .qt_logging_handler import BufferedQtLoggingHandler
 from .settings_dialog import SettingsDialog
-from ..backend.plaxis_interactor.interactor import PlaxisInteractor
-from ..backend.plaxis_interactor import geometry_builder, soil_builder, calculation_builder, results_parser
-from ..backend.exceptions import (
-    PlaxisAutomationError, PlaxisConnectionError, PlaxisConfigurationError,
-    PlaxisCalculationError, PlaxisOutputError, PlaxisCliError, ProjectValidationError
-)
+from ..backend.plaxis_interactor import live_curve
+from ..backend.exceptions import ProjectValidationError
 
 from typing import Optional, Dict, Any, List, Callable # Added Any, List, Callable
 
 logger = logging.getLogger(__name__)
 
+LOG_DISPLAY_MAX_LINES = 5000 # Application log pane keeps only the newest lines.
+
 # --- Analysis Worker Thread ---
 class AnalysisWorkerSignals(QObject):
     """
@@ -55,118 +58,87 @@ class AnalysisWorkerSignals(QObject):
     - progress_updated(int, int): Emits current progress (value, max).
     - analysis_finished(AnalysisResults): Emits the compiled results upon successful completion.
     - analysis_error(str, str): Emits error title and detailed message on failure.
+    - live_curve_updated(int): Emits the number of curve points appended to the worker's live curve buffer.
     - finished: Emitted when the worker's run method completes (success or failure).
     """
     analysis_stage_changed = Signal(str)
     progress_updated = Signal(int, int)
     analysis_finished = Signal(AnalysisResults) # Pass the results object
     analysis_error = Signal(str, str) # title, message
+    live_curve_updated = Signal(int) # Emitted from the live curve polling thread; delivered queued.
     finished = Signal() # To signal the QThread to quit
 
 class AnalysisWorker(QObject): # Changed from QRunnable to QObject for QThread.moveToThread()
     """
-    Worker object to perform PLAXIS analysis in a separate thread.
+    Worker object that runs the PLAXIS analysis in a separate process (see
+    backend.analysis_process) and relays its events as signals. It runs in a QThread
+    that only waits on the process's event pipe, so parsing never holds the GUI's GIL,
+    and a hung analysis can be killed.
     """
     def __init__(self, plaxis_exe_path: str, project_settings: ProjectSettings):
         super().__init__()
         self.signals = AnalysisWorkerSignals()
         self.plaxis_exe_path = plaxis_exe_path
         self.project_settings = project_settings
-        self.interactor: Optional[PlaxisInteractor] = None
+        self.process: Optional[AnalysisProcess] = None
         self._is_cancelled = False
+        # Partial load-penetration curve polled from PLAXIS Output while the calculation runs.
+        self.live_curve_buffer = live_curve.CurveRingBuffer()
 
     @Slot()
     def run_analysis(self):
         """
-        Executes the full PLAXIS analysis workflow.
+        Starts the analysis process and relays its events until it ends.
         This method is intended to be run in a separate thread.
         """
         try:
-            logger.info("AnalysisWorker: Starting analysis run.")
-            self.interactor = PlaxisInteractor(self.plaxis_exe_path, self.project_settings)
-
-            # Connect interactor signals to worker signals to relay them to MainWindow
-            self.interactor.signals.analysis_stage_changed.connect(self.signals.analysis_stage_changed)
-            self.interactor.signals.progress_updated.connect(self.signals.progress_updated)
-
-            if self._is_cancelled: return
-
-            # 1. Define Model Setup Callables
-            self.signals.analysis_stage_changed.emit("setup_start")
-            model_setup_callables = geometry_builder.get_spudcan_geometry_commands(self.project_settings.spudcan) + \
-                                  soil_builder.get_soil_material_commands(self.project_settings.soil_stratigraphy) + \
-                                  soil_builder.get_soil_stratigraphy_commands(self.project_settings.soil_stratigraphy, self.project_settings.water_table_depth)
-            self.interactor.setup_model_in_plaxis(model_setup_callables, is_new_project=True)
-            self.signals.analysis_stage_changed.emit("setup_end")
-            if self._is_cancelled: return
-
-            # 2. Define Calculation Run Callables
-            self.signals.analysis_stage_changed.emit("calculation_start") # Broadly covers mesh, calc
-            calculation_run_callables = calculation_builder.get_full_calculation_workflow_commands(self.project_settings)
-            self.interactor.run_calculation(calculation_run_callables)
-            self.signals.analysis_stage_changed.emit("calculation_end")
+            logger.info("AnalysisWorker: Starting analysis process.")
+            # Per-run JSONL trace of stage/command timings next to the log file (see run_trace.py).
+            trace_dir = os.path.join(os.path.dirname(os.path.abspath(LOG_FILENAME)), DEFAULT_TRACE_DIRNAME)
+            trace_path = new_trace_path(trace_dir, self.project_settings.project_name or "run")
+            logger.info(f"AnalysisWorker: Tracing run to '{trace_path}'.")
+            self.live_curve_buffer.clear()
+            self.process = AnalysisProcess(self.plaxis_exe_path, self.project_settings, trace_path=trace_path,
+                                           log_level=logging.getLogger().getEffectiveLevel())
             if self._is_cancelled: return
-
-            # 3. Define Results Extraction Callables
-            self.signals.analysis_stage_changed.emit("results_start")
-            results_extraction_callables = results_parser.get_standard_results_commands(self.project_settings)
-            raw_results_data = self.interactor.extract_results(results_extraction_callables)
-
-            # 4. Process raw_results_data into AnalysisResults object
-            compiled_results = results_parser.compile_analysis_results(raw_results_data, self.project_settings)
-            self.signals.analysis_stage_changed.emit("results_end")
-            if self._is_cancelled: return
-
-            self.signals.analysis_finished.emit(compiled_results)
-            logger.info("AnalysisWorker: Analysis completed successfully.")
-
-        except PlaxisConnectionError as e:
-            logger.error(f"AnalysisWorker: PLAXIS Connection Error: {e}", exc_info=True)
-            self.signals.analysis_error.emit("PLAXIS Connection Error",
-                                             f"Could not connect to PLAXIS services:\n{e}\n\n"
-                                             "Ensure PLAXIS is running, API service enabled, and connection details are correct.")
-        except PlaxisConfigurationError as e:
-            logger.error(f"AnalysisWorker: PLAXIS Configuration Error: {e}", exc_info=True)
-            self.signals.analysis_error.emit("PLAXIS Configuration Error",
-                                             f"Model or analysis configuration issue for PLAXIS:\n{e}\n\n"
-                                             "Check input parameters, soil definitions, and analysis settings.")
-        except PlaxisCalculationError as e:
-            logger.error(f"AnalysisWorker: PLAXIS Calculation Error: {e}", exc_info=True)
-            self.signals.analysis_error.emit("PLAXIS Calculation Error",
-                                             f"PLAXIS reported an error during calculation:\n{e}\n\n"
-                                             "This may be due to numerical issues or model instability. Check PLAXIS output.")
-        except PlaxisOutputError as e:
-            logger.error(f"AnalysisWorker: PLAXIS Output Error: {e}", exc_info=True)
-            self.signals.analysis_error.emit("PLAXIS Output Error",
-                                             f"Could not retrieve or parse results from PLAXIS:\n{e}")
-        except PlaxisCliError as e: # Should not happen if using API primarily
-            logger.error(f"AnalysisWorker: PLAXIS CLI Error: {e}", exc_info=True)
-            self.signals.analysis_error.emit("PLAXIS Scripting Error",
-                                             f"Error running PLAXIS script (CLI):\n{e}")
-        except ProjectValidationError as ve: # If validation is done before this worker
-            logger.error(f"AnalysisWorker: Project Validation Error: {ve}", exc_info=True)
-            self.signals.analysis_error.emit("Input Validation Error",
-                                             f"Issue with provided input data:\n{ve}\n\nPlease review inputs.")
-        except PlaxisAutomationError as pae: # Catch-all for other specific automation errors
-            logger.error(f"AnalysisWorker: PLAXIS Automation Error: {pae}", exc_info=True)
-            self.signals.analysis_error.emit("PLAXIS Automation Error", f"An automation error occurred:\n{pae}")
+            self.process.start()
+
+            for event in self.process.events():
+                kind = event[0]
+                if kind == "stage":
+                    self.signals.analysis_stage_changed.emit(event[1])
+                elif kind == "progress":
+                    self.signals.progress_updated.emit(event[1], event[2])
+                elif kind == "curve":
+                    self.live_curve_buffer.extend(event[1])
+                    self.signals.live_curve_updated.emit(len(event[1]))
+                elif kind == "finished":
+                    self.signals.analysis_finished.emit(event[1])
+                    logger.info("AnalysisWorker: Analysis completed successfully.")
+                elif kind == "error":
+                    self.signals.analysis_error.emit(event[1], event[2])
+                elif kind == "cancelled":
+                    logger.info("AnalysisWorker: Analysis stopped.")
         except Exception as e:
             detailed_error = traceback.format_exc()
             logger.error(f"AnalysisWorker: Unexpected error during analysis: {e}\n{detailed_error}", exc_info=True)
             self.signals.analysis_error.emit("Unexpected Application Error",
                                              f"An unexpected error occurred:\n{e}\n\nCheck logs for details.")
         finally:
-            if self.interactor:
-                self.interactor.close_all_connections()
+            if self.process:
+                self.process.close()
             self.signals.finished.emit()
             logger.info("AnalysisWorker: Run method finished.")
 
-    def request_stop(self):
-        """Requests the analysis to stop."""
+    def request_stop(self, grace_s: float = DEFAULT_STOP_GRACE_S):
+        """
+        Requests the analysis to stop. The process is killed if it has not stopped
+        after `grace_s` seconds (immediately for 0).
+        """
         logger.info("AnalysisWorker: Stop requested.")
         self._is_cancelled = True
-        if self.interactor:
-            self.interactor.attempt_stop_calculation()
+        if self.process:
+            self.process.request_stop(grace_s)
 
 
 class MainWindow(QMainWindow):
@@ -181,6 +153,11 @@ class MainWindow(QMainWindow):
         # For QThread implementation
         self.analysis_thread: Optional[QThread] = None
         self.analysis_worker: Optional[AnalysisWorker] = None
+        self._live_curve_cursor = 0 # Position of the live plot in the worker's live curve buffer.
+
+        # Shared material library (see backend.material_library), loaded in _load_material_library.
+        self.material_library: MaterialLibrary = MaterialLibrary()
+        self.material_library_path: Optional[str] = None
 
         self.widget_validation_states: Dict[str, bool] = {
             "spudcan_geometry": True,
@@ -270,40 +247,24 @@ class MainWindow(QMainWindow):
         self.page_input_layout.addStretch()
         self.view_stack.addWidget(self.page_input)
 
+        # The results and comparison pages pull in matplotlib; their contents are built on first use
+        # (_ensure_results_page / _ensure_comparison_page) to keep application startup fast.
         self.page_results = QWidget()
         self.page_results_layout = QVBoxLayout(self.page_results)
-        results_summary_group = QGroupBox("Key Results Summary")
-        results_summary_form_layout = QFormLayout(results_summary_group)
-        self.result_final_penetration_label = QLabel("N/A")
-        self.result_peak_resistance_label = QLabel("N/A")
-        results_summary_form_layout.addRow(QLabel("Final Penetration Depth:"), self.result_final_penetration_label)
-        results_summary_form_layout.addRow(QLabel("Peak Vertical Resistance:"), self.result_peak_resistance_label)
-        self.page_results_layout.addWidget(results_summary_group)
-        results_plot_group = QGroupBox("Load-Penetration Curve")
-        results_plot_layout = QVBoxLayout(results_plot_group)
-        self.load_penetration_plot_widget = MplWidget()
-        results_plot_layout.addWidget(self.load_penetration_plot_widget)
-        self.page_results_layout.addWidget(results_plot_group, 1)
-        results_table_group = QGroupBox("Detailed Results Data")
-        results_table_layout = QVBoxLayout(results_table_group)
-        self.results_table_widget = QTableWidget()
-        self.results_table_widget.setColumnCount(2); self.results_table_widget.setHorizontalHeaderLabels(["Penetration", "Load"])
-        self.results_table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.results_table_widget.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers); self.results_table_widget.setAlternatingRowColors(True)
-        results_table_layout.addWidget(self.results_table_widget)
-        self.page_results_layout.addWidget(results_table_group, 1)
-        export_buttons_layout = QHBoxLayout()
-        self.export_plot_button = QPushButton("Export Plot as Image"); self.export_plot_button.clicked.connect(self.on_export_plot)
-        self.export_table_button = QPushButton("Export Table Data as CSV"); self.export_table_button.clicked.connect(self.on_export_table_data)
-        export_buttons_layout.addStretch(); export_buttons_layout.addWidget(self.export_plot_button); export_buttons_layout.addWidget(self.export_table_button)
-        self.page_results_layout.addLayout(export_buttons_layout)
         self.view_stack.addWidget(self.page_results)
+        self._results_page_built = False
+
+        self.page_comparison_container = QWidget()
+        QVBoxLayout(self.page_comparison_container).setContentsMargins(0, 0, 0, 0)
+        self.view_stack.addWidget(self.page_comparison_container)
+        self.page_comparison = None # CurveComparisonWidget, overlay/envelopes of many stored cases (sweeps).
         self.view_stack.setCurrentWidget(self.page_input)
 
         log_group_box = QGroupBox("Application Log")
         log_main_layout = QVBoxLayout(log_group_box)
-        self.log_display_textedit = QTextEdit()
+        self.log_display_textedit = QPlainTextEdit()
         self.log_display_textedit.setReadOnly(True)
+        self.log_display_textedit.setMaximumBlockCount(LOG_DISPLAY_MAX_LINES) # Oldest lines are discarded.
         self.log_display_textedit.setFont(QFont("Courier New", 9))
         log_main_layout.addWidget(self.log_display_textedit)
         log_actions_layout = QHBoxLayout()
@@ -319,9 +280,24 @@ class MainWindow(QMainWindow):
         self._create_status_bar()
         self._setup_ui_logging()
         self._update_run_analysis_button_state()
+        self._load_material_library(SettingsDialog.get_material_library_path())
         self.on_new_project(prompt_save=False)
         logger.info("MainWindow initialized.")
 
+    def _load_material_library(self, library_path: str):
+        """Loads the shared material library (an empty one if the file does not exist yet) for the stratigraphy editor."""
+        library = MaterialLibrary()
+        if os.path.exists(library_path):
+            try:
+                library = MaterialLibrary.load(library_path)
+            except ProjectValidationError as e:
+                logger.error(f"Material library not loaded: {e}")
+                QMessageBox.warning(self, "Material Library", f"The material library could not be loaded:\n{e}")
+        else:
+            logger.info(f"Material library '{library_path}' does not exist yet; it is created when a material is added.")
+        self.material_library, self.material_library_path = library, library_path
+        self.soil_stratigraphy_widget.set_material_library(library, library_path)
+
     @Slot(str, bool)
     def _handle_widget_validation_status_changed(self, widget_name: str, is_valid: bool):
         logger.debug(f"Validation status from {widget_name}: {is_valid}")
@@ -348,15 +324,71 @@ class MainWindow(QMainWindow):
         self.run_analysis_button.setToolTip(tooltip)
 
     @Slot(str)
-    def _append_log_message(self, message: str): self.log_display_textedit.append(message)
+    def _append_log_message(self, message: str): self.log_display_textedit.appendPlainText(message) # One batch of lines.
     def _setup_ui_logging(self):
-        self.qt_log_handler = QtLoggingHandler() # No parent needed if signal name is explicit
+        # Batched: records are queued by the logging thread and appended every 100 ms, so per-API-call
+        # logging of the builders during an analysis cannot flood the GUI thread.
+        self.qt_log_handler = BufferedQtLoggingHandler(self)
         log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
         self.qt_log_handler.setFormatter(log_formatter)
         self.qt_log_handler.connect(self._append_log_message) # Use the provided connect method
         logging.getLogger().addHandler(self.qt_log_handler)
         self.qt_log_handler.setLevel(logging.INFO)
 
+    def _ensure_results_page(self):
+        """Builds the results page contents (plot, table, exports) on first use."""
+        if self._results_page_built:
+            return
+        self._results_page_built = True
+        results_summary_group = QGroupBox("Key Results Summary")
+        results_summary_form_layout = QFormLayout(results_summary_group)
+        self.result_final_penetration_label = QLabel("N/A")
+        self.result_peak_resistance_label = QLabel("N/A")
+        results_summary_form_layout.addRow(QLabel("Final Penetration Depth:"), self.result_final_penetration_label)
+        results_summary_form_layout.addRow(QLabel("Peak Vertical Resistance:"), self.result_peak_resistance_label)
+        self.page_results_layout.addWidget(results_summary_group)
+        results_plot_group = QGroupBox("Load-Penetration Curve")
+        results_plot_layout = QVBoxLayout(results_plot_group)
+        from .widgets.mpl_widget import MplWidget # Deferred: imports matplotlib.
+        self.load_penetration_plot_widget = MplWidget()
+        results_plot_layout.addWidget(self.load_penetration_plot_widget)
+        self.page_results_layout.addWidget(results_plot_group, 1)
+        results_table_group = QGroupBox("Detailed Results Data")
+        results_table_layout = QVBoxLayout(results_table_group)
+        self.results_table_model = CurveTableModel(self)
+        self.results_table_model.clear(["Penetration", "Load"])
+        self.results_table_widget = QTableView() # Virtualized: only visible rows are formatted.
+        self.results_table_widget.setModel(self.results_table_model)
+        self.results_table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_table_widget.verticalHeader().setDefaultSectionSize(self.results_table_widget.fontMetrics().height() + 6) # Uniform rows, no per-row sizing
+        self.results_table_widget.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers); self.results_table_widget.setAlternatingRowColors(True)
+        results_table_layout.addWidget(self.results_table_widget)
+        self.page_results_layout.addWidget(results_table_group, 1)
+        export_buttons_layout = QHBoxLayout()
+        self.export_plot_button = QPushButton("Export Plot as Image"); self.export_plot_button.clicked.connect(self.on_export_plot)
+        self.export_table_button = QPushButton("Export Table Data as CSV"); self.export_table_button.clicked.connect(self.on_export_table_data)
+        self.add_to_comparison_button = QPushButton("Add to Comparison Store"); self.add_to_comparison_button.clicked.connect(self.on_add_result_to_comparison)
+        export_buttons_layout.addStretch(); export_buttons_layout.addWidget(self.add_to_comparison_button)
+        export_buttons_layout.addWidget(self.export_plot_button); export_buttons_layout.addWidget(self.export_table_button)
+        self.page_results_layout.addLayout(export_buttons_layout)
+        logger.debug("Results page built.")
+
+    def _ensure_comparison_page(self) -> 'CurveComparisonWidget':
+        """Builds the comparison page on first use and returns it."""
+        if self.page_comparison is None:
+            from .widgets.curve_comparison_widget import CurveComparisonWidget # Deferred: imports matplotlib.
+            self.page_comparison = CurveComparisonWidget()
+            self.page_comparison_container.layout().addWidget(self.page_comparison)
+        return self.page_comparison
+
+    def _show_results_page(self):
+        self._ensure_results_page()
+        self.view_stack.setCurrentWidget(self.page_results)
+
+    def _show_comparison_page(self):
+        self._ensure_comparison_page()
+        self.view_stack.setCurrentWidget(self.page_comparison_container)
+
     def _create_actions(self):
         self.action_new_project = QAction(QIcon.fromTheme("document-new"), "&New Project", self)
         self.action_new_project.triggered.connect(lambda: self.on_new_project(prompt_save=True))
@@ -373,7 +405,9 @@ class MainWindow(QMainWindow):
         self.action_view_input = QAction("Input Section", self); self.action_view_input.setCheckable(True); self.action_view_input.setChecked(True)
         self.action_view_input.triggered.connect(lambda: self.view_stack.setCurrentWidget(self.page_input))
         self.action_view_results = QAction("Results Section", self); self.action_view_results.setCheckable(True)
-        self.action_view_results.triggered.connect(lambda: self.view_stack.setCurrentWidget(self.page_results))
+        self.action_view_results.triggered.connect(self._show_results_page)
+        self.action_view_comparison = QAction("Comparison Section", self); self.action_view_comparison.setCheckable(True)
+        self.action_view_comparison.triggered.connect(self._show_comparison_page)
         self.action_about = QAction(QIcon.fromTheme("help-about"), "&About", self)
         self.action_about.triggered.connect(self.on_about)
         self.mark_project_modified(False)
@@ -402,7 +436,6 @@ class MainWindow(QMainWindow):
         filePath, _ = QFileDialog.getSaveFileName(self, "Save Plot As Image", suggested_filename, "PNG Files (*.png);;JPEG Files (*.jpg *.jpeg);;SVG Files (*.svg);;PDF Files (*.pdf);;All Files (*)")
         if filePath:
             try:
-                self.load_penetration_plot_widget.figure.tight_layout()
                 self.load_penetration_plot_widget.figure.savefig(filePath, dpi=300)
                 QMessageBox.information(self, "Export Successful", f"Plot saved to:\n{filePath}")
             except Exception as e: QMessageBox.critical(self, "Export Error", f"Could not save plot:\n{e}")
@@ -411,7 +444,7 @@ class MainWindow(QMainWindow):
     def on_export_table_data(self):
         # ... (implementation as before) ...
         logger.info("Export table data action triggered.")
-        if not hasattr(self, 'results_table_widget') or self.results_table_widget.rowCount() == 0:
+        if not hasattr(self, 'results_table_model') or self.results_table_model.rowCount() == 0:
             QMessageBox.warning(self, "Export Error", "No table data available to export.")
             return
         suggested_filename = "results_data.csv"
@@ -422,46 +455,61 @@ class MainWindow(QMainWindow):
         if filePath:
             try:
                 with open(filePath, 'w', newline='') as f:
-                    headers = [self.results_table_widget.horizontalHeaderItem(i).text() for i in range(self.results_table_widget.columnCount())]
-                    f.write(",".join(headers) + "\n")
-                    for row in range(self.results_table_widget.rowCount()):
-                        rowData = [self.results_table_widget.item(row, col).text() if self.results_table_widget.item(row, col) else "" for col in range(self.results_table_widget.columnCount())]
+                    f.write(",".join(self.results_table_model.headers()) + "\n")
+                    for rowData in self.results_table_model.iter_formatted_rows():
                         f.write(",".join(rowData) + "\n")
                 QMessageBox.information(self, "Export Successful", f"Table data saved to:\n{filePath}")
             except Exception as e: QMessageBox.critical(self, "Export Error", f"Could not save table data:\n{e}")
 
+    @Slot()
+    def on_add_result_to_comparison(self):
+        """Stores the current result as a case in the comparison view's result store."""
+        if not self.current_project_data or not self.current_project_data.analysis_results:
+            QMessageBox.warning(self, "Add to Comparison", "No analysis results available to add.")
+            return
+        comparison = self._ensure_comparison_page()
+        store = comparison.store
+        if store is None:
+            directory = QFileDialog.getExistingDirectory(self, "Select or Create Result Store Directory")
+            if not directory: return
+            try: store = ResultStore(directory)
+            except ProjectValidationError as e:
+                QMessageBox.critical(self, "Result Store Error", f"Could not open result store:\n{e}"); return
+        base_id = "".join(c if c.isalnum() or c in ('_', '-') else '_' for c in (self.current_project_data.project_name or "case"))
+        case_id, suffix = base_id, 2
+        while case_id in store:
+            case_id, suffix = f"{base_id}_{suffix}", suffix + 1
+        try:
+            store.add(case_id, self.current_project_data.analysis_results, project_case_parameters(self.current_project_data))
+        except (OSError, ProjectValidationError) as e:
+            QMessageBox.critical(self, "Result Store Error", f"Could not store result:\n{e}"); return
+        comparison.set_store(store)
+        self.statusBar.showMessage(f"Result added to comparison store as '{case_id}' ({len(store)} cases).", 5000)
+
     def _update_results_display(self):
         # ... (implementation mostly as before, ensure variables are defined before use) ...
         penetration_values, load_values = [], [] # Initialize here
         if self.current_project_data and self.current_project_data.analysis_results:
+            self._ensure_results_page()
             results = self.current_project_data.analysis_results
             pen_depth = results.final_penetration_depth
             peak_res = results.peak_vertical_resistance
             self.result_final_penetration_label.setText(f"{pen_depth:.3f} m" if pen_depth is not None else "N/A")
             self.result_peak_resistance_label.setText(f"{peak_res:.2f} kN" if peak_res is not None else "N/A")
-            if results.load_penetration_curve_data:
-                try: # Simplified data extraction
-                    valid_data = [item for item in results.load_penetration_curve_data if isinstance(item, dict)]
-                    pen_load_pairs = [(item.get('penetration'), item.get('load')) for item in valid_data if item.get('penetration') is not None and item.get('load') is not None and isinstance(item.get('penetration'), (int,float)) and isinstance(item.get('load'),(int,float))]
-                    if pen_load_pairs: penetration_values, load_values = zip(*pen_load_pairs)
-                except Exception as e: logger.error(f"Error processing curve data: {e}", exc_info=True)
-            # Plotting and table update logic as before...
-            if penetration_values and load_values:
-                self.load_penetration_plot_widget.plot_data(list(penetration_values), list(load_values), "Load vs. Penetration", f"Penetration ({SettingsDialog.get_units_system()})", f"Vertical Load ({SettingsDialog.get_units_system()})")
-            else: self.load_penetration_plot_widget.plot_data([],[], "Load vs. Penetration (No Data)", "Penetration", "Vertical Load")
-            self.results_table_widget.setRowCount(0)
-            if penetration_values and load_values:
-                self.results_table_widget.setRowCount(len(penetration_values))
-                pen_unit, load_unit = SettingsDialog.get_units_system(), SettingsDialog.get_units_system()
-                self.results_table_widget.setHorizontalHeaderLabels([f"Penetration ({pen_unit})", f"Load ({load_unit})"])
-                for row, (pen, load_val) in enumerate(zip(penetration_values, load_values)):
-                    self.results_table_widget.setItem(row, 0, QTableWidgetItem(f"{pen:.4f}")); self.results_table_widget.setItem(row, 1, QTableWidgetItem(f"{load_val:.2f}"))
-            else: self.results_table_widget.setHorizontalHeaderLabels(["Penetration", "Load"])
+            # Columnar arrays, built once: the plot downsamples them and the table model reads them lazily.
+            penetration_values, load_values = extract_curve_columns(results.load_penetration_curve_data)
+            pen_unit, load_unit = SettingsDialog.get_units_system(), SettingsDialog.get_units_system()
+            if penetration_values:
+                self.load_penetration_plot_widget.plot_data(penetration_values, load_values, "Load vs. Penetration", f"Penetration ({pen_unit})", f"Vertical Load ({load_unit})")
+                self.results_table_model.set_columns([f"Penetration ({pen_unit})", f"Load ({load_unit})"], [penetration_values, load_values], ["{:.4f}", "{:.2f}"])
+            else:
+                self.load_penetration_plot_widget.plot_data([],[], "Load vs. Penetration (No Data)", "Penetration", "Vertical Load")
+                self.results_table_model.clear(["Penetration", "Load"])
             self.view_stack.setCurrentWidget(self.page_results); self.action_view_results.setChecked(True); self.action_view_input.setChecked(False)
-        else: # Clear results display
+        elif self._results_page_built: # Clear results display
             self.result_final_penetration_label.setText("N/A"); self.result_peak_resistance_label.setText("N/A")
             if hasattr(self, 'load_penetration_plot_widget'): self.load_penetration_plot_widget.plot_data([],[], "Load vs. Penetration (No Data)", "Penetration", "Vertical Load")
-            if hasattr(self, 'results_table_widget'): self.results_table_widget.setRowCount(0); self.results_table_widget.setHorizontalHeaderLabels(["Penetration", "Load"])
+            if hasattr(self, 'results_table_model'): self.results_table_model.clear(["Penetration", "Load"])
         logger.info("Results display updated/cleared.")
 
 
@@ -492,7 +540,7 @@ class MainWindow(QMainWindow):
         file_menu = menu_bar.addMenu("&File"); view_menu = menu_bar.addMenu("&View"); help_menu = menu_bar.addMenu("&Help")
         file_menu.addActions([self.action_new_project, self.action_open_project, self.action_save_project, self.action_save_project_as])
         file_menu.addSeparator(); file_menu.addAction(self.action_settings); file_menu.addSeparator(); file_menu.addAction(self.action_exit)
-        view_menu.addActions([self.action_view_input, self.action_view_results])
+        view_menu.addActions([self.action_view_input, self.action_view_results, self.action_view_comparison])
         help_menu.addAction(self.action_about)
 
     def _create_tool_bar(self):
@@ -528,6 +576,8 @@ class MainWindow(QMainWindow):
                 loaded_data = load_project(filepath)
                 if loaded_data:
                     self.current_project_data = loaded_data; self.current_project_path = filepath
+                    if loaded_data.material_library_path and loaded_data.material_library_path != self.material_library_path:
+                        self._load_material_library(loaded_data.material_library_path) # The library the project was built with.
                     self._update_ui_from_project_model(); self.mark_project_modified(False); self.update_window_title()
                     self._validate_all_input_widgets_quietly()
                     self.statusBar.showMessage(f"Project '{filepath}' loaded.", 3000)
@@ -586,6 +636,8 @@ class MainWindow(QMainWindow):
         if analysis_model: self.current_project_data.analysis_control = analysis_model
         self.current_project_data.job_number = self.job_number_input.text() or None
         self.current_project_data.analyst_name = self.analyst_name_input.text() or None
+        if len(self.material_library): # Runs then reuse the library names (an empty library would only log a warning).
+            self.current_project_data.material_library_path = self.material_library_path
 
     def _update_ui_from_project_model(self):
         if not self.current_project_data:
@@ -611,14 +663,15 @@ class MainWindow(QMainWindow):
 
     def _clear_results_ui(self):
         """Clears all result display areas."""
+        if not self._results_page_built: # Nothing shown yet
+            return
         self.result_final_penetration_label.setText("N/A")
         self.result_peak_resistance_label.setText("N/A")
         if hasattr(self, 'load_penetration_plot_widget'):
             self.load_penetration_plot_widget.clear_plot()
             self.load_penetration_plot_widget.plot_data([],[], "Load vs. Penetration (No Data)", "Penetration", "Vertical Load")
-        if hasattr(self, 'results_table_widget'):
-            self.results_table_widget.setRowCount(0)
-            self.results_table_widget.setHorizontalHeaderLabels(["Penetration", "Load"])
+        if hasattr(self, 'results_table_model'):
+            self.results_table_model.clear(["Penetration", "Load"])
         logger.info("Results UI cleared.")
 
 
@@ -672,6 +725,10 @@ class MainWindow(QMainWindow):
         self.analysis_worker.signals.progress_updated.connect(self._update_progress_bar)
         self.analysis_worker.signals.analysis_finished.connect(self._on_analysis_worker_finished)
         self.analysis_worker.signals.analysis_error.connect(self._on_analysis_worker_error)
+        self.analysis_worker.signals.live_curve_updated.connect(self._on_live_curve_updated)
+        self._live_curve_cursor = 0
+        self._ensure_results_page()
+        self.load_penetration_plot_widget.start_live_plot("Load vs. Penetration (calculating...)", "Penetration", "Vertical Load")
 
         self.analysis_thread.started.connect(self.analysis_worker.run_analysis)
         self.analysis_worker.signals.finished.connect(self.analysis_thread.quit)
@@ -685,6 +742,7 @@ class MainWindow(QMainWindow):
     def _on_analysis_worker_finished(self, results: AnalysisResults):
         """Handles successful completion of analysis from worker thread."""
         logger.info("MainWindow: Received analysis_finished signal from worker.")
+        self.load_penetration_plot_widget.finish_live_plot()
         if self.current_project_data:
             self.current_project_data.analysis_results = results
             self._update_results_display()
@@ -696,16 +754,30 @@ class MainWindow(QMainWindow):
     def _on_analysis_worker_error(self, title: str, message: str):
         """Handles errors reported by the worker thread."""
         logger.error(f"MainWindow: Received analysis_error signal: {title} - {message}")
+        self.load_penetration_plot_widget.finish_live_plot() # Keep the partial curve visible for diagnosis.
         QMessageBox.critical(self, title, message)
         self.statusBar.showMessage(f"Analysis failed: {title}", 7000)
         self._update_workflow_stage("error") # Mark workflow as error
 
+    @Slot(int)
+    def _on_live_curve_updated(self, n_new_points: int):
+        """Appends the curve points polled since the last update to the live plot."""
+        if not self.analysis_worker:
+            return
+        penetrations, loads, self._live_curve_cursor = \
+            self.analysis_worker.live_curve_buffer.read_since(self._live_curve_cursor)
+        if penetrations:
+            self.load_penetration_plot_widget.append_live_points(penetrations, loads)
+            self.statusBar.showMessage(f"Calculating... {self._live_curve_cursor} steps, "
+                                       f"penetration {penetrations[-1]:.3f}, load {loads[-1]:.1f}", 0)
+
     @Slot()
     def _on_thread_finished_cleanup(self):
         """General cleanup after the analysis thread finishes (success or error)."""
         logger.info("MainWindow: Analysis thread finished. Cleaning up.")
         self._update_run_analysis_button_state() # Re-evaluate run button
         self.stop_analysis_button.setEnabled(False)
+        self.load_penetration_plot_widget.finish_live_plot() # E.g. stopped before any result was emitted
         self.analysis_thread = None # Clear references
         self.analysis_worker = None
 
@@ -756,6 +828,9 @@ class MainWindow(QMainWindow):
         if dialog.exec():
             logger.info("Settings dialog accepted.")
             self.statusBar.showMessage("Settings updated.", 3000)
+            library_path = SettingsDialog.get_material_library_path()
+            if library_path != self.material_library_path:
+                self._load_material_library(library_path)
             # Potentially re-check PLAXIS path if it affects run button state, though run button primarily checks on run click
             self._update_run_analysis_button_state()
         else:
@@ -776,9 +851,9 @@ class MainWindow(QMainWindow):
         """Handle window close event to ensure threads are stopped."""
         logger.info("Close event triggered. Checking for active analysis thread.")
         if self.analysis_thread and self.analysis_thread.isRunning():
-            logger.info("Analysis thread is running. Requesting stop and attempting to wait.")
+            logger.info("Analysis thread is running. Stopping the analysis process and attempting to wait.")
             if self.analysis_worker:
-                self.analysis_worker.request_stop()
+                self.analysis_worker.request_stop(grace_s=0.0) # Kill the analysis process right away.
 
             # Give the thread a moment to finish after stop request
             # This is a simple wait; a more robust solution might involve a timeout
@@ -791,6 +866,8 @@ class MainWindow(QMainWindow):
             else:
                  logger.info("Analysis thread finished after stop request during close.")
 
+        logging.getLogger().removeHandler(self.qt_log_handler)
+        self.qt_log_handler.close()
         super().closeEvent(event)
 
 
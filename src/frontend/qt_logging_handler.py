@@ -1,5 +1,19 @@
+"""
+Logging handlers that forward log records to Qt widgets.
+
+`QtLoggingHandler` emits one signal per record. `BufferedQtLoggingHandler` is meant
+for the application log: the builders log every PLAXIS API call, and a queued signal
+per record would flood the GUI thread during an analysis. It only appends the raw
+record to a bounded deque on the logging thread. A GUI-thread timer formats the
+records and delivers them as one text batch per interval. Repeated identical lines
+are collapsed, and excess low-severity records are dropped; both are counted and
+reported in the log itself.
+"""
 import logging
-from PySide6.QtCore import QObject, Signal
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal, QTimer
 
 class QtLogSignal(QObject):
     """
@@ -44,6 +58,125 @@ class QtLoggingHandler(logging.Handler):
             logging.getLogger(__name__).debug(f"Error disconnecting logger: {e}")
 
 
+class QtLogBatchSignal(QObject):
+    """
+    Signals of `BufferedQtLoggingHandler`.
+    `batch_ready` carries newline-separated formatted lines, `stats_changed` the
+    running (dropped, coalesced) record counts.
+    """
+    batch_ready = Signal(str)
+    stats_changed = Signal(int, int)
+
+
+class BufferedQtLoggingHandler(logging.Handler):
+    """
+    Logging handler that delivers records to Qt in rate-limited batches.
+
+    `emit` (any thread) only appends the record to a deque; formatting happens on the
+    GUI thread in `flush_to_widget`, which a QTimer calls every `flush_interval_ms`.
+    At most `max_lines_per_flush` lines are delivered per batch. Beyond that, DEBUG/INFO
+    records are dropped and WARNING and above are kept. The deque holds at most
+    `max_buffered_records`; anything older is dropped. Must be created in the GUI thread.
+    """
+    def __init__(self, parent_qobject=None, flush_interval_ms: int = 100, max_lines_per_flush: int = 200,
+                 max_buffered_records: int = 10000):
+        super().__init__()
+        self.emitter = QtLogBatchSignal(parent_qobject)
+        self.max_lines_per_flush = max_lines_per_flush
+        self._records: Deque[logging.LogRecord] = deque(maxlen=max_buffered_records)
+        self._received = 0 # Records passed to emit() (called under the handler lock by Handler.handle).
+        self._taken = 0 # Records taken out of the deque by the GUI thread.
+        self.dropped_count = 0
+        self.coalesced_count = 0
+        self._reported_stats: Tuple[int, int] = (0, 0)
+        self._timer = QTimer(self.emitter)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush_to_widget)
+        self._timer.start()
+
+    def emit(self, record: logging.LogRecord):
+        """Queues the record; cheap enough to call from the analysis thread for every API call."""
+        if record.args: # Merge %-args now: they may change (or be PLAXIS proxies) by the time the GUI formats.
+            record.msg, record.args = record.getMessage(), None
+        self._received += 1
+        self._records.append(record) # Formatting is deferred to the GUI thread; overflow drops the oldest.
+
+    def _take_pending(self) -> Tuple[List[logging.LogRecord], int]:
+        """Empties the deque. Returns (records, number pushed out of the full deque since the last call)."""
+        with self.lock: # Held by emit() only for a counter increment and an append.
+            records = list(self._records)
+            self._records.clear()
+            overflowed = self._received - self._taken - len(records)
+            self._taken = self._received
+        return records, overflowed
+
+    def _limit(self, records: List[logging.LogRecord]) -> List[logging.LogRecord]:
+        """Keeps the newest records up to the per-batch limit, but never drops WARNING or above."""
+        excess = len(records) - self.max_lines_per_flush
+        if excess <= 0:
+            return records
+        kept: List[logging.LogRecord] = []
+        for record in records:
+            if excess > 0 and record.levelno < logging.WARNING:
+                excess -= 1
+                self.dropped_count += 1
+                continue
+            kept.append(record)
+        return kept
+
+    def _coalesce(self, records: List[logging.LogRecord]) -> List[str]:
+        """Formats records, collapsing runs of identical messages into one line with a repeat count."""
+        lines: List[str] = []
+        previous_key: Optional[tuple] = None
+        repeats = 0
+        for record in records:
+            key = (record.levelno, record.name, record.getMessage())
+            if key == previous_key:
+                repeats += 1
+                continue
+            if repeats:
+                lines[-1] += f"  [repeated {repeats}x]"
+                self.coalesced_count += repeats
+            previous_key, repeats = key, 0
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+                lines.append(record.getMessage())
+        if repeats:
+            lines[-1] += f"  [repeated {repeats}x]"
+            self.coalesced_count += repeats
+        return lines
+
+    def flush_to_widget(self):
+        """Formats the queued records and emits them as one batch. Runs on the GUI thread."""
+        records, overflowed = self._take_pending()
+        self.dropped_count += overflowed
+        lines = self._coalesce(self._limit(records))
+
+        stats = (self.dropped_count, self.coalesced_count)
+        if stats[0] != self._reported_stats[0]:
+            lines.append(f"[log] {stats[0] - self._reported_stats[0]} low-severity records dropped "
+                         f"to keep the UI responsive (total dropped: {stats[0]}).")
+        if lines:
+            self.emitter.batch_ready.emit("\n".join(lines))
+        if stats != self._reported_stats:
+            self._reported_stats = stats
+            self.emitter.stats_changed.emit(*stats)
+
+    def close(self):
+        """Stops the flush timer after delivering what is still queued."""
+        self._timer.stop()
+        self.flush_to_widget()
+        super().close()
+
+    def connect(self, slot_function):
+        """
+        Convenience method to connect a slot to the batch_ready signal.
+        """
+        self.emitter.batch_ready.connect(slot_function)
+
+
 if __name__ == '__main__':
     # Example Usage (requires a QApplication to be running for signals/slots)
     from PySide6.QtWidgets import QApplication, QTextEdit, QVBoxLayout, QWidget
@@ -17,6 +17,8 @@ logger = logging.getLogger(__name__)
 # Define settings keys
 PLAXIS_PATH_SETTING = "plaxis/installation_path"
 UNITS_SYSTEM_KEY = "general/units_system"
+MATERIAL_LIBRARY_PATH_SETTING = "materials/library_path"
+DEFAULT_MATERIAL_LIBRARY_FILENAME = "material_library.json" # In the settings directory when no path is set.
 # Add other settings keys here as needed, e.g.:
 # DEFAULT_PROJECT_SETTINGS_KEY = "defaults/project_settings"
 
@@ -60,6 +62,20 @@ class SettingsDialog(QDialog):
 
         main_layout.addWidget(plaxis_group)
 
+        # --- Material Library Group ---
+        library_group = QGroupBox("Material Library")
+        library_form_layout = QFormLayout(library_group)
+        self.material_library_path_edit = QLineEdit()
+        self.material_library_path_edit.setPlaceholderText(SettingsDialog.default_material_library_path())
+        library_browse_button = QPushButton("Browse...")
+        library_browse_button.clicked.connect(self.browse_material_library_path)
+        library_desc_label = QLabel("Shared material library file. Leave empty to use the default file in the settings directory.")
+        library_desc_label.setStyleSheet("font-size: 8pt; color: gray;")
+        library_form_layout.addRow(QLabel("Library File:"), self.material_library_path_edit)
+        library_form_layout.addRow("", library_browse_button)
+        library_form_layout.addRow(library_desc_label)
+        main_layout.addWidget(library_group)
+
         # --- Placeholder for other settings sections (Defaults, Units) ---
         # Example: Defaults Group (Task 8.2 - Deferred for now)
         # defaults_group = QGroupBox("Default Project Settings")
@@ -127,6 +143,18 @@ class SettingsDialog(QDialog):
             self.plaxis_path_edit.setText(file_path)
             logger.debug(f"PLAXIS path selected via browser: {file_path}")
 
+    @Slot()
+    def browse_material_library_path(self):
+        start_path = self.material_library_path_edit.text() or SettingsDialog.default_material_library_path()
+        # A save dialog, so a library that does not exist yet can be chosen too (it is created on first save).
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Select Material Library", start_path, "Material Library (*.json);;All files (*)",
+            options=QFileDialog.Option.DontConfirmOverwrite
+        )
+        if file_path:
+            self.material_library_path_edit.setText(file_path)
+            logger.debug(f"Material library path selected via browser: {file_path}")
+
     def load_settings(self):
         """Loads settings from QSettings into the UI."""
         plaxis_path = self.settings.value(PLAXIS_PATH_SETTING, "")
@@ -142,6 +170,10 @@ class SettingsDialog(QDialog):
             self.units_system_combo.setCurrentIndex(0)
         logger.info(f"Loaded Units System from settings: '{saved_unit_system_value}' (ComboBox index: {idx})")
 
+        library_path = self.settings.value(MATERIAL_LIBRARY_PATH_SETTING, "")
+        self.material_library_path_edit.setText(library_path) # type: ignore
+        logger.info(f"Loaded material library path from settings: '{library_path}'")
+
 
     def save_settings(self):
         """Saves UI settings to QSettings."""
@@ -154,6 +186,10 @@ class SettingsDialog(QDialog):
         self.settings.setValue(UNITS_SYSTEM_KEY, selected_unit_system_data)
         logger.info(f"Saved Units System to settings: '{selected_unit_system_data}'")
 
+        # Save Material Library Path
+        self.settings.setValue(MATERIAL_LIBRARY_PATH_SETTING, self.material_library_path_edit.text().strip())
+        logger.info(f"Saved material library path to settings: '{self.material_library_path_edit.text().strip()}'")
+
         self.settings.sync() # Ensure changes are written to disk
         logger.info("All settings synced to disk.")
 
@@ -188,6 +224,21 @@ class SettingsDialog(QDialog):
             return "SI"
         return str(stored_value)
 
+    @staticmethod
+    def default_material_library_path() -> str:
+        return os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation),
+                            DEFAULT_MATERIAL_LIBRARY_FILENAME)
+
+    @staticmethod
+    def get_material_library_path() -> str:
+        """Retrieves the configured material library file, or the default one in the settings directory."""
+        settings = QSettings(
+            QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation) + "/settings.ini",
+            QSettings.Format.IniFormat
+        )
+        path = settings.value(MATERIAL_LIBRARY_PATH_SETTING, "")
+        return str(path) if path else SettingsDialog.default_material_library_path()
+
 
 if __name__ == '__main__':
     import sys
@@ -0,0 +1,72 @@
+"""
+Coalescing update scheduler for input widgets.
+
+Editing a spin box emits `valueChanged` on every keystroke and arrow step. Doing
+validation, schematic repaints and `data_changed` (which updates the main window)
+for each of them makes the editor lag with large stratigraphies. Widgets instead
+mark work as pending under a key; the scheduler runs each pending callback once
+when input has been idle for `delay_ms` (and at the latest `max_delay_ms` after
+the first pending request, so continuous edits still give feedback). Callbacks run
+in phase order: validation before repaints before change notifications.
+"""
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer
+
+logger = logging.getLogger(__name__)
+
+# Phases, run in this order within one flush.
+VALIDATE = 0
+REPAINT = 1
+NOTIFY = 2
+
+DEFAULT_DEBOUNCE_MS = 150
+DEFAULT_MAX_DELAY_MS = 500
+
+
+class CoalescingUpdateScheduler(QObject):
+    """Runs keyed callbacks once after input settles. See module docstring."""
+
+    def __init__(self, delay_ms: int = DEFAULT_DEBOUNCE_MS, max_delay_ms: int = DEFAULT_MAX_DELAY_MS,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.delay_ms = delay_ms
+        self.max_delay_ms = max_delay_ms
+        self._pending: Dict[str, Tuple[int, Callable[[], None]]] = {} # key -> (phase, callback)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._first_request = QElapsedTimer()
+
+    def has_pending(self, key: Optional[str] = None) -> bool:
+        return bool(self._pending) if key is None else key in self._pending
+
+    def schedule(self, key: str, callback: Callable[[], None], phase: int = VALIDATE) -> None:
+        """Marks `key` dirty; a key scheduled again before the flush runs only once."""
+        if not self._pending:
+            self._first_request.start()
+        self._pending[key] = (phase, callback)
+        remaining = self.max_delay_ms - self._first_request.elapsed()
+        self._timer.start(max(0, min(self.delay_ms, remaining)))
+
+    def cancel(self, key: Optional[str] = None) -> None:
+        """Drops one pending key, or all of them."""
+        if key is None:
+            self._pending.clear()
+        else:
+            self._pending.pop(key, None)
+        if not self._pending:
+            self._timer.stop()
+
+    def flush(self) -> None:
+        """Runs all pending callbacks now (e.g. on editingFinished or before reading data)."""
+        self._timer.stop()
+        while self._pending:
+            pending = sorted(self._pending.items(), key=lambda item: item[1][0]) # Stable: keeps request order per phase
+            self._pending.clear()
+            for key, (_, callback) in pending:
+                try:
+                    callback()
+                except Exception as e: # One failing update must not block the others.
+                    logger.error(f"Deferred update '{key}' failed: {e}", exc_info=True)
@@ -17,6 +17,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal, Slot, Qt
 from typing import Optional, Any, Dict
 
+from ..update_scheduler import CoalescingUpdateScheduler, VALIDATE, NOTIFY
 from ...backend.validation import validate_numerical_range, ValidationError
 from ...backend.models import AnalysisControlParameters
 
@@ -44,6 +45,8 @@ class AnalysisControlWidget(QWidget):
         """
         super().__init__(parent)
         self._is_valid = True # Internal state for overall widget validity
+        # Keystrokes only mark work as pending; validation and data_changed run once input settles.
+        self._updates = CoalescingUpdateScheduler(parent=self)
 
         self.main_layout = QVBoxLayout(self)
         group_box = QGroupBox("Analysis Control Parameters")
@@ -64,6 +67,25 @@ class AnalysisControlWidget(QWidget):
         self.refine_spudcan_checkbox.stateChanged.connect(self.on_data_changed) # Boolean, always valid
         form_layout.addRow(self.refine_spudcan_checkbox)
 
+        self.mesh_convergence_checkbox = QCheckBox("Mesh Convergence Study")
+        self.mesh_convergence_checkbox.setChecked(False)
+        self.mesh_convergence_checkbox.setToolTip("Analyse a ladder of coarseness levels and use the coarsest mesh whose peak resistance has converged.")
+        self.mesh_convergence_checkbox.stateChanged.connect(self.on_data_changed) # Boolean, always valid
+        form_layout.addRow(self.mesh_convergence_checkbox)
+
+        self.domain_auto_size_checkbox = QCheckBox("Auto-size Model Domain")
+        self.domain_auto_size_checkbox.setChecked(False)
+        self.domain_auto_size_checkbox.setToolTip("Size the soil contour and depth from the spudcan diameter and target penetration. Required for quarter symmetry.")
+        self.domain_auto_size_checkbox.stateChanged.connect(self.on_data_changed) # Boolean, always valid
+        form_layout.addRow(self.domain_auto_size_checkbox)
+
+        self.symmetry_combo = QComboBox()
+        self.symmetry_combo.addItems(["full", "quarter"])
+        self.symmetry_combo.setCurrentText("full")
+        self.symmetry_combo.setToolTip("Quarter model about x=0, y=0 for vertical-only loading; forces are scaled back to the full spudcan.")
+        self.symmetry_combo.currentTextChanged.connect(self.on_data_changed) # No specific validation needed
+        form_layout.addRow(QLabel("Model Symmetry:"), self.symmetry_combo)
+
         # --- Initial Stress Calculation ---
         self.initial_stress_combo = QComboBox()
         self.initial_stress_combo.addItems(["K0Procedure", "GravityLoading", "FieldStress (Not Implemented)"])
@@ -123,34 +145,36 @@ class AnalysisControlWidget(QWidget):
         self._validate_all_inputs() # Perform initial validation
         logger.info("AnalysisControlWidget initialized.")
 
-    # --- Slots for valueChanged signals of spinboxes ---
+    def _schedule_validation(self, key: str, validate) -> None:
+        """Defers validation of one field and data_changed until input settles."""
+        self._updates.schedule(key, validate, VALIDATE)
+        self._updates.schedule("data_changed", self.data_changed.emit, NOTIFY)
+
+    # --- Slots for valueChanged signals of spinboxes (deferred until input settles) ---
     @Slot()
     def _on_max_iterations_changed(self):
-        self._validate_max_iterations()
-        self._validate_min_iterations() # Min iterations depends on max
-        self.data_changed.emit()
+        self._schedule_validation("max_iterations", self._validate_max_iterations)
+        self._schedule_validation("min_iterations", self._validate_min_iterations) # Min iterations depends on max
     @Slot()
-    def _on_tolerated_error_changed(self): self._validate_tolerated_error(); self.data_changed.emit()
+    def _on_tolerated_error_changed(self): self._schedule_validation("tolerated_error", self._validate_tolerated_error)
     @Slot()
-    def _on_max_steps_stored_changed(self): self._validate_max_steps_stored(); self.data_changed.emit()
+    def _on_max_steps_stored_changed(self): self._schedule_validation("max_steps_stored", self._validate_max_steps_stored)
     @Slot()
-    def _on_max_calc_steps_changed(self): self._validate_max_calc_steps(); self.data_changed.emit()
+    def _on_max_calc_steps_changed(self): self._schedule_validation("max_calc_steps", self._validate_max_calc_steps)
     @Slot()
-    def _on_min_iterations_changed(self): self._validate_min_iterations(); self.data_changed.emit()
+    def _on_min_iterations_changed(self): self._schedule_validation("min_iterations", self._validate_min_iterations)
 
     # --- Slots for editingFinished signals (for final validation on focus lost) ---
     @Slot()
-    def _on_max_iterations_editing_finished(self):
-        self._validate_max_iterations()
-        self._validate_min_iterations() # Re-check min if max changed
+    def _on_max_iterations_editing_finished(self): self._updates.flush()
     @Slot()
-    def _on_tolerated_error_editing_finished(self): self._validate_tolerated_error()
+    def _on_tolerated_error_editing_finished(self): self._updates.flush()
     @Slot()
-    def _on_max_steps_stored_editing_finished(self): self._validate_max_steps_stored()
+    def _on_max_steps_stored_editing_finished(self): self._updates.flush()
     @Slot()
-    def _on_max_calc_steps_editing_finished(self): self._validate_max_calc_steps()
+    def _on_max_calc_steps_editing_finished(self): self._updates.flush()
     @Slot()
-    def _on_min_iterations_editing_finished(self): self._validate_min_iterations()
+    def _on_min_iterations_editing_finished(self): self._updates.flush()
 
     @Slot()
     def on_data_changed(self):
@@ -247,6 +271,7 @@ class AnalysisControlWidget(QWidget):
             ac_data: The AnalysisControlParameters object. Resets to defaults if None.
         """
         logger.debug(f"AnalysisControlWidget: Loading data - {ac_data}")
+        self._updates.cancel() # Superseded by the synchronous update below.
 
         # Iterate over types one by one to avoid potential findChildren tuple issue
         widgets_to_block = []
@@ -261,6 +286,9 @@ class AnalysisControlWidget(QWidget):
         if ac_data:
             self.mesh_coarseness_combo.setCurrentText(ac_data.meshing_global_coarseness or "Medium")
             self.refine_spudcan_checkbox.setChecked(ac_data.meshing_refinement_spudcan or False)
+            self.mesh_convergence_checkbox.setChecked(ac_data.mesh_convergence_study or False)
+            self.domain_auto_size_checkbox.setChecked(ac_data.domain_auto_size or False)
+            self.symmetry_combo.setCurrentText(ac_data.symmetry or "full")
             self.initial_stress_combo.setCurrentText(ac_data.initial_stress_method or "K0Procedure")
             self.max_iterations_spinbox.setValue(ac_data.MaxIterations if ac_data.MaxIterations is not None else 100)
             self.tolerated_error_spinbox.setValue(ac_data.ToleratedError if ac_data.ToleratedError is not None else 0.01)
@@ -271,6 +299,9 @@ class AnalysisControlWidget(QWidget):
         else: # Reset to defaults
             self.mesh_coarseness_combo.setCurrentText("Medium")
             self.refine_spudcan_checkbox.setChecked(False)
+            self.mesh_convergence_checkbox.setChecked(False)
+            self.domain_auto_size_checkbox.setChecked(False)
+            self.symmetry_combo.setCurrentText("full")
             self.initial_stress_combo.setCurrentText("K0Procedure")
             self.max_iterations_spinbox.setValue(100)
             self.tolerated_error_spinbox.setValue(0.01)
@@ -293,9 +324,13 @@ class AnalysisControlWidget(QWidget):
         Returns:
             Dict[str, Any]: Dictionary of analysis control parameters.
         """
+        self._updates.flush() # Field styles must reflect the latest input.
         data = {
             "meshing_global_coarseness": self.mesh_coarseness_combo.currentText(),
             "meshing_refinement_spudcan": self.refine_spudcan_checkbox.isChecked(),
+            "mesh_convergence_study": self.mesh_convergence_checkbox.isChecked(),
+            "domain_auto_size": self.domain_auto_size_checkbox.isChecked(),
+            "symmetry": self.symmetry_combo.currentText(),
             "initial_stress_method": self.initial_stress_combo.currentText(),
             "MaxIterations": self.max_iterations_spinbox.value() if self.max_iterations_spinbox.styleSheet()!=INVALID_STYLE else None,
             "ToleratedError": self.tolerated_error_spinbox.value() if self.tolerated_error_spinbox.styleSheet()!=INVALID_STYLE else None,
@@ -315,6 +350,7 @@ class AnalysisControlWidget(QWidget):
         Returns:
             Optional[AnalysisControlParameters]: An AnalysisControlParameters object.
         """
+        self._updates.flush() # Apply pending edits (incl. data_changed) before reading the fields.
         self._validate_all_inputs() # Ensure current validation status is accurate
 
         if not self._is_valid:
@@ -325,6 +361,9 @@ class AnalysisControlWidget(QWidget):
         return AnalysisControlParameters(
             meshing_global_coarseness=raw_data["meshing_global_coarseness"],
             meshing_refinement_spudcan=raw_data["meshing_refinement_spudcan"],
+            mesh_convergence_study=raw_data["mesh_convergence_study"],
+            domain_auto_size=raw_data["domain_auto_size"],
+            symmetry=raw_data["symmetry"],
             initial_stress_method=raw_data["initial_stress_method"],
             MaxIterations=raw_data["MaxIterations"],
             ToleratedError=raw_data["ToleratedError"],
@@ -340,6 +379,7 @@ class AnalysisControlWidget(QWidget):
         Returns:
             bool: True if all inputs are valid, False otherwise.
         """
+        self._updates.flush()
         return self._validate_all_inputs()
 
 if __name__ == '__main__':
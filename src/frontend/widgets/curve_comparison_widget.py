@@ -0,0 +1,184 @@
+"""
+Comparison view for many stored load-penetration curves (e.g. a parameter sweep).
+
+The scatter of peak resistance against a swept parameter covers every case and
+uses the store index alone. The envelopes on a common penetration grid also cover
+every case; they are streamed from disk once per store (see
+`curve_comparison.store_envelopes`) and kept until `refresh`. Individual curves are
+only drawn for the selected cases: by default the most recent ones, up to the
+store's curve cache size, so redrawing reads from the cache. Ctrl+click on a
+scatter point adds or removes that case from the selection, a plain click
+highlights its curve. The selected curves are drawn as one `LineCollection`
+(only while "Individual curves" is checked).
+"""
+import logging
+from typing import Optional, List, Dict
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox, QCheckBox, QLabel, QFileDialog, QMessageBox
+)
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from ...backend.result_store import ResultStore
+from ...backend.exceptions import ProjectValidationError
+from ...backend.curve_comparison import (
+    CurveEnvelopes, store_envelopes, peak_vs_parameter, percentile_key, DEFAULT_PERCENTILES
+)
+from ...backend.curve_downsampling import lttb_downsample
+
+logger = logging.getLogger(__name__)
+
+OVERLAY_POINTS_PER_CURVE = 300 # Each overlay curve is downsampled to this many points.
+
+
+class CurveComparisonWidget(QWidget):
+    """Overlay, envelopes and peak-vs-parameter scatter for the cases of a result store."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store: Optional[ResultStore] = None
+        self._scatter_case_ids: List[str] = []
+        self._selected_case_ids: List[str] = [] # Cases whose curves are drawn individually.
+        self._envelopes: Optional[CurveEnvelopes] = None # Of every case; None until computed for the store.
+        self._highlight = None # Line2D of the case picked in the scatter.
+
+        self.open_store_button = QPushButton("Open Result Store...")
+        self.open_store_button.clicked.connect(self.on_open_store_clicked)
+        self.parameter_combo = QComboBox()
+        self.parameter_combo.setToolTip("Swept parameter for the peak resistance scatter.")
+        self.parameter_combo.currentTextChanged.connect(self._update_scatter)
+        self.show_curves_checkbox = QCheckBox("Individual curves")
+        self.show_curves_checkbox.setChecked(True)
+        self.show_curves_checkbox.toggled.connect(self._on_show_curves_toggled)
+        self.status_label = QLabel("No result store open.")
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.open_store_button)
+        controls.addWidget(QLabel("Parameter:"))
+        controls.addWidget(self.parameter_combo, 1)
+        controls.addWidget(self.show_curves_checkbox)
+        controls.addWidget(self.status_label, 1)
+
+        self.figure = Figure(figsize=(8, 4), dpi=100, constrained_layout=True)
+        self.canvas = FigureCanvas(self.figure)
+        self.curve_axes = self.figure.add_subplot(121)
+        self.scatter_axes = self.figure.add_subplot(122)
+        self._overlay: Optional[LineCollection] = None
+        self.canvas.mpl_connect('pick_event', self._on_pick)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(self.canvas, 1)
+        self.setLayout(layout)
+
+    def on_open_store_clicked(self):
+        directory = QFileDialog.getExistingDirectory(self, "Open Result Store")
+        if not directory:
+            return
+        try:
+            self.set_store(ResultStore(directory))
+        except ProjectValidationError as e:
+            QMessageBox.critical(self, "Result Store Error", f"Could not open result store:\n{e}")
+
+    def set_store(self, store: Optional[ResultStore]):
+        """Shows the cases of `store`, drawing the most recent ones (up to its curve cache size)."""
+        self.store = store
+        self._selected_case_ids = []
+        if store is not None and store.cache_size > 0:
+            self._selected_case_ids = [case.case_id for case in store.cases()[-store.cache_size:]]
+        self.parameter_combo.blockSignals(True)
+        self.parameter_combo.clear()
+        if store is not None:
+            self.parameter_combo.addItems(store.parameter_names())
+        self.parameter_combo.blockSignals(False)
+        self.refresh()
+
+    def refresh(self):
+        """Recomputes the envelopes and scatter of all cases (e.g. after cases were added) and redraws."""
+        self._envelopes = None
+        self._redraw()
+
+    def _redraw(self):
+        self._draw_curves()
+        self._update_scatter(self.parameter_combo.currentText())
+
+    def _draw_curves(self):
+        axes = self.curve_axes
+        axes.clear()
+        axes.grid(True)
+        axes.set_title("Load vs. Penetration")
+        axes.set_xlabel("Penetration")
+        axes.set_ylabel("Vertical Load")
+        self._overlay, self._highlight = None, None
+        if not self.store or not len(self.store):
+            self.status_label.setText("No result store open." if not self.store else "Result store is empty.")
+            self.canvas.draw_idle()
+            return
+
+        if self._envelopes is None:
+            self._envelopes = store_envelopes(self.store)
+        result = self._envelopes
+        curves: Dict[str, tuple] = {}
+        if self.show_curves_checkbox.isChecked():
+            case_ids = [case_id for case_id in self._selected_case_ids if case_id in self.store]
+            curves = dict(self.store.iter_curves(case_ids))
+            segments = [list(zip(*lttb_downsample(penetrations, loads, OVERLAY_POINTS_PER_CURVE)))
+                        for penetrations, loads in curves.values() if penetrations]
+            self._overlay = LineCollection(segments, colors="tab:blue", linewidths=0.6, alpha=0.25, label="Cases")
+            axes.add_collection(self._overlay)
+
+        if result.case_ids:
+            axes.fill_between(result.grid, result.envelopes["min"], result.envelopes["max"],
+                              color="tab:gray", alpha=0.2, label="Min-max")
+            for q, style in zip(DEFAULT_PERCENTILES, ("--", "-", "--")):
+                axes.plot(result.grid, result.envelopes[percentile_key(q)], style, color="black",
+                          linewidth=1.0, label=f"P{q:g}")
+        axes.autoscale_view()
+        if curves or result.case_ids:
+            axes.legend(loc="lower right", fontsize="small")
+        self.status_label.setText(f"Envelopes of {len(result.case_ids)} cases, "
+                                  f"{len(curves)} of {len(self.store)} curves drawn")
+        self.canvas.draw_idle()
+
+    def _on_show_curves_toggled(self, checked: bool):
+        if self._overlay is not None:
+            self._overlay.set_visible(checked)
+            self.canvas.draw_idle()
+        elif checked and self.store:
+            self._draw_curves() # The overlay is only built while it is shown.
+
+    def _update_scatter(self, parameter: str):
+        axes = self.scatter_axes
+        axes.clear()
+        axes.grid(True)
+        axes.set_title("Peak Resistance")
+        axes.set_xlabel(parameter or "Parameter")
+        axes.set_ylabel("Peak Vertical Load")
+        self._scatter_case_ids = []
+        if self.store and parameter:
+            values, peaks, self._scatter_case_ids = peak_vs_parameter(self.store.cases(), parameter)
+            selected = set(self._selected_case_ids)
+            colors = ["tab:blue" if case_id in selected else "lightgray" for case_id in self._scatter_case_ids]
+            axes.scatter(values, peaks, s=16, c=colors, picker=5)
+        self.canvas.draw_idle()
+
+    def _on_pick(self, event):
+        if event.artist.axes is not self.scatter_axes or not len(event.ind) or not self.store:
+            return
+        case_id = self._scatter_case_ids[event.ind[0]]
+        if event.mouseevent.key == "control":
+            if case_id in self._selected_case_ids:
+                self._selected_case_ids.remove(case_id)
+            else:
+                self._selected_case_ids.append(case_id)
+            self._redraw() # The envelopes do not depend on the selection.
+            return
+        penetrations, loads = self.store.load_curve(case_id)
+        if self._highlight is None:
+            self._highlight, = self.curve_axes.plot(penetrations, loads, color="tab:red", linewidth=2.0)
+        else:
+            self._highlight.set_data(penetrations, loads)
+        self.status_label.setText(f"Case '{case_id}'")
+        self.canvas.draw_idle()
@@ -0,0 +1,69 @@
+"""
+Table model over columnar curve data.
+
+Replaces per-cell QTableWidgetItems for result tables: the view asks only for
+the visible cells and values are formatted on demand, so filling the table is
+constant-time regardless of the number of calculation steps.
+"""
+import logging
+from typing import List, Sequence, Any, Optional
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject
+
+logger = logging.getLogger(__name__)
+
+
+class CurveTableModel(QAbstractTableModel):
+    """Read-only model over equally long columns of numbers."""
+
+    def __init__(self, parent: Optional[QObject] = None): # type: ignore
+        super().__init__(parent)
+        self._headers: List[str] = []
+        self._columns: List[Sequence[float]] = []
+        self._formats: List[str] = []
+        self._row_count = 0
+
+    def set_columns(self, headers: List[str], columns: List[Sequence[float]], formats: Optional[List[str]] = None) -> None:
+        """Replaces the data; the columns are referenced, not copied."""
+        if len(headers) != len(columns) or len({len(c) for c in columns}) > 1:
+            raise ValueError("CurveTableModel needs one header per column and columns of equal length.")
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._columns = list(columns)
+        self._formats = list(formats) if formats else ["{:.4f}"] * len(columns)
+        self._row_count = len(columns[0]) if columns else 0
+        self.endResetModel()
+
+    def clear(self, headers: Optional[List[str]] = None) -> None:
+        self.set_columns(headers or [], [[] for _ in (headers or [])])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section] if 0 <= section < len(self._headers) else None
+        return str(section + 1)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        value = self._columns[index.column()][index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._formats[index.column()].format(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headers(self) -> List[str]:
+        return list(self._headers)
+
+    def iter_formatted_rows(self):
+        """Yields each row as formatted strings (for CSV export)."""
+        for row in range(self._row_count):
+            yield [fmt.format(column[row]) for fmt, column in zip(self._formats, self._columns)]
@@ -3,7 +3,7 @@ Custom delegates for QTableView in the PLAXIS Spudcan Automation Tool.
 PRD Ref: Task 6.2.3, 6.2.4 (related to material parameter editing)
 """
 import logging
-from PySide6.QtWidgets import QStyledItemDelegate, QComboBox, QWidget, QPushButton, QDialog, QVBoxLayout, QLabel, QDialogButtonBox
+from PySide6.QtWidgets import QStyledItemDelegate, QComboBox, QWidget, QPushButton, QDialog, QVBoxLayout, QLabel, QDialogButtonBox, QMessageBox
 from PySide6.QtCore import Qt, QModelIndex, Slot
 from PySide6.QtGui import QPainter # For custom painting if needed later
 
@@ -161,7 +161,9 @@ class MaterialParametersDelegate(QStyledItemDelegate):
                 layer_data_item = model.data(index, Qt.ItemDataRole.UserRole) # UserRole should give SoilLayerData
                 if layer_data_item and hasattr(layer_data_item, 'original_material'):
                     # Create and open the dialog
-                    dialog = ParameterEditDialog(layer_data_item.original_material, parent=option.widget) # option.widget is the view
+                    dialog = ParameterEditDialog(layer_data_item.original_material, parent=option.widget, # option.widget is the view
+                                                 material_library=getattr(model, 'material_library', None),
+                                                 material_library_path=getattr(model, 'material_library_path', None))
                     if dialog.exec() == QDialog.DialogCode.Accepted:
                         new_params = dialog.get_parameters()
                         current_material = layer_data_item.original_material
@@ -196,6 +198,8 @@ SOIL_MODEL_PARAMETERS = {
         ("cRef", "c'_ref (kN/m²)", float, 5.0),
         ("phi", "φ' (friction angle °)", float, 30.0),
         ("psi", "ψ (dilatancy angle °)", float, 0.0),
+        ("cInc", "c'_inc (kN/m²/m, increase with depth)", float, 0.0),
+        ("EInc", "E'_inc (kN/m²/m, increase with depth)", float, 0.0),
     ],
     "HardeningSoil": [
         ("gammaUnsat", "γ_unsat (kN/m³)", float, 18.0),
@@ -231,12 +235,15 @@ SOIL_MODEL_PARAMETERS = {
 }
 
 
-from PySide6.QtWidgets import QFormLayout, QLineEdit, QDoubleSpinBox # Add missing imports
+from PySide6.QtWidgets import QFormLayout, QLineEdit, QDoubleSpinBox, QSpinBox # Add missing imports
+import dataclasses
 
 class ParameterEditDialog(QDialog):
-    def __init__(self, material_props, parent=None):
+    def __init__(self, material_props, parent=None, material_library=None, material_library_path=None):
         super().__init__(parent)
         self.material_props = material_props
+        self.material_library = material_library # Optional backend.material_library.MaterialLibrary
+        self.material_library_path = material_library_path # Where the library is saved when an entry is added.
         self.model_name = material_props.model_name or "Mohr-Coulomb" # Default if None
         self.setWindowTitle(f"Edit '{self.model_name}' Parameters")
         self.setMinimumWidth(400)
@@ -298,11 +305,61 @@ class ParameterEditDialog(QDialog):
 
         self.layout.addLayout(self.form_layout)
 
+        # --- Material library (reuse a stored definition or store this one) ---
+        if self.material_library is not None and param_definitions:
+            self.library_combo = QComboBox()
+            self.library_combo.addItem("") # No selection
+            for entry in self.material_library.entries.values():
+                if (entry.material.model_name or "Mohr-Coulomb") == self.model_name:
+                    self.library_combo.addItem(entry.name)
+            self.library_combo.currentTextChanged.connect(self._apply_library_material)
+            self.form_layout.addRow("From Library:", self.library_combo)
+            self.add_to_library_button = QPushButton("Add to Library")
+            self.add_to_library_button.clicked.connect(self._add_to_library)
+            self.form_layout.addRow(self.add_to_library_button)
+
         self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         self.button_box.accepted.connect(self.accept)
         self.button_box.rejected.connect(self.reject)
         self.layout.addWidget(self.button_box)
 
+    @Slot(str)
+    def _apply_library_material(self, name: str) -> None:
+        entry = self.material_library.get(name) if name else None
+        if entry is None:
+            return
+        for param_name, editor in self.parameter_widgets.items():
+            value = getattr(entry.material, param_name, None)
+            if value is None:
+                value = entry.material.other_params.get(param_name)
+            if value is None:
+                continue
+            if isinstance(editor, (QDoubleSpinBox, QSpinBox)):
+                editor.setValue(value)
+            else:
+                editor.setText(str(value))
+        logger.info(f"Applied library material '{name}' to the parameter editor.")
+
+    @Slot()
+    def _add_to_library(self) -> None:
+        material = dataclasses.replace(self.material_props, other_params=dict(self.material_props.other_params))
+        for key, value in self.get_parameters().items():
+            if hasattr(material, key):
+                setattr(material, key, value)
+            else:
+                material.other_params[key] = value
+        version = self.material_library.version
+        name = self.material_library.add(material)
+        if self.library_combo.findText(name) < 0:
+            self.library_combo.addItem(name)
+        logger.info(f"Material stored in library as '{name}'.")
+        if self.material_library_path and self.material_library.version != version:
+            try:
+                self.material_library.save(self.material_library_path)
+            except OSError as e:
+                logger.error(f"Could not save material library to '{self.material_library_path}': {e}")
+                QMessageBox.warning(self, "Material Library", f"Could not save the material library:\n{e}")
+
     def get_parameters(self) -> dict:
         params = {}
         if self.model_name == "Custom" or not SOIL_MODEL_PARAMETERS.get(self.model_name):
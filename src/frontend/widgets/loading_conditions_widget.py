@@ -16,6 +16,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal, Slot, Qt
 from typing import Optional, Any, Dict
 
+from ..update_scheduler import CoalescingUpdateScheduler, VALIDATE, NOTIFY
 from ...backend.validation import validate_numerical_range, ValidationError
 from ...backend.models import LoadingConditions
 
@@ -44,6 +45,8 @@ class LoadingConditionsWidget(QWidget):
         """
         super().__init__(parent)
         self._is_valid = True # Internal state for overall widget validity
+        # Keystrokes only mark work as pending; validation and data_changed run once input settles.
+        self._updates = CoalescingUpdateScheduler(parent=self)
 
         self.main_layout = QVBoxLayout(self)
         group_box = QGroupBox("Loading Conditions")
@@ -84,25 +87,25 @@ class LoadingConditionsWidget(QWidget):
 
     @Slot()
     def _on_preload_changed(self):
-        """Handles changes to the preload spinbox value."""
-        self._validate_preload()
-        self.data_changed.emit()
+        """Handles changes to the preload spinbox value (deferred until input settles)."""
+        self._updates.schedule("preload", self._validate_preload, VALIDATE)
+        self._updates.schedule("data_changed", self.data_changed.emit, NOTIFY)
 
     @Slot()
     def _on_preload_editing_finished(self):
         """Ensures final validation for preload when editing is finished."""
-        self._validate_preload()
+        self._updates.flush()
 
     @Slot()
     def _on_target_value_changed(self):
-        """Handles changes to the target value spinbox."""
-        self._validate_target_value()
-        self.data_changed.emit()
+        """Handles changes to the target value spinbox (deferred until input settles)."""
+        self._updates.schedule("target_value", self._validate_target_value, VALIDATE)
+        self._updates.schedule("data_changed", self.data_changed.emit, NOTIFY)
 
     @Slot()
     def _on_target_value_editing_finished(self):
         """Ensures final validation for target value when editing is finished."""
-        self._validate_target_value()
+        self._updates.flush()
 
     @Slot(str)
     def on_target_type_changed(self, text: str):
@@ -120,6 +123,7 @@ class LoadingConditionsWidget(QWidget):
             self.target_value_spinbox.setSuffix(" kN")
             self.target_value_spinbox.setRange(0.1, 1e9) # Max reasonable load
             self.target_value_spinbox.setDecimals(2)
+        self._updates.cancel("target_value")
         self._validate_target_value() # Re-validate as range/suffix changes
         self.data_changed.emit() # Emit data changed as meaning/units of target_value changes
 
@@ -188,6 +192,7 @@ class LoadingConditionsWidget(QWidget):
                            If None, fields are reset to default values.
         """
         logger.debug(f"LoadingConditionsWidget: Loading data - {loading_data}")
+        self._updates.cancel() # Superseded by the synchronous update below.
         self.preload_spinbox.blockSignals(True)
         self.target_type_combo.blockSignals(True)
         self.target_value_spinbox.blockSignals(True)
@@ -223,6 +228,7 @@ class LoadingConditionsWidget(QWidget):
         Returns:
             Dict[str, Any]: A dictionary containing the current loading conditions data.
         """
+        self._updates.flush() # Field styles must reflect the latest input.
         target_type_str = "load" if self.target_type_combo.currentText() == "Load Control" else "penetration"
         return {
             "vertical_preload": self.preload_spinbox.value() if self.preload_spinbox.styleSheet() != INVALID_STYLE else None,
@@ -238,6 +244,7 @@ class LoadingConditionsWidget(QWidget):
         Returns:
             Optional[LoadingConditions]: A LoadingConditions object.
         """
+        self._updates.flush() # Apply pending edits (incl. data_changed) before reading the fields.
         self._validate_all_inputs() # Ensure current validation state is accurate
 
         # If not strictly valid, one might choose to return None or raise an error.
@@ -258,6 +265,7 @@ class LoadingConditionsWidget(QWidget):
         Returns:
             bool: True if all inputs are valid, False otherwise.
         """
+        self._updates.flush()
         return self._validate_all_inputs()
 
 
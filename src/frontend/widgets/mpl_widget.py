@@ -3,32 +3,57 @@ Matplotlib Widget for PySide6 Integration.
 Provides a QWidget that can embed a Matplotlib figure.
 """
 import logging
+import functools
 from PySide6.QtWidgets import QWidget, QVBoxLayout
+import matplotlib
+import matplotlib.style
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt # For theme context
+
+from ...backend.curve_downsampling import downsample_curve, DEFAULT_MAX_PLOT_POINTS
 
 logger = logging.getLogger(__name__)
 
+PLOT_STYLE = 'seaborn-v0_8-darkgrid'
+
+
+@functools.lru_cache(maxsize=None)
+def _plot_style_rc() -> dict:
+    """rcParams of PLOT_STYLE, resolved once per process (pyplot is not needed for styles)."""
+    style = matplotlib.style.library.get(PLOT_STYLE)
+    if style is None:
+        logger.warning(f"Failed to apply '{PLOT_STYLE}' style. Using default Matplotlib style.")
+        return {}
+    return dict(style)
+
 class MplWidget(QWidget):
     """
     A QWidget that embeds a Matplotlib Figure.
+
+    Curves are downsampled to at most `max_points` before drawing and the line
+    artist is reused between plots, so redraw cost does not grow with the number
+    of calculation steps.
+
+    During a calculation the curve is drawn in live mode (`start_live_plot`,
+    `append_live_points`, `finish_live_plot`): the line is animated and blitted
+    over a cached background, and the full figure is only redrawn when new data
+    leaves the current axis limits.
     """
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         super().__init__(parent)
 
-        # Use a context manager for potentially better theme integration if available
-        # and to ensure styles are applied correctly.
-        try:
-            with plt.style.context('seaborn-v0_8-darkgrid'): # Example style
-                self.figure = Figure(figsize=(width, height), dpi=dpi)
-                self.canvas = FigureCanvas(self.figure)
-        except Exception: # Fallback if style context fails or style not found
-            logger.warning("Failed to apply 'seaborn-v0_8-darkgrid' style. Using default Matplotlib style.")
-            self.figure = Figure(figsize=(width, height), dpi=dpi)
+        # The style only needs to be active while the figure and axes are created.
+        with matplotlib.rc_context(_plot_style_rc()):
+            self.figure = Figure(figsize=(width, height), dpi=dpi, constrained_layout=True)
             self.canvas = FigureCanvas(self.figure)
+            self.axes = self.figure.add_subplot(111)
 
-        self.axes = self.figure.add_subplot(111)
+        self.max_points = DEFAULT_MAX_PLOT_POINTS
+        self.downsampling_method = "lttb"
+        self._line = None # Line2D reused by plot_data while the axes are not cleared.
+        self._live_x, self._live_y = [], []
+        self._live_background = None # Axes pixels without the animated line, for blitting.
+        self._live_draw_cid = None   # draw_event connection while in live mode.
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.canvas)
@@ -45,34 +70,98 @@ class MplWidget(QWidget):
             title (str): Title of the plot.
             x_label (str): Label for the x-axis.
             y_label (str): Label for the y-axis.
-            clear_previous (bool): Whether to clear previous plots on the axes.
+            clear_previous (bool): Whether to replace the previous curve; False adds a new line.
         """
-        if not x_data or not y_data or len(x_data) != len(y_data):
+        if not len(x_data) or not len(y_data) or len(x_data) != len(y_data):
             logger.warning("Invalid or mismatched data provided for plotting. No plot generated.")
-            self.axes.clear() # Clear even if data is bad, to show an empty plot
-            self.axes.set_title(title)
-            self.axes.set_xlabel(x_label)
-            self.axes.set_ylabel(y_label)
-            self.canvas.draw()
+            self.clear_plot(title, x_label, y_label)
             return
 
-        if clear_previous:
-            self.axes.clear()
-
-        self.axes.plot(x_data, y_data)
+        plot_x, plot_y = downsample_curve(x_data, y_data, self.max_points, self.downsampling_method)
+        if clear_previous and self._line is not None and len(self.axes.lines) == 1:
+            self._line.set_data(plot_x, plot_y)
+            self.axes.relim()
+            self.axes.autoscale_view()
+        else:
+            if clear_previous:
+                self.axes.clear()
+                self.axes.grid(True) # Ensure grid is on
+            self._line, = self.axes.plot(plot_x, plot_y)
         self.axes.set_title(title)
         self.axes.set_xlabel(x_label)
         self.axes.set_ylabel(y_label)
-        self.axes.grid(True) # Ensure grid is on
 
-        self.figure.tight_layout() # Adjust layout to prevent labels from being cut off
+        self.canvas.draw_idle() # Coalesced with other pending redraws; layout is handled by constrained_layout.
+        logger.info(f"Plotted data for '{title}'. Points: {len(x_data)} (drawn: {len(plot_x)}).")
+
+    def start_live_plot(self, title="Plot", x_label="X-axis", y_label="Y-axis"):
+        """Clears the plot and prepares an animated line for `append_live_points`."""
+        self.finish_live_plot()
+        self.clear_plot(title, x_label, y_label)
+        self.axes.grid(True)
+        self._live_x, self._live_y = [], []
+        self._line, = self.axes.plot([], [], animated=True)
+        self.axes.set_xlim(0.0, 1.0)
+        self.axes.set_ylim(0.0, 1.0)
+        # Any full draw (resize, rescale) refreshes the cached background and redraws the line on it.
+        self._live_draw_cid = self.canvas.mpl_connect('draw_event', self._on_live_draw)
         self.canvas.draw()
-        logger.info(f"Plotted data for '{title}'. X points: {len(x_data)}, Y points: {len(y_data)}")
 
-    def clear_plot(self):
+    def _on_live_draw(self, event):
+        self._live_background = self.canvas.copy_from_bbox(self.axes.bbox)
+        self.axes.draw_artist(self._line)
+
+    @staticmethod
+    def _grown_limits(limits, data_min, data_max, headroom=0.25):
+        """Returns limits covering the data with headroom, or None if `limits` already do."""
+        low, high = limits
+        if low <= data_min and data_max <= high:
+            return None
+        low, high = min(low, data_min), max(high, data_max)
+        return low, high + headroom * (high - low or 1.0)
+
+    def append_live_points(self, x_data, y_data):
+        """Appends points to the live curve and blits it; rescales (full draw) only when needed."""
+        if self._live_draw_cid is None:
+            logger.warning("append_live_points called outside live mode. Ignoring.")
+            return
+        self._live_x.extend(x_data)
+        self._live_y.extend(y_data)
+        plot_x, plot_y = downsample_curve(self._live_x, self._live_y, self.max_points, self.downsampling_method)
+        self._line.set_data(plot_x, plot_y)
+
+        new_xlim = self._grown_limits(self.axes.get_xlim(), min(x_data), max(x_data))
+        new_ylim = self._grown_limits(self.axes.get_ylim(), min(y_data), max(y_data))
+        if new_xlim or new_ylim or self._live_background is None:
+            if new_xlim: self.axes.set_xlim(*new_xlim)
+            if new_ylim: self.axes.set_ylim(*new_ylim)
+            self.canvas.draw() # Triggers _on_live_draw
+            return
+        self.canvas.restore_region(self._live_background)
+        self.axes.draw_artist(self._line)
+        self.canvas.blit(self.axes.bbox)
+
+    def finish_live_plot(self):
+        """Leaves live mode; the curve stays as a normal (non-animated) line."""
+        if self._live_draw_cid is None:
+            return
+        self.canvas.mpl_disconnect(self._live_draw_cid)
+        self._live_draw_cid = None
+        self._live_background = None
+        if self._line is not None:
+            self._line.set_animated(False)
+        self.axes.set_autoscale_on(True) # Fixed live limits must not stick to the final plot_data.
+        self.canvas.draw_idle()
+        logger.info(f"Live plot finished with {len(self._live_x)} points.")
+
+    def clear_plot(self, title="", x_label="", y_label=""):
         """Clears the plot."""
         self.axes.clear()
-        self.canvas.draw()
+        self._line = None
+        self.axes.set_title(title)
+        self.axes.set_xlabel(x_label)
+        self.axes.set_ylabel(y_label)
+        self.canvas.draw_idle()
         logger.info("Plot cleared.")
 
 if __name__ == '__main__':
@@ -5,8 +5,8 @@ import logging
 from typing import List, Dict, Any, Optional
 
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QSizePolicy
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QFontMetrics, QPolygonF
-from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QFontMetrics, QPolygonF, QPainterPath
+from PySide6.QtCore import Qt, QPointF, QRectF, QLineF
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +22,22 @@ class LayerDisplayData:
 class SoilStratigraphySchematicWidget(QWidget):
     """
     A widget that draws a 2D schematic of soil layers and water table.
+
+    The scaled layout (layer rectangles, label positions, water table shapes) is cached
+    and only rebuilt when the data or the widget size change; `update_data` with the
+    same data as before does not repaint at all.
     """
+    PADDING_TOP_BOTTOM = 20
+    PADDING_LEFT_RIGHT = 25 # Increased for text
+    TEXT_AREA_WIDTH = 80 # Reserved width for text labels on the side
+    TEXT_PADDING = 3
+
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
         self._layers_data: List[LayerDisplayData] = []
         self._water_table_depth: Optional[float] = None # Depth below surface (positive down)
         self._total_thickness: float = 0.0
+        self._last_input: Optional[tuple] = None # (layers_data, water_table_depth) of the last update_data call
 
         self.setMinimumHeight(200)
         self.setMinimumWidth(150)
@@ -44,11 +54,24 @@ class SoilStratigraphySchematicWidget(QWidget):
         ]
         self._material_color_map: Dict[str, QColor] = {}
 
+        self._font = QFont()
+        self._font.setPointSize(8)
+        self._font_metrics = QFontMetrics(self._font)
+        self._layer_pen = QPen(Qt.GlobalColor.black, 1)
+        self._water_table_pen = QPen(QColor(Qt.GlobalColor.blue), 2, Qt.PenStyle.DashLine)
+
+        # Cached layout, rebuilt in paintEvent when dirty.
+        self._layout_dirty = True
+        self._layer_items: List[tuple] = [] # (rect, brush, [(position, text)], centered_text or None)
+        self._water_table_line: Optional[QLineF] = None
+        self._water_table_symbol: Optional[QPainterPath] = None
+        self._water_table_label: Optional[tuple] = None # (position, text)
+
 
     def update_data(self, layers_data: List[Dict[str, Any]], water_table_depth: Optional[float]):
         """
         Updates the layer and water table data for the schematic.
-        Triggers a repaint.
+        Triggers a repaint if the data changed.
 
         Args:
             layers_data: A list of dictionaries, each with "name", "thickness",
@@ -56,6 +79,11 @@ class SoilStratigraphySchematicWidget(QWidget):
             water_table_depth: Depth of the water table below the surface (positive downwards).
                                If None, no water table is drawn.
         """
+        new_input = ([dict(ld_dict) for ld_dict in layers_data], water_table_depth)
+        if new_input == self._last_input:
+            return
+        self._last_input = new_input
+
         self._layers_data = []
         self._total_thickness = 0
 
@@ -84,40 +112,37 @@ class SoilStratigraphySchematicWidget(QWidget):
 
         self._water_table_depth = water_table_depth
         logger.debug(f"Schematic data updated: {len(self._layers_data)} layers, WT depth: {self._water_table_depth}, Total thickness: {self._total_thickness}")
+        self._layout_dirty = True
         self.update()
 
+    def resizeEvent(self, event):
+        self._layout_dirty = True
+        super().resizeEvent(event)
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        width = self.width()
-        height = self.height()
-        padding_top_bottom = 20
-        padding_left_right = 25 # Increased for text
-        text_area_width = 80 # Reserved width for text labels on the side
+    def _drawable_size(self) -> tuple:
+        drawable_width = self.width() - 2 * self.PADDING_LEFT_RIGHT - self.TEXT_AREA_WIDTH
+        drawable_height = self.height() - 2 * self.PADDING_TOP_BOTTOM
+        return drawable_width, drawable_height
 
-        drawable_width = width - 2 * padding_left_right - text_area_width
-        drawable_height = height - 2 * padding_top_bottom
+    def _rebuild_layout(self):
+        """Computes the scaled layer rectangles, label positions and water table shapes."""
+        self._layout_dirty = False
+        self._layer_items = []
+        self._water_table_line, self._water_table_symbol, self._water_table_label = None, None, None
 
+        drawable_width, drawable_height = self._drawable_size()
         if drawable_width <= 20 or drawable_height <= 0 or not self._layers_data or self._total_thickness <= 0:
-            painter.setPen(QColor(Qt.GlobalColor.gray))
-            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No Soil Data or Not Enough Space")
             return
 
+        fm = self._font_metrics
+        text_padding = self.TEXT_PADDING
         # Scale factor for layer thickness
         scale_y = drawable_height / self._total_thickness
 
-        current_y = float(padding_top_bottom)
-        layer_rect_x = float(padding_left_right)
+        current_y = float(self.PADDING_TOP_BOTTOM)
+        layer_rect_x = float(self.PADDING_LEFT_RIGHT)
         layer_rect_width = float(drawable_width)
 
-        font = QFont()
-        font.setPointSize(8)
-        painter.setFont(font)
-        fm = QFontMetrics(font)
-
         for i, layer in enumerate(self._layers_data):
             scaled_thickness = layer.thickness * scale_y
 
@@ -129,62 +154,82 @@ class SoilStratigraphySchematicWidget(QWidget):
             if layer.original_material_id and layer.original_material_id in self._material_color_map:
                 color = self._material_color_map[layer.original_material_id]
 
-            painter.setBrush(QBrush(color))
-            painter.setPen(QPen(Qt.GlobalColor.black, 1))
-            painter.drawRect(layer_rect)
-
             # Layer text (name, material, thickness) - try to fit inside or beside
-            text_padding = 3
             text_x = layer_rect_x + layer_rect_width + text_padding * 2
-
-            name_text = f"{layer.name}"
-            mat_text = f"({layer.material_display_name})"
-            thick_text = f"T: {layer.thickness:.2f} m"
-
             text_y_start = current_y + fm.ascent() + text_padding
 
             if text_y_start + 2 * (fm.height()) < current_y + scaled_thickness : # Check if text fits
-                painter.setPen(Qt.GlobalColor.black)
-                painter.drawText(QPointF(text_x, text_y_start), name_text)
-                painter.drawText(QPointF(text_x, text_y_start + fm.height()), mat_text)
-                painter.drawText(QPointF(text_x, text_y_start + 2 * fm.height()), thick_text)
+                labels = [
+                    (QPointF(text_x, text_y_start), f"{layer.name}"),
+                    (QPointF(text_x, text_y_start + fm.height()), f"({layer.material_display_name})"),
+                    (QPointF(text_x, text_y_start + 2 * fm.height()), f"T: {layer.thickness:.2f} m"),
+                ]
+                self._layer_items.append((layer_rect, QBrush(color), labels, None))
             else: # If too small, just draw material name centered in rect
-                painter.setPen(Qt.GlobalColor.black)
-                center_text_rect = QRectF(layer_rect_x, current_y, layer_rect_width, scaled_thickness)
-                painter.drawText(center_text_rect, Qt.AlignmentFlag.AlignCenter, layer.material_display_name[:10])
-
+                self._layer_items.append((layer_rect, QBrush(color), [], layer.material_display_name[:10]))
 
             current_y += scaled_thickness
 
-        # Draw Water Table line
+        # Water Table line
         if self._water_table_depth is not None and self._water_table_depth >= 0:
-            water_table_y_abs = self._water_table_depth * scale_y
-            water_table_draw_y = padding_top_bottom + water_table_y_abs
+            water_table_draw_y = self.PADDING_TOP_BOTTOM + self._water_table_depth * scale_y
 
-            if water_table_draw_y <= height - padding_top_bottom : # Ensure it's within drawable area
-                pen = QPen(QColor(Qt.GlobalColor.blue), 2, Qt.PenStyle.DashLine)
-                painter.setPen(pen)
-                # Draw line slightly wider than layers for visibility
+            if water_table_draw_y <= self.height() - self.PADDING_TOP_BOTTOM : # Ensure it's within drawable area
+                # Line slightly wider than layers for visibility
                 line_x_start = layer_rect_x - 5
                 line_x_end = layer_rect_x + layer_rect_width + 5
-                painter.drawLine(QPointF(line_x_start, water_table_draw_y), QPointF(line_x_end, water_table_draw_y))
+                self._water_table_line = QLineF(QPointF(line_x_start, water_table_draw_y), QPointF(line_x_end, water_table_draw_y))
 
-                # Draw water table symbol (triangle)
+                # Water table symbol (triangle)
                 triangle_size = 6
                 triangle = QPolygonF()
                 triangle.append(QPointF(line_x_start - triangle_size/2, water_table_draw_y))
                 triangle.append(QPointF(line_x_start + triangle_size/2, water_table_draw_y))
                 triangle.append(QPointF(line_x_start, water_table_draw_y - triangle_size)) # Pointing up
-
-                painter.setBrush(QBrush(Qt.GlobalColor.blue))
-                painter.setPen(QPen(Qt.GlobalColor.blue, 1))
-                painter.drawPolygon(triangle)
+                self._water_table_symbol = QPainterPath()
+                self._water_table_symbol.addPolygon(triangle)
+                self._water_table_symbol.closeSubpath()
 
                 # Water table depth text
-                wt_text = f"WT @ {self._water_table_depth:.2f} m"
-                painter.setPen(QColor(Qt.GlobalColor.blue))
-                painter.drawText(QPointF(line_x_end + text_padding, water_table_draw_y + fm.descent()), wt_text)
+                self._water_table_label = (QPointF(line_x_end + text_padding, water_table_draw_y + fm.descent()),
+                                           f"WT @ {self._water_table_depth:.2f} m")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._layout_dirty:
+            self._rebuild_layout()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        if not self._layer_items:
+            painter.setPen(QColor(Qt.GlobalColor.gray))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No Soil Data or Not Enough Space")
+            painter.end()
+            return
+
+        painter.setFont(self._font)
+        for layer_rect, brush, labels, centered_text in self._layer_items:
+            painter.setBrush(brush)
+            painter.setPen(self._layer_pen)
+            painter.drawRect(layer_rect)
+
+            painter.setPen(Qt.GlobalColor.black)
+            for position, text in labels:
+                painter.drawText(position, text)
+            if centered_text is not None:
+                painter.drawText(layer_rect, Qt.AlignmentFlag.AlignCenter, centered_text)
+
+        if self._water_table_line is not None:
+            painter.setPen(self._water_table_pen)
+            painter.drawLine(self._water_table_line)
+
+            painter.setBrush(QBrush(Qt.GlobalColor.blue))
+            painter.setPen(QPen(Qt.GlobalColor.blue, 1))
+            painter.drawPath(self._water_table_symbol)
 
+            painter.setPen(QColor(Qt.GlobalColor.blue))
+            painter.drawText(*self._water_table_label)
 
         painter.end()
 
@@ -5,15 +5,19 @@ PRD Ref: Task 6.2 (Soil Stratigraphy & Properties Input Section)
 import logging
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QAbstractItemView,
-    QHeaderView, QLabel, QGroupBox, QDoubleSpinBox, QFormLayout, QMessageBox, QSizePolicy
+    QHeaderView, QLabel, QGroupBox, QDoubleSpinBox, QFormLayout, QMessageBox, QSizePolicy,
+    QFileDialog, QInputDialog
 )
 from PySide6.QtCore import Qt, Signal, Slot, QAbstractTableModel, QModelIndex, QObject
 from PySide6.QtGui import QColor, QKeySequence, QShortcut
 from typing import List, Dict, Any, Optional
 
 from ...backend.models import SoilLayer, MaterialProperties # For data structure
+from ...backend.exceptions import ProjectValidationError
+from ...backend.material_library import MaterialLibrary
 from .delegates import SoilModelDelegate, MaterialParametersDelegate
 from .soil_stratigraphy_schematic_widget import SoilStratigraphySchematicWidget # Import schematic
+from ..update_scheduler import CoalescingUpdateScheduler, REPAINT, NOTIFY
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,9 @@ class SoilStratigraphyTableModel(QAbstractTableModel):
         self._headers = ["Layer Name", "Thickness (m)", "Material Model", "Parameters", "Material ID (Backend)"]
         self._layers: List[SoilLayerData] = layers if layers is not None else []
         self._available_soil_models = ["Mohr-Coulomb", "HardeningSoil", "SoftSoil", "Custom"]
+        # Shared material library offered by the parameter dialog (see MaterialParametersDelegate).
+        self.material_library: Optional[MaterialLibrary] = None
+        self.material_library_path: Optional[str] = None # File the library is saved to when entries are added.
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(self._layers)
@@ -203,6 +210,8 @@ class SoilStratigraphyWidget(QWidget):
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
+        # Table edits and water table keystrokes only mark the schematic/data_changed as pending.
+        self._updates = CoalescingUpdateScheduler(parent=self)
         self.main_layout = QVBoxLayout(self)
 
         # GroupBox for better visual structure
@@ -226,6 +235,8 @@ class SoilStratigraphyWidget(QWidget):
         self.remove_layer_button = QPushButton("Remove Selected Layer")
         self.move_layer_up_button = QPushButton("Move Up")
         self.move_layer_down_button = QPushButton("Move Down")
+        self.import_cpt_button = QPushButton("Import CPT...")
+        self.import_cpt_button.setToolTip("Replace the layers with a lumped stratigraphy derived from a CPT file (CSV or AGS).")
 
         layer_buttons_layout.addWidget(self.add_layer_button)
         layer_buttons_layout.addWidget(self.remove_layer_button)
@@ -233,6 +244,7 @@ class SoilStratigraphyWidget(QWidget):
         layer_buttons_layout.addWidget(self.move_layer_up_button)
         layer_buttons_layout.addWidget(self.move_layer_down_button)
         layer_buttons_layout.addStretch()
+        layer_buttons_layout.addWidget(self.import_cpt_button)
         group_layout.addLayout(layer_buttons_layout)
 
         water_table_layout = QFormLayout()
@@ -259,6 +271,7 @@ class SoilStratigraphyWidget(QWidget):
         self.remove_layer_button.clicked.connect(self.on_remove_layer)
         self.move_layer_up_button.clicked.connect(self.on_move_layer_up)
         self.move_layer_down_button.clicked.connect(self.on_move_layer_down)
+        self.import_cpt_button.clicked.connect(self.on_import_cpt)
 
         self.table_model.dataChanged.connect(self._emit_data_changed_and_update_schematic)
         self.table_model.rowsInserted.connect(self._emit_data_changed_and_update_schematic)
@@ -277,10 +290,10 @@ class SoilStratigraphyWidget(QWidget):
 
     @Slot()
     def _emit_data_changed_and_update_schematic(self):
-        self._update_schematic_display()
+        """Schedules the schematic update and data_changed; repeated changes before the flush coalesce."""
         self.update_button_states() # Update states when data changes (e.g. rows removed/added)
-        self.data_changed.emit()
-        logger.debug("SoilStratigraphyWidget: Data changed signal emitted and schematic updated.")
+        self._updates.schedule("schematic", self._update_schematic_display, REPAINT)
+        self._updates.schedule("data_changed", self.data_changed.emit, NOTIFY)
 
     def update_button_states(self):
         selected_indexes = self.layers_tableview.selectionModel().selectedRows()
@@ -360,6 +373,36 @@ class SoilStratigraphyWidget(QWidget):
         self.update_button_states()
 
 
+    @Slot()
+    def on_import_cpt(self):
+        from ...backend.cpt_importer import import_cpt_stratigraphy, DEFAULT_LUMPING_TOLERANCE # Deferred: pulls in numpy.
+        filepath, _ = QFileDialog.getOpenFileName(self, "Import CPT", "", "CPT Files (*.csv *.ags *.txt);;All Files (*)")
+        if not filepath:
+            return
+        parameter_labels = {"Undrained strength su (clay)": "su", "Friction angle phi' (sand)": "phi"}
+        label, ok = QInputDialog.getItem(self, "Import CPT", "Derive:", list(parameter_labels), 0, False)
+        if not ok:
+            return
+        tolerance, ok = QInputDialog.getDouble(self, "Import CPT", "Layer lumping tolerance (relative RMS error):",
+                                               DEFAULT_LUMPING_TOLERANCE, 0.0, 1.0, 3)
+        if not ok:
+            return
+        try:
+            layers = import_cpt_stratigraphy(filepath, parameter_labels[label], tolerance=tolerance,
+                                             water_table_depth=max(self.water_table_spinbox.value(), 0.0))
+        except ProjectValidationError as e:
+            QMessageBox.warning(self, "Import CPT", str(e)) # type: ignore
+            return
+        self.table_model.load_layers_data(layers)
+        self._emit_data_changed_and_update_schematic()
+        self._updates.flush()
+        logger.info(f"Imported {len(layers)} layers from CPT '{filepath}'.")
+
+    def set_material_library(self, library: Optional[MaterialLibrary], library_path: Optional[str]) -> None:
+        """Makes `library` available in the material parameter dialog; additions are saved to `library_path`."""
+        self.table_model.material_library = library
+        self.table_model.material_library_path = library_path
+
     def load_data(self, soil_profile_data: Optional[Any]):
         logger.info(f"SoilStratigraphyWidget: Loading data - {type(soil_profile_data)}")
 
@@ -379,8 +422,10 @@ class SoilStratigraphyWidget(QWidget):
         self.water_table_spinbox.blockSignals(False)
 
         self._emit_data_changed_and_update_schematic()
+        self._updates.flush()
 
     def gather_data(self) -> Dict[str, Any]:
+        self._updates.flush() # Apply pending edits (incl. data_changed) before reading the table.
         frontend_layers_data = self.table_model.get_layer_data()
         backend_soil_layers: List[SoilLayer] = []
         for fled in frontend_layers_data:
@@ -18,6 +18,7 @@ from PySide6.QtCore import Signal, Slot
 from typing import Optional, Dict, Any
 
 from .spudcan_schematic_widget import SpudcanSchematicWidget
+from ..update_scheduler import CoalescingUpdateScheduler, VALIDATE, REPAINT, NOTIFY
 from ...backend.validation import validate_numerical_range, ValidationError
 from ...backend.models import SpudcanGeometry
 
@@ -46,6 +47,8 @@ class SpudcanGeometryWidget(QWidget):
         """
         super().__init__(parent)
         self._is_valid = True # Internal state for overall widget validity
+        # Keystrokes only mark work as pending; validation, repaint and data_changed run once input settles.
+        self._updates = CoalescingUpdateScheduler(parent=self)
 
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(0,0,0,0)
@@ -90,31 +93,31 @@ class SpudcanGeometryWidget(QWidget):
         self._update_schematic_display()
         logger.info("SpudcanGeometryWidget initialized.")
 
+    def _schedule_update(self, validate_key: str, validate) -> None:
+        """Defers validation of one field, the schematic update and data_changed to the next flush."""
+        self._updates.schedule(validate_key, validate, VALIDATE)
+        self._updates.schedule("schematic", self._update_schematic_display, REPAINT)
+        self._updates.schedule("data_changed", self.data_changed.emit, NOTIFY)
+
     @Slot()
     def _on_diameter_changed(self):
-        """Handles changes to the diameter spinbox value."""
-        self._validate_diameter()
-        self._update_schematic_display()
-        self.data_changed.emit()
+        """Handles changes to the diameter spinbox value (deferred until input settles)."""
+        self._schedule_update("diameter", self._validate_diameter)
 
     @Slot()
     def _on_diameter_editing_finished(self):
         """Ensures final validation when diameter editing is finished."""
-        self._validate_diameter()
-        self._update_schematic_display()
+        self._updates.flush()
 
     @Slot()
     def _on_cone_angle_changed(self):
-        """Handles changes to the cone angle spinbox value."""
-        self._validate_cone_angle()
-        self._update_schematic_display()
-        self.data_changed.emit()
+        """Handles changes to the cone angle spinbox value (deferred until input settles)."""
+        self._schedule_update("cone_angle", self._validate_cone_angle)
 
     @Slot()
     def _on_cone_angle_editing_finished(self):
         """Ensures final validation when cone angle editing is finished."""
-        self._validate_cone_angle()
-        self._update_schematic_display()
+        self._updates.flush()
 
     def _validate_diameter(self) -> bool:
         """Validates the spudcan diameter input field."""
@@ -191,6 +194,7 @@ class SpudcanGeometryWidget(QWidget):
         """
         logger.debug(f"SpudcanGeometryWidget loading data: {geometry_data}")
 
+        self._updates.cancel() # Superseded by the synchronous update below.
         self.diameter_spinbox.blockSignals(True)
         self.cone_angle_spinbox.blockSignals(True)
         self.type_combobox.blockSignals(True)
@@ -221,6 +225,7 @@ class SpudcanGeometryWidget(QWidget):
         Returns:
             Dict[str, Any]: A dictionary containing the current spudcan geometry data.
         """
+        self._updates.flush() # Field styles must reflect the latest input.
         return {
             "diameter": self.diameter_spinbox.value() if self.diameter_spinbox.styleSheet() != INVALID_STYLE else None,
             "height_cone_angle": self.cone_angle_spinbox.value() if self.cone_angle_spinbox.styleSheet() != INVALID_STYLE else None,
@@ -235,6 +240,7 @@ class SpudcanGeometryWidget(QWidget):
         Returns:
             Optional[SpudcanGeometry]: A SpudcanGeometry object, or None if critical data is invalid.
         """
+        self._updates.flush() # Apply pending edits (incl. data_changed) before reading the fields.
         self._validate_all_inputs() # Ensure validation status is current
 
         if not self._is_valid:
@@ -258,6 +264,7 @@ class SpudcanGeometryWidget(QWidget):
         Returns:
             bool: True if all inputs are valid, False otherwise.
         """
+        self._updates.flush()
         return self._validate_all_inputs()
 
 if __name__ == '__main__':
@@ -3,20 +3,40 @@ Custom widget to display a 2D schematic of a spudcan.
 """
 import math
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout
-from PySide6.QtGui import QPainter, QPen, QBrush, QPolygonF, QColor, QFont, QFontMetrics
-from PySide6.QtCore import Qt, QPointF, Signal, Slot
+from PySide6.QtGui import QPainter, QPen, QBrush, QPolygonF, QColor, QFont, QFontMetrics, QPainterPath
+from PySide6.QtCore import Qt, QPointF, QLineF, Signal, Slot
 
 class SpudcanSchematicWidget(QWidget):
     """
     A widget that draws a 2D schematic of a spudcan cone.
     It updates based on diameter and cone angle (to calculate height).
+
+    The scaled geometry (cone path, dimension lines, label positions) is cached and only
+    rebuilt when the dimensions or the widget size change, so repeated paint events
+    (e.g. while the window is being moved over it) only replay the cached shapes.
     """
+    PADDING = 20 # Padding around the drawing
+
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
         self._diameter: float = 0.0
         self._height: float = 0.0 # Calculated height
         self._cone_angle_deg: float = 0.0 # Store for display if needed
 
+        self._placeholder_font = QFont()
+        self._placeholder_font.setPointSize(10)
+        self._label_font = QFont()
+        self._label_font.setPointSize(8)
+        self._label_metrics = QFontMetrics(self._label_font)
+        self._cone_pen = QPen(QColor(Qt.GlobalColor.black), 2)
+        self._cone_brush = QBrush(QColor(Qt.GlobalColor.lightGray))
+        self._dimension_color = QColor(Qt.GlobalColor.darkGray)
+
+        self._layout_dirty = True
+        self._cone_path: QPainterPath | None = None # None: nothing to draw (invalid dimensions or no space)
+        self._dimension_lines: list[QLineF] = []
+        self._labels: list[tuple[QPointF, str]] = []
+
         self.setMinimumHeight(150)
         self.setMinimumWidth(200)
         # self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred) # Already in parent
@@ -24,12 +44,14 @@ class SpudcanSchematicWidget(QWidget):
     def update_dimensions(self, diameter: float, cone_angle_deg: float):
         """
         Updates the dimensions used for drawing the schematic.
-        Triggers a repaint.
+        Triggers a repaint if they changed.
 
         Args:
             diameter: The diameter of the spudcan base.
             cone_angle_deg: The half-apex angle of the cone in degrees.
         """
+        if diameter == self._diameter and cone_angle_deg == self._cone_angle_deg:
+            return
         self._diameter = diameter
         self._cone_angle_deg = cone_angle_deg
 
@@ -40,32 +62,25 @@ class SpudcanSchematicWidget(QWidget):
         else:
             self._height = 0 # Invalid input, draw nothing or a placeholder
 
+        self._layout_dirty = True
         self.update() # Trigger repaint
 
-    def paintEvent(self, event):
-        """
-        Handles the paint event to draw the spudcan schematic.
-        """
-        super().paintEvent(event) # Important for QWidget subclasses
+    def resizeEvent(self, event):
+        self._layout_dirty = True
+        super().resizeEvent(event)
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def _rebuild_layout(self):
+        """Computes the scaled cone path, dimension lines and label positions for the current size."""
+        self._layout_dirty = False
+        self._cone_path = None
+        self._dimension_lines = []
+        self._labels = []
+        if self._diameter <= 0 or self._height <= 0:
+            return
 
         width = self.width()
         height = self.height()
-        padding = 20  # Padding around the drawing
-
-        # Clear background (optional, depends on stylesheet)
-        # painter.fillRect(self.rect(), self.palette().color(self.backgroundRole()))
-
-        if self._diameter <= 0 or self._height <= 0:
-            # Draw placeholder text if dimensions are invalid
-            painter.setPen(QColor(Qt.GlobalColor.gray))
-            font = QFont()
-            font.setPointSize(10)
-            painter.setFont(font)
-            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Invalid Spudcan Dimensions")
-            return
+        padding = self.PADDING
 
         # --- Drawing Parameters ---
         # Scale the spudcan to fit within the widget, maintaining aspect ratio
@@ -93,56 +108,84 @@ class SpudcanSchematicWidget(QWidget):
         base_y = padding
         tip_y = base_y + scaled_height
 
-        # --- Draw Cone (Triangle) ---
+        # --- Cone (Triangle) ---
         # Points for the triangle (base left, base right, tip)
         p1 = QPointF(offset_x, base_y)  # Base left
         p2 = QPointF(offset_x + scaled_diameter, base_y)  # Base right
         p3 = QPointF(offset_x + scaled_diameter / 2, tip_y)  # Tip
 
-        cone_polygon = QPolygonF([p1, p2, p3])
-
-        painter.setPen(QPen(QColor(Qt.GlobalColor.black), 2))
-        painter.setBrush(QBrush(QColor(Qt.GlobalColor.lightGray)))
-        painter.drawPolygon(cone_polygon)
+        self._cone_path = QPainterPath()
+        self._cone_path.addPolygon(QPolygonF([p1, p2, p3]))
+        self._cone_path.closeSubpath()
 
-        # --- Draw Dimensions and Labels ---
-        font = QFont()
-        font.setPointSize(8)
-        painter.setFont(font)
-        painter.setPen(QColor(Qt.GlobalColor.darkGray))
-        fm = QFontMetrics(font)
+        # --- Dimensions and Labels ---
+        fm = self._label_metrics
 
         # Diameter line and label
         dim_line_y_offset = -10 # Above the base
         dim_line_y = base_y + dim_line_y_offset
         if dim_line_y < padding / 2 : dim_line_y = base_y + 5 # ensure it's visible
 
-        painter.drawLine(QPointF(p1.x(), dim_line_y), QPointF(p2.x(), dim_line_y))
-        painter.drawLine(QPointF(p1.x(), dim_line_y - 3), QPointF(p1.x(), dim_line_y + 3)) # Tick left
-        painter.drawLine(QPointF(p2.x(), dim_line_y - 3), QPointF(p2.x(), dim_line_y + 3)) # Tick right
+        self._dimension_lines += [
+            QLineF(QPointF(p1.x(), dim_line_y), QPointF(p2.x(), dim_line_y)),
+            QLineF(QPointF(p1.x(), dim_line_y - 3), QPointF(p1.x(), dim_line_y + 3)), # Tick left
+            QLineF(QPointF(p2.x(), dim_line_y - 3), QPointF(p2.x(), dim_line_y + 3)), # Tick right
+        ]
 
         diameter_text = f"D: {self._diameter:.2f} m"
         text_width_d = fm.horizontalAdvance(diameter_text)
-        painter.drawText(QPointF(offset_x + (scaled_diameter - text_width_d) / 2, dim_line_y - 3), diameter_text)
+        self._labels.append((QPointF(offset_x + (scaled_diameter - text_width_d) / 2, dim_line_y - 3), diameter_text))
 
         # Height line and label
         dim_line_x_offset = -10 # To the left of the cone
         dim_line_x = offset_x + dim_line_x_offset
         if dim_line_x < padding / 2: dim_line_x = offset_x + scaled_diameter + 5 # Or to the right if no space left
 
-        painter.drawLine(QPointF(dim_line_x, base_y), QPointF(dim_line_x, tip_y))
-        painter.drawLine(QPointF(dim_line_x - 3, base_y), QPointF(dim_line_x + 3, base_y)) # Tick top
-        painter.drawLine(QPointF(dim_line_x - 3, tip_y), QPointF(dim_line_x + 3, tip_y)) # Tick bottom
+        self._dimension_lines += [
+            QLineF(QPointF(dim_line_x, base_y), QPointF(dim_line_x, tip_y)),
+            QLineF(QPointF(dim_line_x - 3, base_y), QPointF(dim_line_x + 3, base_y)), # Tick top
+            QLineF(QPointF(dim_line_x - 3, tip_y), QPointF(dim_line_x + 3, tip_y)), # Tick bottom
+        ]
 
         height_text = f"H: {self._height:.2f} m"
         text_width_h = fm.horizontalAdvance(height_text)
         # For vertical text, it's a bit more complex to center along the line.
         # Simple placement:
-        painter.drawText(QPointF(dim_line_x - text_width_h - 3, base_y + (scaled_height / 2) + (fm.ascent()/2) ), height_text)
+        self._labels.append((QPointF(dim_line_x - text_width_h - 3, base_y + (scaled_height / 2) + (fm.ascent()/2)), height_text))
 
         # Angle (optional, can get cluttered)
         # angle_text = f"Angle: {self._cone_angle_deg:.1f}°"
-        # painter.drawText(QPointF(padding, height - padding / 2), angle_text)
+
+    def paintEvent(self, event):
+        """
+        Handles the paint event to draw the spudcan schematic from the cached layout.
+        """
+        super().paintEvent(event) # Important for QWidget subclasses
+
+        if self._layout_dirty:
+            self._rebuild_layout()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        if self._diameter <= 0 or self._height <= 0:
+            # Draw placeholder text if dimensions are invalid
+            painter.setPen(QColor(Qt.GlobalColor.gray))
+            painter.setFont(self._placeholder_font)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Invalid Spudcan Dimensions")
+            painter.end()
+            return
+
+        if self._cone_path is not None:
+            painter.setPen(self._cone_pen)
+            painter.setBrush(self._cone_brush)
+            painter.drawPath(self._cone_path)
+
+            painter.setFont(self._label_font)
+            painter.setPen(self._dimension_color)
+            painter.drawLines(self._dimension_lines)
+            for position, text in self._labels:
+                painter.drawText(position, text)
 
         painter.end()
 
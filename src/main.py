@@ -4,13 +4,17 @@ PRD Ref: Category 4 (Frontend Development: UI Shell & Framework) - Task 4.1
 """
 
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication
-from .frontend.main_window import MainWindow # Relative import from sibling package
+
+from .backend.logger_config import setup_logging
 
 def main():
     """
     Initializes and runs the Qt application.
     """
+    multiprocessing.freeze_support() # The analysis runs in a spawned worker process (frozen builds need this).
+    setup_logging() # Console and log file are written by a background thread.
     app = QApplication(sys.argv)
 
     # Set application details (optional but good practice)
@@ -95,6 +99,8 @@ def main():
         }
     """)
 
+    # Imported only once the QApplication exists; the window defers matplotlib and PLAXIS imports itself.
+    from .frontend.main_window import MainWindow
     main_window = MainWindow()
     main_window.show()
 
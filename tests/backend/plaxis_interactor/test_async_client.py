@@ -0,0 +1,133 @@
+"""
+Unit tests for the asyncio PLAXIS client and facade (async_client.py, async_interactor.py),
+run against the synthetic PLAXIS server.
+"""
+import asyncio
+import pytest
+
+from backend.models import ProjectSettings
+from backend.exceptions import PlaxisConfigurationError, PlaxisConnectionError, PlaxisOutputError
+from backend.plaxis_interactor import api_crypto
+from backend.plaxis_interactor.async_client import (
+    AsyncHTTPConnection, AsyncPlaxisServer, PlxObjectRef, PlxScriptingError, method_call_cmd
+)
+from backend.plaxis_interactor.async_interactor import AsyncPlaxisInteractor
+from backend.plaxis_interactor.synthetic_server import SyntheticPlaxis, start_synthetic_instances
+
+
+@pytest.fixture
+def plaxis():
+    with SyntheticPlaxis(n_steps=100) as instance:
+        yield instance
+
+
+def _project_for(instance: SyntheticPlaxis) -> ProjectSettings:
+    project = ProjectSettings(project_name="AsyncTest")
+    project.plaxis_api_input_port = instance.input_port
+    project.plaxis_api_output_port = instance.output_port
+    project.plaxis_api_password = ""
+    project.spudcan.plaxis_output_name = "Spudcan"
+    return project
+
+
+async def _build_spudcan_model(server: AsyncPlaxisServer) -> PlxObjectRef:
+    await server.new()
+    volume, _surface = await server.call("cone", 2.0, 1.0, (0, 0, 0), (0, 0, -1))
+    initial = await server.get_named_object("InitialPhase")
+    phase = await server.call("phase", initial)
+    await server.call_commands(method_call_cmd("rename", volume, "Spudcan"),
+                               method_call_cmd("rename", phase, "Penetration"),
+                               method_call_cmd("activate", volume, phase),
+                               method_call_cmd("calculate", phase))
+    return phase
+
+
+def test_method_call_cmd_matches_plxscripting():
+    point = PlxObjectRef("{AB-1}", "Point")
+    assert method_call_cmd("move", 1, 2.5, 3, target=point) == "move {AB-1} 1 2.5 3"
+    assert method_call_cmd("soilmat", "Identification", 'Say "hi"', "Eref", 5000.0, True) == \
+        'soilmat "Identification" \'Say "hi"\' "Eref" 5000.0 True'
+    assert method_call_cmd("cone", 2.0, 1.0, (0, 0, 0), [point]) == "cone 2.0 1.0 (0 0 0) ({AB-1})"
+
+
+def test_commands_queries_and_errors(plaxis):
+    async def scenario():
+        connection = AsyncHTTPConnection("127.0.0.1", plaxis.input_port, max_streams=2)
+        server = AsyncPlaxisServer(connection)
+        phase = await _build_spudcan_model(server)
+        assert await server.get_property(phase, "Name") == "Penetration"
+        phases = await server.get_named_object("Phases")
+        assert await server.count(phases) == 2
+        listed = await server.sublist(phases, 0, 2)
+        assert listed[1] == phase
+        assert await server.get_properties(listed, "DeformCalcType") == ["K0 procedure", "Plastic"]
+        assert (await server.get_named_objects("Spudcan", "Nothing"))["Nothing"] is None
+        members = await server.get_members(phase)
+        assert members["properties"]["Deform"].plx_type == "Object"
+        with pytest.raises(PlxScriptingError, match="Unknown command"):
+            await server.call("frobnicate")
+        # Parallel reads share the connection's streams.
+        project = await server.get_named_object("Project")
+        titles = await asyncio.gather(*(server.get_property(project, "Title") for _ in range(10)))
+        assert set(titles) == {"Synthetic project"}
+        assert len(connection._idle) <= 2
+        await connection.close()
+    asyncio.run(scenario())
+
+
+def test_connection_refused():
+    async def scenario():
+        server = AsyncPlaxisServer(AsyncHTTPConnection("127.0.0.1", 1, timeout=1.0))
+        with pytest.raises(PlaxisConnectionError):
+            await server.get_named_object("Project")
+    asyncio.run(scenario())
+
+
+def test_facade_sessions_run_concurrently():
+    instances = start_synthetic_instances(3, n_steps=50)
+    try:
+        async def session(instance):
+            facade = AsyncPlaxisInteractor(_project_for(instance))
+            await _build_spudcan_model(await facade.connect_input())
+            await facade.connect_output()
+            disp, load = await facade.fetch_step_results(phase_name="Penetration")
+            with pytest.raises(PlaxisOutputError):
+                await facade.fetch_step_results(phase_name="NoSuchPhase")
+            await facade.close()
+            return disp, load
+
+        async def run_all():
+            return await asyncio.gather(*(session(i) for i in instances))
+
+        results = asyncio.run(run_all())
+        assert all(len(disp) == len(load) == 50 for disp, load in results)
+        assert all(instance.model.command_counts["getresults"] == 2 for instance in instances)
+    finally:
+        for instance in instances:
+            instance.stop()
+
+
+def test_facade_maps_command_errors(plaxis):
+    async def scenario():
+        facade = AsyncPlaxisInteractor(_project_for(plaxis))
+        with pytest.raises(PlaxisConfigurationError):
+            await facade.run_commands(["rename {00000000-DEAD} \"x\""])
+        assert await facade.run_commands(["gotostages", "borehole 0 0"]) != []
+        await facade.close()
+    asyncio.run(scenario())
+
+
+@pytest.mark.skipif(api_crypto.Blowfish is None, reason="pycryptodome not installed")
+def test_encrypted_round_trip():
+    async def scenario(instance):
+        server = AsyncPlaxisServer(AsyncHTTPConnection("127.0.0.1", instance.input_port, password="secret"))
+        phase = await _build_spudcan_model(server)
+        assert await server.get_property(phase, "Name") == "Penetration"
+        wrong = AsyncPlaxisServer(AsyncHTTPConnection("127.0.0.1", instance.input_port, password="wrong"))
+        with pytest.raises(PlxScriptingError):
+            await wrong.get_named_object("Project")
+        await server.connection.close()
+        await wrong.connection.close()
+
+    with SyntheticPlaxis(password="secret") as instance:
+        asyncio.run(scenario(instance))
@@ -0,0 +1,61 @@
+"""
+Unit tests for meshing-related callables in calculation_builder.py.
+"""
+from unittest.mock import MagicMock
+
+from backend.models import AnalysisControlParameters, LoadingConditions
+from backend.plaxis_interactor.calculation_builder import (
+    generate_analysis_control_callables, generate_loading_condition_callables
+)
+
+
+def _mesh_callable(control: AnalysisControlParameters):
+    callables = generate_analysis_control_callables(control, LoadingConditions(target_type="penetration", target_penetration_or_load=1.0))
+    return callables[0]
+
+
+def test_mesh_without_refinement_sets_no_local_factors():
+    g_i = MagicMock()
+    _mesh_callable(AnalysisControlParameters(meshing_global_coarseness="Coarse"))(g_i)
+    g_i.mesh.assert_called_once_with("Coarseness", 0.1)
+    g_i.set.assert_not_called()
+
+
+def test_mesh_with_refinement_sets_local_coarseness_before_meshing():
+    g_i = MagicMock()
+    cone, zone = MagicMock(name="Cone"), MagicMock(name="Zone")
+    g_i.Volumes = {"Spudcan_ConeVolume": cone, "Spudcan_RefinementZone": zone}
+    order = []
+    g_i.set.side_effect = lambda *a: order.append("set")
+    g_i.mesh.side_effect = lambda *a: order.append("mesh")
+
+    control = AnalysisControlParameters(meshing_refinement_spudcan=True, refinement_cone_coarseness_factor=0.2,
+                                        refinement_zone_coarseness_factor=0.4)
+    _mesh_callable(control)(g_i)
+
+    g_i.set.assert_any_call(cone.CoarsenessFactor, 0.2)
+    g_i.set.assert_any_call(zone.CoarsenessFactor, 0.4)
+    assert order == ["set", "set", "mesh"]
+
+
+def test_skip_meshing_only_switches_to_stages():
+    callables = generate_analysis_control_callables(AnalysisControlParameters(), None, skip_meshing=True)
+    g_i = MagicMock()
+    callables[0](g_i)
+    g_i.gotostages.assert_called_once()
+    g_i.gotomesh.assert_not_called()
+    g_i.mesh.assert_not_called()
+
+
+def test_quarter_symmetry_scales_preload_only():
+    loading = LoadingConditions(vertical_preload=400.0, target_type="penetration", target_penetration_or_load=2.0)
+    preload, displacement = generate_loading_condition_callables(loading, symmetry_factor=4.0)
+    g_i = MagicMock()
+    preload(g_i)
+    displacement(g_i)
+    g_i.pointload.assert_called_once_with((0,0,0), Name="Spudcan_Preload", Fz=-100.0)
+    assert g_i.pointdispl.call_args.kwargs["uz"] == -2.0 # Displacements are not scaled
+
+    # The symmetry planes x=0, y=0 are the x_min/y_min boundaries, normally fixed by default.
+    names = [c.__name__ for c in generate_analysis_control_callables(AnalysisControlParameters(), loading)]
+    assert "apply_symmetry_fixities_callable" not in names
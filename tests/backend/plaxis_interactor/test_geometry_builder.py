@@ -2,10 +2,15 @@
 Unit tests for the PLAXIS geometry_builder module.
 """
 import unittest
+from dataclasses import dataclass
 from unittest.mock import MagicMock, patch
 
-from src.backend.models import SpudcanGeometry
-from src.backend.plaxis_interactor.geometry_builder import generate_spudcan_geometry_callables
+from src.backend.models import SpudcanGeometry, SoilLayer, LoadingConditions, AnalysisControlParameters
+from src.backend.plaxis_interactor.geometry_builder import (
+    generate_spudcan_geometry_callables, generate_refinement_zone_callables, SPUDCAN_REFINEMENT_ZONE_NAME,
+    compute_model_domain, generate_model_domain_callables, is_vertical_only_loading, get_symmetry_factor,
+    plan_area_fraction_in_domain, ModelDomain
+)
 from src.backend.exceptions import PlaxisConfigurationError
 
 class TestGeometryBuilder(unittest.TestCase):
@@ -117,5 +122,111 @@ class TestGeometryBuilder(unittest.TestCase):
         with self.assertRaises(PlaxisConfigurationError):
             generate_spudcan_geometry_callables(spudcan_model_invalid)
 
+    def test_generate_refinement_zone_sized_by_diameter(self):
+        """
+        Test that the refinement cylinder is sized from the spudcan diameter and extra depth.
+        """
+        spudcan_model = SpudcanGeometry(diameter=6.0, height_cone_angle=30.0)
+        callables = generate_refinement_zone_callables(spudcan_model, radius_factor=1.0, depth_factor=1.5, extra_depth=2.0)
+        self.assertEqual(len(callables), 1)
+
+        mock_g_i = MagicMock()
+        callables[0](mock_g_i)
+        mock_g_i.cylinder.assert_called_once_with(6.0, 11.0, (0,0,0), (0,0,-1))
+        mock_g_i.rename.assert_called_once_with(mock_g_i.cylinder.return_value[0], SPUDCAN_REFINEMENT_ZONE_NAME)
+
+        with self.assertRaises(PlaxisConfigurationError):
+            generate_refinement_zone_callables(spudcan_model, radius_factor=0.0)
+
+    def test_compute_model_domain_from_diameter_and_penetration(self):
+        """
+        Test domain extents derived from diameter, target penetration and stratigraphy depth.
+        """
+        spudcan_model = SpudcanGeometry(diameter=10.0, height_cone_angle=30.0)
+        loading = LoadingConditions(target_type="penetration", target_penetration_or_load=5.0)
+        layers = [SoilLayer(name="Clay", thickness=100.0)]
+        control = AnalysisControlParameters(domain_auto_size=True, domain_lateral_factor=3.0, domain_depth_factor=2.0)
+
+        domain = compute_model_domain(spudcan_model, loading, layers, control)
+        self.assertEqual((domain.x_min, domain.x_max, domain.y_min, domain.y_max), (-30.0, 30.0, -30.0, 30.0))
+        self.assertAlmostEqual(domain.depth, 25.0)
+        self.assertFalse(domain.quarter_symmetry)
+
+        # Shallow stratigraphy caps the depth; quarter symmetry for vertical loading.
+        control.symmetry = "quarter"
+        domain = compute_model_domain(spudcan_model, loading, [SoilLayer(name="Clay", thickness=12.0)], control)
+        self.assertAlmostEqual(domain.depth, 12.0)
+        self.assertTrue(domain.quarter_symmetry)
+        self.assertEqual((domain.x_min, domain.y_min), (0.0, 0.0))
+
+        control.domain_auto_size = False
+        with self.assertRaises(PlaxisConfigurationError):
+            compute_model_domain(spudcan_model, loading, layers, control)
+        control.symmetry = "full"
+        self.assertIsNone(compute_model_domain(spudcan_model, loading, layers, control))
+
+    def test_quarter_domain_clips_exactly_one_quarter_of_the_spudcan(self):
+        """
+        Test the spudcan plan area cut off by the domain: a quarter for quarter symmetry, none otherwise.
+        """
+        spudcan_model = SpudcanGeometry(diameter=10.0, height_cone_angle=30.0)
+        layers = [SoilLayer(name="Clay", thickness=100.0)]
+        control = AnalysisControlParameters(domain_auto_size=True)
+        full = compute_model_domain(spudcan_model, None, layers, control)
+        self.assertAlmostEqual(plan_area_fraction_in_domain(full, (0.0, 0.0), 5.0), 1.0, places=4)
+        control.symmetry = "quarter"
+        quarter = compute_model_domain(spudcan_model, None, layers, control)
+        self.assertAlmostEqual(plan_area_fraction_in_domain(quarter, (0.0, 0.0), 5.0), 0.25, places=4)
+
+        # Half the spudcan outside a domain edge, and a spudcan outside the domain.
+        half = ModelDomain(x_min=0.0, x_max=20.0, y_min=-20.0, y_max=20.0, bottom_z=-10.0)
+        self.assertAlmostEqual(plan_area_fraction_in_domain(half, (0.0, 0.0), 5.0), 0.5, places=4)
+        self.assertEqual(plan_area_fraction_in_domain(half, (-6.0, 0.0), 5.0), 0.0)
+
+        # A lateral boundary inside the spudcan would cut off more than the symmetry accounts for.
+        control.domain_lateral_factor = 0.4
+        with self.assertRaises(PlaxisConfigurationError):
+            compute_model_domain(spudcan_model, None, layers, control)
+
+    def test_domain_auto_size_is_opt_in(self):
+        """
+        Test that projects without `domain_auto_size` keep the PLAXIS default domain.
+        """
+        self.assertFalse(AnalysisControlParameters().domain_auto_size)
+        self.assertIsNone(compute_model_domain(SpudcanGeometry(diameter=4.0, height_cone_angle=30.0), None,
+                                               [SoilLayer(name="Sand", thickness=50.0)], AnalysisControlParameters()))
+
+    def test_horizontal_or_moment_load_disables_quarter_symmetry(self):
+        """
+        Test that only purely vertical loading is treated as symmetric.
+        """
+        @dataclass
+        class CombinedLoading(LoadingConditions):
+            horizontal_load: float = 0.0
+            moment: float = 0.0
+
+        vertical = LoadingConditions(vertical_preload=800.0, target_type="load", target_penetration_or_load=2000.0)
+        self.assertTrue(is_vertical_only_loading(vertical))
+        self.assertTrue(is_vertical_only_loading(CombinedLoading(vertical_preload=800.0)))
+        control = AnalysisControlParameters(domain_auto_size=True, symmetry="quarter")
+        self.assertEqual(get_symmetry_factor(control, vertical), 4.0)
+        for loading in (CombinedLoading(vertical_preload=800.0, horizontal_load=50.0),
+                        CombinedLoading(vertical_preload=800.0, moment=120.0)):
+            self.assertFalse(is_vertical_only_loading(loading))
+            self.assertEqual(get_symmetry_factor(control, loading), 1.0)
+
+    def test_generate_model_domain_callables_sets_soil_contour(self):
+        """
+        Test that the soil contour is initialised from the domain extents.
+        """
+        domain = compute_model_domain(SpudcanGeometry(diameter=4.0, height_cone_angle=30.0), None,
+                                      [SoilLayer(name="Sand", thickness=50.0)], AnalysisControlParameters(domain_auto_size=True))
+        callables = generate_model_domain_callables(domain)
+        mock_g_i = MagicMock()
+        callables[0](mock_g_i)
+        mock_g_i.gotosoil.assert_called_once()
+        mock_g_i.SoilContour.initializerectangular.assert_called_once_with(-20.0, -20.0, 20.0, 20.0)
+        self.assertEqual(generate_model_domain_callables(None), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for live curve polling during a calculation (live_curve.py).
+"""
+import threading
+from unittest.mock import MagicMock, patch
+
+from backend.models import ProjectSettings, AnalysisControlParameters, LoadingConditions
+from backend.plaxis_interactor import live_curve
+from backend.plaxis_interactor.interactor import PlaxisInteractor
+from backend.plaxis_interactor.live_curve import CurveRingBuffer, LiveCurvePoller, make_output_step_fetcher
+
+
+def test_ring_buffer_cursor_and_overflow():
+    buffer = CurveRingBuffer(capacity=4)
+    buffer.extend([(0.1, 10.0), (0.2, 20.0)])
+    pens, loads, cursor = buffer.read_since(0)
+    assert (pens, loads, cursor) == ([0.1, 0.2], [10.0, 20.0], 2)
+
+    buffer.extend([(0.3, 30.0)])
+    assert buffer.read_since(cursor) == ([0.3], [30.0], 3)
+    assert buffer.read_since(3) == ([], [], 3)
+
+    buffer.extend([(0.4, 40.0), (0.5, 50.0), (0.6, 60.0)]) # Drops the three oldest points
+    assert len(buffer) == 4 and buffer.total == 6
+    assert buffer.read_since(1)[0] == [0.3, 0.4, 0.5, 0.6] # Reader that fell behind resumes at the oldest held
+    assert buffer.snapshot()[1] == [30.0, 40.0, 50.0, 60.0]
+
+
+def test_poller_appends_new_steps_and_survives_fetch_errors():
+    steps = [(0.1, 5.0), (0.2, 9.0), (0.3, 12.0)]
+    calls = []
+
+    def fetch(first_step):
+        calls.append(first_step)
+        if len(calls) == 2:
+            raise RuntimeError("Output busy")
+        stored = steps[:len(calls)]
+        return stored[first_step:], len(stored)
+
+    chunks = []
+    poller = LiveCurvePoller(fetch, CurveRingBuffer(), on_chunk=chunks.append)
+    assert poller.poll_once() == 1
+    assert poller.poll_once() == 0 # Error logged, retried on the next poll
+    assert poller.poll_once() == 2
+    assert calls == [0, 1, 1]
+    assert chunks == [1, 2]
+    assert poller.buffer.snapshot() == ([0.1, 0.2, 0.3], [5.0, 9.0, 12.0])
+
+
+def test_poller_thread_start_stop():
+    polled = threading.Event()
+
+    def fetch(first_step):
+        polled.set()
+        return [(0.1, 1.0)], first_step + 1
+
+    poller = LiveCurvePoller(fetch, CurveRingBuffer(), interval=0.01)
+    poller.start()
+    assert polled.wait(2.0)
+    poller.stop()
+    assert not poller.is_running
+    assert poller.buffer.total == poller.next_step >= 1
+
+
+def test_output_step_fetcher_reads_only_new_steps():
+    g_o = MagicMock()
+    spudcan = MagicMock(name="SpudcanOutput")
+    g_o.RigidBodies = {"Spudcan": spudcan}
+    stored_steps = ["step1", "step2", "step3"]
+    g_o.Phases = [MagicMock()]
+    g_o.Phases[-1].Steps.__getitem__.side_effect = lambda s: stored_steps[s]
+    values = {("step1", "Uy"): -0.1, ("step1", "Fz"): -100.0, ("step2", "Uy"): -0.2, ("step2", "Fz"): -180.0,
+              ("step3", "Uy"): -0.3, ("step3", "Fz"): "n/a"}
+    g_o.ResultTypes.RigidBody.Uy = "Uy"
+    g_o.ResultTypes.RigidBody.Fz = "Fz"
+    g_o.getcurveresults.side_effect = lambda obj, step, rt: values[(step, rt)]
+
+    fetch = make_output_step_fetcher(g_o)
+    assert fetch(0) == ([(0.1, 100.0), (0.2, 180.0)], 3) # Non-numeric step skipped, but read
+    assert fetch(3) == ([], 3)
+    assert g_o.getcurveresults.call_args_list[0].args[0] is spudcan
+
+
+def test_interactor_fetcher_scales_quarter_model_and_closes_output_on_stop(tmp_path):
+    settings = ProjectSettings(analysis_control=AnalysisControlParameters(symmetry="quarter"),
+                               loading=LoadingConditions(target_type="penetration", target_penetration_or_load=1.0))
+    settings.project_file_path = str(tmp_path / "spudcan.p3d")
+    interactor = PlaxisInteractor(project_settings=settings)
+    s_i, g_i, s_o = MagicMock(), MagicMock(), MagicMock()
+    servers = {10000: (s_i, g_i), 10001: (s_o, MagicMock())}
+    polled = []
+    with patch.object(interactor, "_new_server", side_effect=lambda host, port, password: servers[port]) as new_server, \
+            patch.object(live_curve, "make_output_step_fetcher", return_value=lambda first: ([(0.1, 25.0)], 1)):
+        poller = LiveCurvePoller(interactor.create_live_curve_fetcher(), CurveRingBuffer(),
+                                 on_stop=interactor.close_live_curve_connection)
+        assert poller.poll_once() == 0 # Not saved for this calculation yet: a stale file is not opened.
+        s_o.open.assert_not_called()
+
+        def calculate_callable(g_i):
+            polled.extend([poller.poll_once(), poller.poll_once()]) # While PLAXIS calculates.
+        interactor.run_calculation([calculate_callable])
+    assert polled == [1, 1]
+    assert poller.buffer.snapshot() == ([0.1, 0.1], [100.0, 100.0]) # x4, as in the final results
+    assert new_server.call_count == 2 # Input, then one Output connection for all polls.
+    s_o.open.assert_called_once_with(settings.project_file_path)
+    assert g_i.save.call_args_list[0].args == (settings.project_file_path,) # Saved before calculating.
+
+    poller.stop()
+    s_o.close.assert_called_once_with()
+    s_o.connection.session.close.assert_called_once_with()
+    interactor.close_all_connections() # Already closed: nothing to do.
+    assert s_o.close.call_count == 1
@@ -0,0 +1,226 @@
+"""
+Unit tests for the mesh-template cache (mesh_cache.py).
+"""
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.models import (
+    ProjectSettings, SpudcanGeometry, SoilLayer, MaterialProperties,
+    LoadingConditions, AnalysisControlParameters
+)
+from backend.exceptions import PlaxisConfigurationError
+from backend.plaxis_interactor.mesh_cache import (
+    MeshTemplateCache, get_mesh_key_components, compute_mesh_template_key,
+    generate_cached_workflow_callables, generate_template_reuse_callables
+)
+from backend.plaxis_interactor.interactor import PlaxisInteractor
+
+
+def _settings(phi: float = 30.0, preload: float = 100.0, coarseness: str = "Medium") -> ProjectSettings:
+    return ProjectSettings(
+        project_name="MeshCacheTest",
+        spudcan=SpudcanGeometry(diameter=6.0, height_cone_angle=30.0),
+        soil_stratigraphy=[
+            SoilLayer(name="Clay", thickness=5.0, material=MaterialProperties(model_name="MohrCoulomb", Identification="Clay", phi=phi)),
+            SoilLayer(name="Sand", thickness=10.0, material=MaterialProperties(model_name="MohrCoulomb", Identification="Sand", phi=35.0)),
+        ],
+        water_table_depth=1.0,
+        loading=LoadingConditions(vertical_preload=preload, target_type="penetration", target_penetration_or_load=2.0),
+        analysis_control=AnalysisControlParameters(meshing_global_coarseness=coarseness),
+    )
+
+
+def test_key_ignores_material_and_load_magnitudes():
+    key_a = compute_mesh_template_key(get_mesh_key_components(_settings(phi=25.0, preload=100.0)))
+    key_b = compute_mesh_template_key(get_mesh_key_components(_settings(phi=40.0, preload=900.0)))
+    assert key_a == key_b
+
+
+def test_key_changes_with_mesh_relevant_inputs():
+    base = compute_mesh_template_key(get_mesh_key_components(_settings()))
+    assert compute_mesh_template_key(get_mesh_key_components(_settings(coarseness="Fine"))) != base
+    no_preload = compute_mesh_template_key(get_mesh_key_components(_settings(preload=0.0)))
+    assert no_preload != base # Preload object is part of the geometry
+
+    thicker = _settings()
+    thicker.soil_stratigraphy[0].thickness = 6.0
+    assert compute_mesh_template_key(get_mesh_key_components(thicker)) != base
+
+
+def test_key_requires_spudcan_geometry():
+    settings = _settings()
+    settings.spudcan = SpudcanGeometry(diameter=None, height_cone_angle=30.0)
+    with pytest.raises(PlaxisConfigurationError):
+        get_mesh_key_components(settings)
+
+
+def test_cache_register_lookup_and_stale_entry(tmp_path):
+    cache = MeshTemplateCache(str(tmp_path))
+    plan = cache.plan(_settings())
+    assert not plan.cache_hit
+
+    # Registering without the file on disk is treated as stale and pruned.
+    cache.register(plan.cache_key, plan.key_components)
+    assert cache.lookup(plan.cache_key) is None
+
+    with open(plan.template_path, "w") as f:
+        f.write("meshed")
+    cache.register(plan.cache_key, plan.key_components)
+    hit_plan = cache.plan(_settings(phi=20.0))
+    assert hit_plan.cache_hit
+    assert hit_plan.template_path == plan.template_path
+
+    cache.invalidate(plan.cache_key)
+    assert not os.path.exists(plan.template_path)
+    assert cache.lookup(plan.cache_key) is None
+
+
+def test_cache_miss_meshes_and_saves_template(tmp_path):
+    cache = MeshTemplateCache(str(tmp_path))
+    settings = _settings()
+    settings.project_file_path = str(tmp_path / "run.p3dxml")
+    plan, setup_callables, calc_callables = generate_cached_workflow_callables(settings, cache)
+    assert not plan.cache_hit
+
+    names = [getattr(c, "__name__", "") for c in calc_callables]
+    assert names[0] == "mesh_generation_callable"
+    assert names[1] == "save_mesh_template_callable"
+
+    g_i = MagicMock()
+    g_i.save.side_effect = lambda path: open(path, "w").close()
+    calc_callables[1](g_i)
+    assert [c.args[0] for c in g_i.save.call_args_list] == [plan.template_path, settings.project_file_path]
+    assert cache.lookup(plan.cache_key) == plan.template_path
+
+
+def _file_tracking_g_i(active: dict) -> MagicMock:
+    """g_i whose `save` switches the active project file (save-as), recording it for each phase added."""
+    g_i = MagicMock()
+
+    def save(path):
+        open(path, "w").close()
+        active["file"] = path
+    g_i.save.side_effect = save
+
+    def phase(*args):
+        active.setdefault("phases_added_to", []).append(active["file"])
+        return MagicMock()
+    g_i.phase.side_effect = phase
+    return g_i
+
+
+def _without_calculate(callables):
+    return [func for func in callables if getattr(func, "__name__", "") != "calculate_callable"]
+
+
+def test_cache_miss_calculates_in_project_file_not_template(tmp_path):
+    cache = MeshTemplateCache(str(tmp_path / "cache"))
+    settings = _settings()
+    settings.project_file_path = str(tmp_path / "run.p3dxml")
+    plan, _, calc_callables = generate_cached_workflow_callables(settings, cache)
+
+    active = {"file": None}
+    g_i = _file_tracking_g_i(active)
+    for func in _without_calculate(calc_callables):
+        func(g_i)
+    assert active["phases_added_to"] and set(active["phases_added_to"]) == {settings.project_file_path}
+    assert cache.lookup(plan.cache_key) == plan.template_path
+
+
+def test_cache_hit_saves_template_as_project_before_editing(tmp_path):
+    cache = MeshTemplateCache(str(tmp_path / "cache"))
+    template = cache.plan(_settings())
+    os.makedirs(cache.cache_dir)
+    open(template.template_path, "w").close()
+    cache.register(template.cache_key, template.key_components)
+    settings = _settings(phi=22.0)
+    settings.project_file_path = str(tmp_path / "run.p3dxml")
+    plan, setup_callables, calc_callables = generate_cached_workflow_callables(settings, cache)
+    assert plan.cache_hit
+
+    active = {"file": None}
+    s_i, g_i = MagicMock(), _file_tracking_g_i(active)
+    s_i.open.side_effect = lambda path: active.update(file=path)
+    g_i.delete.side_effect = lambda *args: active.setdefault("edited", []).append(active["file"])
+    g_i.SoilMaterials = [MagicMock(name="TemplateClay")]
+    g_i.Boreholes = {"BH1": MagicMock(SoilLayers=[MagicMock(), MagicMock()])}
+    interactor = PlaxisInteractor(project_settings=settings)
+    with patch.object(interactor, "_new_server", return_value=(s_i, g_i)):
+        interactor.setup_model_in_plaxis(setup_callables, template_path=plan.template_path)
+        interactor.run_calculation(_without_calculate(calc_callables))
+    s_i.open.assert_called_once_with(plan.template_path)
+    assert set(active["edited"]) == {settings.project_file_path} # Template materials purged in the copy.
+    assert active["phases_added_to"] and set(active["phases_added_to"]) == {settings.project_file_path}
+    assert plan.template_path not in [c.args[0] for c in g_i.save.call_args_list]
+
+
+def test_cache_hit_skips_meshing_and_geometry(tmp_path):
+    cache = MeshTemplateCache(str(tmp_path))
+    plan = cache.plan(_settings())
+    open(plan.template_path, "w").close()
+    cache.register(plan.cache_key, plan.key_components)
+
+    hit_plan, setup_callables, calc_callables = generate_cached_workflow_callables(_settings(phi=22.0), cache)
+    assert hit_plan.cache_hit
+
+    setup_names = [getattr(c, "__name__", "") for c in setup_callables]
+    assert "create_cone_callable" not in setup_names
+    assert "create_borehole_and_layers_callable" not in setup_names
+    assert setup_names[0] == "purge_template_materials_callable"
+
+    calc_names = [getattr(c, "__name__", "") for c in calc_callables]
+    assert "mesh_generation_callable" not in calc_names
+    assert calc_names[0] == "enter_staged_construction_callable"
+
+
+def test_template_reuse_callables_reassign_layers_and_loads():
+    layers = _settings().soil_stratigraphy
+    loading = LoadingConditions(vertical_preload=500.0, target_type="penetration", target_penetration_or_load=3.0)
+    purge, reassign, update_loads = generate_template_reuse_callables(layers, 1.5, loading)
+
+    g_i = MagicMock()
+    old_mat = MagicMock(name="OldClay")
+    g_i.SoilMaterials = [old_mat]
+    bh = MagicMock()
+    bh.SoilLayers = [MagicMock(), MagicMock()]
+    g_i.Boreholes = {"BH1": bh}
+    g_i.PointLoads = {"Spudcan_Preload": MagicMock()}
+    g_i.PointDisplacements = {"Spudcan_TargetPenetration": MagicMock()}
+
+    purge(g_i)
+    g_i.delete.assert_called_once_with(old_mat)
+
+    reassign(g_i)
+    g_i.set.assert_any_call(bh.SoilLayers[0].Material, "Clay")
+    g_i.set.assert_any_call(bh.SoilLayers[1].Material, "Sand")
+    g_i.set.assert_any_call(bh.Head, -1.5)
+
+    update_loads(g_i)
+    g_i.set.assert_any_call(g_i.PointLoads["Spudcan_Preload"].Fz, -500.0)
+    g_i.set.assert_any_call(g_i.PointDisplacements["Spudcan_TargetPenetration"].uz, -3.0)
+
+
+def test_key_and_setup_use_domain_clipped_stratigraphy(tmp_path):
+    settings = _settings()
+    settings.analysis_control.domain_auto_size = True
+    settings.analysis_control.domain_depth_factor = 1.0 # 2 m penetration + 6 m -> bottom at -8 m
+    components = get_mesh_key_components(settings)
+    assert components["layer_boundaries"] == [0.0, -5.0, -8.0]
+    assert components["domain"] == [-30.0, 30.0, -30.0, 30.0, -8.0]
+
+    plan, setup_callables, _ = generate_cached_workflow_callables(settings, MeshTemplateCache(str(tmp_path)))
+    assert getattr(setup_callables[0], "__name__", "") == "set_soil_contour_callable"
+
+
+def test_shared_gradient_material_split_by_reference_level():
+    from backend.material_library import MaterialLibrary
+    from backend.plaxis_interactor.model_setup import resolve_model_domain_and_layers
+    settings = _settings()
+    gradient = MaterialProperties(model_name="MohrCoulomb", Identification="NCClay", cRef=5.0, cInc=1.5, phi=0.0)
+    settings.soil_stratigraphy = [SoilLayer(name="Upper", thickness=5.0, material=gradient),
+                                  SoilLayer(name="Lower", thickness=10.0, material=gradient)]
+    settings.analysis_control.domain_auto_size = False
+    _, layers = resolve_model_domain_and_layers(settings, MaterialLibrary())
+    assert [l.material.Identification for l in layers] == ["NCClay", "NCClay_2"]
+    assert [l.material.z_ref for l in layers] == [0.0, -5.0]
@@ -0,0 +1,95 @@
+"""
+Unit tests for the mesh convergence study (mesh_convergence.py).
+"""
+import threading
+import pytest
+from unittest.mock import patch
+
+from backend.models import ProjectSettings, AnalysisControlParameters, AnalysisResults
+from backend.exceptions import PlaxisConfigurationError, PlaxisAutomationError, PlaxisCalculationError
+from backend.plaxis_interactor import mesh_convergence
+from backend.plaxis_interactor.mesh_convergence import run_mesh_convergence_study, build_interactor_analysis_runner
+
+
+def _runner(peaks, calls=None, lock=threading.Lock()):
+    def run(settings: ProjectSettings) -> AnalysisResults:
+        coarseness = settings.analysis_control.meshing_global_coarseness
+        with lock:
+            if calls is not None:
+                calls.append(coarseness)
+        peak = peaks[coarseness]
+        if isinstance(peak, Exception):
+            raise peak
+        return AnalysisResults(peak_vertical_resistance=peak)
+    return run
+
+
+def test_stops_at_first_converged_pair_and_selects_coarser_level():
+    peaks = {"Coarse": 1000.0, "Medium": 1200.0, "Fine": 1210.0, "VeryFine": 1212.0}
+    calls = []
+    study = run_mesh_convergence_study(ProjectSettings(), _runner(peaks, calls), tolerance=0.02, max_workers=1)
+    assert study.converged
+    assert study.selected_coarseness == "Medium"
+    assert calls == ["Coarse", "Medium", "Fine"] # VeryFine never analysed
+    assert study.selected_results.peak_vertical_resistance == 1200.0
+
+
+def test_parallel_batches_keep_ladder_order():
+    peaks = {"Coarse": 1000.0, "Medium": 1005.0, "Fine": 1006.0, "VeryFine": 1006.0}
+    study = run_mesh_convergence_study(ProjectSettings(), _runner(peaks), max_workers=2)
+    assert [lvl.coarseness for lvl in study.levels] == ["Coarse", "Medium"]
+    assert study.selected_coarseness == "Coarse"
+
+
+def test_not_converged_uses_finest_successful_level():
+    peaks = {"Coarse": 100.0, "Medium": 200.0, "Fine": RuntimeError("diverged")}
+    study = run_mesh_convergence_study(ProjectSettings(), _runner(peaks), levels=["Fine", "Coarse", "Medium"], max_workers=3)
+    assert not study.converged
+    assert study.selected_coarseness == "Medium"
+    assert study.levels[2].error == "diverged"
+
+
+def test_settings_per_level_do_not_mutate_base():
+    base = ProjectSettings(analysis_control=AnalysisControlParameters(meshing_global_coarseness="Medium", mesh_convergence_study=True))
+    peaks = {"Coarse": 1.0, "Fine": 1.0}
+    run_mesh_convergence_study(base, _runner(peaks), levels=["Coarse", "Fine"])
+    assert base.analysis_control.meshing_global_coarseness == "Medium"
+    assert base.analysis_control.mesh_convergence_study is True
+
+
+def test_invalid_ladders_and_total_failure():
+    with pytest.raises(PlaxisConfigurationError):
+        run_mesh_convergence_study(ProjectSettings(), _runner({}), levels=["Medium", "UltraFine"])
+    with pytest.raises(PlaxisConfigurationError):
+        run_mesh_convergence_study(ProjectSettings(), _runner({}), levels=["Medium"])
+    failing = {"Coarse": RuntimeError("x"), "Medium": RuntimeError("y")}
+    with pytest.raises(PlaxisAutomationError):
+        run_mesh_convergence_study(ProjectSettings(), _runner(failing), levels=["Coarse", "Medium"])
+
+
+def test_cancel_stops_the_study_between_batches():
+    calls, cancelled = [], threading.Event()
+    run = _runner({"Coarse": 1000.0, "Medium": 1500.0, "Fine": 2000.0, "VeryFine": 2500.0}, calls)
+
+    def run_and_cancel(settings):
+        cancelled.set() # Cancelled while the first level runs.
+        return run(settings)
+    with pytest.raises(PlaxisCalculationError):
+        run_mesh_convergence_study(ProjectSettings(), run_and_cancel, max_workers=1, should_stop=cancelled.is_set)
+    assert calls == ["Coarse"]
+
+
+def test_interactor_runner_defaults_to_the_project_ports_and_passes_the_stop_check():
+    settings = ProjectSettings()
+    settings.plaxis_api_input_port, settings.plaxis_api_output_port = 12000, 12001
+    should_stop = lambda: False
+    seen = []
+    with patch.object(mesh_convergence, "run_interactor_analysis",
+                      side_effect=lambda path, s, should_stop: seen.append((s.plaxis_api_input_port,
+                                                                            s.plaxis_api_output_port, should_stop))
+                      or AnalysisResults(peak_vertical_resistance=1.0)):
+        run_mesh_convergence_study(settings, build_interactor_analysis_runner(None, should_stop=should_stop),
+                                   levels=["Coarse", "Medium"], max_workers=2)
+        build_interactor_analysis_runner(None, api_ports=[(13000, 13001)])(ProjectSettings())
+    assert seen[:2] == [(12000, 12001, should_stop)] * 2
+    assert seen[2][:2] == (13000, 13001)
@@ -179,6 +179,16 @@ def test_compile_analysis_results():
     assert compiled.final_penetration_depth == 0.2
     assert compiled.peak_vertical_resistance == 200
 
+def test_compile_analysis_results_scales_quarter_model_loads():
+    raw_results = [[{'penetration': 0.1, 'load': 25.0}, {'penetration': 0.2, 'load': 50.0}], 0.2]
+    settings = ProjectSettings(analysis_control=AnalysisControlParameters(symmetry="quarter"),
+                               loading=LoadingConditions(target_type="penetration", target_penetration_or_load=0.2))
+    compiled = compile_analysis_results(raw_results, settings)
+    assert [p['load'] for p in compiled.load_penetration_curve_data] == [100.0, 200.0]
+    assert compiled.peak_vertical_resistance == 200.0
+    assert compiled.final_penetration_depth == 0.2
+    assert raw_results[0][1]['load'] == 50.0 # Raw data untouched
+
 def test_get_standard_results_commands_and_compile():
     mock_g_o = MockG_o_ForResults()
     mock_g_o._add_mock_phase("StandardPhase")
@@ -0,0 +1,155 @@
+"""
+Unit tests for the PLAXIS API retry policy and circuit breaker (retry_policy.py).
+"""
+import asyncio
+import random
+import pytest
+from unittest.mock import MagicMock
+
+from backend.exceptions import PlaxisConnectionError
+from backend.run_trace import RunTracer
+from backend.plaxis_interactor.async_client import AsyncHTTPConnection, AsyncPlaxisServer
+from backend.plaxis_interactor.retry_policy import (
+    RetryPolicy, RetryStats, CircuitBreaker, attach_retry_policy, is_idempotent, run_with_retries,
+    wait_for_server, CLOSED, OPEN, HALF_OPEN
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200, content: bytes = b"{}", content_length: int = None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.content = content
+        self.headers = {"content-length": str(len(content) if content_length is None else content_length)}
+
+
+class FakeErrorMode:
+    should_retry = True
+
+
+class FakeHTTPConnection:
+    """The parts of plxscripting's HTTPConnection that `attach_retry_policy` replaces or calls."""
+    def __init__(self, responses):
+        self.host, self.port = "localhost", 10000
+        self.request_timeout = None
+        self.error_mode = None
+        self.session = MagicMock()
+        self.session.post.side_effect = responses
+        self.sent = 0
+
+    def _send_request_and_get_response(self, operation_address, payload):
+        self.sent += 1
+        return self._make_request(operation_address, "{}")
+
+    def _make_request(self, operation_address, json_payload):
+        raise AssertionError("replaced by attach_retry_policy")
+
+
+class FakeServer:
+    def __init__(self, responses):
+        self.connection = FakeHTTPConnection(responses)
+
+
+def _policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(base_delay_s=0.001, max_delay_s=0.002, jitter=0.0, **kwargs)
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    policy = RetryPolicy(base_delay_s=0.1, max_delay_s=1.0, jitter=0.0)
+    assert [policy.backoff_s(n) for n in range(1, 6)] == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0])
+    jittered = RetryPolicy(base_delay_s=0.1, max_delay_s=1.0, jitter=1.0, rng=random.Random(7))
+    delays = [jittered.backoff_s(3) for _ in range(200)]
+    assert all(0.0 <= d <= 0.4 for d in delays) and len(set(delays)) > 100
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_only_read_only_requests_are_idempotent():
+    assert is_idempotent("/members") and is_idempotent("propertyvalues") and is_idempotent("list")
+    assert is_idempotent("selection", {"action": {"name": "get", "objects": []}})
+    assert not is_idempotent("selection", {"action": {"name": "set", "objects": []}})
+    assert is_idempotent("exceptions", {"action": {"name": "peeklast"}})
+    assert not is_idempotent("exceptions", {"action": {"name": "getlast"}})
+    assert not is_idempotent("commands") and not is_idempotent("environment")
+
+
+def test_retries_read_only_requests_and_counts():
+    tracer = RunTracer()
+    stats = RetryStats(tracer)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionResetError("reset")
+        return "ok"
+
+    with tracer.span("stage", "stage"):
+        assert run_with_retries(_policy(), flaky, lambda r: False, "members", stats=stats) == "ok"
+    assert stats.snapshot()["retries"] == 2 and stats.snapshot()["attempts"] == 3
+    assert tracer.spans[-1].counters["retry.retries"] == 2
+
+    calls.clear()
+    with pytest.raises(ConnectionResetError):
+        run_with_retries(_policy(), flaky, lambda r: False, "commands", stats=stats)
+    assert len(calls) == 1 # Commands change the project: never repeated automatically.
+    assert run_with_retries(_policy(retry_non_idempotent=True), flaky, lambda r: False, "commands") == "ok"
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_s=10.0, clock=lambda: now[0])
+    stats = RetryStats()
+    breaker.record_failure(stats)
+    assert breaker.state == CLOSED
+    breaker.record_failure(stats)
+    assert breaker.state == OPEN and stats.snapshot()["breaker_opened"] == 1
+    with pytest.raises(PlaxisConnectionError, match="circuit open"):
+        breaker.before_request(stats)
+    now[0] = 10.0
+    assert breaker.state == HALF_OPEN
+    breaker.before_request(stats) # The trial request...
+    with pytest.raises(PlaxisConnectionError):
+        breaker.before_request(stats) # ...is the only one let through.
+    breaker.record_failure(stats)
+    assert breaker.state == OPEN
+    now[0] = 20.0
+    breaker.before_request(stats)
+    breaker.record_success()
+    assert breaker.state == CLOSED and stats.snapshot()["breaker_rejected"] == 2
+
+
+def test_attach_bounds_truncated_responses_and_error_mode_retries():
+    server = FakeServer([FakeResponse(content=b"{}", content_length=10)] * 3)
+    assert attach_retry_policy(server, _policy(), CircuitBreaker())
+    with pytest.raises(PlaxisConnectionError, match="truncated"):
+        server.connection._send_request_and_get_response("http://localhost:10000/members", {})
+    assert server.connection.session.post.call_count == 3
+    assert server.connection.retry_stats.snapshot()["truncated_responses"] == 3
+
+    server = FakeServer([FakeResponse(500), FakeResponse(500), FakeResponse(200)])
+    attach_retry_policy(server, _policy(), CircuitBreaker())
+    connection = server.connection
+    assert connection._send_request_and_get_response("http://localhost:10000/commands", {}).status_code == 500
+    assert connection._retry_request("http://localhost:10000/commands", {}) is None # No "retry" error mode.
+    connection.error_mode = FakeErrorMode()
+    assert connection._retry_request("http://localhost:10000/commands", {}).ok
+    assert connection.sent == 3
+
+    assert not attach_retry_policy(MagicMock(), _policy())
+
+
+def test_wait_for_server_gives_up_after_timeout():
+    assert not wait_for_server("127.0.0.1", 1, _policy(connect_timeout_s=0.05))
+
+
+def test_async_connection_fails_fast_once_breaker_opens():
+    async def scenario():
+        breaker = CircuitBreaker("127.0.0.1:1", failure_threshold=2, reset_timeout_s=60.0)
+        stats = RetryStats()
+        server = AsyncPlaxisServer(AsyncHTTPConnection("127.0.0.1", 1, timeout=1.0, retry_policy=_policy(),
+                                                       circuit_breaker=breaker, retry_stats=stats))
+        with pytest.raises(PlaxisConnectionError, match="circuit open"):
+            await server.get_named_object("Project")
+        assert stats.snapshot()["attempts"] == 2 and stats.snapshot()["breaker_opened"] == 1
+    asyncio.run(scenario())
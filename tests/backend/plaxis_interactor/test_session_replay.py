@@ -0,0 +1,103 @@
+"""
+Unit tests for recording and replaying PLAXIS API sessions (session_replay.py).
+"""
+import json
+import time
+import http.client
+import pytest
+
+from backend.plaxis_interactor.session_replay import (
+    SessionRecorder, ReplayServer, load_session, normalize_request, main
+)
+from backend.exceptions import ProjectValidationError
+
+
+class FakeResponse:
+    def __init__(self, url: str, text: str, status_code: int = 200, reason: str = "OK"):
+        self.url = url
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = {"Content-Type": "application/json", "Date": "Mon, 01 Jan 2024"}
+
+
+class FakeConnection:
+    """Calls its `logger` around each request like plxscripting's HTTPConnection."""
+    def __init__(self):
+        self.logger = None
+
+    def request(self, endpoint: str, payload: dict, reply: dict, delay: float = 0.0):
+        self.logger.log_request_start(json.dumps(payload))
+        time.sleep(delay)
+        self.logger.log_request_end(FakeResponse(f"http://localhost:10000{endpoint}", json.dumps(reply)))
+
+
+class FakeServer:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+
+def _post(port: int, endpoint: str, payload: dict):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request("POST", endpoint, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, response.read().decode("utf-8")
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / "session.plxrec.gz")
+    recorder = SessionRecorder(path)
+    s_i, s_o = FakeServer(), FakeServer()
+    assert recorder.attach(s_i, "input") and recorder.attach(s_o, "output")
+    assert not recorder.attach(object(), "input")
+
+    query = {"ReplyCode": "r1", "commands": ["echo Phases"]}
+    s_i.connection.request("/commands", query, {"ReplyCode": "r1", "result": "first"}, delay=0.02)
+    s_i.connection.request("/commands", dict(query, ReplyCode="r2"), {"result": "second"})
+    s_o.connection.request("/members", {"guids": ["abc"]}, {"result": "output"})
+    recorder.close()
+    return path
+
+
+def test_recording_round_trip(archive):
+    exchanges = load_session(archive)
+    assert [(e.channel, e.seq, e.endpoint) for e in exchanges] == [
+        ("input", 0, "/commands"), ("input", 1, "/commands"), ("output", 0, "/members")]
+    first = exchanges[0]
+    assert "ReplyCode" not in first.request and "ReplyCode" not in first.body
+    assert first.request == normalize_request('{"commands": ["echo Phases"], "ReplyCode": "x"}')
+    assert first.headers == {"Content-Type": "application/json"}
+    assert first.elapsed_s >= 0.02
+
+
+def test_load_session_rejects_invalid_archives(tmp_path):
+    bad = tmp_path / "bad.plxrec.gz"
+    bad.write_text("not gzip", encoding="utf-8")
+    with pytest.raises(ProjectValidationError):
+        load_session(str(bad))
+
+
+def test_replay_server_serves_recorded_responses_in_order(archive, capsys):
+    exchanges = load_session(archive)
+    with ReplayServer(exchanges, "input", fixed_latency_s=0.01) as server:
+        payload = {"commands": ["echo Phases"], "ReplyCode": "other"}
+        replies = [_post(server.port, "/commands", payload) for _ in range(3)]
+        assert [json.loads(body)["result"] for _, body in replies] == ["first", "second", "second"]
+        assert all(status == 200 for status, _ in replies)
+
+        status, _ = _post(server.port, "/members", {"guids": ["abc"]}) # Recorded on the output channel only
+        assert status == 404
+        assert (server.served, server.misses) == (3, 1)
+
+        server.latency_scale = 2.0
+        start = time.perf_counter()
+        _post(server.port, "/commands", payload)
+        assert time.perf_counter() - start >= exchanges[1].elapsed_s * 2.0 + 0.01
+
+    assert main(["info", archive]) == 0
+    assert "input: 2 requests" in capsys.readouterr().out
@@ -0,0 +1,162 @@
+"""
+Unit tests for multi-leg / multi-borehole site model generation.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from backend.models import (
+    ProjectSettings, SpudcanGeometry, SpudcanLeg, Borehole, SoilLayer, MaterialProperties,
+    LoadingConditions, AnalysisControlParameters
+)
+from backend.exceptions import PlaxisConfigurationError
+from backend.plaxis_interactor import geometry_builder, soil_builder, calculation_builder
+from backend.plaxis_interactor.model_setup import generate_model_setup_callables, resolve_model_domain_and_layers
+from backend.plaxis_interactor.results_parser import compile_analysis_results
+
+
+def _layer(name: str, thickness: float) -> SoilLayer:
+    return SoilLayer(name=name, thickness=thickness, material=MaterialProperties(model_name="MohrCoulomb", Identification=name))
+
+
+def _site() -> ProjectSettings:
+    return ProjectSettings(
+        spudcan=SpudcanGeometry(diameter=10.0, height_cone_angle=30.0),
+        legs=[SpudcanLeg("Bow", 0.0, 20.0), SpudcanLeg("Port", -15.0, -10.0), SpudcanLeg("Stbd", 15.0, -10.0)],
+        boreholes=[Borehole("CPT1", 0.0, 20.0, [_layer("Clay", 10.0), _layer("Sand", 40.0)]),
+                   Borehole("CPT2", 0.0, -10.0, [_layer("Clay", 6.0), _layer("Silt", 4.0), _layer("Sand", 50.0)], water_table_depth=2.0)],
+        water_table_depth=0.0,
+        loading=LoadingConditions(vertical_preload=800.0, target_type="penetration", target_penetration_or_load=3.0),
+        analysis_control=AnalysisControlParameters(domain_auto_size=True, domain_lateral_factor=2.0, domain_depth_factor=3.0),
+    )
+
+
+def test_merge_layer_names_and_inconsistent_order():
+    site = _site()
+    assert soil_builder.merge_borehole_layer_names(site.boreholes) == ["Clay", "Silt", "Sand"]
+    bad = [Borehole("A", soil_layers=[_layer("Clay", 1.0), _layer("Sand", 1.0)]),
+           Borehole("B", soil_layers=[_layer("Sand", 1.0), _layer("Clay", 1.0)])]
+    with pytest.raises(PlaxisConfigurationError):
+        soil_builder.merge_borehole_layer_names(bad)
+
+
+def test_multi_borehole_callable_sets_shared_levels_per_borehole():
+    site = _site()
+    callables = soil_builder.generate_multi_borehole_stratigraphy_callables(site.boreholes, site.water_table_depth)
+    assert len(callables) == 1
+
+    g_i = MagicMock()
+    bh1, bh2 = MagicMock(name="bh1"), MagicMock(name="bh2")
+    g_i.borehole.side_effect = [bh1, bh2]
+    layers1, layers2 = [MagicMock() for _ in range(3)], [MagicMock() for _ in range(3)]
+    bh1.SoilLayers.__getitem__.return_value = layers1
+    bh2.SoilLayers.__getitem__.return_value = layers2
+    callables[0](g_i)
+
+    assert g_i.soillayer.call_count == 3 # Shared layers added once
+    g_i.setsoillayerlevel.assert_any_call(bh1, 2, -10.0) # Silt absent in CPT1 -> zero thickness
+    g_i.setsoillayerlevel.assert_any_call(bh1, 3, -50.0)
+    g_i.setsoillayerlevel.assert_any_call(bh2, 2, -10.0)
+    bh1.SoilLayers.__getitem__.assert_called_once_with(slice(0, 3)) # One sublist read per borehole
+    g_i.set.assert_any_call(layers1[1].Material, "Silt") # Borrowed from CPT2
+    g_i.set.assert_any_call(bh1.Head, 0.0)
+    g_i.set.assert_any_call(bh2.Head, -2.0)
+
+
+def test_multi_leg_geometry_and_domain():
+    site = _site()
+    g_i = MagicMock()
+    g_i.cone.return_value = [MagicMock()]
+    geometry_builder.generate_multi_leg_geometry_callables(site.legs, site.spudcan)[0](g_i)
+    centers = [c.args[2] for c in g_i.cone.call_args_list]
+    assert centers == [(0.0, 20.0, 0), (-15.0, -10.0, 0), (15.0, -10.0, 0)]
+    renamed = [c.args[1] for c in g_i.rename.call_args_list]
+    assert renamed == ["Spudcan_ConeVolume_Bow", "Spudcan_ConeVolume_Port", "Spudcan_ConeVolume_Stbd"]
+
+    domain, _ = resolve_model_domain_and_layers(site)
+    assert (domain.x_min, domain.x_max, domain.y_min, domain.y_max) == (-35.0, 35.0, -30.0, 40.0)
+    assert domain.depth == pytest.approx(33.0)
+
+    with pytest.raises(PlaxisConfigurationError):
+        geometry_builder.validate_legs([SpudcanLeg("A"), SpudcanLeg("A")])
+
+
+def test_multi_leg_cones_sent_in_two_requests():
+    class RecordingServer:
+        class _InputProc:
+            def create_method_call_cmd(self, target, method_name, params):
+                return " ".join([method_name] + [str(p) for p in params])
+        input_proc = _InputProc()
+
+        def __init__(self):
+            self.requests = []
+
+        def call_and_handle_commands(self, *commands):
+            self.requests.append(list(commands))
+            return [[f"Volume_{i + 1}"] for i in range(len(commands))]
+
+    server = RecordingServer()
+    g_i = type("GlobalProxy", (), {})()
+    g_i._server = server
+    geometry_builder.generate_multi_leg_geometry_callables(_site().legs, _site().spudcan)[0](g_i)
+    assert len(server.requests) == 2 # All cones, then all renames
+    assert [command.split()[0] for command in server.requests[0]] == ["cone"] * 3
+    assert server.requests[1] == ["rename Volume_1 Spudcan_ConeVolume_Bow", "rename Volume_2 Spudcan_ConeVolume_Port",
+                                  "rename Volume_3 Spudcan_ConeVolume_Stbd"]
+
+
+def test_quarter_symmetry_falls_back_for_multi_leg():
+    site = _site()
+    site.analysis_control.symmetry = "quarter"
+    assert geometry_builder.get_symmetry_factor(site.analysis_control, site.loading, site.legs) == 1.0
+
+
+def test_site_setup_and_phases_cover_all_legs():
+    site = _site()
+    names = [c.__name__ for c in generate_model_setup_callables(site)]
+    assert names == ["set_soil_contour_callable", "create_leg_cones_callable",
+                     "create_materials_batch_callable", "create_site_boreholes_callable", "define_leg_loads_callable"]
+
+    callables = calculation_builder.generate_analysis_control_callables(
+        site.analysis_control, site.loading, leg_names=[leg.name for leg in site.legs])
+    g_i = MagicMock()
+    g_i.Phases = [MagicMock()]
+    g_i.Volumes = {f"Spudcan_ConeVolume_{leg.name}": MagicMock() for leg in site.legs}
+    g_i.PointLoads = {f"Spudcan_Preload_{leg.name}": MagicMock() for leg in site.legs}
+    for func in callables[1:3]: # initial + preload phase
+        func(g_i)
+    preload_phase = g_i.phase.return_value
+    for leg in site.legs:
+        g_i.activate.assert_any_call(g_i.Volumes[f"Spudcan_ConeVolume_{leg.name}"], preload_phase)
+        g_i.activate.assert_any_call(g_i.PointLoads[f"Spudcan_Preload_{leg.name}"], preload_phase)
+
+
+def test_compile_results_per_leg():
+    site = _site()
+    curve = [{'penetration': 0.5, 'load': 100.0}, {'penetration': 1.0, 'load': 150.0}]
+    raw = [curve, 1.0, curve, [{'penetration': 0.8, 'load': 300.0}], None]
+    compiled = compile_analysis_results(raw, site)
+    assert list(compiled.leg_results) == ["Bow", "Port", "Stbd"]
+    assert compiled.leg_results["Port"].peak_vertical_resistance == 300.0
+    assert compiled.leg_results["Port"].final_penetration_depth == 0.8
+    assert compiled.leg_results["Stbd"].load_penetration_curve_data is None
+
+
+def test_quarter_symmetry_single_origin_leg_scales_loads_and_leg_results():
+    site = _site()
+    site.legs = [SpudcanLeg("Main", 0.0, 0.0)]
+    site.boreholes = []
+    site.soil_stratigraphy = [_layer("Clay", 10.0), _layer("Sand", 40.0)]
+    site.analysis_control.symmetry = "quarter"
+    site.loading = LoadingConditions(vertical_preload=800.0)
+    assert geometry_builder.get_symmetry_factor(site.analysis_control, site.loading, site.legs) == 4.0
+
+    g_i = MagicMock()
+    define_leg_loads = generate_model_setup_callables(site)[-1]
+    define_leg_loads(g_i)
+    g_i.pointload.assert_called_once_with((0.0, 0.0, 0), Name="Spudcan_Preload_Main", Fz=-200.0)
+
+    curve = [{'penetration': 0.5, 'load': 50.0}, {'penetration': 1.0, 'load': 75.0}]
+    compiled = compile_analysis_results([curve, 1.0, curve], site)
+    assert compiled.peak_vertical_resistance == 300.0
+    assert compiled.leg_results["Main"].peak_vertical_resistance == 300.0
+    assert compiled.leg_results["Main"].load_penetration_curve_data[0]['load'] == 200.0
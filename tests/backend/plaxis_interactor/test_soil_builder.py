@@ -7,8 +7,12 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # Models and builder to test
-from src.backend.models import MaterialProperties, SoilLayer
-from src.backend.plaxis_interactor.soil_builder import generate_material_callables, generate_soil_stratigraphy_callables
+from src.backend.models import MaterialProperties, SoilLayer, Borehole
+from src.backend.plaxis_interactor.soil_builder import (
+    generate_material_callables, generate_soil_stratigraphy_callables, clip_soil_layers_to_depth,
+    build_material_property_map, generate_stratigraphy_material_callables,
+    resolve_depth_reference_levels, merge_linear_gradient_layers, generate_multi_borehole_stratigraphy_callables
+)
 from src.backend.exceptions import PlaxisConfigurationError
 
 # Mock g_i object for testing callables
@@ -281,3 +285,220 @@ def test_generate_stratigraphy_material_missing_id_and_name():
     layers = [SoilLayer(name="LayerWithBadMat", thickness=1.0, material=mat_bad)]
     with pytest.raises(PlaxisConfigurationError, match="missing 'Identification' or 'model_name'"):
         generate_soil_stratigraphy_callables(layers, -1.0)
+
+
+def test_clip_soil_layers_to_depth():
+    mat = MaterialProperties(Identification="Mat")
+    layers = [SoilLayer(name="A", thickness=5.0, material=mat),
+              SoilLayer(name="B", thickness=10.0, material=mat),
+              SoilLayer(name="C", thickness=20.0, material=mat)]
+    clipped = clip_soil_layers_to_depth(layers, 12.0)
+    assert [l.name for l in clipped] == ["A", "B"]
+    assert clipped[1].thickness == pytest.approx(7.0)
+    assert layers[1].thickness == 10.0 # Input untouched
+    assert clip_soil_layers_to_depth(layers, 100.0) == layers
+    assert clip_soil_layers_to_depth(layers, None) == layers
+
+
+# --- Tests for the bulk material builder ---
+
+class MockServerForBatch:
+    """Stands in for plxscripting's Server: records each request's command strings."""
+    class _InputProc:
+        def create_method_call_cmd(self, target, method_name, params):
+            return " ".join([method_name] + [repr(p) for p in params])
+
+    def __init__(self):
+        self.input_proc = self._InputProc()
+        self.requests: List[List[str]] = []
+
+    def call_and_handle_commands(self, *commands):
+        self.requests.append(list(commands))
+        return [f"Material_{i+1}" for i in range(len(commands))]
+
+
+class MockGlobalProxy:
+    def __init__(self, server):
+        self._server = server
+
+
+def test_build_material_property_map_other_params_do_not_override():
+    mat = MaterialProperties(Identification="M", model_name="Mohr Coulomb", Eref=1000.0,
+                             other_params={"eref": 5.0, "K0": 0.5, "OCR": None})
+    props = build_material_property_map(mat, "M")
+    assert list(props)[:3] == ["Identification", "SoilModel", "ERef"]
+    assert props["SoilModel"] == "MohrCoulomb"
+    assert props["ERef"] == 1000.0 and "eref" not in props
+    assert props["K0"] == 0.5 and "OCR" not in props
+
+def test_stratigraphy_materials_sent_in_one_request():
+    clay = MaterialProperties(Identification="Clay", model_name="MohrCoulomb", cRef=20.0)
+    sand = MaterialProperties(Identification="Sand", model_name="MohrCoulomb", phi=35.0)
+    layers = [SoilLayer(name="L1", thickness=2.0, material=clay), SoilLayer(name="L2", thickness=3.0, material=sand),
+              SoilLayer(name="L3", thickness=4.0, material=clay)]
+    callables = generate_stratigraphy_material_callables(layers)
+    assert [c.__name__ for c in callables] == ["create_materials_batch_callable"]
+
+    server = MockServerForBatch()
+    callables[0](MockGlobalProxy(server))
+    assert len(server.requests) == 1
+    assert server.requests[0] == [
+        "soilmat 'Identification' 'Clay' 'SoilModel' 'MohrCoulomb' 'cRef' 20.0",
+        "soilmat 'Identification' 'Sand' 'SoilModel' 'MohrCoulomb' 'phi' 35.0",
+    ]
+
+def test_bulk_materials_fall_back_to_direct_calls_without_server():
+    from unittest.mock import MagicMock
+    layers = [SoilLayer(name="L1", thickness=2.0, material=MaterialProperties(Identification="Clay", cRef=20.0))]
+    g_i = MagicMock()
+    generate_stratigraphy_material_callables(layers)[0](g_i)
+    g_i.soilmat.assert_called_once_with("Identification", "Clay", "SoilModel", "MohrCoulomb", "cRef", 20.0)
+    assert generate_stratigraphy_material_callables([]) == []
+
+
+def test_stratigraphy_commands_pipelined_with_one_layer_read():
+    class Listable(list):
+        reads = 0
+        def __getitem__(self, key):
+            if isinstance(key, slice):
+                Listable.reads += 1
+            return list.__getitem__(self, key)
+
+    server = MockServerForBatch()
+    bh = type("Borehole", (), {"SoilLayers": Listable([type("Layer", (), {"Material": f"L{i}.Material"})() for i in range(2)]),
+                               "Head": "BH1.Head"})()
+    g_i = MockGlobalProxy(server)
+    g_i.borehole = lambda x, y: bh
+    g_i.rename = lambda obj, name: None
+
+    mat = MaterialProperties(Identification="Clay")
+    layers = [SoilLayer(name="A", thickness=2.0, material=mat), SoilLayer(name="B", thickness=3.0, material=mat)]
+    generate_soil_stratigraphy_callables(layers, 1.0)[0](g_i)
+
+    assert len(server.requests) == 2 # Layers + levels, then materials + head
+    assert len(server.requests[0]) == 2 + 3
+    assert server.requests[0][-1].endswith("2 -5.0")
+    assert server.requests[1] == ["set 'L0.Material' 'Clay'", "set 'L1.Material' 'Clay'", "set 'BH1.Head' -1.0"]
+    assert Listable.reads == 1
+
+
+class CountingMembersServer(MockServerForBatch):
+    """MockServerForBatch that also answers members queries, counting the requests."""
+    class _Connection:
+        def __init__(self):
+            self.members_requests: List[tuple] = []
+
+        def request_members(self, *guids):
+            self.members_requests.append(guids)
+            return {"queries": {guid: {"properties": ["Material", "Head"]} for guid in guids}}
+
+    class _ResultHandler:
+        def handle_members_response(self, members_response, proxy_obj):
+            return {name: f"{proxy_obj._guid}.{name}" for name in members_response["properties"]}
+
+    def __init__(self):
+        super().__init__()
+        self.connection = self._Connection()
+        self.result_handler = self._ResultHandler()
+
+    def get_object_attributes(self, proxy_obj):
+        response = self.connection.request_members(proxy_obj._guid)
+        return self.result_handler.handle_members_response(response["queries"][proxy_obj._guid], proxy_obj)
+
+
+class CountingProxy:
+    """Object proxy that loads its members from the server on first attribute access, like plxscripting's."""
+    def __init__(self, server, guid):
+        self._server, self._guid, self._attr_cache = server, guid, {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if not self._attr_cache:
+            self._attr_cache = self._server.get_object_attributes(self)
+        if name not in self._attr_cache:
+            raise AttributeError(name)
+        return self._attr_cache[name]
+
+
+def test_layer_members_prefetched_in_one_request():
+    server = CountingMembersServer()
+    bh = CountingProxy(server, "BH1")
+    bh.__dict__["SoilLayers"] = [CountingProxy(server, f"L{i}") for i in range(4)]
+    g_i = MockGlobalProxy(server)
+    g_i.borehole = lambda x, y: bh
+    g_i.rename = lambda obj, name: None
+
+    mat = MaterialProperties(Identification="Clay")
+    layers = [SoilLayer(name=f"S{i}", thickness=1.0, material=mat) for i in range(4)]
+    generate_soil_stratigraphy_callables(layers, 1.0)[0](g_i)
+
+    assert server.connection.members_requests == [("L0", "L1", "L2", "L3", "BH1")]
+    assert server.requests[1] == [f"set 'L{i}.Material' 'Clay'" for i in range(4)] + ["set 'BH1.Head' -1.0"]
+
+
+def test_site_layer_members_prefetched_in_one_request():
+    server = CountingMembersServer()
+    bh_proxies = [CountingProxy(server, f"BH{b}") for b in range(3)]
+    for b, proxy in enumerate(bh_proxies):
+        proxy.__dict__["SoilLayers"] = [CountingProxy(server, f"BH{b}_L{i}") for i in range(2)]
+    server.call_and_handle_commands = lambda *commands: server.requests.append(list(commands)) or \
+        (bh_proxies if commands[0].startswith("borehole") else [None] * len(commands))
+
+    mat = MaterialProperties(Identification="Clay")
+    boreholes = [Borehole(name=f"BH{b}", x=float(b), y=0.0, water_table_depth=1.0,
+                          soil_layers=[SoilLayer(name="Top", thickness=2.0, material=mat),
+                                  SoilLayer(name="Bottom", thickness=3.0, material=mat)]) for b in range(3)]
+    generate_multi_borehole_stratigraphy_callables(boreholes, None)[0](MockGlobalProxy(server))
+
+    assert len(server.connection.members_requests) == 1
+    assert len(server.connection.members_requests[0]) == 3 * 2 + 3
+    assert len(server.requests) == 3 # Boreholes, then layers + levels, then materials + heads
+
+
+# --- Tests for depth-dependent (gradient) layers ---
+
+def test_gradient_parameters_mapped_and_reference_level_resolved():
+    clay = MaterialProperties(Identification="NCClay", model_name="MohrCoulomb", cRef=5.0, cInc=1.5, phi=0.0)
+    layers = [SoilLayer(name="Top", thickness=2.0, material=MaterialProperties(Identification="Sand", cRef=1.0)),
+              SoilLayer(name="NC", thickness=20.0, material=clay)]
+    resolved = resolve_depth_reference_levels(layers)
+    assert resolved[0].material.z_ref is None # Not depth dependent
+    assert resolved[1].material.z_ref == -2.0 # Top of its layer
+    assert clay.z_ref is None # Input untouched
+
+    props = build_material_property_map(resolved[1].material, "NCClay")
+    assert (props["cRef"], props["cInc"], props["zRef"]) == (5.0, 1.5, -2.0)
+
+def test_merge_linear_gradient_layers():
+    def layer(name, su, e=None):
+        return SoilLayer(name=name, thickness=1.0, material=MaterialProperties(
+            Identification=name, model_name="MohrCoulomb", cRef=su, phi=0.0, Eref=e))
+    thin = [layer(f"C{i}", 10.0 + 2.0 * (i + 0.5), e=1000.0 * (10.0 + 2.0 * (i + 0.5))) for i in range(10)]
+    stiff = SoilLayer(name="Sand", thickness=5.0, material=MaterialProperties(Identification="Sand", model_name="MohrCoulomb", cRef=1.0, phi=35.0))
+    merged = merge_linear_gradient_layers(thin + [stiff])
+    assert [l.name for l in merged] == ["C0", "Sand"]
+    gradient = merged[0].material
+    assert merged[0].thickness == pytest.approx(10.0)
+    assert (gradient.cRef, gradient.cInc) == (pytest.approx(10.0), pytest.approx(2.0))
+    assert (gradient.Eref, gradient.EInc) == (pytest.approx(10000.0), pytest.approx(2000.0))
+
+    # A step breaks the linear run; short runs stay as they are.
+    stepped = [layer("A", 10.0), layer("B", 12.0), layer("C", 14.0), layer("D", 60.0), layer("E", 61.0)]
+    merged = merge_linear_gradient_layers(stepped)
+    assert [l.name for l in merged] == ["A", "D", "E"]
+    assert merged[0].thickness == 3.0
+
+def test_merge_skips_decreasing_or_negative_gradients():
+    def layer(name, su):
+        return SoilLayer(name=name, thickness=1.0, material=MaterialProperties(
+            Identification=name, model_name="MohrCoulomb", cRef=su, phi=0.0))
+    # Linear, but decreasing with depth (the fit would be cRef=55, cInc=-10).
+    decreasing = [layer("A", 50.0), layer("B", 40.0), layer("C", 30.0), layer("D", 20.0)]
+    assert merge_linear_gradient_layers(decreasing) == decreasing
+
+    # Increasing, but the fit through the first layer is negative at its top (cRef=-5).
+    merged = merge_linear_gradient_layers([layer("A", 0.0), layer("B", 10.0), layer("C", 20.0), layer("D", 30.0)])
+    assert [l.name for l in merged] == ["A", "B"]
+    assert (merged[1].material.cRef, merged[1].material.cInc) == (pytest.approx(5.0), pytest.approx(10.0))
+    assert all((l.material.cInc or 0.0) >= 0.0 and l.material.cRef >= 0.0 for l in merged)
@@ -0,0 +1,164 @@
+"""
+Unit tests for the synthetic PLAXIS server (synthetic_server.py), speaking the
+unencrypted plxscripting protocol over HTTP.
+"""
+import json
+import http.client
+import pytest
+
+from backend.plaxis_interactor import synthetic_server
+from backend.plaxis_interactor.synthetic_server import (
+    SyntheticPlaxis, start_synthetic_instances, parse_command, _Ref, NULL_GUID
+)
+from backend.exceptions import PlaxisConfigurationError
+
+
+def post(port: int, resource: str, action: dict) -> dict:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("POST", f"/{resource}", json.dumps({"action": action}))
+    response = conn.getresponse()
+    assert response.status == 200
+    data = json.loads(response.read())
+    conn.close()
+    return data
+
+
+def commands(port: int, *cmds: str) -> list:
+    return [c["feedback"] for c in post(port, "commands", {"commands": cmds})["commands"]]
+
+
+def named(port: int, name: str) -> dict:
+    return post(port, "namedobjects", {"namedobjects": [name]})["namedobjects"][name]
+
+
+@pytest.fixture
+def plaxis():
+    with SyntheticPlaxis(n_steps=250) as instance:
+        yield instance
+
+
+def test_parse_command():
+    name, args = parse_command('soilmat "Identification" \'Soft "clay"\' "Eref" 5000.0 "nu" 3e-1 '
+                               '{0A-1} (1 -2 3.5) True Plastic')
+    assert name == "soilmat"
+    assert args == ["Identification", 'Soft "clay"', "Eref", 5000.0, "nu", 0.3, _Ref("{0A-1}"),
+                    (1, -2, 3.5), True, "Plastic"]
+    with pytest.raises(ValueError):
+        parse_command("cone (1 2")
+
+
+def test_global_members_and_named_objects(plaxis):
+    members = post(plaxis.input_port, "members", {"members": [""]})["queries"][""]
+    assert {"cone", "soilmat", "borehole", "phase", "calculate", "getresults"} <= set(members["commands"])
+    phases = named(plaxis.input_port, "Phases")
+    assert phases["success"] and phases["returnedobject"]["islistable"]
+    assert not named(plaxis.input_port, "NoSuchObject")["success"]
+    count = post(plaxis.input_port, "list", {"listqueries": [{"guid": phases["returnedobject"]["guid"], "method": "count"}]})
+    assert count["listqueries"][0]["outputdata"] == 1 # The initial phase.
+
+
+def test_builder_commands_build_stratigraphy(plaxis):
+    port = plaxis.input_port
+    material, borehole = commands(port, 'soilmat "Identification" "Clay" "Eref" 5000.0', "borehole 0 0")
+    assert material["success"] and borehole["success"]
+    bh_guid = borehole["returnedobjects"][0]["guid"]
+    feedback = commands(port, f"soillayer {bh_guid} 2.0", f"soillayer {bh_guid} 3.0",
+                        f"setsoillayerlevel {bh_guid} 0 0.0", f"setsoillayerlevel {bh_guid} 1 -2.0",
+                        f"setsoillayerlevel {bh_guid} 2 -5.0", f"rename {bh_guid} \"BH_Main\"")
+    assert all(f["success"] for f in feedback)
+    assert named(port, "BH_Main")["returnedobject"]["guid"] == bh_guid
+    assert named(port, "Clay")["returnedobject"]["guid"] == material["returnedobjects"][0]["guid"]
+
+    # bh.SoilLayers[0:2] goes through the property's guid.
+    layers_ip = post(port, "members", {"members": [bh_guid]})["queries"][bh_guid]["properties"]["SoilLayers"]
+    assert layers_ip["type"] == "Object" and layers_ip["islistable"]
+    sublist = post(port, "list", {"listqueries": [{"guid": layers_ip["guid"], "method": "sublist",
+                                                   "startindex": 0, "stopindex": 2}]})["listqueries"][0]
+    assert len(sublist["outputdata"]) == 2
+    layer_guid = sublist["outputdata"][1]["guid"]
+    material_ip = post(port, "members", {"members": [layer_guid]})["queries"][layer_guid]["properties"]["Material"]
+    assert commands(port, f'set {material_ip["guid"]} "Clay"')[0]["success"]
+    assert not commands(port, f'set {material_ip["guid"]} "Sand"')[0]["success"]
+
+    values = post(port, "propertyvalues", {"propertyvalues": {"owner": layer_guid, "propertyname": "Material",
+                                                              "phaseguid": ""}})
+    assert values["queries"][layer_guid]["properties"]["Material"]["guid"] == material["returnedobjects"][0]["guid"]
+    values = post(port, "propertyvalues", {"propertyvalues": [
+        {"owner": layer_guid, "propertyname": "Thickness", "phaseguid": ""},
+        {"owner": layer_guid, "propertyname": "Top", "phaseguid": ""}]})
+    assert values["queries"] == [{layer_guid: {"extrainfo": "", "success": True, "properties": {"Thickness": 3.0}}},
+                                 {layer_guid: {"extrainfo": "", "success": True, "properties": {"Top": -2.0}}}]
+
+
+def test_unknown_and_invalid_commands_fail(plaxis):
+    unknown, missing_object = commands(plaxis.input_port, "frobnicate 1 2", "rename {DEAD-BEEF} \"x\"")
+    assert not unknown["success"] and "Unknown command" in unknown["extrainfo"]
+    assert not missing_object["success"]
+
+
+def test_phases_and_step_results(plaxis):
+    port = plaxis.input_port
+    initial = named(port, "InitialPhase")["returnedobject"]["guid"]
+    cone = commands(port, "cone 2.0 1.0 (0 0 0) (0 0 -1)")[0]
+    assert len(cone["returnedobjects"]) == 2 # Volume and surface; builders index the result.
+    load = commands(port, "pointload (0 0 0)")[0]
+    phase = commands(port, f"phase {initial}")[0]["returnedobjects"][0]["guid"]
+    assert all(f["success"] for f in commands(
+        port, f'activate {cone["returnedobjects"][0]["guid"]} {phase}',
+        f'activate {load["returnedobjects"][1]["guid"]} {phase}', "mesh 0.06", f"calculate {phase}"))
+
+    result_types = named(plaxis.output_port, "ResultTypes")["returnedobject"]["guid"]
+    rigid_body = post(plaxis.output_port, "propertyvalues", {"propertyvalues": {
+        "owner": result_types, "propertyname": "RigidBody", "phaseguid": ""}})["queries"][result_types]
+    rigid_guid = rigid_body["properties"]["RigidBody"]["guid"]
+    ips = post(plaxis.output_port, "members", {"members": [rigid_guid]})["queries"][rigid_guid]["properties"]
+    uy, fz = commands(plaxis.output_port, f'getresults {phase} {ips["Uy"]["guid"]} "step"',
+                      f'getresults {cone["returnedobjects"][0]["guid"]} {phase} {ips["Fz"]["guid"]} "step"')
+    assert len(uy["returnedvalues"]) == len(fz["returnedvalues"]) == 250
+    assert uy["returnedvalues"][-1] == pytest.approx(-synthetic_server.SYNTHETIC_MAX_DISPLACEMENT)
+    assert fz["returnedvalues"] == sorted(fz["returnedvalues"])
+    assert plaxis.model.command_counts["getresults"] == 2
+    assert plaxis.request_counts["commands"] == 5 # Batched commands are one request.
+
+
+def test_new_resets_model(plaxis):
+    commands(plaxis.input_port, "borehole 0 0")
+    post(plaxis.input_port, "environment", {"name": "new", "filename": ""})
+    assert not named(plaxis.input_port, "Borehole_1")["success"]
+    project = named(plaxis.input_port, "Project")["returnedobject"]["guid"]
+    title = post(plaxis.input_port, "propertyvalues", {"propertyvalues": {"owner": project, "propertyname": "Title"}})
+    assert title["queries"][project]["properties"]["Title"] == "Synthetic project"
+    empty = post(plaxis.input_port, "propertyvalues", {"propertyvalues": {"owner": NULL_GUID, "propertyname": "x"}})
+    assert not empty["queries"][NULL_GUID]["success"]
+
+
+def test_instances_are_independent():
+    instances = start_synthetic_instances(3, n_steps=10)
+    try:
+        ports = {p for i in instances for p in (i.input_port, i.output_port)}
+        assert len(ports) == 6
+        commands(instances[0].input_port, "borehole 0 0")
+        assert named(instances[0].input_port, "Borehole_1")["success"]
+        assert not named(instances[1].input_port, "Borehole_1")["success"]
+    finally:
+        for instance in instances:
+            instance.stop()
+
+
+def test_unsupported_resource_and_bad_payload(plaxis):
+    conn = http.client.HTTPConnection("127.0.0.1", plaxis.input_port, timeout=5)
+    conn.request("POST", "/tokenizer", json.dumps({"action": {"tokenize": ["x"]}}))
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 404
+    conn.request("POST", "/members", "not json")
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 400
+    conn.close()
+
+
+@pytest.mark.skipif(synthetic_server.Blowfish is not None, reason="pycryptodome is installed")
+def test_password_requires_pycryptodome():
+    with pytest.raises(PlaxisConfigurationError):
+        SyntheticPlaxis(password="secret")
@@ -0,0 +1,102 @@
+"""
+Unit tests for the process-isolated analysis runner (analysis_process.py), with fake
+pipelines instead of PLAXIS.
+"""
+import time
+import logging
+import multiprocessing
+import pytest
+
+from backend.models import ProjectSettings, AnalysisResults
+from backend.exceptions import PlaxisCalculationError
+from backend.analysis_process import AnalysisProcess, AnalysisEvents, describe_analysis_error
+
+# Fake pipelines are defined in this test module, which a spawned child could not import.
+fork_only = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+
+
+def _process(pipeline) -> AnalysisProcess:
+    return AnalysisProcess(None, ProjectSettings(project_name="Proc"), pipeline=pipeline,
+                           context=multiprocessing.get_context("fork"))
+
+
+def successful_pipeline(plaxis_path, settings, events: AnalysisEvents, tracer):
+    events.stage("setup_start")
+    events.progress(1, 2)
+    events.live_curve_points([(0.1, 10.0), (0.2, 20.0)])
+    logging.getLogger("backend.fake_pipeline").warning(f"Running {settings.project_name} in the child.")
+    return AnalysisResults(peak_vertical_resistance=20.0)
+
+
+def failing_pipeline(plaxis_path, settings, events, tracer):
+    events.stage("calculation_start")
+    raise PlaxisCalculationError("Soil body seems to collapse")
+
+
+class FakeInteractor:
+    def __init__(self):
+        self.stopped = False
+
+    def attempt_stop_calculation(self):
+        self.stopped = True
+
+
+def cooperative_pipeline(plaxis_path, settings, events, tracer):
+    interactor = FakeInteractor()
+    events.interactor_created(interactor)
+    events.stage("calculation_start")
+    while not interactor.stopped:
+        time.sleep(0.01)
+    return None if events.cancelled() else AnalysisResults()
+
+
+def hung_pipeline(plaxis_path, settings, events, tracer):
+    events.stage("calculation_start")
+    time.sleep(60) # A request that never returns and ignores the stop request.
+
+
+def crashing_pipeline(plaxis_path, settings, events, tracer):
+    import os
+    os._exit(3)
+
+
+@fork_only
+def test_streams_events_logs_and_results(caplog):
+    with caplog.at_level(logging.WARNING, logger="backend.fake_pipeline"):
+        events = list(_process(successful_pipeline).start().events())
+    assert events[:3] == [("stage", "setup_start"), ("progress", 1, 2), ("curve", [(0.1, 10.0), (0.2, 20.0)])]
+    assert events[-1][0] == "finished" and events[-1][1].peak_vertical_resistance == 20.0
+    assert "Running Proc in the child." in caplog.text # Re-emitted to the parent's loggers.
+
+
+@fork_only
+def test_errors_are_described_for_the_user():
+    events = list(_process(failing_pipeline).start().events())
+    assert events[-1] == ("error",) + describe_analysis_error(PlaxisCalculationError("Soil body seems to collapse"))
+    assert events[-1][1] == "PLAXIS Calculation Error"
+    crashed = list(_process(crashing_pipeline).start().events())
+    assert crashed[-1][0] == "error" and "exit code 3" in crashed[-1][2]
+
+
+@fork_only
+def test_stop_request_reaches_the_interactor():
+    process = _process(cooperative_pipeline).start()
+    events = process.events()
+    assert next(events) == ("stage", "calculation_start")
+    process.request_stop(grace_s=10.0)
+    assert list(events) == [("cancelled",)]
+    assert not process.killed
+    process.close()
+
+
+@fork_only
+def test_hung_analysis_is_killed_after_grace_period():
+    process = _process(hung_pipeline).start()
+    events = process.events()
+    assert next(events) == ("stage", "calculation_start")
+    started = time.monotonic()
+    process.request_stop(grace_s=0.2)
+    assert list(events) == [("cancelled",)]
+    assert time.monotonic() - started < 5.0
+    assert process.killed and not process.is_alive()
+    process.close()
@@ -0,0 +1,144 @@
+"""
+Unit tests for CPT import and layer lumping (cpt_importer.py).
+"""
+import pytest
+
+from backend import cpt_importer
+from backend.exceptions import ProjectValidationError
+from backend.cpt_importer import (
+    read_cpt_profile, derive_strength_profile, lump_profile, import_cpt_stratigraphy, cpt_to_borehole, CPTProfile
+)
+
+
+def _write_two_layer_csv(path, step_depth: float = 8.0):
+    """su ~ 20 kPa above `step_depth` and ~ 60 kPa below (gamma 18, Nkt 15, no u2)."""
+    lines = ["# Synthetic CPT", "Depth (m),qc (kPa),fs (kPa)"]
+    for k in range(1, 1601):
+        z = k * 0.01
+        su = 20.0 if z < step_depth - 0.005 else 60.0
+        lines.append(f"{z:.2f},{15.0 * su + 18.0 * z:.3f},{10.0}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_read_csv_with_header_units(tmp_path):
+    path = tmp_path / "cpt.csv"
+    path.write_text("Depth (m),qc (MPa),u2 (kPa)\n0.5,1.2,30\n1.0,,40\n0.2,0.8,10\n")
+    profile = read_cpt_profile(str(path))
+    assert profile.name == "cpt"
+    assert profile.depth == [0.2, 0.5] # Sorted; row with missing qc skipped
+    assert profile.qc == [800.0, 1200.0]
+    assert profile.u2 == [10.0, 30.0]
+    assert profile.fs == [None, None]
+
+
+def test_read_ags_scpt_group_first_location(tmp_path):
+    path = tmp_path / "site.ags"
+    path.write_text(
+        '"GROUP","PROJ"\n"HEADING","PROJ_ID"\n"DATA","P1"\n\n'
+        '"GROUP","SCPT"\n'
+        '"HEADING","LOCA_ID","SCPG_TESN","SCPT_DPTH","SCPT_RES","SCPT_FRES","SCPT_PWP2"\n'
+        '"UNIT","","","m","MPa","kPa","kPa"\n'
+        '"TYPE","ID","X","2DP","2DP","0DP","0DP"\n'
+        '"DATA","CPT01","1","0.50","1.00","12","40"\n'
+        '"DATA","CPT02","1","0.50","9.00","12","40"\n'
+        '"DATA","CPT01","1","1.00","1.50","15","55"\n')
+    profile = read_cpt_profile(str(path))
+    assert profile.name == "CPT01"
+    assert profile.qc == [1000.0, 1500.0]
+    assert read_cpt_profile(str(path), location="CPT02").qc == [9000.0]
+
+
+def test_read_errors(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("a,b\n1,2\n")
+    with pytest.raises(ProjectValidationError, match="depth and qc"):
+        read_cpt_profile(str(path))
+    with pytest.raises(ProjectValidationError):
+        read_cpt_profile(str(tmp_path / "missing.csv"))
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend_mode(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(cpt_importer, "np", None)
+    elif cpt_importer.np is None:
+        pytest.skip("numpy not installed")
+    return request.param
+
+
+def test_derive_su_and_phi(backend_mode):
+    profile = CPTProfile(depth=[1.0, 2.0], qc=[318.0, 336.0], fs=[None, None], u2=[0.0, 0.0])
+    depths, su = derive_strength_profile(profile, "su", gamma=18.0, nkt=15.0)
+    assert su == pytest.approx([20.0, 20.0])
+    depths, phi = derive_strength_profile(CPTProfile(depth=[5.0], qc=[10000.0], u2=[0.0]), "phi",
+                                          gamma=30.0, water_table_depth=0.0)
+    assert phi[0] == pytest.approx(17.6 + 11.0 * 2.0) # qt/pa = 100, sigma'v = pa
+    with pytest.raises(ProjectValidationError):
+        derive_strength_profile(profile, "E")
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    if cpt_importer.np is None:
+        pytest.skip("numpy not installed")
+    profile = CPTProfile(depth=[0.5 * k for k in range(1, 41)], qc=[300.0 + 40.0 * k + (k % 3) * 25.0 for k in range(1, 41)],
+                         u2=[None if k % 5 == 0 else 2.0 * k for k in range(1, 41)])
+    def run():
+        derived = {parameter: derive_strength_profile(profile, parameter, gamma=17.0, water_table_depth=3.0)
+                   for parameter in ("su", "phi")}
+        lumped = lump_profile(*derived["su"], tolerance=0.02)
+        return derived, [(layer.top, layer.bottom, layer.value) for layer in lumped]
+    with_numpy = run()
+    monkeypatch.setattr(cpt_importer, "np", None)
+    without_numpy = run()
+    for parameter in ("su", "phi"):
+        assert without_numpy[0][parameter][0] == pytest.approx(with_numpy[0][parameter][0])
+        assert without_numpy[0][parameter][1] == pytest.approx(with_numpy[0][parameter][1])
+    assert without_numpy[1] == pytest.approx(with_numpy[1])
+
+
+def test_lump_profile_finds_step_and_respects_limits(backend_mode):
+    depths = [k * 0.1 for k in range(1, 201)]
+    values = [20.0 if z < 7.95 else 60.0 for z in depths]
+    layers = lump_profile(depths, values, tolerance=0.01)
+    assert len(layers) == 2
+    assert layers[0].top == 0.0 and layers[0].bottom == pytest.approx(8.0, abs=0.5)
+    assert layers[1].bottom == pytest.approx(20.0)
+    assert [round(l.value) for l in layers] == [20, 60]
+
+    assert len(lump_profile(depths, values, tolerance=1.0)) == 1 # Loose tolerance -> one layer
+    linear = [float(z) for z in depths]
+    assert len(lump_profile(depths, linear, tolerance=0.0, max_layers=5)) == 5
+
+
+def test_import_stratigraphy_and_borehole(tmp_path, backend_mode):
+    path = tmp_path / "CPT7.csv"
+    _write_two_layer_csv(path)
+    layers = import_cpt_stratigraphy(str(path), "su", tolerance=0.02, qc_unit="kPa")
+    assert [l.name for l in layers] == ["CPT7_L1", "CPT7_L2"]
+    assert sum(l.thickness for l in layers) == pytest.approx(16.0)
+    assert layers[0].material.cRef == pytest.approx(20.0, rel=0.01)
+    assert layers[1].material.phi == 0.0
+
+    borehole = cpt_to_borehole(str(path), x=5.0, y=-3.0, parameter="su", tolerance=0.02)
+    assert (borehole.name, borehole.x, borehole.y, len(borehole.soil_layers)) == ("CPT7", 5.0, -3.0, 2)
+    assert borehole.water_table_depth == 0.0 # The water table the strengths were derived with
+    deep_water = cpt_to_borehole(str(path), parameter="phi", water_table_depth=2.0, qc_unit="kPa")
+    derived_with = import_cpt_stratigraphy(str(path), "phi", water_table_depth=2.0, qc_unit="kPa")
+    assert deep_water.water_table_depth == 2.0
+    assert [l.material.phi for l in deep_water.soil_layers] == [l.material.phi for l in derived_with]
+
+
+def test_import_merges_linear_su_profile_into_gradient_layer(tmp_path):
+    path = tmp_path / "NC.csv"
+    lines = ["Depth (m),qc (kPa)"] + [f"{k * 0.01:.2f},{15.0 * (10.0 + 2.0 * k * 0.01) + 18.0 * k * 0.01:.3f}"
+                                      for k in range(1, 2001)]
+    path.write_text("\n".join(lines) + "\n")
+    stepped = import_cpt_stratigraphy(str(path), "su", tolerance=0.05, qc_unit="kPa", merge_gradients=False)
+    assert len(stepped) >= 3
+
+    layers = import_cpt_stratigraphy(str(path), "su", tolerance=0.05, qc_unit="kPa")
+    assert [l.name for l in layers] == ["NC_L1"]
+    assert layers[0].thickness == pytest.approx(20.0)
+    material = layers[0].material
+    assert (material.cRef, material.cInc) == (pytest.approx(10.0, abs=0.5), pytest.approx(2.0, rel=0.05))
+    assert material.Identification == "NC_L1_su10_inc"
@@ -0,0 +1,71 @@
+"""
+Unit tests for multi-curve envelopes (curve_comparison.py).
+"""
+import math
+import pytest
+
+from backend import curve_comparison
+from backend.curve_comparison import compare_curves, compute_envelopes, peak_vs_parameter, resample_curves, store_envelopes
+from backend.models import AnalysisResults
+from backend.result_store import ResultStore, StoredCase
+
+
+def _curves():
+    return {
+        "a": ([0.0, 1.0, 2.0], [0.0, 10.0, 20.0]),
+        "b": ([0.0, 1.0, 2.0, 4.0], [0.0, 30.0, 60.0, 120.0]),
+        "c": ([2.0, 0.0, 1.0], [40.0, 0.0, 20.0]), # Unsorted input
+        "empty": ([], []),
+    }
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend_mode(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(curve_comparison, "np", None)
+    elif curve_comparison.np is None:
+        pytest.skip("numpy not installed")
+    return request.param
+
+
+def test_envelopes_on_common_grid(backend_mode):
+    result = compare_curves(_curves(), n_points=5, percentiles=(50.0,))
+    assert result.case_ids == ["a", "b", "c"]
+    assert result.grid == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert result.counts == [3, 3, 3, 1, 1] # Only 'b' reaches beyond 2 m
+    assert result.envelopes["min"][:3] == [0.0, 10.0, 20.0]
+    assert result.envelopes["max"] == pytest.approx([0.0, 30.0, 60.0, 90.0, 120.0])
+    assert result.envelopes["p50"][2] == pytest.approx(40.0)
+    assert result.envelopes["mean"][1] == pytest.approx(20.0)
+
+
+def test_resample_and_all_nan_columns(backend_mode):
+    rows = resample_curves([([1.0, 2.0], [5.0, 7.0])], [0.0, 1.5, 3.0])
+    assert math.isnan(rows[0][0]) and rows[0][1] == pytest.approx(6.0) and math.isnan(rows[0][2])
+    envelopes, counts = compute_envelopes(rows, percentiles=(90.0,))
+    assert counts == [0, 1, 0]
+    assert math.isnan(envelopes["p90"][0]) and envelopes["p90"][1] == pytest.approx(6.0)
+
+
+def test_store_envelopes_cover_every_case_beyond_the_cache(tmp_path, backend_mode):
+    store = ResultStore(str(tmp_path), cache_size=1)
+    for case_id, (penetrations, loads) in _curves().items():
+        curve = [{'penetration': p, 'load': l} for p, l in zip(penetrations, loads)]
+        store.add(case_id, AnalysisResults(load_penetration_curve_data=curve), save_index=False)
+    store.load_curve("a")
+
+    result = store_envelopes(store, n_points=5, percentiles=(50.0,))
+    expected = compare_curves(_curves(), n_points=5, percentiles=(50.0,))
+    assert result.case_ids == ["a", "b", "c"]
+    assert (result.grid, result.counts) == (expected.grid, expected.counts)
+    assert result.envelopes["max"] == pytest.approx(expected.envelopes["max"])
+    assert result.envelopes["p50"][:3] == pytest.approx(expected.envelopes["p50"][:3])
+    assert list(store._curve_cache) == ["a"] # Streaming does not evict the browsed curves.
+
+
+def test_peak_vs_parameter_uses_index_only():
+    cases = [StoredCase("x", {"su": 30.0}, peak_vertical_resistance=300.0),
+             StoredCase("y", {"su": 20.0}, peak_vertical_resistance=200.0),
+             StoredCase("z", {"phi": 30.0}, peak_vertical_resistance=500.0),
+             StoredCase("w", {"su": 25.0})]
+    assert peak_vs_parameter(cases, "su") == ([20.0, 30.0], [200.0, 300.0], ["y", "x"])
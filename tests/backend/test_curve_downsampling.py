@@ -0,0 +1,48 @@
+"""
+Unit tests for curve extraction and plot downsampling (curve_downsampling.py).
+"""
+import math
+import pytest
+
+from backend.curve_downsampling import (
+    extract_curve_columns, lttb_downsample, minmax_downsample, downsample_curve
+)
+
+
+def _curve(n: int):
+    x = [i * 0.001 for i in range(n)]
+    y = [1000.0 * math.sin(v) + (5000.0 if i == n // 3 else 0.0) for i, v in enumerate(x)] # One spike
+    return x, y
+
+
+def test_extract_curve_columns_skips_malformed_points():
+    data = [{'penetration': 0.1, 'load': 10}, {'penetration': None, 'load': 5}, "bad", {'penetration': 0.2, 'load': 20.5}]
+    assert extract_curve_columns(data) == ([0.1, 0.2], [10.0, 20.5])
+    assert extract_curve_columns(None) == ([], [])
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x, y = _curve(50000)
+    dx, dy = lttb_downsample(x, y, 1000)
+    assert len(dx) == len(dy) == 1000
+    assert (dx[0], dx[-1]) == (x[0], x[-1])
+    assert dx == sorted(dx)
+    assert max(dy) == max(y) # The spike survives
+    assert lttb_downsample(x[:10], y[:10], 1000) == (x[:10], y[:10])
+
+
+def test_minmax_keeps_extremes():
+    x, y = _curve(50000)
+    dx, dy = minmax_downsample(x, y, 500)
+    assert len(dx) <= 500
+    assert max(dy) == max(y) and min(dy) == min(y)
+    assert dx == sorted(dx)
+
+
+def test_downsample_curve_validates_input():
+    with pytest.raises(ValueError):
+        downsample_curve([1.0, 2.0], [1.0], 10)
+    with pytest.raises(ValueError):
+        downsample_curve([1.0], [1.0], 10, method="random")
+    x, y = _curve(10000)
+    assert len(downsample_curve(x, y, 300, method="minmax")[0]) <= 300
@@ -0,0 +1,46 @@
+"""
+Start-up import time benchmark (import_profile.py).
+
+The budgets are generous wall-clock limits for a cold interpreter; override them with
+STARTUP_IMPORT_BUDGET_MS on slow CI machines. The breakdown is printed on failure.
+"""
+import os
+import importlib.util
+import pytest
+
+from backend.import_profile import parse_importtime, measure_import_time, DEFERRED_STARTUP_PACKAGES
+
+BACKEND_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 1500))
+MAIN_WINDOW_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 4000))
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       241 |        241 |     _typing
+import time:      5077 |       5317 |   typing
+import time:      9094 |       9094 |   src.backend.models
+import time:      3466 |      17877 | src.backend.plaxis_interactor.mesh_cache
+Traceback line that is not importtime output
+"""
+
+
+def test_parse_importtime():
+    report = parse_importtime(SAMPLE)
+    assert report.modules() == ["_typing", "typing", "src.backend.models", "src.backend.plaxis_interactor.mesh_cache"]
+    assert [r.depth for r in report.records] == [2, 1, 1, 0]
+    assert report.total_us == 241 + 5077 + 9094 + 3466
+    assert report.cumulative_us("src.backend.plaxis_interactor.mesh_cache") == 17877
+    assert list(report.by_package()) == ["src", "typing", "_typing"]
+    assert report.imported("src.backend") and not report.imported("src.back")
+
+
+def test_backend_startup_imports_within_budget():
+    report = measure_import_time("src.backend.plaxis_interactor.mesh_cache")
+    assert not [p for p in DEFERRED_STARTUP_PACKAGES if report.imported(p)], report.format()
+    assert report.total_us / 1000.0 < BACKEND_BUDGET_MS, report.format()
+
+
+@pytest.mark.skipif(importlib.util.find_spec("PySide6") is None, reason="PySide6 not installed")
+def test_main_window_defers_plotting_and_plaxis_imports():
+    report = measure_import_time("src.frontend.main_window")
+    eager = [p for p in DEFERRED_STARTUP_PACKAGES if report.imported(p)]
+    assert not eager, f"Eagerly imported: {eager}\n{report.format()}"
+    assert report.total_us / 1000.0 < MAIN_WINDOW_BUDGET_MS, report.format()
@@ -0,0 +1,207 @@
+"""
+Unit tests for the PLAXIS job scheduler (job_scheduler.py), with a fake runner instead of PLAXIS.
+"""
+import sqlite3
+import functools
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.models import ProjectSettings, AnalysisResults, SpudcanGeometry, SoilLayer, MaterialProperties
+from backend.exceptions import PlaxisCalculationError, ProjectValidationError
+from backend.job_scheduler import (
+    JobScheduler, PlaxisInstance, SchedulerAPIServer, SchedulerClient, Job, fair_share_order, parse_instance,
+    QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED
+)
+
+
+class FakeInteractor:
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def attempt_stop_calculation(self):
+        self.stopped.set()
+
+
+class FakeRunner:
+    """Blocks each run until released (or stopped via the interactor) and records the ports used."""
+    def __init__(self):
+        self.release = {}
+        self.ports = {}
+        self.lock = threading.Lock()
+
+    def gate(self, project_name: str) -> threading.Event:
+        with self.lock:
+            return self.release.setdefault(project_name, threading.Event())
+
+    def __call__(self, settings: ProjectSettings, on_interactor, should_stop) -> AnalysisResults:
+        interactor = FakeInteractor()
+        on_interactor(interactor)
+        self.ports[settings.project_name] = (settings.plaxis_api_input_port, settings.plaxis_api_output_port)
+        gate = self.gate(settings.project_name)
+        while not gate.wait(0.01):
+            if interactor.stopped.is_set():
+                raise PlaxisCalculationError("Calculation stopped by user.")
+        if settings.project_name.startswith("fail"):
+            raise PlaxisCalculationError("Soil body seems to collapse")
+        curve = [{"penetration": 0.1 * i, "load": 100.0 * i} for i in range(5)]
+        return AnalysisResults(peak_vertical_resistance=400.0, final_penetration_depth=0.4,
+                               load_penetration_curve_data=curve)
+
+
+def _scheduler(tmp_path, runner, n_instances=1, **kwargs) -> JobScheduler:
+    instances = [PlaxisInstance(f"plx{i}", 10000 + 2 * i, 10001 + 2 * i) for i in range(n_instances)]
+    return JobScheduler(str(tmp_path / "jobs.sqlite"), instances, runner=runner, **kwargs)
+
+
+def _submit(scheduler, name, owner="alice", priority=0, preemptible=False) -> Job:
+    return scheduler.submit(ProjectSettings(project_name=name), owner, priority, preemptible)
+
+
+def test_fair_share_order_and_instance_spec():
+    jobs = [Job("a1", "alice", 0, submitted_at=1.0), Job("b1", "bob", 0, submitted_at=2.0),
+            Job("c1", "carol", 5, submitted_at=3.0), Job("a2", "alice", 0, submitted_at=0.5)]
+    order = fair_share_order(jobs, {"alice": 1}, {"bob": 100.0})
+    assert [j.job_id for j in order] == ["c1", "b1", "a2", "a1"]
+    assert fair_share_order(jobs[:2], {}, {"alice": 10.0})[0].job_id == "b1"
+    assert parse_instance("lic2=10002:10003") == PlaxisInstance("lic2", 10002, 10003)
+    assert parse_instance("10000:10001").name == "plaxis-10000"
+
+
+def test_runs_jobs_records_results_and_failures(tmp_path):
+    runner = FakeRunner()
+    scheduler = _scheduler(tmp_path, runner, n_instances=2)
+    ok, failing = _submit(scheduler, "ok"), _submit(scheduler, "fail-1", owner="bob")
+    assert sorted(scheduler.dispatch()) == sorted([ok.job_id, failing.job_id])
+    assert scheduler.get(ok.job_id).state == RUNNING
+    runner.gate("ok").set()
+    runner.gate("fail-1").set()
+    assert scheduler.wait_idle(5.0)
+    done = scheduler.get(ok.job_id)
+    assert done.state == SUCCEEDED and done.peak_vertical_resistance == 400.0
+    assert ok.job_id in scheduler.results
+    assert scheduler.get(failing.job_id).state == FAILED
+    assert "collapse" in scheduler.get(failing.job_id).error
+    assert set(runner.ports.values()) == {(10000, 10001), (10002, 10003)}
+    assert set(scheduler.owner_usage()) == {"alice", "bob"}
+    scheduler.stop()
+
+
+def test_preempts_low_priority_sweep_and_requeues_it(tmp_path):
+    runner = FakeRunner()
+    scheduler = _scheduler(tmp_path, runner, preemption_margin=10)
+    sweep = _submit(scheduler, "sweep", owner="bob", priority=0, preemptible=True)
+    scheduler.dispatch()
+    normal = _submit(scheduler, "normal", priority=5)
+    assert scheduler.dispatch() == [] # Not enough of a priority difference.
+    urgent = _submit(scheduler, "urgent", priority=20)
+    assert scheduler.dispatch() == []
+    assert scheduler.wait_idle(5.0)
+    requeued = scheduler.get(sweep.job_id)
+    assert requeued.state == QUEUED and requeued.preemptions == 1
+    assert scheduler.dispatch() == [urgent.job_id]
+    runner.gate("urgent").set()
+    assert scheduler.wait_idle(5.0)
+    assert scheduler.dispatch() == [normal.job_id] # Priority before the requeued sweep.
+    runner.gate("normal").set()
+    runner.gate("sweep").set()
+    assert scheduler.wait_idle(5.0)
+    scheduler.dispatch()
+    assert scheduler.wait_idle(5.0)
+    assert [scheduler.get(j.job_id).state for j in (sweep, normal, urgent)] == [SUCCEEDED] * 3
+    scheduler.stop()
+
+
+class SetupInteractor:
+    """Stands in for PlaxisInteractor: not connected (no g_i) and pausing between setup commands."""
+    between_commands = threading.Event()
+    resume = threading.Event()
+    calculated = False
+
+    def __init__(self, plaxis_path, settings):
+        self.g_i = None
+
+    def attempt_stop_calculation(self):
+        pass # Nothing to break before the calculation runs.
+
+    def setup_model_in_plaxis(self, callables, is_new_project=True):
+        for func in callables:
+            func(MagicMock())
+            self.between_commands.set()
+            assert self.resume.wait(5.0)
+
+    def run_calculation(self, callables):
+        SetupInteractor.calculated = True
+
+    def extract_results(self, commands):
+        return []
+
+    def close_all_connections(self):
+        pass
+
+
+def test_preempts_job_during_model_setup(tmp_path):
+    from backend.plaxis_interactor.mesh_convergence import run_interactor_analysis
+    SetupInteractor.between_commands.clear()
+    SetupInteractor.resume.clear()
+    with patch("backend.plaxis_interactor.interactor.PlaxisInteractor", SetupInteractor):
+        scheduler = _scheduler(tmp_path, functools.partial(run_interactor_analysis, None), preemption_margin=10)
+        settings = ProjectSettings(project_name="sweep", spudcan=SpudcanGeometry(diameter=6.0, height_cone_angle=30.0),
+                                   soil_stratigraphy=[SoilLayer("Clay", 20.0, MaterialProperties(Identification="Clay"))])
+        sweep = scheduler.submit(settings, "bob", 0, preemptible=True)
+        scheduler.dispatch()
+        assert SetupInteractor.between_commands.wait(5.0)
+        _submit(scheduler, "urgent", priority=20)
+        assert scheduler.dispatch() == [] # Preempts the sweep, whose break request reaches nothing.
+        SetupInteractor.resume.set()
+        assert scheduler.wait_idle(5.0)
+        requeued = scheduler.get(sweep.job_id)
+        assert requeued.state == QUEUED and requeued.preemptions == 1
+        assert not SetupInteractor.calculated
+        scheduler.stop()
+
+
+def test_cancel_and_restart_recovery(tmp_path):
+    runner = FakeRunner()
+    scheduler = _scheduler(tmp_path, runner)
+    running, queued = _submit(scheduler, "first"), _submit(scheduler, "second")
+    scheduler.dispatch()
+    assert scheduler.cancel(queued.job_id).state == CANCELLED
+    scheduler.cancel(running.job_id)
+    assert scheduler.wait_idle(5.0)
+    assert scheduler.get(running.job_id).state == CANCELLED
+    with pytest.raises(KeyError):
+        scheduler.cancel("nope")
+
+    interrupted = _submit(scheduler, "interrupted")
+    scheduler.stop()
+    with sqlite3.connect(scheduler.db_path) as db: # As left by a daemon that died mid-run.
+        db.execute("UPDATE jobs SET state = 'running', instance = 'plx0' WHERE job_id = ?", (interrupted.job_id,))
+        db.execute("INSERT INTO runs (job_id, owner, instance, started_at) VALUES (?, 'alice', 'plx0', 1.0)",
+                   (interrupted.job_id,))
+    reopened = _scheduler(tmp_path, FakeRunner())
+    assert reopened.get(interrupted.job_id).state == QUEUED
+    assert reopened.owner_usage()["alice"] < 60.0 # The interrupted run (of unknown length) is not charged.
+    reopened.stop()
+
+
+def test_http_api_round_trip(tmp_path):
+    runner = FakeRunner()
+    with _scheduler(tmp_path, runner, poll_interval_s=0.05) as scheduler, \
+            SchedulerAPIServer(scheduler, port=0) as api:
+        client = SchedulerClient(f"http://127.0.0.1:{api.port}")
+        job = client.submit(ProjectSettings(project_name="via-api"), owner="carol", priority=3)
+        assert job.owner == "carol" and job.project_name == "via-api"
+        runner.gate("via-api").set()
+        for _ in range(500):
+            if client.job(job.job_id).state == SUCCEEDED:
+                break
+            threading.Event().wait(0.01)
+        assert client.job(job.job_id).state == SUCCEEDED
+        assert [j.job_id for j in client.jobs(state=SUCCEEDED, owner="carol")] == [job.job_id]
+        status = client.status()
+        assert status["jobs"][SUCCEEDED] == 1 and status["instances"][0]["job_id"] is None
+        with pytest.raises(KeyError):
+            client.job("missing")
+        with pytest.raises(ProjectValidationError):
+            client._request("/jobs", {"owner": "carol"})
@@ -0,0 +1,63 @@
+"""
+Unit tests for the queued logging setup (logger_config.py).
+"""
+import logging
+import logging.handlers
+import pytest
+
+from backend import logger_config
+from backend.logger_config import setup_logging, shutdown_logging, parse_module_levels, measure_logging_overhead
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+    logging.getLogger("test_logger_config.quiet").setLevel(logging.NOTSET)
+
+
+def test_queued_setup_writes_file_from_listener_thread(tmp_path, restore_logging, monkeypatch):
+    monkeypatch.setenv(logger_config.LOG_LEVELS_ENV_VAR, "test_logger_config.quiet=ERROR")
+    log_file = tmp_path / "app.log"
+    setup_logging(logging.DEBUG, log_to_console=False, log_file_path=str(log_file))
+
+    root = logging.getLogger()
+    assert [type(h) for h in root.handlers] == [logging.handlers.QueueHandler]
+    logging.getLogger("test_logger_config.loud").debug("step %d of %d", 3, 7)
+    logging.getLogger("test_logger_config.quiet.child").warning("suppressed")
+    shutdown_logging() # Drains the queue
+
+    text = log_file.read_text(encoding="utf-8")
+    assert "step 3 of 7" in text
+    assert "test_logger_config.test_queued_setup_writes_file_from_listener_thread:" in text # module.funcName:lineno
+    assert "suppressed" not in text
+
+
+def test_parse_module_levels():
+    assert parse_module_levels(" a.b=debug, c=WARNING,") == {"a.b": "DEBUG", "c": "WARNING"}
+    with pytest.raises(ValueError):
+        parse_module_levels("a.b")
+    with pytest.raises(ValueError):
+        parse_module_levels("a.b=LOUD")
+
+
+def test_measure_logging_overhead_leaves_app_logging_running(tmp_path, restore_logging):
+    log_file = tmp_path / "app.log"
+    setup_logging(logging.DEBUG, log_to_console=False, log_file_path=str(log_file))
+    root = logging.getLogger()
+    handlers_before, listener_before = list(root.handlers), logger_config._queue_listener
+
+    results = measure_logging_overhead(n_calls=200)
+    assert set(results) == {"direct_us_per_call", "queued_us_per_call"}
+    assert all(value > 0 for value in results.values())
+    assert root.handlers == handlers_before
+    assert logger_config._queue_listener is listener_before and listener_before._thread is not None
+
+    logging.getLogger("test_logger_config").info("after benchmark")
+    shutdown_logging()
+    text = log_file.read_text(encoding="utf-8")
+    assert "after benchmark" in text and "Executing API command" not in text
@@ -0,0 +1,55 @@
+"""
+Unit tests for the material library (material_library.py).
+"""
+import json
+import dataclasses
+import pytest
+
+from backend.models import MaterialProperties, SoilLayer
+from backend.exceptions import ProjectValidationError
+from backend.material_library import MaterialLibrary, compute_material_hash, load_project_material_library
+
+
+def _clay(name: str = "Clay", cu: float = 20.0) -> MaterialProperties:
+    return MaterialProperties(model_name="MohrCoulomb", Identification=name, cRef=cu, phi=0.0, other_params={"cInc": 1.5})
+
+
+def test_hash_ignores_name_and_unset_parameters():
+    assert compute_material_hash(_clay("A")) == compute_material_hash(_clay("B"))
+    with_none = dataclasses.replace(_clay(), other_params={"cInc": 1.5, "unused": None})
+    assert compute_material_hash(with_none) == compute_material_hash(_clay())
+    assert compute_material_hash(_clay(cu=21.0)) != compute_material_hash(_clay())
+
+
+def test_assign_layers_deduplicates_and_renames_conflicts():
+    layers = [SoilLayer("L1", 2.0, _clay("Clay")), SoilLayer("L2", 3.0, _clay("Clay copy")),
+              SoilLayer("L3", 4.0, _clay("Clay", cu=60.0))]
+    library = MaterialLibrary()
+    assigned = library.assign_layers(layers)
+    assert [l.material.Identification for l in assigned] == ["Clay", "Clay", "Clay_2"]
+    assert len(library) == 2
+    assert len(library.unique_materials(assigned)) == 2
+    assert layers[1].material.Identification == "Clay copy" # Inputs untouched
+
+
+def test_save_load_round_trip_and_version(tmp_path):
+    library = MaterialLibrary()
+    library.add(_clay())
+    library.add(_clay("Stiff", cu=80.0), description="Stiff clay")
+    path = str(tmp_path / "lib" / "materials.json")
+    library.save(path)
+
+    loaded = load_project_material_library(path)
+    assert loaded.version == library.version == 2
+    assert loaded.names() == ["Clay", "Stiff"]
+    assert loaded.get("Stiff").description == "Stiff clay"
+    assert loaded.add(_clay("Another name")) == "Clay" # Shared names stay consistent across projects
+
+    with open(path) as f:
+        data = json.load(f)
+    data["format_version"] = 99
+    with open(path, "w") as f:
+        json.dump(data, f)
+    with pytest.raises(ProjectValidationError):
+        MaterialLibrary.load(path)
+    assert len(load_project_material_library(str(tmp_path / "missing.json"))) == 0
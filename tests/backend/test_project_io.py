@@ -9,9 +9,11 @@ from tempfile import NamedTemporaryFile
 # Corrected imports based on models.py structure
 from src.backend.models import (
     ProjectSettings, SpudcanGeometry, SoilLayer, MaterialProperties,
-    LoadingConditions, AnalysisControlParameters # Changed AnalysisSettings to AnalysisControlParameters
+    LoadingConditions, AnalysisControlParameters, # Changed AnalysisSettings to AnalysisControlParameters
+    SpudcanLeg, Borehole
 )
 from src.backend.project_io import save_project, load_project # Corrected function names
+from src.backend.plaxis_interactor.model_setup import generate_model_setup_callables
 
 class TestProjectIO(unittest.TestCase):
     """
@@ -231,6 +233,36 @@ class TestProjectIO(unittest.TestCase):
         self.assertEqual(saved_layer2_mat.Identification, loaded_layer2_mat.Identification)
         self.assertEqual(saved_layer2_mat.cRef, loaded_layer2_mat.cRef)
 
+    def test_round_trip_legs_and_boreholes(self):
+        """Test that multi-leg / multi-borehole site models survive a save/load round trip."""
+        def layer(name, thickness):
+            return SoilLayer(name=name, thickness=thickness,
+                             material=MaterialProperties(model_name="MohrCoulomb", Identification=name))
+
+        settings_to_save = ProjectSettings(
+            project_name="SiteRoundTrip",
+            spudcan=SpudcanGeometry(diameter=10.0, height_cone_angle=30.0),
+            legs=[SpudcanLeg("Bow", 0.0, 20.0), SpudcanLeg("Port", -15.0, -10.0, SpudcanGeometry(diameter=12.0, height_cone_angle=30.0))],
+            boreholes=[Borehole("CPT1", 0.0, 20.0, [layer("Clay", 10.0), layer("Sand", 40.0)]),
+                       Borehole("CPT2", 0.0, -10.0, [layer("Clay", 6.0), layer("Sand", 50.0)], water_table_depth=2.0)],
+            water_table_depth=0.0,
+            loading=LoadingConditions(vertical_preload=800.0, target_type="penetration", target_penetration_or_load=3.0),
+        )
+
+        self.assertTrue(save_project(settings_to_save, self.temp_file_path))
+        loaded_settings = load_project(self.temp_file_path)
+        if not loaded_settings: self.fail("Loaded settings should not be None")
+
+        self.assertEqual(loaded_settings.legs, settings_to_save.legs)
+        self.assertIsInstance(loaded_settings.legs[1].spudcan, SpudcanGeometry)
+        self.assertIsNone(loaded_settings.legs[0].spudcan)
+        self.assertEqual(loaded_settings.boreholes, settings_to_save.boreholes)
+        self.assertIsInstance(loaded_settings.boreholes[1].soil_layers[0].material, MaterialProperties)
+
+        setup_names = [c.__name__ for c in generate_model_setup_callables(loaded_settings)]
+        self.assertIn("create_site_boreholes_callable", setup_names)
+        self.assertIn("create_leg_cones_callable", setup_names)
+
 
 if __name__ == '__main__':
     unittest.main()
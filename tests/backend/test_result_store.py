@@ -0,0 +1,55 @@
+"""
+Unit tests for the on-disk result store (result_store.py).
+"""
+import json
+import pytest
+
+from backend.models import ProjectSettings, AnalysisResults, SoilLayer, MaterialProperties
+from backend.exceptions import ProjectValidationError
+from backend.result_store import ResultStore, project_case_parameters, INDEX_FILENAME
+
+
+def _results(peak: float) -> AnalysisResults:
+    curve = [{'penetration': 0.1 * i, 'load': peak * min(i, 5) / 5} for i in range(10)]
+    return AnalysisResults(peak_vertical_resistance=peak, final_penetration_depth=0.9, load_penetration_curve_data=curve)
+
+
+def test_add_reopen_and_lazy_curves(tmp_path):
+    store = ResultStore(str(tmp_path))
+    for i, su in enumerate([20.0, 30.0, 40.0]):
+        store.add(f"case{i}", _results(100.0 * su), {"su": su, "diameter": 10.0}, save_index=False)
+    store.save_index()
+
+    reopened = ResultStore(str(tmp_path), cache_size=2)
+    assert [c.case_id for c in reopened.cases()] == ["case0", "case1", "case2"]
+    assert reopened.parameter_names() == ["su"] # 'diameter' does not vary
+    assert reopened.get("case1").n_points == 10
+    assert reopened._curve_cache == {} # Nothing loaded until asked
+
+    pens, loads = reopened.load_curve("case2")
+    assert loads[-1] == 4000.0 and len(pens) == 10
+    list(reopened.iter_curves())
+    assert list(reopened._curve_cache) == ["case1", "case2"] # Bounded LRU
+    assert [case_id for case_id, _ in reopened.iter_curves(cache=False)] == ["case0", "case1", "case2"]
+    assert list(reopened._curve_cache) == ["case1", "case2"] # Uncached reads leave the LRU as it was
+    with pytest.raises(KeyError):
+        reopened.load_curve("missing")
+
+
+def test_invalid_ids_and_index(tmp_path):
+    store = ResultStore(str(tmp_path))
+    with pytest.raises(ProjectValidationError):
+        store.add("../escape", _results(1.0))
+    (tmp_path / INDEX_FILENAME).write_text(json.dumps({"format_version": 99, "cases": []}))
+    with pytest.raises(ProjectValidationError, match="format version"):
+        ResultStore(str(tmp_path))
+
+
+def test_project_case_parameters():
+    settings = ProjectSettings(soil_stratigraphy=[SoilLayer(name="Clay", thickness=5.0, material=MaterialProperties(cRef=25.0))])
+    settings.spudcan.diameter = 12.0
+    params = project_case_parameters(settings)
+    assert params["spudcan.diameter"] == 12.0
+    assert params["soil_stratigraphy[0].material.cRef"] == 25.0
+    assert params["soil_stratigraphy[0].thickness"] == 5.0
+    assert "analysis_control.meshing_refinement_spudcan" not in params # Booleans are not parameters
@@ -0,0 +1,109 @@
+"""
+Unit tests for run tracing and the trace analyzer (run_trace.py).
+"""
+import json
+import pytest
+
+from backend.run_trace import RunTracer, load_trace, build_breakdown, format_breakdown, main
+from backend.plaxis_interactor.interactor import PlaxisInteractor
+from backend.exceptions import PlaxisAutomationError
+
+
+class FakeResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+class FakeTextResponse:
+    """Like plxscripting's decrypted Response, which has `text` but no `content`."""
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeConnection:
+    """Calls its `logger` around each request like plxscripting's HTTPConnection."""
+    def __init__(self):
+        self.logger = None
+
+    def request(self, payload: str, reply: bytes):
+        self.logger.log_request_start(payload)
+        self.logger.log_request_end(FakeResponse(reply))
+
+
+class FakeServer:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+
+def test_spans_nest_and_count_connection_traffic(tmp_path):
+    path = tmp_path / "traces" / "run.jsonl"
+    tracer = RunTracer(str(path), project_name="P1")
+    server = FakeServer()
+    assert tracer.attach_connection(server)
+    assert not tracer.attach_connection(object())
+
+    with tracer.span("setup"):
+        with tracer.span("mesh", "command"):
+            server.connection.request("abcd", b"123456")
+            server.connection.request("ef", b"")
+        with pytest.raises(ValueError):
+            with tracer.span("bad", "command"):
+                raise ValueError("boom")
+    tracer.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["type"] == "run" and lines[0]["project_name"] == "P1"
+    spans = {s.name: s for s in load_trace(str(path))}
+    assert spans["mesh"].parent == spans["setup"].id and spans["bad"].parent == spans["setup"].id
+    assert (spans["mesh"].requests, spans["mesh"].bytes_sent, spans["mesh"].bytes_received) == (2, 6, 6)
+    assert spans["setup"].requests == 2 # Includes the traffic of child spans
+    assert spans["bad"].status == "error" and spans["bad"].error == "ValueError: boom"
+
+
+def test_connection_traffic_counts_text_only_responses():
+    tracer = RunTracer()
+    server = FakeServer()
+    tracer.attach_connection(server)
+    with tracer.span("extract", "command"):
+        server.connection.logger.log_request_start("abc")
+        server.connection.logger.log_request_end(FakeTextResponse('{"reply": 1}'))
+    tracer.close()
+    span = tracer.spans[0]
+    assert (span.requests, span.bytes_sent, span.bytes_received) == (1, 3, 12)
+
+
+def test_breakdown_merges_siblings_by_name(tmp_path, capsys):
+    path = tmp_path / "run.jsonl"
+    tracer = RunTracer(str(path))
+    with tracer.span("calculation"):
+        for _ in range(3):
+            with tracer.span("set_phase_property", "command"):
+                pass
+    tracer.close()
+
+    roots = build_breakdown(load_trace(str(path)))
+    assert [r.name for r in roots] == ["calculation"]
+    child = roots[0].children["set_phase_property"]
+    assert child.count == 3 and child.kind == "command"
+    assert "set_phase_property x3" in format_breakdown(roots)
+
+    assert main([str(path), "--min-percent", "0"]) == 0
+    assert "calculation" in capsys.readouterr().out
+
+
+def test_interactor_records_command_spans():
+    tracer = RunTracer()
+    interactor = PlaxisInteractor(tracer=tracer)
+
+    def create_points(g_i): pass
+    def failing_command(g_i): raise RuntimeError("server error")
+
+    interactor._execute_api_commands([create_points], object(), "Input (g_i) - Test")
+    with pytest.raises(PlaxisAutomationError):
+        interactor._execute_api_commands([failing_command], object(), "Input (g_i) - Failing")
+
+    by_name = {s.name: s for s in tracer.spans}
+    assert by_name["create_points"].kind == "command"
+    assert by_name["create_points"].parent == by_name["Input (g_i) - Test"].id
+    assert by_name["failing_command"].status == "error"
+    assert by_name["Input (g_i) - Failing"].status == "error"